@@ -3,23 +3,205 @@
 - 광고선전비, 간접비, 직접비 분석을 수행합니다
 """
 
+import logging
+import re
 import sys
 import os
-import json
+import asyncio
+import hashlib
+import orjson
 import time
+import polars as pl
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # 상위 디렉토리 경로 추가
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 from core.base_analyzer import BaseAnalyzer
+from config.analysis_config import BRAND_CODE_MAP
 from config.sql_queries import (
-    get_ad_expense_total_query,
-    get_ad_expense_detail_query,
-    get_ad_expense_trend_query,
+    get_ad_expense_batch_query,
     get_indirect_cost_query,
     get_direct_cost_query
 )
 
+logger = logging.getLogger(__name__)
+_BANNER = "=" * 60
+
+# LLM 응답을 감싼 마크다운 코드 블록 (```json ... ```)
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+# 광고선전비 분석 결과 버전 (_input_hash에 포함)
+# 템플릿 외에 모델/시스템 프롬프트/응답 파싱 방식을 바꿨을 때 올리면 기존 결과를 재사용하지 않고 다시 분석
+AD_EXPENSE_ANALYSIS_VERSION = "1"
+
+# LLM 프롬프트 템플릿 (모듈 로드 시 한 번만 생성, format_map으로 값 채움)
+AD_EXPENSE_PROMPT_TEMPLATE = """
+너는 F&F 그룹의 {brd_name} 브랜드 마케팅 전략 책임자야. {py_year}년 {month}월과 {year}년 {month}월의 광고선전비를 비교 분석하여 마케팅 투자 효율성과 최적화 방안을 제시해야 해.
+
+**분석 기간**
+- 당해: {year}년 {month}월
+- 전년: {py_year}년 {month}월
+
+<분석 목표>
+{brd_name} 브랜드의 {py_year}년 {month}월 vs {year}년 {month}월 광고선전비 투자 변화를 분석하여 마케팅 전략의 효과성과 향후 예산 배분 전략을 경영관리팀에게 수립해줘.
+
+<전체 합계 데이터>
+{total_json}
+
+<세부 계정별 데이터 (백만원, 전년/당해/증감)>
+{categories_json}
+
+<요구사항>
+아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
+
+{{
+  "title": "광고비 분석",
+  "sections": [
+    {{
+      "sub_title": "투자 방향성 종합 평가",
+      "ai_text": "전년대비 {py_year}년 {month}월 vs {year}년 {month}월 광고비 변화를 종합적으로 평가한 내용"
+    }},
+    {{
+      "sub_title": "효율적 투자 영역",
+      "ai_text": "효과적인 투자 영역들을 불릿 포인트로 나열"
+    }},
+    {{
+      "sub_title": "주의 필요 영역",
+      "ai_text": "주의가 필요한 영역들을 불릿 포인트로 나열"
+    }},
+    {{
+      "sub_title": "이상징후 및 리스크 감지",
+      "ai_text": "이상징후와 리스크를 구체적으로 설명"
+    }},
+    {{
+      "sub_title": "마케팅 전략 최적화 방안",
+      "ai_text": "단기 전략 방향과 중장기 전략 방향을 구체적으로 제시"
+    }}
+  ]
+}}
+
+<작성 가이드라인>
+- 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
+- 숫자는 백만원 단위로 표시하고 변형하지 말 것
+- 모든 광고선전비 계정 (CTGR3) 누락 없이 분석
+- 전년대비 변화에 대한 구체적 원인과 효과 분석
+- 즉시 실행 가능한 예산 최적화 방안 제시
+- 불릿 포인트는 마크다운 형식(-, •, **) 사용 가능
+- 줄바꿈은 반드시 \\n을 사용하여 표시
+- 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
+
+위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
+"""
+
+INDIRECT_COST_PROMPT_TEMPLATE = """
+너는 F&F 그룹의 {brd_name} 브랜드 간접비 관리 전문가야. {py_year}년 {month}월과 {year}년 {month}월의 간접비를 상세 비교 분석하여 비용 효율성 개선과 수익성 제고 방안을 제시해야 해.
+
+**분석 기간**
+- 당해: {year}년 {month}월
+- 전년: {py_year}년 {month}월
+
+<분석 목표>
+{brd_name} 브랜드의 {py_year}년 {month}월 vs {year}년 {month}월 간접비 투자 변화를 분석하여 비용 최적화와 운영 효율성 향상을 위한 실행 가능한 전략을 경영관리팀에게 제시해줘.
+
+<핵심 분석 요구사항>
+
+1. **📊 {py_year}년 vs {year}년 {month}월 간접비 요약 비교 (가장 먼저 작성)**
+   - **{py_year}년 {month}월 총 간접비**: X,XXX백만원
+   - **{year}년 {month}월 총 간접비**: X,XXX백만원
+   - **전년대비 증감**: ±X,XXX백만원 (±X.X%)
+   - **비용 관리 평가**: 효율화/비효율화 및 그 원인
+
+2. **간접비 카테고리별 상세 변화 분석**
+   - CTGR1별 {py_year}년 vs {year}년 투자 변화와 비중 분석
+   - 증가한 간접비 카테고리의 사업적 필요성 평가
+   - 감소한 간접비 카테고리의 운영 효율성 개선 효과
+   - 신규 발생/중단된 간접비 항목 식별
+   - 모든 간접비 계정을 누락 없이 포함하여 분석
+
+3. **간접비 효율성 및 적정성 평가**
+   - 전년 동월 대비 간접비 증감률과 변화 요인 분석
+   - 고정비 vs 변동비 성격의 간접비 구조 분석
+   - 규모의 경제 실현 여부와 비용 효율성 평가
+
+4. **이상징후 및 리스크 감지**
+   - 급증한 간접비 카테고리와 그 원인 분석
+   - 과도한 고정비 부담으로 인한 수익성 압박 요인
+   - 비효율적 간접비 지출 패턴 및 개선 가능 영역
+
+5. **간접비 구조 최적화 방안**
+   - 고효율 간접비 카테고리로의 재배분 전략
+   - 비효율적 간접비의 단계적 축소 방안
+   - 브랜드 운영 기여도 대비 간접비 투자 우선순위 재조정
+
+<작성 가이드라인>
+- 맨 처음에 {py_year}년 vs {year}년 {month}월 간접비 요약 비교를 명확히 제시
+- 모든 간접비 카테고리 (CTGR1, CTGR2, CTGR3) 누락 없이 분석
+- 전년대비 변화에 대한 구체적 원인과 비용 효율성 분석
+- 즉시 실행 가능한 비용 최적화 방안 제시
+- 최대 100줄까지 작성
+- 숫자는 변형하지 말 것 (단위: 백만원)
+
+<데이터>
+{records_json}
+
+위 데이터를 바탕으로 {brd_name} 브랜드의 {py_year}년 vs {year}년 {month}월 간접비 비교 분석 및 비용 최적화 전략 보고서를 작성해줘:
+"""
+
+DIRECT_COST_PROMPT_TEMPLATE = """
+너는 F&F 그룹의 {brd_name} 브랜드 직접비 관리 전문가야. {py_year}년 {month}월과 {year}년 {month}월의 직접비를 상세 비교 분석하여 운영 효율성 개선과 수익성 제고 방안을 제시해야 해.
+
+**분석 기간**
+- 당해: {year}년 {month}월
+- 전년: {py_year}년 {month}월
+
+<분석 목표>
+{brd_name} 브랜드의 {py_year}년 {month}월 vs {year}년 {month}월 직접비 투자 변화를 분석하여 운영비 최적화와 채널별 효율성 향상을 위한 실행 가능한 전략을 경영관리팀에게 제시해줘.
+
+<핵심 분석 요구사항>
+
+1. **📊 {py_year}년 vs {year}년 {month}월 직접비 요약 비교 (가장 먼저 작성)**
+   - **{py_year}년 {month}월 총 직접비**: X,XXX백만원
+   - **{year}년 {month}월 총 직접비**: X,XXX백만원
+   - **전년대비 증감**: ±X,XXX백만원 (±X.X%)
+   - **비용 관리 평가**: 효율화/비효율화 및 그 원인
+
+2. **직접비 항목별 상세 변화 분석**
+   - 로열티, 매장임차료, 판매직수수료, 카드수수료, 물류보관비, 매장감가상각비별 {py_year}년 vs {year}년 변화
+   - 증가한 직접비 항목의 운영상 필요성 평가
+   - 감소한 직접비 항목의 효율성 개선 효과
+   - 신규 발생/중단된 직접비 항목 식별
+   - 모든 직접비 계정을 누락 없이 포함하여 분석
+
+3. **직접비 효율성 및 적정성 평가**
+   - 전년 동월 대비 직접비 증감률과 변화 요인 분석
+   - 고정비 vs 변동비 성격의 직접비 구조 분석
+   - 채널별 직접비 효율성과 운영 특성 평가
+
+4. **이상징후 및 리스크 감지**
+   - 급증한 직접비 항목과 그 원인 분석
+   - 과도한 고정 직접비 부담으로 인한 수익성 압박 요인
+   - 비효율적 직접비 지출 패턴 및 개선 가능 영역
+
+5. **직접비 구조 최적화 방안**
+   - 고효율 직접비 항목으로의 재배분 전략
+   - 비효율적 직접비의 단계적 축소 방안
+   - 채널별 운영 특성에 맞는 직접비 투자 우선순위 재조정
+
+<작성 가이드라인>
+- 맨 처음에 {py_year}년 vs {year}년 {month}월 직접비 요약 비교를 명확히 제시
+- 모든 직접비 항목 (로열티, 임차료, 수수료, 물류비 등) 누락 없이 분석
+- 전년대비 변화에 대한 구체적 원인과 운영 효율성 분석
+- 즉시 실행 가능한 운영비 최적화 방안 제시
+- 최대 100줄까지 작성
+- 숫자는 변형하지 말 것 (단위: 백만원)
+
+<데이터>
+{records_json}
+
+위 데이터를 바탕으로 {brd_name} 브랜드의 {py_year}년 vs {year}년 {month}월 직접비 비교 분석 및 운영 최적화 전략 보고서를 작성해줘:
+"""
+
 
 class CostAnalyzer(BaseAnalyzer):
     """
@@ -30,251 +212,349 @@ class CostAnalyzer(BaseAnalyzer):
         analyzer.analyze_ad_expense()      # 광고선전비 분석
         analyzer.analyze_indirect_cost()   # 간접비 분석
         analyzer.analyze_direct_cost()     # 직접비 분석
+        
+        # 세 가지 비용 분석을 동시에 실행
+        CostAnalyzer.run_concurrently(
+            analyzer.analyze_ad_expense_async(),
+            analyzer.analyze_indirect_cost_async(),
+            analyzer.analyze_direct_cost_async(),
+        )
+        
+        # 여러 브랜드를 한 번에 실행할 때는 동시 LLM 호출 수 제한
+        analyzers = [CostAnalyzer(yyyymm='202509', brd_cd=b) for b in ['M', 'I', 'X']]
+        CostAnalyzer.run_concurrently(
+            *(a.analyze_ad_expense_async() for a in analyzers),
+            max_concurrency=4,
+        )
     """
     
-    def analyze_ad_expense(self):
+    __slots__ = ()
+    
+    def analyze_ad_expense(self, force=False):
         """
         07번: 광고선전비 추이분석
         
         전년 동월과 당해 동월의 광고선전비를 비교 분석합니다.
         JSON과 Markdown 파일을 모두 생성합니다.
+        
+        같은 입력 데이터로 이미 생성된 JSON이 있으면 LLM을 호출하지 않고 그 결과를 반환합니다.
+        
+        Args:
+            force (bool): True면 기존 결과가 있어도 다시 분석
         """
-        print(f"\n{'='*60}")
-        print(f"📊 [{self.brd_name}] 광고선전비 추이분석 시작...")
-        print(f"{'='*60}")
+        logger.info("\n%s", _BANNER)
+        logger.info(f"📊 [{self.brd_name}] 광고선전비 추이분석 시작...")
+        logger.info(_BANNER)
         
         try:
-            # 분석 대상 월 추출
-            current_year = self.yyyymm[:4]
-            current_month = self.yyyymm[4:6]
-            previous_year = self.yyyymm_py[:4]
-            
-            # 1. 전체 합계 데이터 조회
-            total_sql = get_ad_expense_total_query(
-                yyyymm=self.yyyymm,
-                yyyymm_py=self.yyyymm_py,
-                brd_cd=self.brd_cd
-            )
-            df_total = self.execute_query(total_sql)
-            total_records = df_total.to_dicts()
-            
-            # 2. 세부 내역 데이터 조회
-            detail_sql = get_ad_expense_detail_query(
-                yyyymm=self.yyyymm,
-                yyyymm_py=self.yyyymm_py,
-                brd_cd=self.brd_cd
-            )
-            df_detail = self.execute_query(detail_sql)
-            detail_records = df_detail.to_dicts()
-            
-            # 3. 12개월 추세 데이터 조회
-            trend_months = self._generate_trend_months()
-            trend_total_sql = get_ad_expense_trend_query(trend_months, self.brd_cd)
-            df_trend_total = self.execute_query(trend_total_sql)
-            trend_total_records = df_trend_total.to_dicts()
-            
-            # 4. 요약 정보 계산
-            total_by_year = {}
-            for row in total_records:
-                year = row['PST_YYYYMM'][:4]
-                total_by_year[year] = row['TOTAL_AMT']
-            
-            prev_year_total = total_by_year.get(previous_year, 0)
-            curr_year_total = total_by_year.get(current_year, 0)
-            change_amount = curr_year_total - prev_year_total
-            change_pct = (change_amount / prev_year_total * 100) if prev_year_total != 0 else 0
-            
-            print(f"📈 {previous_year}년 {current_month}월: {prev_year_total:,.0f}원")
-            print(f"📈 {current_year}년 {current_month}월: {curr_year_total:,.0f}원")
-            print(f"📊 전년대비 변화: {change_amount:+,.0f}원 ({change_pct:+.1f}%)")
+            prompt, json_data = self._build_ad_expense_prompt()
             
-            # 5. LLM 프롬프트 생성
-            prompt = f"""
-            너는 F&F 그룹의 {self.brd_name} 브랜드 마케팅 전략 책임자야. {previous_year}년 {current_month}월과 {current_year}년 {current_month}월의 광고선전비를 비교 분석하여 마케팅 투자 효율성과 최적화 방안을 제시해야 해.
+            cached = None if force else self._load_ad_expense_result(json_data['_input_hash'])
+            if cached is not None:
+                return cached
             
-            **분석 기간**
-            - 당해: {current_year}년 {current_month}월
-            - 전년: {previous_year}년 {current_month}월
-
-            <분석 목표>
-            {self.brd_name} 브랜드의 {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월 광고선전비 투자 변화를 분석하여 마케팅 전략의 효과성과 향후 예산 배분 전략을 경영관리팀에게 수립해줘.
-
-            <전체 합계 데이터>
-            {total_records}
+            # 8. LLM 호출 (분석할 데이터가 없으면 호출 없이 기본 결과 저장)
+            response = self.call_llm(prompt) if prompt is not None else None
             
-            <세부 계정별 데이터>
-            {detail_records}
-
-            <요구사항>
-            아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
-
-            {{
-              "title": "광고비 분석",
-              "sections": [
-                {{
-                  "sub_title": "투자 방향성 종합 평가",
-                  "ai_text": "전년대비 {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월 광고비 변화를 종합적으로 평가한 내용"
-                }},
-                {{
-                  "sub_title": "효율적 투자 영역",
-                  "ai_text": "효과적인 투자 영역들을 불릿 포인트로 나열"
-                }},
-                {{
-                  "sub_title": "주의 필요 영역",
-                  "ai_text": "주의가 필요한 영역들을 불릿 포인트로 나열"
-                }},
-                {{
-                  "sub_title": "이상징후 및 리스크 감지",
-                  "ai_text": "이상징후와 리스크를 구체적으로 설명"
-                }},
-                {{
-                  "sub_title": "마케팅 전략 최적화 방안",
-                  "ai_text": "단기 전략 방향과 중장기 전략 방향을 구체적으로 제시"
-                }}
-              ]
-            }}
-
-            <작성 가이드라인>
-            - 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
-            - 숫자는 백만원 단위로 표시하고 변형하지 말 것
-            - 모든 광고선전비 계정 (CTGR3) 누락 없이 분석
-            - 전년대비 변화에 대한 구체적 원인과 효과 분석
-            - 즉시 실행 가능한 예산 최적화 방안 제시
-            - 불릿 포인트는 마크다운 형식(-, •, **) 사용 가능
-            - 줄바꿈은 반드시 \\n을 사용하여 표시
-            - 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
-
-            위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
-            """
-            
-            # 6. LLM 호출
-            response = self.call_llm(prompt)
-            
-            # 7. JSON 파싱
-            response_clean = response.strip()
-            if response_clean.startswith('```json'):
-                response_clean = response_clean[7:]
-            elif response_clean.startswith('```'):
-                response_clean = response_clean[3:]
-            if response_clean.endswith('```'):
-                response_clean = response_clean[:-3]
-            response_clean = response_clean.strip()
-            
-            try:
-                ai_analysis_json = json.loads(response_clean)
-            except json.JSONDecodeError as e:
-                print(f"❌ JSON 파싱 오류: {e}")
-                print(f"응답 내용: {response_clean[:500]}")
-                ai_analysis_json = {
-                    "title": "광고비 분석",
-                    "sections": [{
-                        "sub_title": "분석 오류",
-                        "ai_text": response
-                    }]
-                }
+            return self._save_ad_expense_result(response, json_data)
             
-            # 8. Markdown 파일 생성
-            md_content = f"# 📊 {self.brd_name} 브랜드 광고선전비 비교 분석 보고서 ({previous_year}.{current_month} vs {current_year}.{current_month})\n\n"
-            for section in ai_analysis_json.get('sections', []):
-                md_content += f"## {section.get('sub_title', '')}\n\n"
-                ai_text = section.get('ai_text', '').replace('\\n', '\n')
-                md_content += f"{ai_text}\n\n"
-            
-            filename = self.format_filename("07", "광고선전비_추이분석")
-            self.save_markdown(md_content, filename)
-            
-            # 9. 카테고리별 데이터 구조화
-            categories_by_year = {}
-            for row in detail_records:
-                year = row['PST_YYYYMM'][:4]
-                ctgr2 = row.get('CTGR2', '기타')
-                ctgr3 = row.get('CTGR3', '기타')
-                gl_nm = row.get('GL_NM', '')
-                amount = row.get('TTL_USE_AMT', 0)
-                
-                category_key = f"{ctgr2}|{ctgr3}|{gl_nm}"
-                if category_key not in categories_by_year:
-                    categories_by_year[category_key] = {
-                        'ctgr2': ctgr2,
-                        'ctgr3': ctgr3,
-                        'gl_nm': gl_nm,
-                        'prev_year': 0,
-                        'curr_year': 0
-                    }
-                
-                if year == previous_year:
-                    categories_by_year[category_key]['prev_year'] = float(amount)
-                elif year == current_year:
-                    categories_by_year[category_key]['curr_year'] = float(amount)
-            
-            # 카테고리별 변화량 계산 (백만원 단위)
-            categories_list = []
-            for category_key, category_data in categories_by_year.items():
-                prev_year_m = float(category_data['prev_year']) / 1000000
-                curr_year_m = float(category_data['curr_year']) / 1000000
-                change = curr_year_m - prev_year_m
-                change_pct_cat = (change / prev_year_m * 100) if prev_year_m != 0 else (100 if curr_year_m > 0 else 0)
-                
-                category_data['prev_year'] = round(prev_year_m, 2)
-                category_data['curr_year'] = round(curr_year_m, 2)
-                category_data['change'] = round(change, 2)
-                category_data['change_pct'] = round(change_pct_cat, 1)
-                category_data['is_new'] = prev_year_m == 0 and curr_year_m > 0
-                category_data['is_discontinued'] = prev_year_m > 0 and curr_year_m == 0
-                
-                categories_list.append(category_data)
-            
-            categories_list.sort(key=lambda x: abs(x['change']), reverse=True)
+        except Exception as e:
+            error_msg = f"❌ 분석 실패: {e}"
+            logger.error(error_msg)
+            raise
+    
+    async def analyze_ad_expense_async(self, force=False):
+        """
+        07번: 광고선전비 추이분석 (비동기 버전)
+        
+        DB 조회는 별도 스레드에서, LLM 호출은 비동기로 실행하여
+        다른 분석과 동시에 실행할 수 있습니다.
+        
+        Args:
+            force (bool): True면 기존 결과가 있어도 다시 분석
+        """
+        logger.info("\n%s", _BANNER)
+        logger.info(f"📊 [{self.brd_name}] 광고선전비 추이분석 시작...")
+        logger.info(_BANNER)
+        
+        try:
+            prompt, json_data = await asyncio.to_thread(self._build_ad_expense_prompt)
             
-            # 10. JSON 데이터 생성
-            json_data = {
-                'brand_cd': self.brd_cd,
-                'yyyymm': self.yyyymm,
-                'analysis_data': {
-                    'title': ai_analysis_json.get('title', '광고비 분석'),
-                    'sections': ai_analysis_json.get('sections', [])
-                },
-                'summary': {
-                    'prev_year_total': round(float(prev_year_total) / 1000000, 2),
-                    'curr_year_total': round(float(curr_year_total) / 1000000, 2),
-                    'change_amount': round(float(change_amount) / 1000000, 2),
-                    'change_pct': round(change_pct, 1),
-                    'investment_direction': '확대' if change_amount > 0 else '축소' if change_amount < 0 else '유지'
-                },
-                'categories': categories_list,
-                'category_summary': {
-                    'increased': [c for c in categories_list if c['change'] > 0],
-                    'decreased': [c for c in categories_list if c['change'] < 0],
-                    'new_investments': [c for c in categories_list if c['is_new']],
-                    'discontinued': [c for c in categories_list if c['is_discontinued']]
-                },
-                'raw_data': {
-                    'total_records': self.convert_decimal_to_float(total_records),
-                    'detail_records': self.convert_decimal_to_float(detail_records)
-                },
-                'trend_data': {
-                    'trend_months': trend_months,
-                    'monthly_totals': [
-                        {
-                            'yyyymm': row['PST_YYYYMM'],
-                            'total_amount': round(float(row['TOTAL_AMT']) / 1000000, 2)
-                        }
-                        for row in self.convert_decimal_to_float(trend_total_records)
-                    ]
-                }
-            }
+            cached = None if force else self._load_ad_expense_result(json_data['_input_hash'])
+            if cached is not None:
+                return cached
             
-            # 11. JSON 파일 저장
-            self.save_json(json_data, filename)
+            # 8. LLM 호출 (분석할 데이터가 없으면 호출 없이 기본 결과 저장)
+            response = await self.call_llm_async(prompt) if prompt is not None else None
             
-            print(f"✅ [{self.brd_name}] 광고선전비 추이분석 완료! (MD + JSON)\n")
-            return json_data
+            return self._save_ad_expense_result(response, json_data)
             
         except Exception as e:
             error_msg = f"❌ 분석 실패: {e}"
-            print(error_msg)
+            logger.error(error_msg)
             raise
     
+    def _build_ad_expense_prompt(self):
+        """
+        광고선전비 추이분석 데이터 조회 및 LLM 프롬프트 생성
+        
+        Returns:
+            tuple: (LLM 프롬프트, LLM 분석 결과(analysis_data)를 제외한 JSON 데이터)
+                전년/당해 광고선전비가 모두 0이면 프롬프트는 None
+        """
+        current_year = self.year_str
+        current_month = self.month_str
+        previous_year = self.py_year_str
+        
+        # 1~3. 전체 합계 / 세부 내역 / 12개월 추세 데이터를 한 번의 쿼리로 조회
+        trend_months = self._generate_trend_months()
+        batch_sql = get_ad_expense_batch_query(
+            yyyymm=self.yyyymm,
+            yyyymm_py=self.yyyymm_py,
+            trend_months=trend_months,
+            brd_cd=self.brd_cd
+        )
+        df_batch = self.cast_decimal_columns(self.execute_query(batch_sql))
+        
+        # QUERY_TYPE별로 분리하여 기존 개별 쿼리와 같은 컬럼 구성으로 복원
+        df_total = (
+            df_batch.filter(pl.col('QUERY_TYPE') == 'total')
+            .select('PST_YYYYMM', pl.col('AMT').alias('TOTAL_AMT'))
+        )
+        df_detail = (
+            df_batch.filter(pl.col('QUERY_TYPE') == 'detail')
+            .select(
+                'PST_YYYYMM', 'BRD_CD', 'BRD_NM', 'CTGR1', 'CTGR2', 'CTGR3', 'GL_NM',
+                pl.col('AMT').alias('TTL_USE_AMT')
+            )
+            .sort('TTL_USE_AMT', descending=True)
+        )
+        df_trend_total = (
+            df_batch.filter(pl.col('QUERY_TYPE') == 'trend')
+            .select('PST_YYYYMM', pl.col('AMT').alias('TOTAL_AMT'))
+        )
+        total_records = df_total.to_dicts()
+        detail_records = df_detail.to_dicts()
+        trend_total_records = df_trend_total.to_dicts()
+        
+        # 4. 요약 정보 계산
+        total_by_year = {}
+        for row in total_records:
+            year = row['PST_YYYYMM'][:4]
+            total_by_year[year] = row['TOTAL_AMT']
+        
+        prev_year_total = total_by_year.get(previous_year, 0)
+        curr_year_total = total_by_year.get(current_year, 0)
+        change_amount = curr_year_total - prev_year_total
+        change_pct = (change_amount / prev_year_total * 100) if prev_year_total != 0 else 0
+        
+        logger.info(f"📈 {previous_year}년 {current_month}월: {prev_year_total:,.0f}원")
+        logger.info(f"📈 {current_year}년 {current_month}월: {curr_year_total:,.0f}원")
+        logger.info(f"📊 전년대비 변화: {change_amount:+,.0f}원 ({change_pct:+.1f}%)")
+        
+        # 5. 카테고리별 전년/당해 금액 집계 및 변화량 계산 (백만원 단위)
+        prev_amt = pl.col('TTL_USE_AMT').filter(pl.col('YEAR') == previous_year).sum() / 1000000
+        curr_amt = pl.col('TTL_USE_AMT').filter(pl.col('YEAR') == current_year).sum() / 1000000
+        df_categories = (
+            df_detail
+            .with_columns(
+                pl.col('PST_YYYYMM').str.slice(0, 4).alias('YEAR'),
+                pl.col('TTL_USE_AMT').cast(pl.Float64),
+            )
+            .group_by(['CTGR2', 'CTGR3', 'GL_NM'], maintain_order=True)
+            .agg(prev_amt.alias('prev'), curr_amt.alias('curr'))
+            .select(
+                pl.col('CTGR2').alias('ctgr2'),
+                pl.col('CTGR3').alias('ctgr3'),
+                pl.col('GL_NM').alias('gl_nm'),
+                pl.col('prev').round(2).alias('prev_year'),
+                pl.col('curr').round(2).alias('curr_year'),
+                (pl.col('curr') - pl.col('prev')).round(2).alias('change'),
+                pl.when(pl.col('prev') != 0)
+                  .then((pl.col('curr') - pl.col('prev')) / pl.col('prev') * 100)
+                  .when(pl.col('curr') > 0).then(100.0)
+                  .otherwise(0.0)
+                  .round(1).alias('change_pct'),
+                ((pl.col('prev') == 0) & (pl.col('curr') > 0)).alias('is_new'),
+                ((pl.col('prev') > 0) & (pl.col('curr') == 0)).alias('is_discontinued'),
+            )
+            .sort(pl.col('change').abs(), descending=True, maintain_order=True)
+        )
+        categories_list = df_categories.to_dicts()
+        
+        # 프롬프트에는 원본 세부 행 대신 계정별 전년/당해/증감 집계만 전달 (입력 토큰 절감)
+        categories_json = orjson.dumps(categories_list).decode()
+        
+        # 6. LLM 프롬프트 생성 (전년/당해 모두 광고선전비가 없으면 분석할 내용이 없으므로 생략)
+        if prev_year_total == 0 and curr_year_total == 0:
+            logger.warning(f"⚠️ 데이터가 없습니다: {self.brd_name} 브랜드 광고선전비 데이터 (LLM 분석 생략)")
+            prompt = None
+        else:
+            prompt = AD_EXPENSE_PROMPT_TEMPLATE.format_map({
+                'brd_name': self.brd_name,
+                'year': current_year,
+                'month': current_month,
+                'py_year': previous_year,
+                'total_json': orjson.dumps(total_records).decode(),
+                'categories_json': categories_json,
+            })
+        
+        # 7. JSON 데이터 생성 (analysis_data는 LLM 응답 파싱 후 채움)
+        json_data = {
+            'brand_cd': self.brd_cd,
+            'yyyymm': self.yyyymm,
+            'analysis_data': None,
+            'summary': {
+                'prev_year_total': round(float(prev_year_total) / 1000000, 2),
+                'curr_year_total': round(float(curr_year_total) / 1000000, 2),
+                'change_amount': round(float(change_amount) / 1000000, 2),
+                'change_pct': round(change_pct, 1),
+                'investment_direction': '확대' if change_amount > 0 else '축소' if change_amount < 0 else '유지'
+            },
+            'categories': categories_list,
+            'category_summary': {
+                'increased': df_categories.filter(pl.col('change') > 0).to_dicts(),
+                'decreased': df_categories.filter(pl.col('change') < 0).to_dicts(),
+                'new_investments': df_categories.filter(pl.col('is_new')).to_dicts(),
+                'discontinued': df_categories.filter(pl.col('is_discontinued')).to_dicts()
+            },
+            'raw_data': {
+                'total_records': total_records,
+                'detail_records': detail_records
+            },
+            'trend_data': {
+                'trend_months': trend_months,
+                'monthly_totals': [
+                    {
+                        'yyyymm': row['PST_YYYYMM'],
+                        'total_amount': round(float(row['TOTAL_AMT']) / 1000000, 2)
+                    }
+                    for row in trend_total_records
+                ]
+            },
+            # 입력 해시 (같은 버전/프롬프트/데이터로 재실행 시 LLM 호출 생략용)
+            # 프롬프트 문구(템플릿)가 바뀌면 해시도 바뀌므로 기존 결과를 재사용하지 않음
+            '_input_hash': hashlib.sha256(
+                orjson.dumps([AD_EXPENSE_ANALYSIS_VERSION, prompt, total_records, detail_records, trend_total_records])
+            ).hexdigest()
+        }
+        
+        return prompt, json_data
+    
+    def _load_ad_expense_result(self, input_hash):
+        """
+        같은 입력(분석 버전/프롬프트/데이터)으로 생성된 기존 광고선전비 분석 결과 조회
+        
+        Args:
+            input_hash (str): 현재 입력 해시
+        
+        Returns:
+            dict: 기존 JSON 데이터 (없거나 입력이 바뀌었거나 파싱 실패로 저장된 결과면 None)
+        """
+        filename = self.format_filename("07", "광고선전비_추이분석")
+        try:
+            existing = self.file_manager.read_json(filename)
+        except Exception:
+            return None
+        
+        if existing.get('_input_hash') != input_hash:
+            return None
+        
+        logger.info(f"♻️ [{self.brd_name}] 입력 데이터가 같아 기존 광고선전비 분석 결과 사용 ({filename})")
+        return existing
+    
+    def _parse_ad_expense_response(self, response):
+        """
+        광고선전비 분석 LLM 응답(JSON) 파싱
+        
+        Args:
+            response (str): LLM 응답 (```json ... ``` 코드 블록으로 감싸져 있을 수 있음)
+        
+        Returns:
+            tuple: ({'title': str, 'sections': [{'sub_title': str, 'ai_text': str}, ...]}, 파싱 성공 여부)
+                항상 이 구조로 정규화되며, 파싱 실패 시 응답 원문을 담은 오류 섹션과 False를 반환
+        """
+        fence_match = _FENCE_RE.match(response)
+        payload = fence_match.group(1) if fence_match else response
+        
+        try:
+            parsed = orjson.loads(payload)
+            if not isinstance(parsed, dict):
+                raise ValueError(f"최상위 값이 객체가 아닙니다 ({type(parsed).__name__})")
+        except (orjson.JSONDecodeError, ValueError) as e:
+            logger.error(f"❌ JSON 파싱 오류: {e}")
+            logger.info(f"응답 내용: {payload[:500]}")
+            return {
+                "title": "광고비 분석",
+                "sections": [{
+                    "sub_title": "분석 오류",
+                    "ai_text": response
+                }]
+            }, False
+        
+        # 응답 스키마 정규화 (누락/잘못된 타입의 필드는 기본값으로 채움)
+        sections = parsed.get('sections')
+        return {
+            "title": str(parsed.get('title') or "광고비 분석"),
+            "sections": [
+                {
+                    "sub_title": str(section.get('sub_title') or ""),
+                    "ai_text": str(section.get('ai_text') or "")
+                }
+                for section in (sections if isinstance(sections, list) else [])
+                if isinstance(section, dict)
+            ]
+        }, True
+    
+    def _save_ad_expense_result(self, response, json_data):
+        """
+        광고선전비 추이분석 결과 파싱 및 저장
+        
+        Args:
+            response (str): LLM 응답 (JSON 형식, 분석할 데이터가 없어 LLM을 호출하지 않았으면 None)
+            json_data (dict): _build_ad_expense_prompt에서 생성한 JSON 데이터
+        
+        Returns:
+            dict: 저장된 JSON 데이터
+        """
+        current_year = self.year_str
+        current_month = self.month_str
+        previous_year = self.py_year_str
+        
+        # 9. JSON 파싱 (응답이 없으면 데이터 없음 안내 섹션으로 대체)
+        if response is None:
+            ai_analysis_json = {
+                "title": "광고비 분석",
+                "sections": [{
+                    "sub_title": "투자 방향성 종합 평가",
+                    "ai_text": f"{previous_year}년 {current_month}월과 {current_year}년 {current_month}월 모두 광고선전비 집행 내역이 없습니다."
+                }]
+            }
+        else:
+            ai_analysis_json, parsed_ok = self._parse_ad_expense_response(response)
+            if not parsed_ok:
+                # 파싱 실패 결과는 재사용하지 않도록 입력 해시를 저장하지 않음 (다음 실행에서 다시 분석)
+                json_data.pop('_input_hash', None)
+        
+        # 10. Markdown 파일 생성
+        md_parts = [f"# 📊 {self.brd_name} 브랜드 광고선전비 비교 분석 보고서 ({previous_year}.{current_month} vs {current_year}.{current_month})\n\n"]
+        for section in ai_analysis_json['sections']:
+            md_parts.append(f"## {section['sub_title']}\n\n")
+            md_parts.append(section['ai_text'].replace('\\n', '\n'))
+            md_parts.append("\n\n")
+        md_content = "".join(md_parts)
+        
+        filename = self.format_filename("07", "광고선전비_추이분석")
+        self.save_markdown(md_content, filename, background=True)
+        
+        json_data['analysis_data'] = ai_analysis_json
+        
+        # 11. JSON 파일 저장
+        self.save_json(json_data, filename, background=True)
+        
+        logger.info(f"✅ [{self.brd_name}] 광고선전비 추이분석 완료! (MD + JSON)\n")
+        return json_data
+    
     def _generate_trend_months(self):
         """
         12개월 추세 데이터를 위한 월 리스트 생성
@@ -282,22 +562,12 @@ class CostAnalyzer(BaseAnalyzer):
         Returns:
             list: 12개월 월 리스트 (예: ['202410', '202411', ...])
         """
-        current_year = int(self.yyyymm[:4])
-        current_month = int(self.yyyymm[4:6])
-        trend_months = []
-        
-        for i in range(12):
-            year = current_year
-            month = current_month - i
-            
-            while month <= 0:
-                month += 12
-                year -= 1
-            
-            trend_months.append(f"{year:04d}{month:02d}")
-        
-        trend_months.sort()
-        return trend_months
+        # 월 인덱스(년*12+월) 산술로 11개월 전부터 당월까지 오름차순 생성
+        base = int(self.year_str) * 12 + int(self.month_str) - 1
+        return [
+            f"{(base - i) // 12:04d}{(base - i) % 12 + 1:02d}"
+            for i in range(11, -1, -1)
+        ]
     
     def analyze_indirect_cost(self):
         """
@@ -305,193 +575,231 @@ class CostAnalyzer(BaseAnalyzer):
         
         전년 동월과 당해 동월의 간접비를 비교 분석합니다.
         """
-        print(f"\n{'='*60}")
-        print(f"📊 [{self.brd_name}] 간접비 분석 시작...")
-        print(f"{'='*60}")
+        logger.info("\n%s", _BANNER)
+        logger.info(f"📊 [{self.brd_name}] 간접비 분석 시작...")
+        logger.info(_BANNER)
         
         try:
-            current_year = self.yyyymm[:4]
-            current_month = self.yyyymm[4:6]
-            previous_year = self.yyyymm_py[:4]
-            
-            # SQL 쿼리 실행
-            sql = get_indirect_cost_query(
-                yyyymm=self.yyyymm,
-                yyyymm_py=self.yyyymm_py,
-                brd_cd=self.brd_cd
-            )
-            df = self.execute_query(sql)
-            records = df.to_dicts()
-            
-            if not records:
-                print(f"⚠️ 데이터가 없습니다: {self.brd_name} 브랜드 간접비 데이터")
+            prompt = self._build_indirect_cost_prompt()
+            if prompt is None:
                 return None
             
-            # LLM 프롬프트 생성
-            prompt = f"""
-            너는 F&F 그룹의 {self.brd_name} 브랜드 간접비 관리 전문가야. {previous_year}년 {current_month}월과 {current_year}년 {current_month}월의 간접비를 상세 비교 분석하여 비용 효율성 개선과 수익성 제고 방안을 제시해야 해.
-            
-            **분석 기간**
-            - 당해: {current_year}년 {current_month}월
-            - 전년: {previous_year}년 {current_month}월
-
-            <분석 목표>
-            {self.brd_name} 브랜드의 {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월 간접비 투자 변화를 분석하여 비용 최적화와 운영 효율성 향상을 위한 실행 가능한 전략을 경영관리팀에게 제시해줘.
-
-            <핵심 분석 요구사항>
-
-            1. **📊 {previous_year}년 vs {current_year}년 {current_month}월 간접비 요약 비교 (가장 먼저 작성)**
-               - **{previous_year}년 {current_month}월 총 간접비**: X,XXX백만원
-               - **{current_year}년 {current_month}월 총 간접비**: X,XXX백만원
-               - **전년대비 증감**: ±X,XXX백만원 (±X.X%)
-               - **비용 관리 평가**: 효율화/비효율화 및 그 원인
-
-            2. **간접비 카테고리별 상세 변화 분석**
-               - CTGR1별 {previous_year}년 vs {current_year}년 투자 변화와 비중 분석
-               - 증가한 간접비 카테고리의 사업적 필요성 평가
-               - 감소한 간접비 카테고리의 운영 효율성 개선 효과
-               - 신규 발생/중단된 간접비 항목 식별
-               - 모든 간접비 계정을 누락 없이 포함하여 분석
-
-            3. **간접비 효율성 및 적정성 평가**
-               - 전년 동월 대비 간접비 증감률과 변화 요인 분석
-               - 고정비 vs 변동비 성격의 간접비 구조 분석
-               - 규모의 경제 실현 여부와 비용 효율성 평가
-
-            4. **이상징후 및 리스크 감지**
-               - 급증한 간접비 카테고리와 그 원인 분석
-               - 과도한 고정비 부담으로 인한 수익성 압박 요인
-               - 비효율적 간접비 지출 패턴 및 개선 가능 영역
-
-            5. **간접비 구조 최적화 방안**
-               - 고효율 간접비 카테고리로의 재배분 전략
-               - 비효율적 간접비의 단계적 축소 방안
-               - 브랜드 운영 기여도 대비 간접비 투자 우선순위 재조정
-
-            <작성 가이드라인>
-            - 맨 처음에 {previous_year}년 vs {current_year}년 {current_month}월 간접비 요약 비교를 명확히 제시
-            - 모든 간접비 카테고리 (CTGR1, CTGR2, CTGR3) 누락 없이 분석
-            - 전년대비 변화에 대한 구체적 원인과 비용 효율성 분석
-            - 즉시 실행 가능한 비용 최적화 방안 제시
-            - 최대 100줄까지 작성
-            - 숫자는 변형하지 말 것 (단위: 백만원)
-
-            <데이터>
-            {records}
-
-            위 데이터를 바탕으로 {self.brd_name} 브랜드의 {previous_year}년 vs {current_year}년 {current_month}월 간접비 비교 분석 및 비용 최적화 전략 보고서를 작성해줘:
-            """
-            
             # LLM 호출
             response = self.call_llm(prompt)
             
-            # 파일 저장
-            filename = self.format_filename("10", "간접비_분석")
-            self.save_markdown(response, filename)
+            return self._save_indirect_cost_result(response)
+            
+        except Exception as e:
+            error_msg = f"❌ 분석 실패: {e}"
+            logger.error(error_msg)
+            raise
+    
+    async def analyze_indirect_cost_async(self):
+        """
+        10번: 간접비 분석 (비동기 버전)
+        
+        DB 조회는 별도 스레드에서, LLM 호출은 비동기로 실행하여
+        다른 분석과 동시에 실행할 수 있습니다.
+        """
+        logger.info("\n%s", _BANNER)
+        logger.info(f"📊 [{self.brd_name}] 간접비 분석 시작...")
+        logger.info(_BANNER)
+        
+        try:
+            prompt = await asyncio.to_thread(self._build_indirect_cost_prompt)
+            if prompt is None:
+                return None
+            
+            # LLM 호출
+            response = await self.call_llm_async(prompt)
             
-            print(f"✅ [{self.brd_name}] 간접비 분석 완료!\n")
-            return response
+            return self._save_indirect_cost_result(response)
             
         except Exception as e:
             error_msg = f"❌ 분석 실패: {e}"
-            print(error_msg)
+            logger.error(error_msg)
             raise
     
+    def _build_indirect_cost_prompt(self):
+        """
+        간접비 분석 데이터 조회 및 LLM 프롬프트 생성
+        
+        Returns:
+            str: LLM 프롬프트 (데이터가 없으면 None)
+        """
+        # SQL 쿼리 실행
+        sql = get_indirect_cost_query(
+            yyyymm=self.yyyymm,
+            yyyymm_py=self.yyyymm_py,
+            brd_cd=self.brd_cd
+        )
+        df = self.execute_query(sql)
+        
+        if df.is_empty():
+            logger.warning(f"⚠️ 데이터가 없습니다: {self.brd_name} 브랜드 간접비 데이터")
+            return None
+        
+        # LLM 프롬프트 생성 (데이터는 Python repr 대신 압축된 JSON으로 전달)
+        records_json = orjson.dumps(self.cast_decimal_columns(df).to_dicts()).decode()
+        prompt = INDIRECT_COST_PROMPT_TEMPLATE.format_map({
+            'brd_name': self.brd_name,
+            'year': self.year_str,
+            'month': self.month_str,
+            'py_year': self.py_year_str,
+            'records_json': records_json,
+        })
+        
+        return prompt
+    
+    def _save_indirect_cost_result(self, response):
+        """
+        간접비 분석 결과 저장
+        
+        Args:
+            response (str): LLM이 생성한 분석 텍스트
+        
+        Returns:
+            str: 분석 텍스트
+        """
+        filename = self.format_filename("10", "간접비_분석")
+        self.save_markdown(response, filename, background=True)
+        
+        logger.info(f"✅ [{self.brd_name}] 간접비 분석 완료!\n")
+        return response
+    
     def analyze_direct_cost(self):
         """
         11번: 직접비 분석
         
         전년 동월과 당해 동월의 직접비를 비교 분석합니다.
         """
-        print(f"\n{'='*60}")
-        print(f"📊 [{self.brd_name}] 직접비 분석 시작...")
-        print(f"{'='*60}")
+        logger.info("\n%s", _BANNER)
+        logger.info(f"📊 [{self.brd_name}] 직접비 분석 시작...")
+        logger.info(_BANNER)
         
         try:
-            current_year = self.yyyymm[:4]
-            current_month = self.yyyymm[4:6]
-            previous_year = self.yyyymm_py[:4]
-            
-            # SQL 쿼리 실행
-            sql = get_direct_cost_query(
-                yyyymm=self.yyyymm,
-                yyyymm_py=self.yyyymm_py,
-                brd_cd=self.brd_cd
-            )
-            df = self.execute_query(sql)
-            records = df.to_dicts()
-            
-            if not records:
-                print(f"⚠️ 데이터가 없습니다: {self.brd_name} 브랜드 직접비 데이터")
+            prompt = self._build_direct_cost_prompt()
+            if prompt is None:
                 return None
             
-            # LLM 프롬프트 생성
-            prompt = f"""
-            너는 F&F 그룹의 {self.brd_name} 브랜드 직접비 관리 전문가야. {previous_year}년 {current_month}월과 {current_year}년 {current_month}월의 직접비를 상세 비교 분석하여 운영 효율성 개선과 수익성 제고 방안을 제시해야 해.
-            
-            **분석 기간**
-            - 당해: {current_year}년 {current_month}월
-            - 전년: {previous_year}년 {current_month}월
-
-            <분석 목표>
-            {self.brd_name} 브랜드의 {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월 직접비 투자 변화를 분석하여 운영비 최적화와 채널별 효율성 향상을 위한 실행 가능한 전략을 경영관리팀에게 제시해줘.
-
-            <핵심 분석 요구사항>
-
-            1. **📊 {previous_year}년 vs {current_year}년 {current_month}월 직접비 요약 비교 (가장 먼저 작성)**
-               - **{previous_year}년 {current_month}월 총 직접비**: X,XXX백만원
-               - **{current_year}년 {current_month}월 총 직접비**: X,XXX백만원
-               - **전년대비 증감**: ±X,XXX백만원 (±X.X%)
-               - **비용 관리 평가**: 효율화/비효율화 및 그 원인
-
-            2. **직접비 항목별 상세 변화 분석**
-               - 로열티, 매장임차료, 판매직수수료, 카드수수료, 물류보관비, 매장감가상각비별 {previous_year}년 vs {current_year}년 변화
-               - 증가한 직접비 항목의 운영상 필요성 평가
-               - 감소한 직접비 항목의 효율성 개선 효과
-               - 신규 발생/중단된 직접비 항목 식별
-               - 모든 직접비 계정을 누락 없이 포함하여 분석
-
-            3. **직접비 효율성 및 적정성 평가**
-               - 전년 동월 대비 직접비 증감률과 변화 요인 분석
-               - 고정비 vs 변동비 성격의 직접비 구조 분석
-               - 채널별 직접비 효율성과 운영 특성 평가
-
-            4. **이상징후 및 리스크 감지**
-               - 급증한 직접비 항목과 그 원인 분석
-               - 과도한 고정 직접비 부담으로 인한 수익성 압박 요인
-               - 비효율적 직접비 지출 패턴 및 개선 가능 영역
-
-            5. **직접비 구조 최적화 방안**
-               - 고효율 직접비 항목으로의 재배분 전략
-               - 비효율적 직접비의 단계적 축소 방안
-               - 채널별 운영 특성에 맞는 직접비 투자 우선순위 재조정
-
-            <작성 가이드라인>
-            - 맨 처음에 {previous_year}년 vs {current_year}년 {current_month}월 직접비 요약 비교를 명확히 제시
-            - 모든 직접비 항목 (로열티, 임차료, 수수료, 물류비 등) 누락 없이 분석
-            - 전년대비 변화에 대한 구체적 원인과 운영 효율성 분석
-            - 즉시 실행 가능한 운영비 최적화 방안 제시
-            - 최대 100줄까지 작성
-            - 숫자는 변형하지 말 것 (단위: 백만원)
-
-            <데이터>
-            {records}
-
-            위 데이터를 바탕으로 {self.brd_name} 브랜드의 {previous_year}년 vs {current_year}년 {current_month}월 직접비 비교 분석 및 운영 최적화 전략 보고서를 작성해줘:
-            """
-            
             # LLM 호출
             response = self.call_llm(prompt)
             
-            # 파일 저장
-            filename = self.format_filename("11", "직접비_분석")
-            self.save_markdown(response, filename)
+            return self._save_direct_cost_result(response)
+            
+        except Exception as e:
+            error_msg = f"❌ 분석 실패: {e}"
+            logger.error(error_msg)
+            raise
+    
+    async def analyze_direct_cost_async(self):
+        """
+        11번: 직접비 분석 (비동기 버전)
+        
+        DB 조회는 별도 스레드에서, LLM 호출은 비동기로 실행하여
+        다른 분석과 동시에 실행할 수 있습니다.
+        """
+        logger.info("\n%s", _BANNER)
+        logger.info(f"📊 [{self.brd_name}] 직접비 분석 시작...")
+        logger.info(_BANNER)
+        
+        try:
+            prompt = await asyncio.to_thread(self._build_direct_cost_prompt)
+            if prompt is None:
+                return None
+            
+            # LLM 호출
+            response = await self.call_llm_async(prompt)
             
-            print(f"✅ [{self.brd_name}] 직접비 분석 완료!\n")
-            return response
+            return self._save_direct_cost_result(response)
             
         except Exception as e:
             error_msg = f"❌ 분석 실패: {e}"
-            print(error_msg)
+            logger.error(error_msg)
             raise
+    
+    def _build_direct_cost_prompt(self):
+        """
+        직접비 분석 데이터 조회 및 LLM 프롬프트 생성
+        
+        Returns:
+            str: LLM 프롬프트 (데이터가 없으면 None)
+        """
+        # SQL 쿼리 실행
+        sql = get_direct_cost_query(
+            yyyymm=self.yyyymm,
+            yyyymm_py=self.yyyymm_py,
+            brd_cd=self.brd_cd
+        )
+        df = self.execute_query(sql)
+        
+        if df.is_empty():
+            logger.warning(f"⚠️ 데이터가 없습니다: {self.brd_name} 브랜드 직접비 데이터")
+            return None
+        
+        # LLM 프롬프트 생성 (데이터는 Python repr 대신 압축된 JSON으로 전달)
+        records_json = orjson.dumps(self.cast_decimal_columns(df).to_dicts()).decode()
+        prompt = DIRECT_COST_PROMPT_TEMPLATE.format_map({
+            'brd_name': self.brd_name,
+            'year': self.year_str,
+            'month': self.month_str,
+            'py_year': self.py_year_str,
+            'records_json': records_json,
+        })
+        
+        return prompt
+    
+    def _save_direct_cost_result(self, response):
+        """
+        직접비 분석 결과 저장
+        
+        Args:
+            response (str): LLM이 생성한 분석 텍스트
+        
+        Returns:
+            str: 분석 텍스트
+        """
+        filename = self.format_filename("11", "직접비_분석")
+        self.save_markdown(response, filename, background=True)
+        
+        logger.info(f"✅ [{self.brd_name}] 직접비 분석 완료!\n")
+        return response
 
+
+def run_cost_analyses(yyyymm, brands=None, max_workers=None):
+    """
+    여러 브랜드의 광고선전비/간접비/직접비 분석을 스레드 풀로 동시에 실행
+    
+    브랜드별 분석은 서로 독립적이고 대부분의 시간이 DB/LLM 응답 대기(I/O)이므로
+    스레드로 병렬 실행해도 충분합니다.
+    
+    Args:
+        yyyymm (str): 분석할 년월 (예: '202509')
+        brands (list, optional): 브랜드 코드 리스트 (None이면 BRAND_CODE_MAP의 전체 브랜드)
+        max_workers (int, optional): 동시 실행 스레드 수 (None이면 브랜드 수)
+    
+    Returns:
+        dict: {브랜드 코드: {'ad_expense': ..., 'indirect_cost': ..., 'direct_cost': ...}}
+    
+    사용 예시:
+        results = run_cost_analyses('202509', ['M', 'I', 'X'])
+    """
+    if brands is None:
+        brands = list(BRAND_CODE_MAP)
+    if not brands:
+        return {}
+    
+    def _run(brd_cd):
+        analyzer = CostAnalyzer(yyyymm=yyyymm, brd_cd=brd_cd)
+        return brd_cd, {
+            'ad_expense': analyzer.analyze_ad_expense(),
+            'indirect_cost': analyzer.analyze_indirect_cost(),
+            'direct_cost': analyzer.analyze_direct_cost()
+        }
+    
+    with ThreadPoolExecutor(max_workers=max_workers or len(brands)) as executor:
+        results = dict(executor.map(_run, brands))
+    
+    BaseAnalyzer.wait_for_saves()
+    BaseAnalyzer.dispose_shared_clients()
+    return results
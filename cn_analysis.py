@@ -6,7 +6,18 @@
 """
 
 import os
+import logging
+import re
+import atexit
+import pathlib
 import json
+import threading
+import hashlib
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+import orjson
 import polars as pl
 import anthropic
 from datetime import datetime, timedelta
@@ -14,9 +25,21 @@ from decimal import Decimal
 from sqlalchemy import create_engine
 from snowflake.sqlalchemy import URL
 from dotenv import load_dotenv
+from llm_stream import read_json_stream
 
-# 환경 변수 로드
-load_dotenv()
+# 환경 변수(.env)는 import 시점이 아니라 DB/LLM 연결이 처음 필요할 때 로드 (_ensure_env_loaded)
+_env_loaded = False
+_env_lock = threading.Lock()
+
+def _ensure_env_loaded():
+    """.env 파일을 프로세스당 한 번만 로드 (이미 설정된 환경 변수는 덮어쓰지 않음)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
 
 # ============================================================================
 # 설정
@@ -33,9 +56,25 @@ BRAND_CODE_MAP = {
 OUTPUT_JSON_PATH = './cn_output/json'
 OUTPUT_MD_PATH = './cn_output/md'
 
-# 출력 폴더 생성
-os.makedirs(OUTPUT_JSON_PATH, exist_ok=True)
-os.makedirs(OUTPUT_MD_PATH, exist_ok=True)
+# 출력 폴더 (첫 저장 시 _ensure_output_dirs에서 한 번만 Path 생성 및 폴더 생성)
+# import만 해서는 폴더를 만들지 않으므로, 첫 저장 전에 OUTPUT_JSON_PATH/OUTPUT_MD_PATH를 바꿔 쓸 수 있음
+_JSON_DIR = None
+_MD_DIR = None
+_dirs_ready = False
+_dirs_lock = threading.Lock()
+
+def _ensure_output_dirs():
+    """출력 폴더를 프로세스당 한 번만 생성"""
+    global _JSON_DIR, _MD_DIR, _dirs_ready
+    if _dirs_ready:
+        return
+    with _dirs_lock:
+        if not _dirs_ready:
+            _JSON_DIR = pathlib.Path(OUTPUT_JSON_PATH)
+            _MD_DIR = pathlib.Path(OUTPUT_MD_PATH)
+            _JSON_DIR.mkdir(parents=True, exist_ok=True)
+            _MD_DIR.mkdir(parents=True, exist_ok=True)
+            _dirs_ready = True
 
 # 채널 순서 정의 (JSON/MD 추출 시 사용)
 CHANNEL_ORDER = [
@@ -49,6 +88,17 @@ CHANNEL_ORDER = [
     '(OFF)대리상',
 ]
 
+# 채널명 -> 정렬 순위 (CHANNEL_ORDER에 없는 채널은 뒤로)
+_CHANNEL_RANK = {channel: idx for idx, channel in enumerate(CHANNEL_ORDER)}
+
+def _channel_sort_key(channel):
+    """정의된 순서 우선, 순서에 없는 채널은 이름순으로 뒤에 배치"""
+    return (_CHANNEL_RANK.get(channel, len(_CHANNEL_RANK)), channel)
+
+def _ordered_keys(channel_dict):
+    """채널명 키를 정의된 순서로 정렬 (순서에 없는 채널들은 뒤에 알파벳 순서)"""
+    return sorted(channel_dict, key=_channel_sort_key)
+
 
 def format_channel_name(chnl_nm):
     """
@@ -86,8 +136,16 @@ def format_channel_name(chnl_nm):
 # ============================================================================
 # DB 연결
 # ============================================================================
+@functools.lru_cache(maxsize=1)
 def get_db_engine():
-    """Snowflake DB 연결 엔진 생성"""
+    """
+    Snowflake DB 연결 엔진 생성
+    
+    프로세스 내에서 한 번만 생성되어 재사용됩니다.
+    (커넥션 풀을 통해 매 분석마다 Snowflake 인증을 다시 하지 않음)
+    분석 함수에서는 dispose하지 않으며, 풀 정리는 종료 시 _dispose_db_engine에서 수행합니다.
+    """
+    _ensure_env_loaded()
     account = os.getenv('SNOWFLAKE_ACCOUNT')
     user = os.getenv('SNOWFLAKE_USER')
     password = os.getenv('SNOWFLAKE_PASSWORD')
@@ -108,34 +166,118 @@ def get_db_engine():
             schema=schema,
             warehouse=warehouse,
             role=role,
-        )
+        ),
+        pool_size=8,
+        pool_pre_ping=True,
+        pool_recycle=3600,
     )
 
+@atexit.register
+def _dispose_db_engine():
+    """프로세스 종료 시 공유 엔진의 커넥션 풀을 한 번만 정리"""
+    if get_db_engine.cache_info().currsize:
+        get_db_engine().dispose()
+
 # ============================================================================
 # SQL 쿼리 실행
 # ============================================================================
-def run_query(sql, engine):
-    """SQL 쿼리 실행하고 DataFrame 반환"""
+def _cursor_to_dataframe(cursor):
+    """
+    실행이 끝난 Snowflake 커서의 결과를 Polars DataFrame으로 변환
+    
+    Snowflake 커넥터가 내부적으로 받은 Arrow 결과(fetch_arrow_all)를 그대로 Polars로 변환하여
+    Python 튜플 행을 만들고 다시 컬럼으로 바꾸는 과정을 생략합니다.
+    """
+    arrow_table = cursor.fetch_arrow_all()
+    if arrow_table is None:
+        # 결과가 0건이면 Arrow 테이블이 없으므로 컬럼만 있는 빈 DataFrame 생성
+        return pl.DataFrame(schema=[col[0] for col in cursor.description])
+    
+    df = pl.from_arrow(arrow_table)
+    # NUMBER(p,s) 컬럼은 Decimal로 들어오므로 컬럼 단위로 한 번에 Float64 변환
+    # (이후 to_dicts()/JSON 직렬화 시 값마다 Decimal 변환을 거치지 않음)
+    decimal_columns = [
+        name for name, dtype in df.schema.items() if isinstance(dtype, pl.Decimal)
+    ]
+    if decimal_columns:
+        df = df.with_columns(pl.col(decimal_columns).cast(pl.Float64))
+    return df
+
+def run_query(sql, engine, params=None):
+    """
+    SQL 쿼리 실행하고 DataFrame 반환
+    
+    params가 주어지면 SQL의 %(name)s 자리표시자에 드라이버가 값을 바인딩합니다.
+    (값을 문자열로 직접 끼워 넣지 않으므로 따옴표/이스케이프 문제가 없음)
+    커넥션은 엔진의 커넥션 풀에서 빌려 쓰고 반환합니다.
+    """
     print(f"[SQL] 쿼리 실행 중...")
-    df = pl.read_database(sql, engine)
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            df = _cursor_to_dataframe(cursor)
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
     print(f"[OK] {len(df)}개 행 조회 완료")
     return df
 
+def run_queries(queries, engine):
+    """
+    여러 SQL을 한 커넥션에서 비동기로 모두 제출한 뒤 결과를 모아 DataFrame으로 반환
+    
+    쿼리마다 응답을 기다렸다가 다음 쿼리를 보내지 않고, execute_async로 먼저 전부 제출해
+    Snowflake에서 동시에 실행되도록 합니다. (쿼리 수만큼의 왕복 대기 → 가장 느린 쿼리 1개 수준)
+    
+    Args:
+        queries: {태그: (sql, params)}
+        engine: SQLAlchemy 엔진
+    
+    Returns:
+        dict: {태그: DataFrame}
+    """
+    print(f"[SQL] 쿼리 {len(queries)}개 동시 제출 중...")
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            query_ids = {}
+            for tag, (sql, params) in queries.items():
+                cursor.execute_async(sql, params)
+                query_ids[tag] = cursor.sfqid
+            
+            results = {}
+            for tag, query_id in query_ids.items():
+                # 해당 쿼리가 끝날 때까지 대기 후 결과를 커서로 가져옴
+                cursor.get_results_from_sfqid(query_id)
+                results[tag] = _cursor_to_dataframe(cursor)
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+    print(f"[OK] 쿼리 {len(results)}개 조회 완료 ({', '.join(f'{tag}: {len(df)}행' for tag, df in results.items())})")
+    return results
+
 # ============================================================================
 # LLM 호출
 # ============================================================================
 # 전역 토큰 사용량 추적
-_total_tokens_used = {'input': 0, 'output': 0}
+_total_tokens_used = {'input': 0, 'output': 0, 'cache_read': 0, 'cache_creation': 0}
+_token_lock = threading.Lock()  # 여러 스레드에서 call_llm을 동시에 호출해도 누락 없이 합산
 
-def call_llm(prompt, max_tokens=4000, temperature=0.7):
-    """Claude API 호출"""
-    api_key = os.getenv('CLAUDE_API_KEY')
-    if not api_key:
-        raise ValueError("CLAUDE_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
-    
-    client = anthropic.Anthropic(api_key=api_key, timeout=120.0)
-    
-    system_prompt = """
+# Claude 클라이언트는 프로세스 전체에서 하나만 생성해 HTTP 연결(TLS 핸드셰이크)을 재사용
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+# 한 분석 안에서 서로 독립적인 LLM 호출을 겹쳐 실행하기 위한 스레드 풀
+_llm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='llm')
+
+# 공통 시스템 프롬프트 (모든 분석에서 동일 → Anthropic 프롬프트 캐싱 대상)
+LLM_MODEL = 'claude-sonnet-4-20250514'
+SYSTEM_PROMPT = """
 당신은 F&F 그룹의 최고 전략 분석가입니다. 다음 원칙을 반드시 준수하세요:
 
 📊 **분석 원칙**
@@ -159,75 +301,411 @@ def call_llm(prompt, max_tokens=4000, temperature=0.7):
 - 근거 기반의 객관적 분석
 - 이상징후나 특이사항 언급
 """
+
+# LLM 응답 캐시 (동일 프롬프트 재실행 시 API 호출 생략)
+LLM_CACHE_PATH = './cache/llm'
+# 이 값보다 높은 temperature의 응답은 무작위 샘플이므로 캐시하지 않음 (캐시가 한 번의 샘플을 영구 결과로 고정하지 않도록)
+LLM_CACHE_MAX_TEMPERATURE = 0.3
+# 분석 함수의 LLM 호출 temperature (결정적인 분석 결과 + 응답 캐시 재사용)
+ANALYSIS_TEMPERATURE = 0.3
+
+# 분석별 프롬프트 버전 (데이터 기준 캐시 키에 포함)
+# 분석 함수의 프롬프트 문구를 수정하면 해당 분석의 버전을 올려 기존 캐시 응답을 재사용하지 않도록 함
+# (prompt_prefix 변경은 캐시 키에 직접 포함되므로 버전을 올리지 않아도 됨)
+ANALYSIS_PROMPT_VERSIONS = {
+    'retail_channel_top3': 1,
+    'retail_channel_overall': 1,
+    'outbound_category': 1,
+    'agent_store': 1,
+    'discount_rate': 1,
+    'operating_expense': 1,
+    'monthly_channel_sales_trend': 1,
+    'monthly_item_sales_trend': 1,
+    'monthly_item_stock_trend': 1,
+}
+
+def _get_llm_cache_path(prompt, max_tokens, temperature, prompt_prefix=None):
+    """모델/시스템 프롬프트/프롬프트/옵션으로 응답 캐시 파일 경로 생성"""
+    key_parts = [LLM_MODEL, SYSTEM_PROMPT, prompt, str(max_tokens), str(temperature)]
+    if prompt_prefix:
+        key_parts.append(prompt_prefix)
+    key_source = "\x1f".join(key_parts)
+    key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    return os.path.join(LLM_CACHE_PATH, f"{key}.txt")
+
+def _get_llm_data_cache_path(cache_key, max_tokens, temperature, prompt_prefix=None):
+    """
+    (분석명, 브랜드, 기간, 원본 데이터) 기준 응답 캐시 파일 경로 생성
+    
+    DataFrame은 CSV로 직렬화해 해시하므로 프롬프트의 가변 부분(숫자 포맷 등)과 무관하게 같은 데이터 스냅샷이면 같은 키가 됨
+    분석별 규칙/응답 형식(prompt_prefix)과 분석별 프롬프트 버전(ANALYSIS_PROMPT_VERSIONS)도 키에 포함
+    """
+    prompt_version = ANALYSIS_PROMPT_VERSIONS.get(cache_key[0], 0)
+    digest = hashlib.sha256()
+    for part in (LLM_MODEL, SYSTEM_PROMPT, str(max_tokens), str(temperature), prompt_prefix or "",
+                 f"v{prompt_version}", *cache_key):
+        if isinstance(part, pl.DataFrame):
+            digest.update(part.write_csv().encode('utf-8'))
+        else:
+            digest.update(str(part).encode('utf-8'))
+        digest.update(b"\x1f")
+    return os.path.join(LLM_CACHE_PATH, 'data', f"{digest.hexdigest()}.txt")
+
+def _get_llm_client():
+    """공유 Claude 클라이언트 반환 (최초 호출 시 생성)"""
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            _ensure_env_loaded()
+            api_key = os.getenv('CLAUDE_API_KEY')
+            if not api_key:
+                raise ValueError("CLAUDE_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+            _llm_client = anthropic.Anthropic(api_key=api_key, timeout=120.0)
+        return _llm_client
+
+def _request_llm(prompt, prompt_prefix, max_tokens, temperature):
+    """Claude API를 실제로 호출하고 토큰 사용량을 누적 (캐시 처리는 call_llm에서)"""
+    client = _get_llm_client()
     
-    full_prompt = system_prompt + "\n\n" + prompt
+    system_blocks = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+    if prompt_prefix:
+        system_blocks.append({"type": "text", "text": prompt_prefix, "cache_control": {"type": "ephemeral"}})
     
     print(f"[LLM] Claude API 호출 중...")
-    message = client.messages.create(
-        model='claude-sonnet-4-20250514',
+    # 스트리밍으로 받으면서 JSON이 완성되는 시점을 감지 (llm_stream.read_json_stream)
+    with client.messages.stream(
+        model=LLM_MODEL,
         max_tokens=max_tokens,
         temperature=temperature,
-        messages=[{"role": "user", "content": full_prompt}]
-    )
+        system=system_blocks,
+        messages=[{"role": "user", "content": prompt}]
+    ) as stream:
+        response_text, message = read_json_stream(stream)
     
     # 토큰 사용량 추적
     if hasattr(message, 'usage') and message.usage:
         input_tokens = message.usage.input_tokens if hasattr(message.usage, 'input_tokens') else 0
         output_tokens = message.usage.output_tokens if hasattr(message.usage, 'output_tokens') else 0
-        _total_tokens_used['input'] += input_tokens
-        _total_tokens_used['output'] += output_tokens
-        print(f"[OK] LLM 응답 완료 (입력: {input_tokens:,} 토큰, 출력: {output_tokens:,} 토큰, 총: {input_tokens + output_tokens:,} 토큰)")
+        # 프롬프트 캐시 적중/생성 토큰 (input_tokens에는 포함되지 않음)
+        cache_read_tokens = getattr(message.usage, 'cache_read_input_tokens', 0) or 0
+        cache_creation_tokens = getattr(message.usage, 'cache_creation_input_tokens', 0) or 0
+        with _token_lock:
+            _total_tokens_used['input'] += input_tokens
+            _total_tokens_used['output'] += output_tokens
+            _total_tokens_used['cache_read'] += cache_read_tokens
+            _total_tokens_used['cache_creation'] += cache_creation_tokens
+        print(f"[OK] LLM 응답 완료 (입력: {input_tokens:,} 토큰, 출력: {output_tokens:,} 토큰, 총: {input_tokens + output_tokens:,} 토큰, "
+              f"캐시 읽기: {cache_read_tokens:,} 토큰, 캐시 생성: {cache_creation_tokens:,} 토큰)")
     else:
         print(f"[OK] LLM 응답 완료")
     
-    return message.content[0].text
+    return response_text
+
+# ----------------------------------------------------------------------------
+# 브랜드 묶음 호출 (run_analyses(batch_brands=True)에서만 사용, 기본값은 사용 안 함)
+# 같은 분석/기간의 여러 브랜드 프롬프트를 한 번의 요청으로 보내고 응답을 브랜드별로 나눔
+# → 왕복 횟수가 줄고, 시스템 프롬프트/분석 프리픽스 캐시를 한 요청에서 공유
+# 단, 묶음 응답은 브랜드 수만큼 긴 출력을 한 요청에서 순차 생성하므로 브랜드별 병렬 호출보다
+# 전체 소요 시간이 늘어날 수 있음 (API 요청 수/레이트 리밋을 줄여야 할 때 사용)
+# ----------------------------------------------------------------------------
+LLM_BATCH_MAX_BRANDS = 4  # 한 요청에 묶을 최대 브랜드 수 (출력 토큰 = 브랜드별 max_tokens × 브랜드 수)
+LLM_BATCH_WINDOW = 10.0  # 첫 요청 후 다른 브랜드 요청을 기다리는 최대 시간(초)
+
+_brand_batcher = None  # run_analyses 실행 중에만 설정됨
+
+class _BrandBatch:
+    """같은 batch_key로 모인 브랜드별 프롬프트와 결과"""
+    def __init__(self):
+        self.prompts = {}  # {brd_cd: prompt} (도착 순서 유지)
+        self.results = {}  # {brd_cd: 응답 텍스트}
+        self.closed = False
+        self.done = threading.Event()
+
+class _BrandBatcher:
+    """
+    동시에 실행 중인 분석들의 call_llm 요청을 (분석, 기간, 옵션)별로 모아 브랜드 묶음으로 호출
+    
+    pending은 {(LLM 호출명, yyyymm): 아직 해당 호출에 도달하지 않은 브랜드 집합}으로,
+    실제로 실행할 작업에서 만들어집니다. 브랜드는 다음 경우에 pending에서 빠집니다.
+    - 묶음에 합류 (submit)
+    - 캐시 적중 등으로 LLM을 호출하지 않음 (resolve)
+    - 분석 작업이 끝남 (task_done - 데이터 없음으로 조기 종료 포함)
+    가장 먼저 도착한 스레드가 대표로, pending이 비거나 LLM_BATCH_MAX_BRANDS개가 모이거나
+    window초가 지날 때까지 기다린 뒤 묶음 요청을 보내고, 나머지 스레드는 결과를 기다립니다.
+    묶음 응답에서 빠진 브랜드(파싱 실패 등)는 해당 스레드가 개별 호출로 대체합니다.
+    """
+    def __init__(self, pending, llm_calls, window=LLM_BATCH_WINDOW):
+        self.window = window
+        self._pending = pending
+        self._llm_calls = llm_calls  # {분석 함수: 해당 분석의 LLM 호출명}
+        self._batches = {}
+        self._cond = threading.Condition()
+    
+    def resolve(self, name, yyyymm, brd_cd):
+        """brd_cd가 이 LLM 호출에 합류하지 않음 (캐시 적중 등)"""
+        with self._cond:
+            self._pending.get((name, yyyymm), set()).discard(brd_cd)
+            self._cond.notify_all()
+    
+    def task_done(self, analyze_fn, yyyymm, brd_cd):
+        """분석 작업 종료 - 해당 분석의 남은 LLM 호출에서 brd_cd를 기다리지 않음"""
+        with self._cond:
+            for name in self._llm_calls.get(analyze_fn, ()):
+                self._pending.get((name, yyyymm), set()).discard(brd_cd)
+            self._cond.notify_all()
+    
+    def submit(self, batch_key, brd_cd, prompt, prompt_prefix, max_tokens, temperature):
+        name, yyyymm = batch_key[:2]
+        with self._cond:
+            self._pending.get((name, yyyymm), set()).discard(brd_cd)
+            batch = self._batches.get(batch_key)
+            leader = batch is None or batch.closed or brd_cd in batch.prompts
+            if leader:
+                batch = _BrandBatch()
+                self._batches[batch_key] = batch
+            batch.prompts[brd_cd] = prompt
+            self._cond.notify_all()
+            
+            if leader:
+                # 더 올 브랜드가 없거나 최대 개수가 모이면 바로 호출 (최대 window초 대기)
+                self._cond.wait_for(
+                    lambda: (not self._pending.get((name, yyyymm))
+                             or len(batch.prompts) >= LLM_BATCH_MAX_BRANDS),
+                    timeout=self.window,
+                )
+                batch.closed = True
+                if self._batches.get(batch_key) is batch:
+                    del self._batches[batch_key]
+        
+        if leader:
+            try:
+                self._run(batch, prompt_prefix, max_tokens, temperature)
+            except Exception as e:
+                print(f"[WARNING] 브랜드 묶음 LLM 호출 실패, 브랜드별로 개별 호출합니다: {e}")
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+        
+        response_text = batch.results.get(brd_cd)
+        if response_text is None:
+            response_text = _request_llm(prompt, prompt_prefix, max_tokens, temperature)
+        return response_text
+    
+    def _run(self, batch, prompt_prefix, max_tokens, temperature):
+        if len(batch.prompts) == 1:
+            (brd_cd, prompt), = batch.prompts.items()
+            batch.results[brd_cd] = _request_llm(prompt, prompt_prefix, max_tokens, temperature)
+            return
+        
+        brand_codes = list(batch.prompts)
+        print(f"[LLM] 브랜드 묶음 호출: {', '.join(brand_codes)}")
+        response = _request_llm(_build_brand_batch_prompt(batch.prompts), prompt_prefix,
+                                max_tokens * len(brand_codes), temperature)
+        combined = extract_json_from_response(response)
+        if not isinstance(combined, dict):
+            print(f"[WARNING] 브랜드 묶음 응답 JSON 파싱 실패")
+            return
+        for brd_cd in brand_codes:
+            brand_result = combined.get(brd_cd)
+            if isinstance(brand_result, dict):
+                # 개별 호출 응답과 같은 형태(JSON 텍스트)로 돌려줘 분석 함수의 파싱/캐시 로직을 그대로 사용
+                batch.results[brd_cd] = json_dumps_safe(brand_result, indent=2)
+            else:
+                print(f"[WARNING] 브랜드 묶음 응답에 {brd_cd} 결과가 없어 개별 호출합니다.")
+
+def _build_brand_batch_prompt(prompts):
+    """브랜드별 프롬프트를 <brand> 블록으로 묶고 브랜드 코드를 키로 하는 JSON 응답을 요청"""
+    example = ", ".join(f'"{brd_cd}": {{...}}' for brd_cd in prompts)
+    parts = [
+        f"아래 {len(prompts)}개 브랜드의 분석 요청을 브랜드별로 각각 독립적으로 수행해줘.\n"
+        "각 <brand> 블록의 요구사항에 맞는 JSON 결과를, 브랜드 코드를 키로 하는 하나의 JSON 객체로 반환해줘.\n"
+        f"형식: {{{example}}}\n"
+        "반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)\n"
+    ]
+    for brd_cd, prompt in prompts.items():
+        parts.append(f"\n<brand code=\"{brd_cd}\">\n{prompt.strip()}\n</brand>\n")
+    return "".join(parts)
+
+def call_llm(prompt, max_tokens=4000, temperature=0.7, force_refresh=False, cache_key=None, prompt_prefix=None,
+             yyyymm=None, brd_cd=None):
+    """
+    Claude API 호출
+    
+    - 시스템 프롬프트는 cache_control로 표시해 Anthropic 프롬프트 캐시를 재사용
+    - prompt_prefix(분석별 고정 응답 형식/가이드라인)는 시스템 프롬프트 뒤에 별도 블록으로 붙여
+      데이터가 달라도 같은 분석이면 프리픽스 캐시가 적중하도록 함 (prompt에는 가변 데이터만)
+    - 응답은 LLM_CACHE_PATH에 2단계로 저장되어 재실행 시 그대로 반환
+      (force_refresh=True면 캐시를 무시하고 다시 호출)
+      1) 프롬프트 전체의 sha256 (완전 일치)
+      2) cache_key=(분석명, 브랜드, 기간, 데이터...)가 주어지면 해당 키 기준
+         - prompt_prefix와 ANALYSIS_PROMPT_VERSIONS[분석명]이 키에 포함되므로
+           분석 함수의 프롬프트 문구를 수정하면 해당 분석의 버전을 올릴 것
+    - temperature가 LLM_CACHE_MAX_TEMPERATURE보다 높으면 캐시를 읽지도 저장하지도 않음
+    - run_analyses(batch_brands=True) 실행 중에는 cache_key(분석명)/yyyymm/brd_cd가 모두 주어진 호출을
+      같은 분석/기간(yyyymm)의 다른 브랜드와 묶어서 보냄 (_BrandBatcher, 응답은 브랜드별로 나뉘어 각각 캐시됨)
+    """
+    use_cache = temperature <= LLM_CACHE_MAX_TEMPERATURE
+    cache_paths = []
+    if use_cache:
+        cache_paths.append(_get_llm_cache_path(prompt, max_tokens, temperature, prompt_prefix))
+        if cache_key is not None:
+            cache_paths.append(_get_llm_data_cache_path(cache_key, max_tokens, temperature, prompt_prefix))
+    
+    batcher = _brand_batcher
+    batchable = batcher is not None and cache_key is not None and yyyymm is not None and brd_cd is not None
+    
+    if not force_refresh:
+        for cache_path in cache_paths:
+            if os.path.exists(cache_path):
+                if batchable:
+                    # 이 브랜드는 묶음에 합류하지 않으므로 다른 브랜드가 기다리지 않도록 알림
+                    batcher.resolve(cache_key[0], yyyymm, brd_cd)
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    print(f"[CACHE] 캐시된 LLM 응답 사용 ({cache_path})")
+                    return f.read()
+    
+    if batchable:
+        # run_analyses(batch_brands=True) 실행 중이면 같은 분석/기간의 다른 브랜드 요청과 묶어서 호출
+        batch_key = (cache_key[0], yyyymm, prompt_prefix, max_tokens, temperature)
+        response_text = batcher.submit(batch_key, brd_cd, prompt, prompt_prefix, max_tokens, temperature)
+    else:
+        response_text = _request_llm(prompt, prompt_prefix, max_tokens, temperature)
+    
+    try:
+        for cache_path in cache_paths:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                f.write(response_text)
+    except OSError as e:
+        # 캐시 저장 실패는 분석 결과에 영향을 주지 않음
+        print(f"[WARNING] LLM 응답 캐시 저장 실패: {e}")
+    
+    return response_text
 
 def get_total_tokens():
     """전체 토큰 사용량 반환"""
-    return _total_tokens_used.copy()
+    with _token_lock:
+        return _total_tokens_used.copy()
 
 def reset_token_counter():
     """토큰 카운터 초기화"""
-    global _total_tokens_used
-    _total_tokens_used = {'input': 0, 'output': 0}
+    with _token_lock:
+        for key in _total_tokens_used:
+            _total_tokens_used[key] = 0
 
 # ============================================================================
 # 파일 저장
 # ============================================================================
+def _atomic_write_bytes(file_path, *chunks):
+    """
+    임시 파일에 bytes 조각들을 그대로 쓴 뒤 os.replace로 교체 (중단 시에도 기존 파일이 깨지지 않음)
+    
+    여러 조각을 writelines로 넘기므로 조각들을 하나로 합치는 복사가 생기지 않음
+    """
+    tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+    with open(tmp_path, "wb", buffering=1 << 20) as f:
+        f.writelines(chunks)
+    os.replace(tmp_path, file_path)
+
+@functools.lru_cache(maxsize=256)
+def _build_frontmatter(key, sub_key, country):
+    """YAML frontmatter를 UTF-8 bytes로 생성 (동일한 메타데이터는 한 번만 생성)"""
+    key_line = f"key: {key}\n" if key else ""
+    sub_key_line = f"sub_key: {sub_key}\n" if sub_key else ""
+    return f"---\n{key_line}{sub_key_line}country: {country}\n---\n\n".encode("utf-8")
+
 def save_markdown(content, filename):
     """Markdown 파일 저장"""
     # KEY, sub_key, country 추출
     key, sub_key, country = extract_key_from_filename(filename)
     
-    # YAML frontmatter 추가
-    frontmatter_lines = ["---"]
-    if key:
-        frontmatter_lines.append(f"key: {key}")
-    if sub_key:
-        frontmatter_lines.append(f"sub_key: {sub_key}")
-    frontmatter_lines.append(f"country: {country}")
-    frontmatter_lines.append("---")
-    frontmatter = "\n".join(frontmatter_lines) + "\n\n"
-    
-    # content 앞에 frontmatter 추가
-    full_content = frontmatter + content
-    
-    file_path = os.path.join(OUTPUT_MD_PATH, f"{filename}.md")
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(full_content)
+    # content 앞에 YAML frontmatter 추가
+    frontmatter = _build_frontmatter(key, sub_key, country)
+    body = content if isinstance(content, bytes) else content.encode("utf-8")
+    
+    _ensure_output_dirs()
+    file_path = _MD_DIR / f"{filename}.md"
+    _atomic_write_bytes(file_path, frontmatter, body)
     print(f"[OK] Markdown 저장: {file_path}")
     return file_path
 
-class DecimalEncoder(json.JSONEncoder):
-    """Decimal 타입을 float로 변환하는 JSON 인코더"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+def _json_default(obj):
+    """orjson이 기본 지원하지 않는 타입(Decimal) 변환 - 쿼리 결과는 run_query에서 이미 float로 변환됨"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"JSON 직렬화할 수 없는 타입: {type(obj).__name__}")
+
+def json_dumps_bytes(obj, *, indent=False):
+    """Decimal 타입을 안전하게 처리하는 JSON 직렬화 - orjson 결과(UTF-8 bytes)를 그대로 반환"""
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=_json_default, option=option)
+
+def json_dumps_safe(obj, indent=None, **kwargs):
+    """
+    json_dumps_bytes의 str 버전 (프롬프트 f-string 삽입용)
+    
+    orjson은 항상 UTF-8로 출력하므로 ensure_ascii 등 나머지 인자는 무시됨
+    """
+    return json_dumps_bytes(obj, indent=bool(indent)).decode("utf-8")
+
+# AI 응답 JSON 추출용 정규식 (모듈 로드 시 한 번만 컴파일)
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_CODE_BLOCK_RE = re.compile(r'```\s*(.*?)\s*```', re.DOTALL)
 
-def json_dumps_safe(obj, **kwargs):
-    """Decimal 타입을 안전하게 처리하는 json.dumps 래퍼"""
-    return json.dumps(obj, cls=DecimalEncoder, **kwargs)
+def _find_balanced_json(text, start):
+    """
+    start 위치의 '{'부터 중괄호 균형이 맞는 JSON 객체 문자열을 한 번의 선형 스캔으로 추출
+    
+    문자열 리터럴 내부의 중괄호와 이스케이프 문자는 무시함
+    먼저 orjson(C 파서)으로 끝까지 파싱해 보고, 뒤에 설명 문장이 붙어 실패하면 오류 위치(pos)까지
+    잘라 다시 파싱함. 둘 다 실패한 경우(깨진 JSON)에만 아래 Python 스캔으로 균형을 맞춤
+    
+    Returns:
+        str: 균형이 맞는 JSON 객체 문자열, 찾지 못하면 None
+    """
+    if start < 0:
+        return None
+    
+    candidate = text[start:]
+    try:
+        orjson.loads(candidate)
+        return candidate.rstrip()
+    except orjson.JSONDecodeError as e:
+        if e.pos:
+            head = candidate[:e.pos].rstrip()
+            try:
+                orjson.loads(head)
+                return head
+            except orjson.JSONDecodeError:
+                pass
+    
+    depth = 0
+    in_string = False
+    escape_next = False
+    
+    for i in range(start, len(text)):
+        char = text[i]
+        
+        if escape_next:
+            escape_next = False
+        elif in_string:
+            if char == '\\':
+                escape_next = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    return None
 
 def extract_json_from_response(text):
     """
@@ -239,24 +717,31 @@ def extract_json_from_response(text):
     Returns:
         dict: 파싱된 JSON 데이터, 실패 시 None
     """
-    import re
-    
     if not text:
         return None
     
+    # 0. 응답 전체가 JSON이면 정규식 탐색 없이 바로 파싱 (가장 흔한 경우)
+    stripped = text.strip()
+    if stripped.startswith('{'):
+        try:
+            return orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+    
     json_str = None
     
+    # 코드 블록 정규식은 첫 ``` 위치부터만 탐색 (``` 자체가 없으면 정규식 탐색 생략)
+    fence_idx = text.find('```')
+    
     # 1. JSON 코드 블록 찾기 (```json ... ```)
-    json_block_pattern = r'```json\s*(.*?)\s*```'
-    match = re.search(json_block_pattern, text, re.DOTALL)
+    match = _JSON_BLOCK_RE.search(text, fence_idx) if fence_idx >= 0 else None
     
     if match:
         json_str = match.group(1).strip()
         print(f"[DEBUG] JSON 코드 블록에서 추출: {len(json_str)}자")
     else:
         # 2. 코드 블록 없으면 ``` ... ``` 찾기
-        code_block_pattern = r'```\s*(.*?)\s*```'
-        match = re.search(code_block_pattern, text, re.DOTALL)
+        match = _CODE_BLOCK_RE.search(text, fence_idx) if fence_idx >= 0 else None
         if match:
             json_str = match.group(1).strip()
             # json 마커 제거
@@ -264,25 +749,10 @@ def extract_json_from_response(text):
                 json_str = json_str[4:].strip()
             print(f"[DEBUG] 코드 블록에서 추출: {len(json_str)}자")
         else:
-            # 3. 코드 블록이 없으면 전체 텍스트에서 JSON 객체 찾기
-            # 첫 번째 { 부터 마지막 } 까지 추출 (더 정확한 방법)
-            start_idx = text.find('{')
-            if start_idx >= 0:
-                # 중괄호 균형을 맞춰서 끝 찾기
-                brace_count = 0
-                end_idx = start_idx
-                for i in range(start_idx, len(text)):
-                    if text[i] == '{':
-                        brace_count += 1
-                    elif text[i] == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            end_idx = i
-                            break
-                
-                if end_idx > start_idx:
-                    json_str = text[start_idx:end_idx+1]
-                    print(f"[DEBUG] 텍스트에서 JSON 추출: {len(json_str)}자")
+            # 3. 코드 블록이 없으면 전체 텍스트에서 중괄호 균형이 맞는 첫 JSON 객체 찾기
+            json_str = _find_balanced_json(text, text.find('{'))
+            if json_str:
+                print(f"[DEBUG] 텍스트에서 JSON 추출: {len(json_str)}자")
     
     if not json_str:
         print(f"[WARNING] JSON 문자열을 찾을 수 없음")
@@ -291,9 +761,9 @@ def extract_json_from_response(text):
     # JSON 파싱 시도 (여러 방법으로)
     parsed = None
     
-    # 방법 1: 직접 파싱
+    # 방법 1: 직접 파싱 (orjson, 실패 시 아래 방법들은 표준 json으로 재시도)
     try:
-        parsed = json.loads(json_str)
+        parsed = orjson.loads(json_str)
         sections_count = len(parsed.get('sections', []))
         print(f"[OK] JSON 파싱 성공: {sections_count}개 섹션 추출")
         return parsed
@@ -315,103 +785,82 @@ def extract_json_from_response(text):
     except (json.JSONDecodeError, Exception) as e:
         print(f"[DEBUG] 방법2 실패: {str(e)[:100]}")
     
-    # 방법 3: 원본 텍스트에서 다시 추출
-    try:
-        if '```json' in text:
-            json_block_pattern = r'```json\s*(.*?)\s*```'
-            match = re.search(json_block_pattern, text, re.DOTALL)
-            if match:
-                raw_json = match.group(1).strip()
-                print(f"[DEBUG] 원본 재추출: JSON 문자열 길이 {len(raw_json)}자")
-                parsed = json.loads(raw_json)
-                sections_count = len(parsed.get('sections', []))
-                print(f"[OK] JSON 파싱 성공 (방법3 - 원본 재추출): {sections_count}개 섹션 추출")
-                return parsed
-    except json.JSONDecodeError as e1:
-        error_pos1 = getattr(e1, 'pos', None)
-        print(f"[DEBUG] 방법3 JSON 파싱 실패: {str(e1)[:200]}")
-        if error_pos1 and 'raw_json' in locals():
-            print(f"[DEBUG] 오류 위치: {error_pos1}, 주변:\n{raw_json[max(0, error_pos1-100):error_pos1+100]}")
-    except Exception as e1:
-        print(f"[DEBUG] 방법3 예외: {str(e1)[:100]}")
-    
-    # 방법 4: 중괄호 균형 맞춰서 추출 (더 정확한 방법)
+    # 방법 3: 중괄호 균형 맞춰서 추출 (코드 블록 내용이 깨진 경우 원본 텍스트에서 재시도)
     try:
-        start_idx = text.find('{')
-        if start_idx >= 0:
-            brace_count = 0
-            end_idx = start_idx
-            in_string = False
-            escape_next = False
-            
-            for i in range(start_idx, len(text)):
-                char = text[i]
-                
-                if escape_next:
-                    escape_next = False
-                    continue
-                
-                if char == '\\':
-                    escape_next = True
-                    continue
-                
-                if char == '"' and not escape_next:
-                    in_string = not in_string
-                    continue
-                
-                if not in_string:
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            end_idx = i
-                            break
-            
-            if end_idx > start_idx:
-                extracted_json = text[start_idx:end_idx+1]
-                # 코드 블록 마커 제거
-                extracted_json = extracted_json.replace('```json', '').replace('```', '').strip()
-                print(f"[DEBUG] 방법4: JSON 문자열 길이 {len(extracted_json)}자")
-                parsed = json.loads(extracted_json)
-                sections_count = len(parsed.get('sections', []))
-                print(f"[OK] JSON 파싱 성공 (방법4 - 중괄호 균형): {sections_count}개 섹션 추출")
-                return parsed
+        extracted_json = _find_balanced_json(text, text.find('{'))
+        if extracted_json and extracted_json != json_str:
+            print(f"[DEBUG] 방법3: JSON 문자열 길이 {len(extracted_json)}자")
+            parsed = json.loads(extracted_json)
+            sections_count = len(parsed.get('sections', []))
+            print(f"[OK] JSON 파싱 성공 (방법3 - 중괄호 균형): {sections_count}개 섹션 추출")
+            return parsed
     except (json.JSONDecodeError, Exception) as e:
-        print(f"[DEBUG] 방법4 실패: {str(e)[:100]}")
+        print(f"[DEBUG] 방법3 실패: {str(e)[:100]}")
     
     print(f"[ERROR] 모든 JSON 파싱 방법 실패")
     print(f"[DEBUG] 추출된 JSON 문자열 앞 500자: {json_str[:500]}")
     return None
 
-def sort_channels_by_order(channel_dict):
+def parse_analysis_response(response, fallback_title, fallback_sections=None):
     """
-    채널 딕셔너리를 정의된 순서로 정렬
+    LLM 분석 응답(JSON)을 파싱 (마크다운 코드 블록 제거 후 json.loads)
     
     Args:
-        channel_dict: 채널명을 키로 하는 딕셔너리
+        response: LLM 응답 텍스트
+        fallback_title: 파싱 실패 시 사용할 제목
+        fallback_sections: 파싱 실패 시 사용할 (div, sub_title) 목록
+                           (None이면 "분석 결과" 단일 섹션)
     
     Returns:
-        OrderedDict: 정렬된 채널 딕셔너리
+        dict: 분석 결과 (파싱 실패 시 응답 원문을 첫 섹션 ai_text에 담은 기본 구조)
     """
-    from collections import OrderedDict
+    text = response.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.startswith('```'):
+        text = text[3:]
+    if text.endswith('```'):
+        text = text[:-3]
+    text = text.strip()
+    
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {text[:500]}")
     
-    ordered_dict = OrderedDict()
+    # 기본 구조로 대체
+    if not fallback_sections:
+        return {"title": fallback_title, "sections": [{"sub_title": "분석 결과", "ai_text": text}]}
+    return {
+        "title": fallback_title,
+        "sections": [
+            {"div": div, "sub_title": sub_title, "ai_text": text if idx == 0 else ""}
+            for idx, (div, sub_title) in enumerate(fallback_sections)
+        ]
+    }
+
+def save_analysis_outputs(json_data, filename, default_title):
+    """분석 결과를 JSON으로, analysis_data의 title/sections를 Markdown으로 저장"""
+    save_json(json_data, filename)
     
-    # 정의된 순서대로 채널 추가
-    for channel in CHANNEL_ORDER:
-        if channel in channel_dict:
-            ordered_dict[channel] = channel_dict[channel]
+    analysis_data = json_data['analysis_data']
+    parts = [f"# {analysis_data.get('title', default_title)}\n\n"]
+    for section in analysis_data.get('sections', []):
+        parts.append(f"## {section.get('sub_title', '')}\n\n{section.get('ai_text', '')}\n\n")
+    save_markdown("".join(parts), filename)
+
+def sort_channels_by_order(channel_dict):
+    """
+    채널 딕셔너리를 정의된 순서로 정렬
     
-    # 정의된 순서에 없는 채널들은 뒤에 추가 (알파벳 순서)
-    remaining_channels = sorted([
-        (k, v) for k, v in channel_dict.items() 
-        if k not in CHANNEL_ORDER
-    ])
-    for channel, data in remaining_channels:
-        ordered_dict[channel] = data
+    Args:
+        channel_dict: 채널명을 키로 하는 딕셔너리
     
-    return ordered_dict
+    Returns:
+        dict: 정렬된 채널 딕셔너리 (dict는 삽입 순서를 유지)
+    """
+    return {channel: channel_dict[channel] for channel in _ordered_keys(channel_dict)}
 
 def get_channel_list_sorted(channel_dict):
     """
@@ -423,22 +872,9 @@ def get_channel_list_sorted(channel_dict):
     Returns:
         list: 정렬된 채널명 리스트
     """
-    sorted_list = []
-    
-    # 정의된 순서대로 채널 추가
-    for channel in CHANNEL_ORDER:
-        if channel in channel_dict:
-            sorted_list.append(channel)
-    
-    # 정의된 순서에 없는 채널들은 뒤에 추가 (알파벳 순서)
-    remaining_channels = sorted([
-        k for k in channel_dict.keys() 
-        if k not in CHANNEL_ORDER
-    ])
-    sorted_list.extend(remaining_channels)
-    
-    return sorted_list
+    return _ordered_keys(channel_dict)
 
+@functools.lru_cache(maxsize=1024)
 def extract_key_from_filename(filename):
     """
     파일명에서 KEY와 sub_key를 추출 (브랜드 코드 제외)
@@ -453,104 +889,91 @@ def extract_key_from_filename(filename):
         - country: CN
     """
     # CN_2509_M_리테일매출_채널별매출분석 형식
-    parts = filename.split('_')
-    if len(parts) < 4:
-        return None, None, 'CN'
-    
-    # CN 제거하고 나머지 부분 사용
-    if parts[0] == 'CN':
-        parts = parts[1:]  # ['2509', 'M', '리테일', '채널별매출분석']
-    
-    if len(parts) < 3:
-        return None, None, 'CN'
+    # CN 접두사가 있으면 한 칸 뒤에서 시작 (리스트를 자르지 않고 인덱스로만 처리)
+    start = 1 if filename.startswith('CN_') else 0
     
-    # yyyymm_short, brd_cd, 나머지
-    analysis_parts = parts[2:]  # ['리테일', '채널별매출분석']
-    
-    if len(analysis_parts) == 0:
+    # yyyymm_short, brd_cd, 분석타입, 세부분석 - 세부분석은 '_'가 있어도 그대로 유지되도록 분할 횟수 제한
+    parts = filename.split('_', start + 3)  # ['CN', '2509', 'M', '리테일', '채널별매출분석']
+    if len(parts) < 4:
         return None, None, 'CN'
     
     # KEY: 첫번째 분석타입만 (브랜드 코드 제외)
-    key = analysis_parts[0]  # '리테일'
+    key = parts[start + 2]  # '리테일'
     
     # sub_key: 두번째부터 끝까지 (브랜드 코드 제외)
-    if len(analysis_parts) > 1:
-        sub_key = '_'.join(analysis_parts[1:])  # '채널별매출분석'
-    else:
-        sub_key = None
+    sub_key = parts[start + 3] if len(parts) > start + 3 else None  # '채널별매출분석'
     
     return key, sub_key, 'CN'
 
+# save_json 필드 순서 (나머지 필드는 이 뒤에 원래 순서대로)
+_JSON_FIELD_ORDER = ('country', 'brand_cd', 'brand_name', 'yyyymm', 'yyyymm_py', 'key', 'sub_key', 'analysis_data')
+_JSON_FIELD_SET = frozenset(_JSON_FIELD_ORDER)
+
 def save_json(data, filename):
     """JSON 파일 저장 - 필드 순서: country, brand_cd, brand_name, yyyymm, yyyymm_py, key, sub_key, analysis_data, ..."""
     # KEY, sub_key, country 추출
     key, sub_key, country = extract_key_from_filename(filename)
     
-    # JSON 데이터에 KEY, sub_key, country 추가 (지정된 순서로)
+    # JSON 데이터에 KEY, sub_key, country 추가 (지정된 순서로, Python 3.7+ dict는 삽입 순서 보장)
     if isinstance(data, dict):
-        # 순서를 보장하기 위해 OrderedDict 사용
-        from collections import OrderedDict
-        new_data = OrderedDict()
-        
-        # 1. country (항상 첫 번째)
-        if 'country' in data:
-            new_data['country'] = data['country']
-        elif country:
-            new_data['country'] = country
-        
-        # 2. brand_cd
-        if 'brand_cd' in data:
-            new_data['brand_cd'] = data['brand_cd']
-        
-        # 3. brand_name
-        if 'brand_name' in data:
-            new_data['brand_name'] = data['brand_name']
-        
-        # 4. yyyymm
-        if 'yyyymm' in data:
-            new_data['yyyymm'] = data['yyyymm']
-        
-        # 5. yyyymm_py
-        if 'yyyymm_py' in data:
-            new_data['yyyymm_py'] = data['yyyymm_py']
-        
-        # 6. key
-        if 'key' in data:
-            new_data['key'] = data['key']
-        elif key:
-            new_data['key'] = key
-        
-        # 7. sub_key
-        if 'sub_key' in data:
-            new_data['sub_key'] = data['sub_key']
-        elif sub_key:
-            new_data['sub_key'] = sub_key
-        
-        # 8. analysis_data
-        if 'analysis_data' in data:
-            new_data['analysis_data'] = data['analysis_data']
+        fallbacks = {'country': country, 'key': key, 'sub_key': sub_key}
+        new_data = {}
+        for k in _JSON_FIELD_ORDER:
+            if k in data:
+                new_data[k] = data[k]
+            elif fallbacks.get(k):
+                new_data[k] = fallbacks[k]
         
         # 나머지 필드들 (summary, channel_summary, raw_data 등)
-        for k, v in data.items():
-            if k not in ['country', 'brand_cd', 'brand_name', 'yyyymm', 'yyyymm_py', 'key', 'sub_key', 'analysis_data']:
-                new_data[k] = v
-        
-        data = dict(new_data)  # OrderedDict를 일반 dict로 변환 (Python 3.7+에서는 순서 보장)
+        new_data.update((k, v) for k, v in data.items() if k not in _JSON_FIELD_SET)
+        data = new_data
     
-    file_path = os.path.join(OUTPUT_JSON_PATH, f"{filename}.json")
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+    _ensure_output_dirs()
+    file_path = _JSON_DIR / f"{filename}.json"
+    _atomic_write_bytes(file_path, json_dumps_bytes(data, indent=True))
     print(f"[OK] JSON 저장: {file_path}")
     return file_path
 
 # ============================================================================
 # SQL 쿼리 함수들 (사용자가 채워넣을 부분)
 # ============================================================================
-    
-def get_outbound_category_sales_query(yyyymm, yyyymm_py, brd_cd):
+
+_RETAIL_CHANNEL_SALES_SQL = """
+WITH
+-- SHOP : BOS 매핑용 매장
+-- SAP 매장코드가 기준인 SAP_FNF.MST_SHOP에는 ERP 기준인 SHOP_CD 중복이 있을 수 있어 1건만 처리하는 로직 추가
+SHOP AS (SELECT *
+         FROM SAP_FNF.MST_SHOP
+         QUALIFY
+             ROW_NUMBER() OVER ( PARTITION BY BRD_CD, CNTRY_CD, SHOP_CD, AGNT_CD, MAP_SHOP_AGNT_CD ORDER BY SAP_SHOP_CD ) =
+             1)
+-- 최종조회쿼리
+SELECT A.YYMM          AS YYYYMM
+     , A.BRD_CD        AS BRD_CD
+     , C.MGMT_CHNL_CD  as MGMT_CHNL_CD
+     , C.MGMT_CHNL_NM  AS MGMT_CHNL_NM
+     , B.ITEM_NM
+     , SUM(A.SALE_AMT) AS SALE_AMT
+FROM CHN.DM_SH_S_M A
+         LEFT JOIN SAP_FNF.MST_PRDT B
+                   ON A.PRDT_CD = B.PRDT_CD
+         LEFT JOIN SHOP C
+                   ON A.MAP_SHOP_AGNT_CD = C.MAP_SHOP_AGNT_CD
+WHERE A.YYMM IN (%(yyyymm)s, %(yyyymm_py)s)
+  AND A.BRD_CD = %(brd_cd)s
+  AND ITEM_NM IS NOT NULL
+  AND SALE_AMT <> 0
+GROUP BY A.YYMM
+       , A.BRD_CD
+       , c.MGMT_CHNL_CD
+       , c.MGMT_CHNL_NM
+       , B.ITEM_NM
+ORDER BY A.YYMM DESC, MGMT_CHNL_NM,ITEM_NM, SALE_AMT DESC
     """
-    출고카테고리별 매출분석 쿼리 (당해/전년 동월 비교)
-    직영 매출 + 대리상 매출 통합
+
+def get_retail_channel_sales_query(yyyymm, yyyymm_py, brd_cd):
+    """
+    리테일 채널별 아이템 매출 쿼리 (당해/전년 동월 비교)
     
     Args:
         yyyymm: 당해 년월 (예: '202510')
@@ -558,9 +981,11 @@ def get_outbound_category_sales_query(yyyymm, yyyymm_py, brd_cd):
         brd_cd: 브랜드 코드
     
     Returns:
-        str: SQL 쿼리 문자열
+        tuple: (SQL 쿼리 문자열, 바인딩 파라미터 dict)
     """
-    sql = f"""
+    return _RETAIL_CHANNEL_SALES_SQL, {'yyyymm': yyyymm, 'yyyymm_py': yyyymm_py, 'brd_cd': brd_cd}
+
+_OUTBOUND_CATEGORY_SALES_SQL = """
 WITH
     -- SHOP : BOS 매핑용 매장
     -- SAP 매장코드가 기준인 SAP_FNF.MST_SHOP에는 ERP 기준인 SHOP_CD 중복이 있을 수 있어 1건만 처리하는 로직 추가
@@ -583,8 +1008,8 @@ WITH
                      LEFT JOIN SHOP C
                              ON A.MAP_SHOP_AGNT_CD = C.MAP_SHOP_AGNT_CD
                  WHERE C.CHNL_CD <> '84' -- 대리상 제외 (직영만)
-                   AND A.YYMM IN ('{yyyymm}', '{yyyymm_py}')
-                   AND A.BRD_CD = '{brd_cd}'
+                   AND A.YYMM IN (%(yyyymm)s, %(yyyymm_py)s)
+                   AND A.BRD_CD = %(brd_cd)s
                  GROUP BY A.YYMM
                         , A.BRD_CD
                         , B.LARGE_CLASS_NM
@@ -605,8 +1030,8 @@ WITH
                      LEFT JOIN SHOP C
                              ON A.SHOP_CD = C.SAP_SHOP_CD
                  WHERE C.CHNL_CD = '84' -- 대리상만
-                   AND A.PST_YYYYMM IN ('{yyyymm}', '{yyyymm_py}')
-                   AND A.BRD_CD = '{brd_cd}'
+                   AND A.PST_YYYYMM IN (%(yyyymm)s, %(yyyymm_py)s)
+                   AND A.BRD_CD = %(brd_cd)s
                  GROUP BY A.PST_YYYYMM
                         , A.BRD_CD
                         , B.LARGE_CLASS_NM
@@ -614,7 +1039,7 @@ WITH
                         , B.ITEM_NM
                         , A.PRDT_CD )
 -- 최종조회쿼리
-SELECT A.YYYYMM, A.BRD_CD, A.LARGE_CLASS_NM, A.MIDDLE_CLASS_NM, A.ITEM_NM, A.PRDT_CD, B.PRDT_NM, SUM(A.SALE_AMT) AS SALE_AMT
+SELECT A.YYYYMM, A.BRD_CD, A.LARGE_CLASS_NM, A.MIDDLE_CLASS_NM, A.ITEM_NM, A.PRDT_CD, B.PRDT_NM, COALESCE(SUM(A.SALE_AMT), 0) AS SALE_AMT
 FROM ( SELECT YYYYMM, BRD_CD, LARGE_CLASS_NM, MIDDLE_CLASS_NM, ITEM_NM, PRDT_CD, SALE_AMT
        FROM OR_SALE
        UNION ALL
@@ -630,11 +1055,11 @@ GROUP BY a.YYYYMM
        , a.PRDT_CD
        , B.PRDT_NM
     """
-    return sql
 
-def get_agent_store_sales_query(yyyymm, yyyymm_py, brd_cd):
+def get_outbound_category_sales_query(yyyymm, yyyymm_py, brd_cd):
     """
-    대리상 점당매출 종합분석 쿼리 (당해/전년 동월 비교)
+    출고카테고리별 매출분석 쿼리 (당해/전년 동월 비교)
+    직영 매출 + 대리상 매출 통합
     
     Args:
         yyyymm: 당해 년월 (예: '202510')
@@ -642,39 +1067,105 @@ def get_agent_store_sales_query(yyyymm, yyyymm_py, brd_cd):
         brd_cd: 브랜드 코드
     
     Returns:
-        str: SQL 쿼리 문자열
+        tuple: (SQL 쿼리 문자열, 바인딩 파라미터 dict)
     """
-    # TODO: SQL 쿼리 작성 필요
-    sql = f"""
-    -- 대리상 점당매출 종합분석 쿼리
-    -- 당해: {yyyymm}, 전년: {yyyymm_py}, 브랜드: {brd_cd}
-    SELECT 
-        -- 여기에 SQL 쿼리 작성
-        1 as placeholder
+    return _OUTBOUND_CATEGORY_SALES_SQL, {'yyyymm': yyyymm, 'yyyymm_py': yyyymm_py, 'brd_cd': brd_cd}
+
+_AGENT_STORE_SALES_SQL = """
+WITH
+    -- PARAM : 기간설정 (당해/전년 기간을 한 번에 조회)
+    PARAM AS ( SELECT 'CY' AS DIV, %(yyyymm_start)s AS STD_START_YYYYMM, %(yyyymm)s AS STD_END_YYYYMM
+               UNION ALL
+               SELECT 'PY' AS DIV, %(yyyymm_py_start)s AS STD_START_YYYYMM, %(yyyymm_py)s AS STD_END_YYYYMM
+    )
+    -- SHOP : BOS 매핑용 매장
+    -- SAP 매장코드가 기준인 SAP_FNF.MST_SHOP에는 ERP 기준인 SHOP_CD 중복이 있을 수 있어 1건만 처리하는 로직 추가
+  , SHOP AS ( SELECT *
+              FROM SAP_FNF.MST_SHOP
+              QUALIFY
+                  ROW_NUMBER() OVER ( PARTITION BY BRD_CD, CNTRY_CD, SHOP_CD, AGNT_CD, MAP_SHOP_AGNT_CD ORDER BY SAP_SHOP_CD ) =
+                  1 )
+    -- FR_OFF : 대리상 OFF (당해+전년, 매출 테이블 1회 스캔 - 두 기간은 겹치지 않으므로 행마다 DIV 하나만 매칭)
+  , FR_OFF AS ( SELECT PARAM.DIV      AS DIV
+                     , A.YYMM          AS YYYYMM
+                     , A.BRD_CD        AS BRD_CD
+                     , A.SHOP_ID as shop_cd
+                     , C.SHOP_NM_EN as shop_en_nm
+                     , SUM(A.SALE_AMT) AS SALE_AMT
+                FROM CHN.DM_SH_S_M A
+                    JOIN PARAM
+                            ON A.YYMM BETWEEN PARAM.STD_START_YYYYMM AND PARAM.STD_END_YYYYMM
+                    JOIN CHN.DW_SHOP_WH_DETAIL B
+                            ON A.SHOP_ID = B.OA_MAP_SHOP_ID AND B.FR_OR_CLS = 'FR' -- 대리상
+                    JOIN CHN.MST_SHOP_ALL C
+                            ON B.SHOP_ID = C.SHOP_ID
+                WHERE 1 = 1
+                  AND B.BRD_CD = %(brd_cd)s             -- 브랜드필터링 필요
+                  AND C.ANLYS_ONOFF_CLS_CD = '1' -- OFFLINE
+                  AND B.ANLYS_SHOP_TYPE_NM IN ( 'FP', 'FO' )
+                GROUP BY PARAM.DIV
+                       , A.YYMM
+                       , A.BRD_CD
+                       , A.SHOP_ID
+                       , C.SHOP_NM_EN )
+    -- CY_FR_OFF : 대리상 OFF (당해)
+  , CY_FR_OFF AS ( SELECT YYYYMM, BRD_CD, SHOP_CD, SHOP_EN_NM, SALE_AMT
+                   FROM FR_OFF
+                   WHERE DIV = 'CY' )
+    -- PY_FR_OFF : 대리상 OFF (전년)
+  , PY_FR_OFF AS ( SELECT YYYYMM
+                        , TO_VARCHAR(ADD_MONTHS(TO_DATE(YYYYMM || '01', 'YYYYMMDD'), 12), 'YYYYMM') AS NEXT_1Y_YYYYMM
+                        , BRD_CD
+                        , SHOP_CD
+                        , SHOP_EN_NM
+                        , SALE_AMT
+                   FROM FR_OFF
+                   WHERE DIV = 'PY' )
+SELECT C.YYYYMM
+     , C.BRD_CD
+     , C.SHOP_CD
+     , C.SHOP_EN_NM
+     , coalesce(sum(C.SALE_AMT),0) AS CY_SALE_AMT -- 당해 매출액
+     , coalesce(sum(P.SALE_AMT),0) AS PY_SALE_AMT -- 전년 매출액
+     , case when CY_SALE_AMT <> 0 and PY_SALE_AMT =0 then '신규점'
+            when CY_SALE_AMT <> 0 and PY_SALE_AMT <>0 then '기존점'
+            else '미지정' end as div  -- 혹시몰라서..
+FROM CY_FR_OFF C
+    LEFT JOIN PY_FR_OFF P
+            ON C.YYYYMM = P.NEXT_1Y_YYYYMM AND C.BRD_CD = P.BRD_CD AND C.SHOP_CD = P.SHOP_CD
+GROUP BY C.YYYYMM
+       , C.BRD_CD
+       , C.SHOP_CD
+       , C.SHOP_EN_NM
+having CY_SALE_AMT <> 0
+ORDER BY C.YYYYMM DESC
     """
-    return sql
 
-def get_discount_rate_query(yyyymm, yyyymm_py, brd_cd):
+def get_agent_store_sales_query(yyyymm, yyyymm_py, brd_cd):
     """
-    할인율 종합분석 쿼리 (전년 1월부터 당해 월까지 추세 분석)
+    대리상 점당매출 종합분석 쿼리 (당해 1월~당월 vs 전년 1월~전년 동월, 한 번의 쿼리로 조회)
     
     Args:
-        yyyymm: 당해 년월 (예: '202511')
-        yyyymm_py: 전년 동월 (예: '202411')
+        yyyymm: 당해 년월 (예: '202510')
+        yyyymm_py: 전년 동월 (예: '202410')
         brd_cd: 브랜드 코드
     
     Returns:
-        str: SQL 쿼리 문자열
+        tuple: (SQL 쿼리 문자열, 바인딩 파라미터 dict)
     """
-    # 전년도 1월 계산 (추세 분석용: 전년도 1월 ~ 당해당월)
-    current_year = int(yyyymm[:4])
-    previous_year = current_year - 1
-    start_yyyymm = f"{previous_year}01"  # 전년도 1월
-    
-    sql = f"""
+    params = {
+        'yyyymm_start': f"{yyyymm[:4]}01",  # 당해 1월
+        'yyyymm': yyyymm,
+        'yyyymm_py_start': f"{yyyymm_py[:4]}01",  # 전년 1월
+        'yyyymm_py': yyyymm_py,
+        'brd_cd': brd_cd,
+    }
+    return _AGENT_STORE_SALES_SQL, params
+
+_DISCOUNT_RATE_SQL = """
 WITH
     -- PARAM : 날짜조건
-    PARAM AS ( SELECT 'CY' AS DIV, '{start_yyyymm}' AS STD_START_YYYYMM, '{yyyymm}' AS STD_END_YYYYMM
+    PARAM AS ( SELECT 'CY' AS DIV, %(start_yyyymm)s AS STD_START_YYYYMM, %(yyyymm)s AS STD_END_YYYYMM
                )
     -- SHOP : BOS 매핑용 매장
     -- SAP 매장코드가 기준인 SAP_FNF.MST_SHOP에는 ERP 기준인 SHOP_CD 중복이 있을 수 있어 1건만 처리하는 로직 추가
@@ -696,21 +1187,17 @@ FROM CHN.DM_SH_S_M A
                    AND A.YYMM BETWEEN PARAM.STD_START_YYYYMM AND PARAM.STD_END_YYYYMM
     LEFT JOIN SHOP C
             ON A.MAP_SHOP_AGNT_CD = C.MAP_SHOP_AGNT_CD
-WHERE A.BRD_CD = '{brd_cd}' -- 브랜드조건 필터링 필요
+WHERE A.BRD_CD = %(brd_cd)s -- 브랜드조건 필터링 필요
 GROUP BY A.YYMM
        , A.BRD_CD
        , C.MGMT_CHNL_NM
 HAVING SUM(A.SALE_AMT) <> 0
 ORDER BY A.YYMM DESC, A.BRD_CD, C.MGMT_CHNL_NM
     """
-    return sql
 
-def get_operating_expense_query(yyyymm, yyyymm_py, brd_cd):
+def get_discount_rate_query(yyyymm, yyyymm_py, brd_cd):
     """
-    영업비 종합분석 쿼리 (전년도 1월 ~ 당해당월)
-    - 추세 분석: 전년도 1월 ~ 당해당월
-    - 전년 누적: 전년도 1월 ~ 전년 동월
-    - 당해 누적: 당해 1월 ~ 당해당월
+    할인율 종합분석 쿼리 (전년 1월부터 당해 월까지 추세 분석)
     
     Args:
         yyyymm: 당해 년월 (예: '202511')
@@ -718,14 +1205,16 @@ def get_operating_expense_query(yyyymm, yyyymm_py, brd_cd):
         brd_cd: 브랜드 코드
     
     Returns:
-        str: SQL 쿼리 문자열
+        tuple: (SQL 쿼리 문자열, 바인딩 파라미터 dict)
     """
     # 전년도 1월 계산 (추세 분석용: 전년도 1월 ~ 당해당월)
     current_year = int(yyyymm[:4])
     previous_year = current_year - 1
     start_yyyymm = f"{previous_year}01"  # 전년도 1월
     
-    sql = f"""
+    return _DISCOUNT_RATE_SQL, {'start_yyyymm': start_yyyymm, 'yyyymm': yyyymm, 'brd_cd': brd_cd}
+
+_OPERATING_EXPENSE_SQL = """
     SELECT PST_YYYYMM
          , BRD_CD
          , MGMT_CHNL_NM
@@ -747,15 +1236,14 @@ def get_operating_expense_query(yyyymm, yyyymm_py, brd_cd):
          , sum(DEPRC_CST_OPRT)    as DEPRC_CST_OPRT --감가상각비
          , sum(ETC_CST_OPRT)      as ETC_CST_OPRT --기타
     FROM SAP_FNF.VW_CN_PL_SHOP_M
-    WHERE PST_YYYYMM BETWEEN '{start_yyyymm}' AND '{yyyymm}'
-      AND BRD_CD = '{brd_cd}'
+    WHERE PST_YYYYMM BETWEEN %(start_yyyymm)s AND %(yyyymm)s
+      AND BRD_CD = %(brd_cd)s
     GROUP BY PST_YYYYMM, BRD_CD, MGMT_CHNL_NM
     """
-    return sql
 
-def get_operating_expense_all_brands_query(yyyymm, yyyymm_py):
+def get_operating_expense_query(yyyymm, yyyymm_py, brd_cd):
     """
-    법인 전체 영업비 쿼리 (모든 브랜드 합계)
+    영업비 종합분석 쿼리 (전년도 1월 ~ 당해당월)
     - 추세 분석: 전년도 1월 ~ 당해당월
     - 전년 누적: 전년도 1월 ~ 전년 동월
     - 당해 누적: 당해 1월 ~ 당해당월
@@ -763,22 +1251,23 @@ def get_operating_expense_all_brands_query(yyyymm, yyyymm_py):
     Args:
         yyyymm: 당해 년월 (예: '202511')
         yyyymm_py: 전년 동월 (예: '202411')
+        brd_cd: 브랜드 코드
     
     Returns:
-        str: SQL 쿼리 문자열
+        tuple: (SQL 쿼리 문자열, 바인딩 파라미터 dict)
     """
     # 전년도 1월 계산 (추세 분석용: 전년도 1월 ~ 당해당월)
     current_year = int(yyyymm[:4])
     previous_year = current_year - 1
     start_yyyymm = f"{previous_year}01"  # 전년도 1월
     
-    # 법인 전체 브랜드 코드 리스트
-    all_brand_codes = list(BRAND_CODE_MAP.keys())  # ['M', 'I', 'X', 'V', 'ST', 'W']
-    brand_codes_str = "', '".join(all_brand_codes)
-    
-    sql = f"""
+    return _OPERATING_EXPENSE_SQL, {'start_yyyymm': start_yyyymm, 'yyyymm': yyyymm, 'brd_cd': brd_cd}
+
+# 법인 전체 브랜드 코드 리스트 ('M', 'I', 'X', ... - 모듈 상수이므로 바인딩 없이 SQL에 직접 포함)
+_ALL_BRAND_CODES_SQL = ", ".join(f"'{code}'" for code in BRAND_CODE_MAP)
+
+_OPERATING_EXPENSE_ALL_BRANDS_SQL = f"""
     SELECT PST_YYYYMM
-         , MGMT_CHNL_NM
          , SUM(
                CASE
                  WHEN MGMT_CHNL_CD IN ('CN7', 'CN8')
@@ -797,36 +1286,36 @@ def get_operating_expense_all_brands_query(yyyymm, yyyymm_py):
          , sum(DEPRC_CST_OPRT)    as DEPRC_CST_OPRT --감가상각비
          , sum(ETC_CST_OPRT)      as ETC_CST_OPRT --기타
     FROM SAP_FNF.VW_CN_PL_SHOP_M
-    WHERE PST_YYYYMM BETWEEN '{start_yyyymm}' AND '{yyyymm}'
-      AND BRD_CD IN ('{brand_codes_str}')
-    GROUP BY PST_YYYYMM, MGMT_CHNL_NM
+    WHERE PST_YYYYMM BETWEEN %(start_yyyymm)s AND %(yyyymm)s
+      AND BRD_CD IN ({_ALL_BRAND_CODES_SQL})
+    GROUP BY PST_YYYYMM
     """
-    return sql
 
-# ============================================================================
-# 분석 함수들
-# ============================================================================
-
-def analyze_retail_channel_top3_sales(yyyymm, brd_cd):
-    """리테일 채널별 TOP3 분석 - 전년 VS 당해 채널별 매출이 높은 ITEM 분석"""
-    print(f"\n{'='*60}")
-    print(f"리테일 채널별 TOP3 분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
-    print(f"{'='*60}")
+def get_operating_expense_all_brands_query(yyyymm, yyyymm_py):
+    """
+    법인 전체 영업비 쿼리 (모든 브랜드 합계)
+    분석에서는 월별 합계만 사용하므로 채널 구분 없이 월 단위로 집계해 반환
+    - 추세 분석: 전년도 1월 ~ 당해당월
+    - 전년 누적: 전년도 1월 ~ 전년 동월
+    - 당해 누적: 당해 1월 ~ 당해당월
     
-    # DB 연결
-    engine = get_db_engine()
+    Args:
+        yyyymm: 당해 년월 (예: '202511')
+        yyyymm_py: 전년 동월 (예: '202411')
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행
-        sql = f"""
+    Returns:
+        tuple: (SQL 쿼리 문자열, 바인딩 파라미터 dict)
+    """
+    # 전년도 1월 계산 (추세 분석용: 전년도 1월 ~ 당해당월)
+    current_year = int(yyyymm[:4])
+    previous_year = current_year - 1
+    start_yyyymm = f"{previous_year}01"  # 전년도 1월
+    
+    return _OPERATING_EXPENSE_ALL_BRANDS_SQL, {'start_yyyymm': start_yyyymm, 'yyyymm': yyyymm}
+
+# 월별 채널별 매출 추세 (당해 1월 ~ 분석월)
+_MONTHLY_CHANNEL_SALES_TREND_SQL = """
+--V2-레첼
 WITH
 -- SHOP : BOS 매핑용 매장
 -- SAP 매장코드가 기준인 SAP_FNF.MST_SHOP에는 ERP 기준인 SHOP_CD 중복이 있을 수 있어 1건만 처리하는 로직 추가
@@ -838,200 +1327,326 @@ SHOP AS (SELECT *
 -- 최종조회쿼리
 SELECT A.YYMM          AS YYYYMM
      , A.BRD_CD        AS BRD_CD
-     , C.MGMT_CHNL_CD  as MGMT_CHNL_CD
-     , C.MGMT_CHNL_NM  AS MGMT_CHNL_NM
-     , B.ITEM_NM
+     , C.MGMT_CHNL_CD  as CHNL_CD
+     , C.MGMT_CHNL_NM  AS CHNL_NM
      , SUM(A.SALE_AMT) AS SALE_AMT
 FROM CHN.DM_SH_S_M A
          LEFT JOIN SAP_FNF.MST_PRDT B
                    ON A.PRDT_CD = B.PRDT_CD
          LEFT JOIN SHOP C
                    ON A.MAP_SHOP_AGNT_CD = C.MAP_SHOP_AGNT_CD
-WHERE A.YYMM IN ('{yyyymm}', '{yyyymm_py}')
-  AND A.BRD_CD = '{brd_cd}'
-  AND ITEM_NM IS NOT NULL
-  AND SALE_AMT <> 0
+WHERE A.YYMM BETWEEN %(yyyymm_start)s AND %(yyyymm_end)s
+  AND A.BRD_CD = %(brd_cd)s
 GROUP BY A.YYMM
        , A.BRD_CD
        , c.MGMT_CHNL_CD
        , c.MGMT_CHNL_NM
-       , B.ITEM_NM
-ORDER BY A.YYMM DESC, MGMT_CHNL_NM,ITEM_NM, SALE_AMT DESC
+ORDER BY A.YYMM DESC, CHNL_CD, SALE_AMT DESC
         """
-        df = run_query(sql, engine)
-        records = df.to_dicts() if df is not None else []
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('SALE_AMT', 0) or 0) for r in records)
-        unique_channels = len(set(r.get('MGMT_CHNL_NM', '') for r in records if r.get('MGMT_CHNL_NM')))
-        unique_items = len(set(r.get('ITEM_NM', '') for r in records if r.get('ITEM_NM')))
-        unique_months = len(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"채널 수: {unique_channels}개")
-        print(f"아이템 수: {unique_items}개")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 채널별 요약 데이터 생성
-        channel_summary = {}
-        for record in records:
-            chnl_nm = record.get('MGMT_CHNL_NM', '기타') or '기타'
-            month = record.get('YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0) or 0)
-            
-            if chnl_nm not in channel_summary:
-                channel_summary[chnl_nm] = {
-                    'total_sales': 0,
-                    'months': {},
-                    'top_items': []
-                }
-            
-            channel_summary[chnl_nm]['total_sales'] += sale_amt
-            
-            if month not in channel_summary[chnl_nm]['months']:
-                channel_summary[chnl_nm]['months'][month] = 0
-            channel_summary[chnl_nm]['months'][month] += sale_amt
-        
-        # 채널별 상위 아이템 추출
-        item_sales_by_channel = {}
-        for record in records:
-            chnl_nm = record.get('MGMT_CHNL_NM', '기타') or '기타'
-            item_nm = record.get('ITEM_NM', '기타') or '기타'
-            sale_amt = float(record.get('SALE_AMT', 0) or 0)
-            
-            key = f"{chnl_nm}|{item_nm}"
-            if key not in item_sales_by_channel:
-                item_sales_by_channel[key] = {
-                    'chnl_nm': chnl_nm,
-                    'item_nm': item_nm,
-                    'total_sales': 0
-                }
-            item_sales_by_channel[key]['total_sales'] += sale_amt
-        
-        # 채널별로 상위 5개 아이템 추출
-        for chnl_nm in channel_summary.keys():
-            channel_items = [
-                item for key, item in item_sales_by_channel.items()
-                if item['chnl_nm'] == chnl_nm
-            ]
-            channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            channel_summary[chnl_nm]['top_items'] = [
-                {
-                    'item_nm': item['item_nm'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2)
-                }
-                for item in channel_items[:5]
-            ]
-            channel_summary[chnl_nm]['total_sales'] = round(
-                channel_summary[chnl_nm]['total_sales'] / 1000000, 2
-            )
-        
-        # 월별 합계 계산
-        monthly_totals = {}
-        for record in records:
-            month = record.get('YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0) or 0)
-            if month not in monthly_totals:
-                monthly_totals[month] = 0
-            monthly_totals[month] += sale_amt
-        
-        monthly_totals_list = [
-            {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
-            for month, amount in sorted(monthly_totals.items())
-        ]
-        
-        # 채널별로 당해/전년 데이터 존재 여부 확인
-        channel_data_check = {}
-        for record in records:
-            chnl_nm = record.get('MGMT_CHNL_NM', '기타') or '기타'
-            month = record.get('YYYYMM', '')
-            
-            if chnl_nm not in channel_data_check:
-                channel_data_check[chnl_nm] = {
-                    'has_current': False,
-                    'has_previous': False
-                }
-            
-            if month == yyyymm:
-                channel_data_check[chnl_nm]['has_current'] = True
-            elif month == yyyymm_py:
-                channel_data_check[chnl_nm]['has_previous'] = True
-        
-        # 당해/전년 데이터가 모두 있는 채널만 필터링
-        valid_channels = [
-            chnl for chnl, check in channel_data_check.items()
-            if check['has_current'] and check['has_previous']
-        ]
-        
-        # 채널별 데이터 요약 (당해/전년 비교용)
-        channel_comparison = {}
-        for chnl_nm in valid_channels:
-            current_data = [r for r in records if r.get('MGMT_CHNL_NM') == chnl_nm and r.get('YYYYMM') == yyyymm]
-            previous_data = [r for r in records if r.get('MGMT_CHNL_NM') == chnl_nm and r.get('YYYYMM') == yyyymm_py]
-            
-            # 채널별 TOP 3 아이템 (당해 기준)
-            current_items = sorted(current_data, key=lambda x: float(x.get('SALE_AMT', 0) or 0), reverse=True)[:3]
-            
-            # 채널 총 매출 계산
-            current_total = sum(float(r.get('SALE_AMT', 0) or 0) for r in current_data)
-            previous_total = sum(float(r.get('SALE_AMT', 0) or 0) for r in previous_data)
-            
-            channel_comparison[chnl_nm] = {
-                'current_top3': [
-                    {
-                        'item_nm': item.get('ITEM_NM', ''),
-                        'sale_amt': round(float(item.get('SALE_AMT', 0) or 0) / 1000000, 2)
-                    }
-                    for item in current_items
-                ],
-                'current_total': round(current_total / 1000000, 2),
-                'previous_total': round(previous_total / 1000000, 2)
-            }
-        
-        # LLM 프롬프트 생성 (JSON 형식 응답 요청)
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 채널 전략 전문가야. 각 채널별 당해 당월 매출 베스트 아이템 3개를 전년대비 주요변화로 분석해줘.
 
-**분석 기간**
-- 당해: {current_year}년 {current_month}월 ({yyyymm})
-- 전년: {previous_year}년 {current_month}월 ({yyyymm_py})
+# 월별 아이템별 매출 추세 (당해 1월 ~ 분석월)
+_MONTHLY_ITEM_SALES_TREND_SQL = """
+WITH
+    -- PARAM :
+    PARAM AS ( SELECT 'CY' AS DIV, %(yyyymm_start)s AS STD_START_YYYYMM, %(yyyymm_end)s AS STD_END_YYYYMM -- start, end 기준년월 지정 필요
+               -- UNION ALL
+               -- SELECT 'PY' AS DIV, '202401' AS STD_START_YYYYMM, '202411' AS STD_END_YYYYMM
+               )
+    -- CY_ITEM : 딩헤 아이템 구분 기준
+  , CY_ITEM AS ( SELECT A.PRDT_CD
+                      , A.SESN
+                      , A.PRDT_HRRC1_NM
+                      , A.PRDT_HRRC2_NM
+                      , A.PRDT_HRRC3_NM
+                      , CASE
+    --------------------------------------------------
+    -- ACC 분류
+    --------------------------------------------------
+    -- 주의사항 : PRDT_HRRC2_NM => 첫번째 문자만 대문자고 나머지는 소문자 ..
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'HEADWEAR'
+            THEN '모자'
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'SHOES'
+            THEN '신발'
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'BAG'
+            THEN '가방'
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'ACC_ETC'
+            THEN '기타'
+        --------------------------------------------------
+        -- 의류 분류
+        --------------------------------------------------
+        -- 당시즌 (SN 통합)
+        WHEN A.PRDT_HRRC1_NM = '의류' AND PARAM.STD_END_YYYYMM BETWEEN B.START_YYYYMM AND B.END_YYYYMM
+            THEN REPLACE(A.SESN, 'N', 'S') || ' ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 전시즌 (조회기준 월이 9~2일때만 존재)
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
+             TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
+                     'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM
+            THEN A.SESN || ' ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 차기시즌
+        WHEN A.PRDT_HRRC1_NM = '의류' AND B.START_YYYYMM > PARAM.STD_END_YYYYMM
+            THEN '차기시즌 ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 전년 SF 시즌
+        --------------------------------------------------
+        -- 조회기준 월이 3~8월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
+             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
+              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
+            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 조회기준 월이 9~2월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
+             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
+              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
+            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 과시즌
+        --------------------------------------------------
+        -- 조회기준 월이 3~8월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
+             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12), 'YYYYMM')
+            THEN '과시즌 ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 조회기준 월이 9~2월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
+             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18), 'YYYYMM')
+            THEN '과시즌 ' || A.PRDT_HRRC1_NM
+        ELSE '미지정'
+                        END AS ITEM_STD
+                 FROM SAP_FNF.MST_PRDT A
+                     LEFT JOIN COMM.MST_SESN B
+                             ON A.SESN = B.SESN
+                     JOIN PARAM
+                             ON PARAM.DIV = 'CY'
+                 WHERE 1 = 1
+                   AND A.SESN <> 'X' -- 저장품 제외
+                 )
+-- 최종조회쿼리
+SELECT A.YYMM AS YYYYMM, A.BRD_CD AS BRD_CD, NVL(B.ITEM_STD, 'TBA') AS ITEM_STD, SUM(A.SALE_AMT) AS SALE_AMT
+FROM CHN.DM_SH_S_M A
+    join param
+        on PAram.div = 'CY'
+        and a.YYMM between param.STD_START_YYYYMM and param.STD_END_YYYYMM
+    LEFT JOIN CY_ITEM B
+            ON A.PRDT_CD = B.PRDT_CD
+WHERE A.BRD_CD = %(brd_cd)s -- 브랜드조건 필터링 필요
+GROUP BY A.YYMM
+       , A.BRD_CD
+       , B.ITEM_STD
+having sum(a.sale_amt)<> 0
+order by a.yymm
+        """
 
-**전체 요약**
-- 총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)
-- 분석 가능한 채널 수: {len(valid_channels)}개
-- 분석 채널 목록: {', '.join(valid_channels)}
-- 분석 아이템 수: {unique_items}개
+# 월별 아이템별 재고 추세 (당해 1월 ~ 분석월)
+_MONTHLY_ITEM_STOCK_TREND_SQL = """
+WITH
+    -- PARAM :
+    PARAM AS ( SELECT 'CY' AS DIV, %(yyyymm_start)s AS STD_START_YYYYMM, %(yyyymm_end)s AS STD_END_YYYYMM -- start, end 기준년월 지정 필요
+               -- UNION ALL
+               -- SELECT 'PY' AS DIV, '202401' AS STD_START_YYYYMM, '202411' AS STD_END_YYYYMM
+               )
+    -- CY_ITEM : 당해 아이템 구분 기준
+  , CY_ITEM AS ( SELECT A.PRDT_CD
+                      , A.SESN
+                      , A.PRDT_HRRC1_NM
+                      , A.PRDT_HRRC2_NM
+                      , A.PRDT_HRRC3_NM
+                      , CASE
+    --------------------------------------------------
+    -- ACC 분류
+    --------------------------------------------------
+    -- 주의사항 : PRDT_HRRC2_NM => 첫번째 문자만 대문자고 나머지는 소문자 ..
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'HEADWEAR'
+            THEN '모자'
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'SHOES'
+            THEN '신발'
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'BAG'
+            THEN '가방'
+        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'ACC_ETC'
+            THEN '기타'
+        --------------------------------------------------
+        -- 의류 분류
+        --------------------------------------------------
+        -- 당시즌 (SN 통합)
+        WHEN A.PRDT_HRRC1_NM = '의류' AND PARAM.STD_END_YYYYMM BETWEEN B.START_YYYYMM AND B.END_YYYYMM
+            THEN REPLACE(A.SESN, 'N', 'S') || ' ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 전시즌 (조회기준 월이 9~2일때만 존재)
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
+             TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
+                     'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM
+            THEN A.SESN || ' ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 차기시즌
+        WHEN A.PRDT_HRRC1_NM = '의류' AND B.START_YYYYMM > PARAM.STD_END_YYYYMM
+            THEN '차기시즌 ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 전년 SF 시즌
+        --------------------------------------------------
+        -- 조회기준 월이 3~8월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
+             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
+              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
+            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 조회기준 월이 9~2월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
+             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
+              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18),
+                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
+            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 과시즌
+        --------------------------------------------------
+        -- 조회기준 월이 3~8월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
+             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12), 'YYYYMM')
+            THEN '과시즌 ' || A.PRDT_HRRC1_NM
+        --------------------------------------------------
+        -- 조회기준 월이 9~2월일떄
+        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
+             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18), 'YYYYMM')
+            THEN '과시즌 ' || A.PRDT_HRRC1_NM
+        ELSE '미지정'
+                        END AS ITEM_STD
+                 FROM SAP_FNF.MST_PRDT A
+                     LEFT JOIN COMM.MST_SESN B
+                             ON A.SESN = B.SESN
+                     JOIN PARAM
+                             ON PARAM.DIV = 'CY'
+                 WHERE 1 = 1
+                   AND A.SESN <> 'X' -- 저장품 제외
+                 )
+-- STOCK : 재고
+    -- OR => SAP / FR => BOS
+  , STOCK AS (
+        SELECT YYYYMM, BRD_CD, ITEM_STD, SUM(STOCK_TAG_AMT_EXPECTED) AS STOCK_TAG_AMT_EXPECTED
+            FROM ( SELECT A.YYMM                      AS YYYYMM
+                        , A.BRD_CD                    AS BRD_CD
+                        , D.ITEM_STD                  AS ITEM_STD
+                        , SUM(STOCK_TAG_AMT_EXPECTED) AS STOCK_TAG_AMT_EXPECTED
+                   FROM CHN.DW_STOCK_M A
+                       JOIN CHN.DW_SHOP_WH_DETAIL B
+                               ON A.SHOP_ID = B.OA_MAP_SHOP_ID AND B.FR_OR_CLS = 'FR' -- 대리상만
+                       JOIN CY_ITEM D
+                               ON A.PRDT_CD = D.PRDT_CD
+                       JOIN PARAM P
+                               ON P.DIV = 'CY' AND A.YYMM BETWEEN P.STD_START_YYYYMM AND P.STD_END_YYYYMM
+                   WHERE 1 = 1
+                     AND A.BRD_CD = %(brd_cd)s -- 브랜드필터링 필요
+                   GROUP BY A.YYMM
+                          , A.BRD_CD
+                          , D.ITEM_STD
+                   UNION ALL
+                   SELECT A.YYYYMM               AS YYYYMM
+                        , A.BRD_CD               AS BRD_CD
+                        , ITEM_STD               AS ITEM_STD
+                        , SUM(END_STOCK_TAG_AMT) AS STOCK_TAG_AMT_EXPECTED
+                   FROM SAP_FNF.DW_CN_IVTR_PRDT_M A
+                       JOIN CY_ITEM D
+                               ON A.PRDT_CD = D.PRDT_CD
+                       JOIN PARAM P
+                               ON P.DIV = 'CY' AND A.YYYYMM BETWEEN P.STD_START_YYYYMM AND P.STD_END_YYYYMM
+                   WHERE 1 = 1
+                     AND A.BRD_CD = %(brd_cd)s -- 브랜드필터링 필요
+                   GROUP BY A.YYYYMM
+                          , A.BRD_CD
+                          , ITEM_STD )
+            GROUP BY YYYYMM, BRD_CD, ITEM_STD
+               )
+SELECT *
+FROM STOCK
+order by yyyymm
+        """
 
-**채널별 데이터 요약**
-{json_dumps_safe(channel_comparison, ensure_ascii=False, indent=2)}
+# ============================================================================
+# 분석 함수들
+# ============================================================================
 
-<분석 목표>
-{BRAND_CODE_MAP.get(brd_cd, brd_cd)} 각 채널별 당해 당월 매출 베스트 아이템 3개를 전년대비 주요변화로 분석해줘.
+@dataclass(frozen=True, slots=True)
+class PeriodCtx:
+    """analyze_* 함수 공통 기간/브랜드 정보 (함수 시작 시 한 번 계산해 재사용)"""
+    brand_name: str
+    label: str  # 로그 헤더용 "브랜드명 (yyyymm)"
+    current_year: int
+    current_month: int
+    previous_year: int
+    yyyymm_py: str  # 전년 동월
 
-**중요**: 위 "채널별 데이터 요약"에 있는 채널만 분석하면 됩니다. 데이터가 없는 채널은 분석하지 마세요.
+@functools.lru_cache(maxsize=256)
+def _period_ctx(yyyymm, brd_cd):
+    """기준 년월/브랜드 코드로 PeriodCtx 생성"""
+    brand_name = BRAND_CODE_MAP.get(brd_cd, brd_cd)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    previous_year = current_year - 1
+    return PeriodCtx(
+        brand_name=brand_name,
+        label=f"{brand_name} ({yyyymm})",
+        current_year=current_year,
+        current_month=current_month,
+        previous_year=previous_year,
+        yyyymm_py=f"{previous_year:04d}{current_month:02d}",
+    )
 
-<데이터 샘플>
-{json_dumps_safe(records[:200], ensure_ascii=False, indent=2)}
+def _count_unique_non_blank(df, *col_names):
+    """컬럼별로 null/빈 문자열을 제외한 고유값 개수를 튜플로 반환"""
+    return df.select(
+        pl.col(col_name).filter(pl.col(col_name) != '').n_unique() for col_name in col_names
+    ).row(0)
 
+def _blank_to(col_name, default):
+    """문자열 컬럼의 null/빈 문자열을 기본값으로 대체하는 Polars 식 (컬럼명 유지)"""
+    col = pl.col(col_name)
+    return pl.when(col.is_null() | (col == '')).then(pl.lit(default)).otherwise(col).alias(col_name)
+
+def _to_k(col_name):
+    """금액 컬럼을 천 단위(k) 정수로 변환하는 Polars 식 (컬럼명 유지, 프롬프트에 소수점 없이 표기)"""
+    return (pl.col(col_name) / 1000).round(0).cast(pl.Int64).alias(col_name)
+
+def _monthly_totals_k(df, amount_col):
+    """YYYYMM별 금액 합계를 천 단위(k) 정수로 반환 (년월 오름차순 dict)"""
+    monthly = (
+        df.group_by('YYYYMM')
+        .agg(pl.col(amount_col).cast(pl.Float64).fill_null(0).sum())
+        .with_columns(_to_k(amount_col))
+        .sort('YYYYMM')
+    )
+    return dict(monthly.iter_rows())
+
+def _discount_pct_expr():
+    """합계 TAG_SALE_AMT/ACT_SALE_AMT로 할인율(%)을 계산하는 Polars 식 (태그매출이 0 이하이면 0)"""
+    tag, act = pl.col('TAG_SALE_AMT'), pl.col('ACT_SALE_AMT')
+    return (
+        pl.when(tag > 0).then(((1 - act / tag) * 100).round(1)).otherwise(0.0).alias('DISCOUNT_PCT')
+    )
+
+# 채널별 TOP3 분석 응답 형식/작성 가이드라인 (call_llm의 prompt_prefix로 전달되어 프롬프트 캐시 대상)
+PROMPT_PREFIX_RETAIL_TOP3 = """
 <요구사항>
 아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
 
-각 채널별로 하나의 섹션을 만들어야 합니다. 채널 목록: {', '.join(valid_channels)}
+각 채널별로 하나의 섹션을 만들어야 합니다. (채널 목록은 데이터의 '분석 채널 목록' 참고)
 
-{{
+{
   "title": "채널별 매출 top3 분석 (당해 전년 주요변화)",
   "sections": [
-    {{
-      "div": "{{채널명}}",
-      "sub_title": "{{채널명}} 전년대비 주요 변화",
-      "ai_text": "각 {{채널명}} 당해 당월 매출 베스트 아이템 3개를 한 줄씩 전년대비 주요변화로 분석해줘. 채널별 데이터 요약의 current_top3와 current_total, previous_total을 참고하여 구체적인 변화율과 원인을 분석해줘. (예: • PET: 당해 신규 모노그램 티셔츠 제품 +156.3% 폭증\\n • 다운: 클래식 모노그램 다운점퍼 폭발적 반응 +145.2%\\n • 후드 : 모노그램 후드 제품 폭발적 성장 +120.1% 등)"
-    }}
+    {
+      "div": "{채널명}",
+      "sub_title": "{채널명} 전년대비 주요 변화",
+      "ai_text": "각 {채널명} 당해 당월 매출 베스트 아이템 3개를 한 줄씩 전년대비 주요변화로 분석해줘. 채널별 데이터 요약의 current_top3와 current_total, previous_total을 참고하여 구체적인 변화율과 원인을 분석해줘. (예: • PET: 당해 신규 모노그램 티셔츠 제품 +156.3% 폭증\\n • 다운: 클래식 모노그램 다운점퍼 폭발적 반응 +145.2%\\n • 후드 : 모노그램 후드 제품 폭발적 성장 +120.1% 등)"
+    }
   ]
-}}
+}
 
 <작성 가이드라인>
 - 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
@@ -1044,187 +1659,277 @@ ORDER BY A.YYMM DESC, MGMT_CHNL_NM,ITEM_NM, SALE_AMT DESC
 - ai_text 내에서 여러 문단이나 항목을 나눌 때는 \\n\\n을 사용
 - 불릿 포인트나 리스트 항목 사이에는 \\n을 사용
 - 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
+"""
+
+# 채널별 매출 종합분석 응답 형식/작성 가이드라인 (call_llm의 prompt_prefix로 전달되어 프롬프트 캐시 대상)
+PROMPT_PREFIX_RETAIL_OVERALL = """
+<요구사항>
+아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
+
+{
+  "title": "브랜드별 채널 매출 종합분석",
+  "sections": [
+    {
+      "div": "종합분석-1",
+      "sub_title": "최고 성과 채널",
+      "ai_text": "최고 성과를 보인 채널들을 종합 분석 (최대 2줄)"
+    },
+    {
+      "div": "종합분석-2",
+      "sub_title": "개선 필요 채널",
+      "ai_text": "개선이 필요한 채널들을 종합 분석 (최대 2줄)"
+    },
+    {
+      "div": "종합분석-3",
+      "sub_title": "핵심 제안",
+      "ai_text": "브랜드 전체 채널 전략에 대한 핵심 제안 (최대 2줄)"
+    }
+  ]
+}
+
+<작성 가이드라인>
+- 각 섹션의 ai_text는 최대 2줄을 넘지 않도록 간결하게 작성
+- 숫자는 백만원 단위로 표시하고 절대 변형하지 말 것
+- 모든 채널의 데이터를 종합적으로 분석 (특정 채널만이 아닌 전체 관점)
+- 채널별 top3가 아니라 전체 채널을 종합적으로 분석
+- 구체적인 채널명과 수치를 포함하여 실용적인 내용으로 작성
+- 줄바꿈은 반드시 \\n을 사용하여 표시
+- 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
+"""
+
+def analyze_retail_channel_top3_sales(yyyymm, brd_cd, force_refresh=False, prefetched=None):
+    """리테일 채널별 TOP3 분석 - 전년 VS 당해 채널별 매출이 높은 ITEM 분석"""
+    ctx = _period_ctx(yyyymm, brd_cd)
+    print(f"\n{'='*60}")
+    print(f"리테일 채널별 TOP3 분석 시작: {ctx.label}")
+    print(f"{'='*60}")
+    
+    # DB 연결
+    engine = get_db_engine()
+    
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year, current_month = ctx.current_year, ctx.current_month
+    previous_year, yyyymm_py = ctx.previous_year, ctx.yyyymm_py
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행 (prefetch_analysis_data로 미리 조회한 결과가 있으면 재사용)
+    if prefetched is not None:
+        df = prefetched['retail_channel']
+    else:
+        sql, params = get_retail_channel_sales_query(yyyymm, yyyymm_py, brd_cd)
+        df = run_query(sql, engine, params)
+    if df is None or df.is_empty():
+        print("데이터가 없습니다.")
+        return None
+    
+    # 집계용 데이터 (채널/아이템명이 비어 있으면 '기타', 매출액 null은 0)
+    sales = df.select(
+        pl.col('YYYYMM'),
+        _blank_to('MGMT_CHNL_NM', '기타'),
+        _blank_to('ITEM_NM', '기타'),
+        pl.col('SALE_AMT').cast(pl.Float64).fill_null(0),
+    )
+    
+    # 데이터 요약
+    total_sales = sales['SALE_AMT'].sum()
+    unique_channels, unique_items, unique_months = _count_unique_non_blank(df, 'MGMT_CHNL_NM', 'ITEM_NM', 'YYYYMM')
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"채널 수: {unique_channels}개")
+    print(f"아이템 수: {unique_items}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 채널별 / 채널x월 / 채널x아이템 합계 (채널은 원본 데이터 등장 순서 유지)
+    channel_totals = sales.group_by('MGMT_CHNL_NM', maintain_order=True).agg(pl.col('SALE_AMT').sum())
+    channel_month = sales.group_by(['MGMT_CHNL_NM', 'YYYYMM'], maintain_order=True).agg(pl.col('SALE_AMT').sum())
+    channel_items = (
+        sales.group_by(['MGMT_CHNL_NM', 'ITEM_NM'], maintain_order=True)
+        .agg(pl.col('SALE_AMT').sum())
+        .sort('SALE_AMT', descending=True, maintain_order=True)
+    )
+    
+    # 채널별 요약 데이터 생성 (채널별 상위 5개 아이템 포함)
+    channel_summary = {
+        chnl_nm: {
+            'total_sales': round(amount / 1000000, 2),
+            'months': {},
+            'top_items': []
+        }
+        for chnl_nm, amount in channel_totals.iter_rows()
+    }
+    for chnl_nm, month, amount in channel_month.iter_rows():
+        channel_summary[chnl_nm]['months'][month] = amount
+    for chnl_nm, item_nm, amount in channel_items.group_by('MGMT_CHNL_NM', maintain_order=True).head(5).iter_rows():
+        channel_summary[chnl_nm]['top_items'].append({
+            'item_nm': item_nm,
+            'total_sales': round(amount / 1000000, 2)
+        })
+    
+    # 월별 합계 계산
+    monthly_totals = sales.group_by('YYYYMM').agg(pl.col('SALE_AMT').sum()).sort('YYYYMM')
+    monthly_totals_list = [
+        {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
+        for month, amount in monthly_totals.iter_rows()
+    ]
+    
+    # 당해/전년 데이터가 모두 있는 채널만 필터링
+    valid_channels = (
+        channel_month.group_by('MGMT_CHNL_NM', maintain_order=True)
+        .agg(
+            (pl.col('YYYYMM') == yyyymm).any().alias('has_current'),
+            (pl.col('YYYYMM') == yyyymm_py).any().alias('has_previous'),
+        )
+        .filter(pl.col('has_current') & pl.col('has_previous'))
+        ['MGMT_CHNL_NM'].to_list()
+    )
+    
+    # 채널별 데이터 요약 (당해/전년 비교용)
+    period_totals = {(chnl_nm, month): amount for chnl_nm, month, amount in channel_month.iter_rows()}
+    current_sales = sales.filter(pl.col('YYYYMM') == yyyymm)
+    
+    # 채널별 TOP 3 아이템 (당해 기준)
+    current_top3 = {}
+    top3_rows = (
+        current_sales.sort('SALE_AMT', descending=True, maintain_order=True)
+        .group_by('MGMT_CHNL_NM', maintain_order=True).head(3)
+        .select('MGMT_CHNL_NM', 'ITEM_NM', 'SALE_AMT')
+    )
+    for chnl_nm, item_nm, amount in top3_rows.iter_rows():
+        current_top3.setdefault(chnl_nm, []).append({
+            'item_nm': item_nm,
+            'sale_amt': round(amount / 1000000, 2)
+        })
+    
+    channel_comparison = {
+        chnl_nm: {
+            'current_top3': current_top3.get(chnl_nm, []),
+            'current_total': round(period_totals.get((chnl_nm, yyyymm), 0) / 1000000, 2),
+            'previous_total': round(period_totals.get((chnl_nm, yyyymm_py), 0) / 1000000, 2)
+        }
+        for chnl_nm in valid_channels
+    }
+    
+    # 프롬프트용 채널별 아이템 당해/전년 매출 (원본 행 대신 집계값 전달, 채널별 당해 상위 10개)
+    item_yoy = {}
+    item_yoy_rows = (
+        sales.filter(pl.col('YYYYMM').is_in([yyyymm, yyyymm_py]))
+        .group_by(['MGMT_CHNL_NM', 'ITEM_NM'], maintain_order=True)
+        .agg(
+            pl.col('SALE_AMT').filter(pl.col('YYYYMM') == yyyymm).sum().alias('CURRENT'),
+            pl.col('SALE_AMT').filter(pl.col('YYYYMM') == yyyymm_py).sum().alias('PREVIOUS'),
+        )
+        .sort('CURRENT', descending=True, maintain_order=True)
+        .group_by('MGMT_CHNL_NM', maintain_order=True).head(10)
+    )
+    for chnl_nm, item_nm, current_amt, previous_amt in item_yoy_rows.iter_rows():
+        item_yoy.setdefault(chnl_nm, []).append({
+            'item_nm': item_nm,
+            'current_sale_amt': round(current_amt / 1000000, 2),
+            'previous_sale_amt': round(previous_amt / 1000000, 2)
+        })
+    
+    # JSON 저장용 원본 데이터 (두 분석에서 공유)
+    sample_records = df.head(50).select(
+        'YYYYMM', 'MGMT_CHNL_NM', 'ITEM_NM', pl.col('SALE_AMT').cast(pl.Float64).fill_null(0)
+    ).to_dicts()
+    trend_months = sorted(
+        df.select(pl.col('YYYYMM').filter(pl.col('YYYYMM') != '').unique())['YYYYMM'].to_list()
+    )
+    monthly_details = df.select(
+        pl.col('YYYYMM').alias('yyyymm'),
+        pl.col('MGMT_CHNL_NM').alias('chnl_nm'),
+        pl.col('ITEM_NM').alias('item_nm'),
+        (pl.col('SALE_AMT').cast(pl.Float64).fill_null(0) / 1000000).round(2).alias('sale_amt'),
+    ).to_dicts()
+    
+    # LLM 프롬프트 생성 (JSON 형식 응답 요청)
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 채널 전략 전문가야. 각 채널별 당해 당월 매출 베스트 아이템 3개를 전년대비 주요변화로 분석해줘.
+
+**분석 기간**
+- 당해: {current_year}년 {current_month}월 ({yyyymm})
+- 전년: {previous_year}년 {current_month}월 ({yyyymm_py})
+
+**전체 요약**
+- 총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)
+- 분석 가능한 채널 수: {len(valid_channels)}개
+- 분석 채널 목록: {', '.join(valid_channels)}
+- 분석 아이템 수: {unique_items}개
+
+**채널별 데이터 요약**
+{json_dumps_safe(channel_comparison, ensure_ascii=False, indent=2)}
+
+<분석 목표>
+{ctx.brand_name} 각 채널별 당해 당월 매출 베스트 아이템 3개를 전년대비 주요변화로 분석해줘.
+
+**중요**: 위 "채널별 데이터 요약"에 있는 채널만 분석하면 됩니다. 데이터가 없는 채널은 분석하지 마세요.
+
+<채널별 아이템 당해/전년 매출 (당해 상위 10개, 백만원)>
+{json_dumps_safe({k: v for k, v in item_yoy.items() if k in valid_channels}, ensure_ascii=False, indent=2)}
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "채널별 매출 분석 (12개월 추이)",
-                "sections": [
-                    {"sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'key': '리테일',
-            'sub_key': '채널별TOP3분석',
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'unique_channels': unique_channels,
-                'unique_items': unique_items,
-                'unique_months': unique_months,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'YYYYMM': r.get('YYYYMM', ''),
-                        'MGMT_CHNL_NM': r.get('MGMT_CHNL_NM', ''),
-                        'ITEM_NM': r.get('ITEM_NM', ''),
-                        'SALE_AMT': float(r.get('SALE_AMT', 0) or 0)
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('YYYYMM', ''),
-                        'chnl_nm': r.get('MGMT_CHNL_NM', ''),
-                        'item_nm': r.get('ITEM_NM', ''),
-                        'sale_amt': round(float(r.get('SALE_AMT', 0) or 0) / 1000000, 2)
-                    }
-                    for r in records
-                ]
-            }
+    
+    # LLM 호출 (JSON 응답) - 종합분석(OVERALL) 준비/호출과 겹치도록 백그라운드로 실행
+    top3_future = _llm_executor.submit(
+        call_llm, prompt, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('retail_channel_top3', brd_cd, yyyymm, df),
+        prompt_prefix=PROMPT_PREFIX_RETAIL_TOP3,
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # ============================================================
+    # 두 번째 분석: 브랜드별 채널 매출 종합분석 (OVERALL)
+    # ============================================================
+    print(f"\n{'='*60}")
+    print(f"채널별 매출 종합분석 시작 (OVERALL): {ctx.brand_name} ({yyyymm})")
+    print(f"{'='*60}")
+    
+    # 데이터 요약 (두 번째 분석용) - 이미 월별로 집계한 monthly_totals에서 당해/전년 값을 조회
+    month_amounts = dict(monthly_totals.iter_rows())
+    total_sales_cy = month_amounts.get(yyyymm, 0)
+    total_sales_py = month_amounts.get(yyyymm_py, 0)
+    
+    print(f"전년 매출액: {total_sales_py:,.0f}원 ({total_sales_py/1000000:.2f}백만원)")
+    print(f"당해 매출액: {total_sales_cy:,.0f}원 ({total_sales_cy/1000000:.2f}백만원)")
+    
+    # 채널별 요약 데이터 생성 (당해/전년 비교)
+    channel_summary_overall = {}
+    for chnl_nm in channel_summary:
+        current = period_totals.get((chnl_nm, yyyymm), 0)
+        previous = period_totals.get((chnl_nm, yyyymm_py), 0)
+        channel_summary_overall[chnl_nm] = {
+            'current_sales': round(current / 1000000, 2),
+            'previous_sales': round(previous / 1000000, 2),
+            'all_items': []
         }
-        
-        # ============================================================
-        # 두 번째 분석: 브랜드별 채널 매출 종합분석 (OVERALL)
-        # ============================================================
-        print(f"\n{'='*60}")
-        print(f"채널별 매출 종합분석 시작 (OVERALL): {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
-        print(f"{'='*60}")
-        
-        # 데이터 요약 (두 번째 분석용)
-        current_data = [r for r in records if r.get('YYYYMM') == yyyymm]
-        previous_data = [r for r in records if r.get('YYYYMM') == yyyymm_py]
-        
-        total_sales_cy = sum(float(r.get('SALE_AMT', 0) or 0) for r in current_data)
-        total_sales_py = sum(float(r.get('SALE_AMT', 0) or 0) for r in previous_data)
-        
-        print(f"전년 매출액: {total_sales_py:,.0f}원 ({total_sales_py/1000000:.2f}백만원)")
-        print(f"당해 매출액: {total_sales_cy:,.0f}원 ({total_sales_cy/1000000:.2f}백만원)")
-        
-        # 채널별 요약 데이터 생성 (당해/전년 비교)
-        channel_summary_overall = {}
-        for record in records:
-            chnl_nm = record.get('MGMT_CHNL_NM', '기타') or '기타'
-            month = record.get('YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0) or 0)
-            
-            if chnl_nm not in channel_summary_overall:
-                channel_summary_overall[chnl_nm] = {
-                    'current_sales': 0,
-                    'previous_sales': 0,
-                    'all_items': []
-                }
-            
-            if month == yyyymm:
-                channel_summary_overall[chnl_nm]['current_sales'] += sale_amt
-            elif month == yyyymm_py:
-                channel_summary_overall[chnl_nm]['previous_sales'] += sale_amt
-        
-        # 채널별 상위 아이템 추출 (당해 기준)
-        item_sales_by_channel_overall = {}
-        for record in current_data:
-            chnl_nm = record.get('MGMT_CHNL_NM', '기타') or '기타'
-            item_nm = record.get('ITEM_NM', '기타') or '기타'
-            sale_amt = float(record.get('SALE_AMT', 0) or 0)
-            
-            key = f"{chnl_nm}|{item_nm}"
-            if key not in item_sales_by_channel_overall:
-                item_sales_by_channel_overall[key] = {
-                    'chnl_nm': chnl_nm,
-                    'item_nm': item_nm,
-                    'total_sales': 0
-                }
-            item_sales_by_channel_overall[key]['total_sales'] += sale_amt
-        
-        # 채널별로 전체 아이템 추출 (top3 제한 없음)
-        for chnl_nm in channel_summary_overall.keys():
-            channel_items = [
-                item for key, item in item_sales_by_channel_overall.items()
-                if item['chnl_nm'] == chnl_nm
-            ]
-            channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            # 모든 아이템 포함 (제한 없음)
-            channel_summary_overall[chnl_nm]['all_items'] = [
-                {
-                    'item_nm': item['item_nm'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2)
-                }
-                for item in channel_items
-            ]
-            channel_summary_overall[chnl_nm]['current_sales'] = round(
-                channel_summary_overall[chnl_nm]['current_sales'] / 1000000, 2
-            )
-            channel_summary_overall[chnl_nm]['previous_sales'] = round(
-                channel_summary_overall[chnl_nm]['previous_sales'] / 1000000, 2
+    
+    # 채널별 전체 아이템 추출 (당해 기준, top3 제한 없음)
+    current_items = (
+        current_sales.group_by(['MGMT_CHNL_NM', 'ITEM_NM'], maintain_order=True)
+        .agg(pl.col('SALE_AMT').sum())
+        .sort('SALE_AMT', descending=True, maintain_order=True)
+    )
+    for chnl_nm, item_nm, amount in current_items.iter_rows():
+        channel_summary_overall[chnl_nm]['all_items'].append({
+            'item_nm': item_nm,
+            'total_sales': round(amount / 1000000, 2)
+        })
+    
+    for summary in channel_summary_overall.values():
+        if summary['previous_sales'] > 0:
+            summary['change_pct'] = round(
+                ((summary['current_sales'] - summary['previous_sales']) / summary['previous_sales'] * 100), 1
             )
-            if channel_summary_overall[chnl_nm]['previous_sales'] > 0:
-                channel_summary_overall[chnl_nm]['change_pct'] = round(
-                    ((channel_summary_overall[chnl_nm]['current_sales'] - channel_summary_overall[chnl_nm]['previous_sales']) / channel_summary_overall[chnl_nm]['previous_sales'] * 100), 1
-                )
-            else:
-                channel_summary_overall[chnl_nm]['change_pct'] = 0
-        
-        # 채널별로 당해/전년 데이터 존재 여부 확인
-        channel_data_check_overall = {}
-        for record in records:
-            chnl_nm = record.get('MGMT_CHNL_NM', '기타') or '기타'
-            month = record.get('YYYYMM', '')
-            
-            if chnl_nm not in channel_data_check_overall:
-                channel_data_check_overall[chnl_nm] = {
-                    'has_current': False,
-                    'has_previous': False
-                }
-            
-            if month == yyyymm:
-                channel_data_check_overall[chnl_nm]['has_current'] = True
-            elif month == yyyymm_py:
-                channel_data_check_overall[chnl_nm]['has_previous'] = True
-        
-        # 당해/전년 데이터가 모두 있는 채널만 필터링
-        valid_channels_overall = [
-            channel for channel, check in channel_data_check_overall.items()
-            if check['has_current'] and check['has_previous']
-        ]
-        
-        # LLM 프롬프트 생성 (종합분석용)
-        prompt_overall = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 채널 전략 전문가야. 브랜드 전체 채널을 종합적으로 분석하여 최고 성과 채널, 개선 필요 채널, 핵심 제안을 도출해줘.
+        else:
+            summary['change_pct'] = 0
+    
+    # 당해/전년 데이터가 모두 있는 채널 (첫 번째 분석과 동일)
+    valid_channels_overall = valid_channels
+    
+    # LLM 프롬프트 생성 (종합분석용)
+    prompt_overall = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 채널 전략 전문가야. 브랜드 전체 채널을 종합적으로 분석하여 최고 성과 채널, 개선 필요 채널, 핵심 제안을 도출해줘.
 
 **분석 기간**
 - 당해: {current_year}년 {current_month}월 ({yyyymm})
@@ -1242,372 +1947,172 @@ ORDER BY A.YYMM DESC, MGMT_CHNL_NM,ITEM_NM, SALE_AMT DESC
 {json_dumps_safe({k: v for k, v in channel_summary_overall.items() if k in valid_channels_overall}, ensure_ascii=False, indent=2)}
 
 <분석 목표>
-{BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드의 모든 채널을 종합적으로 분석하여:
+{ctx.brand_name} 브랜드의 모든 채널을 종합적으로 분석하여:
 1. 최고 성과 채널: 매출 규모, 성장률, 전년대비 개선도 등을 종합하여 최고 성과를 보인 채널들을 식별
 2. 개선 필요 채널: 매출 하락, 성장 둔화, 전년대비 악화 등이 있는 채널들을 식별하고 개선 방향 제시
 3. 핵심 제안: 브랜드 전체 채널 포트폴리오 관점에서 즉시 실행 가능한 전략적 제안
 
-<데이터 샘플>
-{json_dumps_safe(records[:200], ensure_ascii=False, indent=2)}
-
-<요구사항>
-아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
-
-{{
-  "title": "브랜드별 채널 매출 종합분석",
-  "sections": [
-    {{
-      "div": "종합분석-1",
-      "sub_title": "최고 성과 채널",
-      "ai_text": "최고 성과를 보인 채널들을 종합 분석 (최대 2줄)"
-    }},
-    {{
-      "div": "종합분석-2",
-      "sub_title": "개선 필요 채널",
-      "ai_text": "개선이 필요한 채널들을 종합 분석 (최대 2줄)"
-    }},
-    {{
-      "div": "종합분석-3",
-      "sub_title": "핵심 제안",
-      "ai_text": "브랜드 전체 채널 전략에 대한 핵심 제안 (최대 2줄)"
-    }}
-  ]
-}}
-
-<작성 가이드라인>
-- 각 섹션의 ai_text는 최대 2줄을 넘지 않도록 간결하게 작성
-- 숫자는 백만원 단위로 표시하고 절대 변형하지 말 것
-- 모든 채널의 데이터를 종합적으로 분석 (특정 채널만이 아닌 전체 관점)
-- 채널별 top3가 아니라 전체 채널을 종합적으로 분석
-- 구체적인 채널명과 수치를 포함하여 실용적인 내용으로 작성
-- 줄바꿈은 반드시 \\n을 사용하여 표시
-- 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
+<채널별 아이템 당해/전년 매출 (당해 상위 10개, 백만원)>
+{json_dumps_safe({k: v for k, v in item_yoy.items() if k in valid_channels_overall}, ensure_ascii=False, indent=2)}
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (종합분석용)
-        analysis_response_overall = call_llm(prompt_overall, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response_overall = analysis_response_overall.strip()
-        if analysis_response_overall.startswith('```json'):
-            analysis_response_overall = analysis_response_overall[7:]
-        if analysis_response_overall.startswith('```'):
-            analysis_response_overall = analysis_response_overall[3:]
-        if analysis_response_overall.endswith('```'):
-            analysis_response_overall = analysis_response_overall[:-3]
-        analysis_response_overall = analysis_response_overall.strip()
-        
-        try:
-            analysis_data_overall = json.loads(analysis_response_overall)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response_overall[:500]}")
-            # 기본 구조로 대체
-            analysis_data_overall = {
-                "title": "브랜드별 채널 매출 종합분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "최고 성과 채널", "ai_text": analysis_response_overall},
-                    {"div": "종합분석-2", "sub_title": "개선 필요 채널", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "핵심 제안", "ai_text": ""}
-                ]
-            }
-        
-        # ============================================================
-        # 채널별 섹션과 종합분석을 하나로 통합
-        # ============================================================
-        
-        # 종합분석 섹션을 채널별 섹션 뒤에 추가
-        # 종합분석의 div를 "종합분석-1", "종합분석-2" 형태로 변경
-        overall_sections = []
-        for idx, section in enumerate(analysis_data_overall.get('sections', []), 1):
-            overall_sections.append({
-                'div': f'종합분석-{idx}',
-                'sub_title': section.get('sub_title', ''),
-                'ai_text': section.get('ai_text', '')
-            })
-        
-        # 채널별 섹션 + 종합분석 섹션 통합
-        combined_sections = analysis_data.get('sections', []) + overall_sections
-        analysis_data_combined = {
-            'title': analysis_data.get('title', '채널별 매출 top3 분석 (당해 전년 주요변화)'),
-            'sections': combined_sections
+    
+    # LLM 호출 (종합분석용)
+    analysis_response_overall = call_llm(prompt_overall, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('retail_channel_overall', brd_cd, yyyymm, df),
+        prompt_prefix=PROMPT_PREFIX_RETAIL_OVERALL,
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # 채널별 TOP3 분석 응답 수신
+    analysis_response = top3_future.result()
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data = parse_analysis_response(analysis_response, "채널별 매출 분석 (12개월 추이)")
+    
+    # JSON 데이터 생성
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'key': '리테일',
+        'sub_key': '채널별TOP3분석',
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'unique_channels': unique_channels,
+            'unique_items': unique_items,
+            'unique_months': unique_months,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary,
+        'raw_data': {
+            'sample_records': sample_records,
+            'total_records_count': len(df)
+        },
+        'trend_data': {
+            'trend_months': trend_months,
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': monthly_details
         }
-        
-        # 통합된 JSON 데이터 생성
-        json_data_combined = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'key': '리테일',
-            'sub_key': '채널별매출분석',
-            'analysis_data': analysis_data_combined,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'total_sales_cy': round(total_sales_cy / 1000000, 2),
-                'total_sales_py': round(total_sales_py / 1000000, 2),
-                'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py != 0 else 0, 1),
-                'unique_channels': unique_channels,
-                'unique_items': unique_items,
-                'unique_months': unique_months,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary,
-            'channel_summary_overall': channel_summary_overall,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'YYYYMM': r.get('YYYYMM', ''),
-                        'MGMT_CHNL_NM': r.get('MGMT_CHNL_NM', ''),
-                        'ITEM_NM': r.get('ITEM_NM', ''),
-                        'SALE_AMT': float(r.get('SALE_AMT', 0) or 0)
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('YYYYMM', ''),
-                        'chnl_nm': r.get('MGMT_CHNL_NM', ''),
-                        'item_nm': r.get('ITEM_NM', ''),
-                        'sale_amt': round(float(r.get('SALE_AMT', 0) or 0) / 1000000, 2)
-                    }
-                    for r in records
-                ]
-            }
+    }
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data_overall = parse_analysis_response(analysis_response_overall, "브랜드별 채널 매출 종합분석", [
+        ("종합분석-1", "최고 성과 채널"),
+        ("종합분석-2", "개선 필요 채널"),
+        ("종합분석-3", "핵심 제안"),
+    ])
+    
+    # ============================================================
+    # 채널별 섹션과 종합분석을 하나로 통합
+    # ============================================================
+    
+    # 종합분석 섹션을 채널별 섹션 뒤에 추가
+    # 종합분석의 div를 "종합분석-1", "종합분석-2" 형태로 변경
+    overall_sections = []
+    for idx, section in enumerate(analysis_data_overall.get('sections', []), 1):
+        overall_sections.append({
+            'div': f'종합분석-{idx}',
+            'sub_title': section.get('sub_title', ''),
+            'ai_text': section.get('ai_text', '')
+        })
+    
+    # 채널별 섹션 + 종합분석 섹션 통합
+    combined_sections = analysis_data.get('sections', []) + overall_sections
+    analysis_data_combined = {
+        'title': analysis_data.get('title', '채널별 매출 top3 분석 (당해 전년 주요변화)'),
+        'sections': combined_sections
+    }
+    
+    # 통합된 JSON 데이터 생성
+    json_data_combined = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'key': '리테일',
+        'sub_key': '채널별매출분석',
+        'analysis_data': analysis_data_combined,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'total_sales_cy': round(total_sales_cy / 1000000, 2),
+            'total_sales_py': round(total_sales_py / 1000000, 2),
+            'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py != 0 else 0, 1),
+            'unique_channels': unique_channels,
+            'unique_items': unique_items,
+            'unique_months': unique_months,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary,
+        'channel_summary_overall': channel_summary_overall,
+        'raw_data': {
+            'sample_records': sample_records,
+            'total_records_count': len(df)
+        },
+        'trend_data': {
+            'trend_months': trend_months,
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': monthly_details
         }
-        
-        # 파일 저장 (통합된 결과)
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"CN_{yyyymm_short}_{brd_cd}_리테일매출_채널별매출분석"
-        save_json(json_data_combined, filename)
-        
-        # Markdown도 저장 (통합된 sections를 조합)
-        markdown_content = f"# {analysis_data_combined.get('title', '채널별 매출 분석')}\n\n"
-        for section in analysis_data_combined.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 채널별 TOP3 분석 및 종합분석 완료!\n")
-        return json_data_combined
-        
-    finally:
-        engine.dispose()
-
-def analyze_outbound_category_sales(yyyymm, brd_cd):
-    """출고카테고리별 매출분석"""
-    print(f"\n{'='*60}")
-    print(f"출고카테고리별 매출분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
-    print(f"{'='*60}")
+    }
     
-    # DB 연결
-    engine = get_db_engine()
+    # 파일 저장 (통합된 결과)
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"CN_{yyyymm_short}_{brd_cd}_리테일매출_채널별매출분석"
+    save_analysis_outputs(json_data_combined, filename, '채널별 매출 분석')
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행
-        sql = get_outbound_category_sales_query(yyyymm, yyyymm_py, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약 및 가공
-        total_sales = sum(float(r.get('SALE_AMT', 0) or 0) for r in records)
-        
-        # 당해/전년 데이터 분리
-        current_data = [r for r in records if r.get('YYYYMM') == yyyymm]
-        previous_data = [r for r in records if r.get('YYYYMM') == yyyymm_py]
-        
-        total_sales_cy = sum(float(r.get('SALE_AMT', 0) or 0) for r in current_data)
-        total_sales_py = sum(float(r.get('SALE_AMT', 0) or 0) for r in previous_data)
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000:.0f}k)")
-        print(f"당해 매출: {total_sales_cy:,.0f}원 ({total_sales_cy/1000:.0f}k)")
-        print(f"전년 매출: {total_sales_py:,.0f}원 ({total_sales_py/1000:.0f}k)")
-        
-        # 카테고리별 데이터 집계 (LARGE_CLASS_NM 기준: ACC, 의류)
-        category_data = {}
-        for r in records:
-            large_class = r.get('LARGE_CLASS_NM', '기타')
-            yyyymm_val = r.get('YYYYMM', '')
-            item_nm = r.get('ITEM_NM', '기타')
-            prdt_cd = r.get('PRDT_CD', '')
-            prdt_nm = r.get('PRDT_NM', '')
-            sale_amt = float(r.get('SALE_AMT', 0) or 0)
-            
-            if large_class not in category_data:
-                category_data[large_class] = {
-                    'current': {'total': 0, 'items': {}},
-                    'previous': {'total': 0, 'items': {}}
-                }
-            
-            if yyyymm_val == yyyymm:
-                category_data[large_class]['current']['total'] += sale_amt
-                item_key = f"{item_nm}|{prdt_cd}"
-                if item_key not in category_data[large_class]['current']['items']:
-                    category_data[large_class]['current']['items'][item_key] = {
-                        'item_nm': item_nm,
-                        'prdt_cd': prdt_cd,
-                        'prdt_nm': prdt_nm,
-                        'sale_amt': 0
-                    }
-                category_data[large_class]['current']['items'][item_key]['sale_amt'] += sale_amt
-            elif yyyymm_val == yyyymm_py:
-                category_data[large_class]['previous']['total'] += sale_amt
-                item_key = f"{item_nm}|{prdt_cd}"
-                if item_key not in category_data[large_class]['previous']['items']:
-                    category_data[large_class]['previous']['items'][item_key] = {
-                        'item_nm': item_nm,
-                        'prdt_cd': prdt_cd,
-                        'prdt_nm': prdt_nm,
-                        'sale_amt': 0
-                    }
-                category_data[large_class]['previous']['items'][item_key]['sale_amt'] += sale_amt
-        
-        # 카테고리별 강세/약세 아이템 분석
-        category_analysis = {}
-        for large_class, data in category_data.items():
-            current_items = data['current']['items']
-            previous_items = data['previous']['items']
-            
-            # 강세 아이템 (당해에만 있거나 전년 대비 증가)
-            strong_items = []
-            weak_items = []
-            
-            for item_key, item_data in current_items.items():
-                current_amt = item_data['sale_amt']
-                previous_amt = previous_items.get(item_key, {}).get('sale_amt', 0)
-                
-                if previous_amt == 0:
-                    # 신규 아이템
-                    strong_items.append({
-                        'item_nm': item_data['item_nm'],
-                        'prdt_nm': item_data['prdt_nm'],
-                        'current_sale': round(current_amt / 1000, 0),
-                        'previous_sale': 0,
-                        'change_pct': 999.9,
-                        'type': '신규'
-                    })
-                else:
-                    change_pct = ((current_amt - previous_amt) / previous_amt * 100) if previous_amt > 0 else 0
-                    item_info = {
-                        'item_nm': item_data['item_nm'],
-                        'prdt_nm': item_data['prdt_nm'],
-                        'current_sale': round(current_amt / 1000, 0),
-                        'previous_sale': round(previous_amt / 1000, 0),
-                        'change_pct': round(change_pct, 1),
-                        'type': '기존'
-                    }
-                    
-                    if change_pct > 0:
-                        strong_items.append(item_info)
-                    elif change_pct < -20:  # 20% 이상 감소
-                        weak_items.append(item_info)
-            
-            # 전년에만 있던 아이템 (단종/판매 중단)
-            for item_key, item_data in previous_items.items():
-                if item_key not in current_items:
-                    weak_items.append({
-                        'item_nm': item_data['item_nm'],
-                        'prdt_nm': item_data['prdt_nm'],
-                        'current_sale': 0,
-                        'previous_sale': round(item_data['sale_amt'] / 1000, 0),
-                        'change_pct': -100.0,
-                        'type': '단종'
-                    })
-            
-            # 정렬
-            strong_items.sort(key=lambda x: x['current_sale'], reverse=True)
-            weak_items.sort(key=lambda x: abs(x['change_pct']), reverse=True)
-            
-            category_analysis[large_class] = {
-                'current_total': round(data['current']['total'] / 1000, 0),
-                'previous_total': round(data['previous']['total'] / 1000, 0),
-                'change_pct': round(((data['current']['total'] - data['previous']['total']) / data['previous']['total'] * 100) if data['previous']['total'] > 0 else 0, 1),
-                'strong_items': strong_items[:10],  # 상위 10개
-                'weak_items': weak_items[:10]  # 상위 10개
-            }
-        
-        # AI 분석 요청
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 상품 기획 전문가야. 출고카테고리별 매출분석을 수행해줘.
-
-**분석 기간**: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월 ({yyyymm_py} VS {yyyymm})
-
-**전체 요약** (모든 금액은 k 단위):
-- 당해 총 매출: {round(total_sales_cy / 1000, 0):,.0f}k
-- 전년 총 매출: {round(total_sales_py / 1000, 0):,.0f}k
-- 변화율: {round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py > 0 else 0, 1):.1f}%
-
-**카테고리별 분석 데이터** (모든 금액은 k 단위):
-{json_dumps_safe(category_analysis, ensure_ascii=False, indent=2)}
-
-<분석 목표>
-1. ACC/의류 각 카테고리별로 강세 아이템과 약세 아이템을 분석
-2. 전체(ACC/의류) 관점에서 당해/전년 어떠한 변화가 있는지 분석
-3. 리스크 요소를 파악하고 종합 인사이트 도출
+    print(f"[OK] 채널별 TOP3 분석 및 종합분석 완료!\n")
+    return json_data_combined
 
+# 출고카테고리별 매출분석 응답 형식/작성 가이드라인 (call_llm의 prompt_prefix로 전달되어 프롬프트 캐시 대상)
+PROMPT_PREFIX_OUTBOUND = """
 <요구사항>
 아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
 
-{{
+{
   "title": "카테고리별 수익성 분석 (당해 전년 주요변화)",
   "sections": [
-    {{
+    {
       "div": "ACC",
       "sub_title": "ACC 전년대비 주요 변화",
       "ai_text": "ACC 카테고리의 매출 성장/감소, 수익성, TOP3 제품 성과, 전략적 시사점, 단기/중장기 전략 방향을 분석한 내용. 강세 아이템과 약세 아이템을 구체적으로 언급하고, 숫자는 k 단위로 표시."
-    }},
-    {{
+    },
+    {
       "div": "의류",
       "sub_title": "의류 전년대비 주요 변화",
       "ai_text": "의류 카테고리의 매출 성장/감소, 수익성, TOP3 제품 성과, 전략적 시사점, 단기/중장기 전략 방향을 분석한 내용. 강세 아이템과 약세 아이템을 구체적으로 언급하고, 숫자는 k 단위로 표시."
-    }},
-    {{
+    },
+    {
       "div": "종합분석-1",
       "sub_title": "카테고리별 수익성 종합 평가",
       "ai_text": "전체(ACC/의류) 관점에서 당해/전년 변화를 종합적으로 평가한 내용. 전체 매출 구조, 카테고리별 기여도, 수익성 구조 등을 분석."
-    }},
-    {{
+    },
+    {
       "div": "종합분석-2",
       "sub_title": "성장 카테고리 및 기회",
       "ai_text": "성장하는 카테고리와 향후 기회를 분석한 내용. 강세 아이템들이 속한 카테고리와 성장 동력을 분석."
-    }},
-    {{
+    },
+    {
       "div": "종합분석-3",
       "sub_title": "주의 필요 카테고리",
       "ai_text": "주의가 필요한 카테고리와 약세 아이템들이 속한 카테고리를 분석한 내용. 리스크 요소와 개선 방향을 제시."
-    }},
-    {{
+    },
+    {
       "div": "종합분석-4",
       "sub_title": "이상징후 및 리스크 감지",
       "ai_text": "이상징후와 리스크 요소를 감지하고 분석한 내용. 데이터 이상, 매출 구조의 문제점, 잠재적 리스크 등을 분석."
-    }},
-    {{
+    },
+    {
       "div": "종합분석-5",
       "sub_title": "카테고리별 전략 최적화 방안",
       "ai_text": "카테고리별 전략 최적화 방안을 제시한 내용. 즉시 실행 방안과 중장기 전략 방향을 구체적으로 제시."
-    }}
+    }
   ]
-}}
+}
 
 <작성 가이드라인>
 - 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
@@ -1619,268 +2124,237 @@ def analyze_outbound_category_sales(yyyymm, brd_cd):
 - ai_text 내에서 여러 문단이나 항목을 나눌 때는 \\n\\n을 사용
 - 불릿 포인트나 리스트 항목 사이에는 \\n을 사용
 - 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
-
-위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        ai_response = call_llm(prompt)
-        
-        # AI 응답 파싱 (JSON 코드 블록에서 추출)
-        analysis_data = extract_json_from_response(ai_response)
-        
-        if analysis_data is None:
-            analysis_data = {
-                'title': '출고카테고리별 매출분석',
-                'sections': [
-                    {
-                        'sub_title': '분석 결과',
-                        'ai_text': ai_response
-                    }
-                ]
-            }
-        
-        # JSON 데이터 구성
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'key': '출고매출',
-            'sub_key': '카테고리별매출분석',
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales_cy': round(total_sales_cy / 1000, 0),
-                'total_sales_py': round(total_sales_py / 1000, 0),
-                'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py > 0 else 0, 1),
-                'total_records': len(records),
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'category_analysis': category_analysis,
-            'raw_data': {
-                'sample_records': [dict(r) for r in records[:50]],
-                'total_records_count': len(records)
-            }
-        }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"CN_{yyyymm_short}_{brd_cd}_출고매출_카테고리별매출분석"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장
-        markdown_content = f"# {analysis_data.get('title', '출고매출 카테고리별 매출분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 출고매출 카테고리별 매출분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
 
-def analyze_agent_store_sales(yyyymm, brd_cd):
-    """오프라인 대리상 점당매출 종합분석"""
+def analyze_outbound_category_sales(yyyymm, brd_cd, force_refresh=False, prefetched=None):
+    """출고카테고리별 매출분석"""
+    ctx = _period_ctx(yyyymm, brd_cd)
     print(f"\n{'='*60}")
-    print(f"오프라인 대리상 점당매출 종합분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"출고카테고리별 매출분석 시작: {ctx.label}")
     print(f"{'='*60}")
     
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해 1월~지정한 연월, 전년 1월~전년 동일 월)
-        analysis_year = int(yyyymm[:4])
-        analysis_month = int(yyyymm[4:6])
-        yyyymm_start = f"{analysis_year}01"  # 당해 1월
-        yyyymm_end = yyyymm  # 함수 파라미터로 지정한 연월
-        
-        previous_year = analysis_year - 1
-        yyyymm_py_start = f"{previous_year}01"  # 전년 1월
-        yyyymm_py_end = f"{previous_year:04d}{analysis_month:02d}"  # 전년 동일 월
-        
-        print(f"분석 기간: {analysis_year}년 1월 ~ {analysis_year}년 {analysis_month}월 (당해) vs {previous_year}년 1월 ~ {previous_year}년 {analysis_month}월 (전년)")
-        
-        # SQL 쿼리 실행
-        sql = f"""
-WITH
-    -- PARAM : 기간설정
-    PARAM AS ( SELECT 'CY' AS DIV, '{yyyymm_start}' AS STD_START_YYYYMM, '{yyyymm_end}' AS STD_END_YYYYMM -- START, END 기준년월 지정 필요
-               UNION ALL
-               SELECT 'PY' AS DIV, '{yyyymm_py_start}' AS STD_START_YYYYMM, '{yyyymm_py_end}' AS STD_END_YYYYMM -- 전년 START, END 기준년월 지정 필요
-    )
-    -- SHOP : BOS 매핑용 매장
-    -- SAP 매장코드가 기준인 SAP_FNF.MST_SHOP에는 ERP 기준인 SHOP_CD 중복이 있을 수 있어 1건만 처리하는 로직 추가
-  , SHOP AS ( SELECT *
-              FROM SAP_FNF.MST_SHOP
-              QUALIFY
-                  ROW_NUMBER() OVER ( PARTITION BY BRD_CD, CNTRY_CD, SHOP_CD, AGNT_CD, MAP_SHOP_AGNT_CD ORDER BY SAP_SHOP_CD ) =
-                  1 )
-    -- CY_FR_OFF : 대리상 OFF (당해)
-  , CY_FR_OFF AS ( SELECT A.YYMM          AS YYYYMM
-                        , A.BRD_CD        AS BRD_CD
-                        , A.SHOP_ID as shop_cd
-                        , C.SHOP_NM_EN as shop_en_nm
-                        , SUM(A.SALE_AMT) AS SALE_AMT
-                   FROM CHN.DM_SH_S_M A
-                       JOIN PARAM
-                               ON PARAM.DIV = 'CY' AND A.YYMM BETWEEN PARAM.STD_START_YYYYMM AND PARAM.STD_END_YYYYMM
-                       JOIN CHN.DW_SHOP_WH_DETAIL B
-                               ON A.SHOP_ID = B.OA_MAP_SHOP_ID AND B.FR_OR_CLS = 'FR' -- 대리상
-                       JOIN CHN.MST_SHOP_ALL C
-                               ON B.SHOP_ID = C.SHOP_ID
-                   WHERE 1 = 1
-                     AND B.BRD_CD = '{brd_cd}'             -- 브랜드필터링 필요
-                     AND C.ANLYS_ONOFF_CLS_CD = '1' -- OFFLINE
-                     AND B.ANLYS_SHOP_TYPE_NM IN ( 'FP', 'FO' )
-                   GROUP BY A.YYMM
-                          , A.BRD_CD
-                          , A.SHOP_ID
-                          , C.SHOP_NM_EN )
-    -- PY_FR_OFF : 대리상 OFF (전년)
-  , PY_FR_OFF AS ( SELECT A.YYMM                                                                      AS YYYYMM
-                        , TO_VARCHAR(ADD_MONTHS(TO_DATE(A.YYMM || '01', 'YYYYMMDD'), 12), 'YYYYMM') AS NEXT_1Y_YYYYMM
-                        , A.BRD_CD                                                                    AS BRD_CD
-                        , A.SHOP_ID as shop_cd
-                        , C.SHOP_NM_EN as shop_en_nm
-                        , SUM(A.SALE_AMT)                                                             AS SALE_AMT
-                   FROM CHN.DM_SH_S_M A
-                       JOIN PARAM
-                               ON PARAM.DIV = 'PY' AND A.YYMM BETWEEN PARAM.STD_START_YYYYMM AND PARAM.STD_END_YYYYMM
-                       JOIN CHN.DW_SHOP_WH_DETAIL B
-                               ON A.SHOP_ID = B.OA_MAP_SHOP_ID AND B.FR_OR_CLS = 'FR' -- 대리상
-                       JOIN CHN.MST_SHOP_ALL C
-                               ON B.SHOP_ID = C.SHOP_ID
-                   WHERE 1 = 1
-                     AND B.BRD_CD = '{brd_cd}'             -- 브랜드필터링 필요
-                     AND C.ANLYS_ONOFF_CLS_CD = '1' -- OFFLINE
-                     AND B.ANLYS_SHOP_TYPE_NM IN ( 'FP', 'FO' )
-                   GROUP BY A.YYMM
-                          , A.BRD_CD
-                          , A.SHOP_ID
-                          , C.SHOP_NM_EN )
-SELECT C.YYYYMM
-     , C.BRD_CD
-     , C.SHOP_CD
-     , C.SHOP_EN_NM
-     , coalesce(sum(C.SALE_AMT),0) AS CY_SALE_AMT -- 당해 매출액
-     , coalesce(sum(P.SALE_AMT),0) AS PY_SALE_AMT -- 전년 매출액
-     , case when CY_SALE_AMT <> 0 and PY_SALE_AMT =0 then '신규점'
-            when CY_SALE_AMT <> 0 and PY_SALE_AMT <>0 then '기존점'
-            else '미지정' end as div  -- 혹시몰라서..
-FROM CY_FR_OFF C
-    LEFT JOIN PY_FR_OFF P
-            ON C.YYYYMM = P.NEXT_1Y_YYYYMM AND C.BRD_CD = P.BRD_CD AND C.SHOP_CD = P.SHOP_CD
-GROUP BY C.YYYYMM
-       , C.BRD_CD
-       , C.SHOP_CD
-       , C.SHOP_EN_NM
-having CY_SALE_AMT <> 0
-ORDER BY C.YYYYMM DESC
-        """
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 가공: 대리상별 집계 (월별 합계)
-        agent_data = {}  # shop_cd -> {shop_en_nm, months: {yyyymm: {cy, py}}, total_cy, total_py}
-        
-        for r in records:
-            shop_cd = r.get('SHOP_CD', '')
-            shop_en_nm = r.get('SHOP_EN_NM', '')
-            yyyymm_val = r.get('YYYYMM', '')
-            cy_sale_amt = float(r.get('CY_SALE_AMT', 0) or 0)
-            py_sale_amt = float(r.get('PY_SALE_AMT', 0) or 0)
-            
-            if shop_cd not in agent_data:
-                agent_data[shop_cd] = {
-                    'shop_en_nm': shop_en_nm,
-                    'months': {},
-                    'total_cy': 0,
-                    'total_py': 0
-                }
-            
-            if yyyymm_val not in agent_data[shop_cd]['months']:
-                agent_data[shop_cd]['months'][yyyymm_val] = {'cy': 0, 'py': 0}
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year, current_month = ctx.current_year, ctx.current_month
+    previous_year, yyyymm_py = ctx.previous_year, ctx.yyyymm_py
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행 (prefetch_analysis_data로 미리 조회한 결과가 있으면 재사용)
+    if prefetched is not None:
+        df = prefetched['outbound_category']
+    else:
+        sql, params = get_outbound_category_sales_query(yyyymm, yyyymm_py, brd_cd)
+        df = run_query(sql, engine, params)
+    if df.is_empty():
+        print("데이터가 없습니다.")
+        return None
+    
+    # 총합/당해/전년 합계와 카테고리별 집계(LARGE_CLASS_NM 기준: ACC, 의류)를 한 번의 순회로 처리
+    # (SALE_AMT는 SQL에서 COALESCE로 항상 채워짐)
+    total_sales = total_sales_cy = total_sales_py = 0
+    category_data = defaultdict(lambda: {
+        'current': {'total': 0, 'items': {}},
+        'previous': {'total': 0, 'items': {}}
+    })
+    for r in df.iter_rows(named=True):
+        large_class = r.get('LARGE_CLASS_NM', '기타')
+        yyyymm_val = r['YYYYMM']
+        item_nm = r.get('ITEM_NM', '기타')
+        prdt_cd = r.get('PRDT_CD', '')
+        prdt_nm = r.get('PRDT_NM', '')
+        sale_amt = r['SALE_AMT']
+        total_sales += sale_amt
+        
+        category = category_data[large_class]
+        if yyyymm_val == yyyymm:
+            total_sales_cy += sale_amt
+            period = category['current']
+        elif yyyymm_val == yyyymm_py:
+            total_sales_py += sale_amt
+            period = category['previous']
+        else:
+            continue
+        
+        period['total'] += sale_amt
+        item_key = (item_nm, prdt_cd)
+        if item_key not in period['items']:
+            period['items'][item_key] = {
+                'item_nm': item_nm,
+                'prdt_cd': prdt_cd,
+                'prdt_nm': prdt_nm,
+                'sale_amt': 0
+            }
+        period['items'][item_key]['sale_amt'] += sale_amt
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000:.0f}k)")
+    print(f"당해 매출: {total_sales_cy:,.0f}원 ({total_sales_cy/1000:.0f}k)")
+    print(f"전년 매출: {total_sales_py:,.0f}원 ({total_sales_py/1000:.0f}k)")
+    
+    # 카테고리별 강세/약세 아이템 분석
+    category_analysis = {}
+    for large_class, data in category_data.items():
+        current_items = data['current']['items']
+        previous_items = data['previous']['items']
+        
+        # 강세 아이템 (당해에만 있거나 전년 대비 증가)
+        strong_items = []
+        weak_items = []
+        
+        for item_key, item_data in current_items.items():
+            current_amt = item_data['sale_amt']
+            previous_amt = previous_items.get(item_key, {}).get('sale_amt', 0)
             
-            agent_data[shop_cd]['months'][yyyymm_val]['cy'] += cy_sale_amt
-            agent_data[shop_cd]['months'][yyyymm_val]['py'] += py_sale_amt
-            agent_data[shop_cd]['total_cy'] += cy_sale_amt
-            agent_data[shop_cd]['total_py'] += py_sale_amt
-        
-        # 대리상별 데이터 정리 (k 단위)
-        agent_summary = []
-        for shop_cd, data in agent_data.items():
-            months_k = {}
-            for yyyymm, amounts in sorted(data['months'].items()):
-                months_k[yyyymm] = {
-                    'cy': round(amounts['cy'] / 1000, 0),
-                    'py': round(amounts['py'] / 1000, 0),
-                    'change_pct': round(((amounts['cy'] - amounts['py']) / amounts['py'] * 100) if amounts['py'] != 0 else 0, 1)
+            if previous_amt == 0:
+                # 신규 아이템
+                strong_items.append({
+                    'item_nm': item_data['item_nm'],
+                    'prdt_nm': item_data['prdt_nm'],
+                    'current_sale': round(current_amt / 1000, 0),
+                    'previous_sale': 0,
+                    'change_pct': 999.9,
+                    'type': '신규'
+                })
+            else:
+                change_pct = ((current_amt - previous_amt) / previous_amt * 100) if previous_amt > 0 else 0
+                item_info = {
+                    'item_nm': item_data['item_nm'],
+                    'prdt_nm': item_data['prdt_nm'],
+                    'current_sale': round(current_amt / 1000, 0),
+                    'previous_sale': round(previous_amt / 1000, 0),
+                    'change_pct': round(change_pct, 1),
+                    'type': '기존'
                 }
-            
-            agent_summary.append({
-                'shop_cd': shop_cd,
-                'shop_en_nm': data['shop_en_nm'],
-                'total_cy': round(data['total_cy'] / 1000, 0),
-                'total_py': round(data['total_py'] / 1000, 0),
-                'total_change_pct': round(((data['total_cy'] - data['total_py']) / data['total_py'] * 100) if data['total_py'] != 0 else 0, 1),
-                'months': months_k
-            })
-        
-        # 총 매출 계산
-        total_cy = sum(float(r.get('CY_SALE_AMT', 0) or 0) for r in records)
-        total_py = sum(float(r.get('PY_SALE_AMT', 0) or 0) for r in records)
-        
-        # 대리상별 정렬 (당해 총 매출 기준)
-        agent_summary_sorted = sorted(agent_summary, key=lambda x: x['total_cy'], reverse=True)
+                
+                if change_pct > 0:
+                    strong_items.append(item_info)
+                elif change_pct < -20:  # 20% 이상 감소
+                    weak_items.append(item_info)
+        
+        # 전년에만 있던 아이템 (단종/판매 중단)
+        for item_key, item_data in previous_items.items():
+            if item_key not in current_items:
+                weak_items.append({
+                    'item_nm': item_data['item_nm'],
+                    'prdt_nm': item_data['prdt_nm'],
+                    'current_sale': 0,
+                    'previous_sale': round(item_data['sale_amt'] / 1000, 0),
+                    'change_pct': -100.0,
+                    'type': '단종'
+                })
         
-        print(f"총 매출액 (당해): {total_cy:,.0f}원 ({total_cy/1000:.0f}k)")
-        print(f"총 매출액 (전년): {total_py:,.0f}원 ({total_py/1000:.0f}k)")
-        print(f"대리상 수: {len(agent_summary_sorted)}개")
+        # 정렬
+        strong_items.sort(key=lambda x: x['current_sale'], reverse=True)
+        weak_items.sort(key=lambda x: abs(x['change_pct']), reverse=True)
         
-        # LLM 분석 프롬프트 생성
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 오프라인 대리상 점당매출 분석 전문가야. 월별 대리상별 매출 추세 분석을 수행해줘.
+        category_analysis[large_class] = {
+            'current_total': round(data['current']['total'] / 1000, 0),
+            'previous_total': round(data['previous']['total'] / 1000, 0),
+            'change_pct': round(((data['current']['total'] - data['previous']['total']) / data['previous']['total'] * 100) if data['previous']['total'] > 0 else 0, 1),
+            'strong_items': strong_items[:10],  # 상위 10개
+            'weak_items': weak_items[:10]  # 상위 10개
+        }
+    
+    # AI 분석 요청
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 상품 기획 전문가야. 출고카테고리별 매출분석을 수행해줘.
 
-**분석 기간**: {analysis_year}년 1월 ~ {analysis_year}년 11월 (당해) vs {previous_year}년 1월 ~ {previous_year}년 11월 (전년)
+**분석 기간**: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월 ({yyyymm_py} VS {yyyymm})
 
-**총 매출 요약** (모든 금액은 k 단위):
-- 당해 총 매출: {round(total_cy / 1000, 0):,}k
-- 전년 총 매출: {round(total_py / 1000, 0):,}k
-- 전년 대비 변화: {round(((total_cy - total_py) / total_py * 100) if total_py != 0 else 0, 1):.1f}%
+**전체 요약** (모든 금액은 k 단위):
+- 당해 총 매출: {round(total_sales_cy / 1000, 0):,.0f}k
+- 전년 총 매출: {round(total_sales_py / 1000, 0):,.0f}k
+- 변화율: {round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py > 0 else 0, 1):.1f}%
+
+**카테고리별 분석 데이터** (모든 금액은 k 단위):
+{json_dumps_safe(category_analysis, ensure_ascii=False, indent=2)}
+
+<분석 목표>
+1. ACC/의류 각 카테고리별로 강세 아이템과 약세 아이템을 분석
+2. 전체(ACC/의류) 관점에서 당해/전년 어떠한 변화가 있는지 분석
+3. 리스크 요소를 파악하고 종합 인사이트 도출
 
-**대리상별 매출 데이터** (모든 금액은 k 단위, 당해 총 매출 기준 내림차순):
-{json_dumps_safe(agent_summary_sorted[:30], ensure_ascii=False, indent=2)}
+위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
+"""
+    
+    ai_response = call_llm(prompt, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('outbound_category', brd_cd, yyyymm, df),
+        prompt_prefix=PROMPT_PREFIX_OUTBOUND,
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # AI 응답 파싱 (JSON 코드 블록에서 추출)
+    analysis_data = extract_json_from_response(ai_response)
+    
+    if analysis_data is None:
+        analysis_data = {
+            'title': '출고카테고리별 매출분석',
+            'sections': [
+                {
+                    'sub_title': '분석 결과',
+                    'ai_text': ai_response
+                }
+            ]
+        }
+    
+    # JSON 데이터 구성
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'key': '출고매출',
+        'sub_key': '카테고리별매출분석',
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales_cy': round(total_sales_cy / 1000, 0),
+            'total_sales_py': round(total_sales_py / 1000, 0),
+            'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py > 0 else 0, 1),
+            'total_records': len(df),
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'category_analysis': category_analysis,
+        'raw_data': {
+            'sample_records': df.head(50).to_dicts(),
+            'total_records_count': len(df)
+        }
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"CN_{yyyymm_short}_{brd_cd}_출고매출_카테고리별매출분석"
+    save_analysis_outputs(json_data, filename, '출고매출 카테고리별 매출분석')
+    
+    print(f"[OK] 출고매출 카테고리별 매출분석 완료!\n")
+    return json_data
 
+# 대리상 점포 분석 응답 형식/작성 가이드라인 (call_llm의 prompt_prefix로 전달되어 프롬프트 캐시 대상)
+PROMPT_PREFIX_AGENT_STORE = """
 <요구사항>
 아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
 
-{{
+{
   "title": "오프라인 대리상 점당매출 종합분석",
   "sections": [
-    {{
+    {
       "div": "종합분석-1",
       "sub_title": "우수 대리상",
       "ai_text": "당월 비교와 전년 비교를 통해 우수한 성과를 보이는 대리상을 분석한 내용. 구체적인 대리상명(shop_en_nm), 매출액, 전년 대비 변화율을 제시하고, 우수한 요인을 분석해줘."
-    }},
-    {{
+    },
+    {
       "div": "종합분석-2",
       "sub_title": "수익성 개선 필요",
       "ai_text": "당월 비교와 전년 비교를 통해 수익성 개선이 필요한 대리상을 분석한 내용. 구체적인 대리상명(shop_en_nm), 매출액, 전년 대비 변화율을 제시하고, 수익성 개선이 필요한 원인을 분석해줘."
-    }},
-    {{
+    },
+    {
       "div": "종합분석-3",
       "sub_title": "인사이트",
       "ai_text": "우수 대리상과 수익성 개선 필요 대리상 분석을 종합하여 핵심 인사이트를 제시한 내용. 대리상별 성과 차이의 원인, 개선 방안, 전략적 시사점을 구체적으로 제시해줘."
-    }}
+    }
   ]
-}}
+}
 
 <작성 가이드라인>
 - 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
@@ -1893,290 +2367,182 @@ ORDER BY C.YYYYMM DESC
 - ai_text 내에서 여러 문단이나 항목을 나눌 때는 \\n\\n을 사용
 - 불릿 포인트나 리스트 항목 사이에는 \\n을 사용
 - 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
-
-위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "오프라인 대리상 점당매출 종합분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "우수 대리상", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "수익성 개선 필요", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "인사이트", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 구성
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,  # 당해 11월
-            'yyyymm_py': f"{previous_year}11",
-            'key': '(대리상오프)점당매출',
-            'sub_key': '(대리상오프)점당매출 AI 분석',
-            'analysis_data': {
-                'title': analysis_data.get('title', '오프라인 대리상 점당매출 종합분석'),
-                'sections': analysis_data.get('sections', [])
-            },
-            'summary': {
-                'total_cy': round(total_cy / 1000, 0),
-                'total_py': round(total_py / 1000, 0),
-                'change_pct': round(((total_cy - total_py) / total_py * 100) if total_py != 0 else 0, 1),
-                'total_agents': len(agent_summary_sorted),
-                'analysis_period': f"{analysis_year}년 1월 ~ {analysis_year}년 11월 vs {previous_year}년 1월 ~ {previous_year}년 11월"
-            },
-            'agent_summary': agent_summary_sorted[:50],  # 상위 50개 대리상
-            'raw_data': {
-                'sample_records': [dict(r) for r in records[:50]],
-                'total_records_count': len(records)
-            }
-        }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm_end[2:]  # 202511 -> 2511
-        filename = f"CN_{yyyymm_short}_{brd_cd}_대리상오프_점당매출"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장
-        markdown_content = f"# {json_data['analysis_data'].get('title', '오프라인 대리상 점당매출 종합분석')}\n\n"
-        for section in json_data['analysis_data'].get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 오프라인 대리상 점당매출 종합분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
 
-def analyze_discount_rate(yyyymm, brd_cd):
-    """할인율 종합분석 - 채널별 할인율 분석 (전년월 VS 당해월, 추세 분석)"""
+def analyze_agent_store_sales(yyyymm, brd_cd, force_refresh=False, prefetched=None):
+    """오프라인 대리상 점당매출 종합분석"""
+    ctx = _period_ctx(yyyymm, brd_cd)
     print(f"\n{'='*60}")
-    print(f"할인율 종합분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"오프라인 대리상 점당매출 종합분석 시작: {ctx.label}")
     print(f"{'='*60}")
     
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        start_yyyymm = f"{previous_year}01"  # 전년도 1월 (추세 분석용)
-        
-        print(f"분석 기간:")
-        print(f"  - 전년월 VS 당해월: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        print(f"  - 추세 분석: {previous_year}년 1월 ~ {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행 (추세 분석용: 전년 1월부터 당해 월까지)
-        sql = get_discount_rate_query(yyyymm, yyyymm_py, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_tag_sales = sum(float(r.get('TAG_SALE_AMT', 0) or 0) for r in records)
-        total_act_sales = sum(float(r.get('ACT_SALE_AMT', 0) or 0) for r in records)
-        overall_discount = round((1 - total_act_sales / total_tag_sales) * 100, 1) if total_tag_sales > 0 else 0
-        
-        unique_channels = len(set(r.get('CHNL_NM', '') for r in records if r.get('CHNL_NM')))
-        unique_months = len(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))
-        
-        print(f"총 태그매출: {total_tag_sales:,.0f}원 ({total_tag_sales/1000:.0f}k)")
-        print(f"총 실제매출: {total_act_sales:,.0f}원 ({total_act_sales/1000:.0f}k)")
-        print(f"전체 할인율: {overall_discount}%")
-        print(f"채널 수: {unique_channels}개")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 당해월/전년월 데이터 분리
-        current_month_data = [r for r in records if r.get('YYYYMM') == yyyymm]
-        previous_month_data = [r for r in records if r.get('YYYYMM') == yyyymm_py]
-        
-        # 채널별 할인율 집계 (당해월)
-        channel_discount_current = {}
-        for record in current_month_data:
-            chnl_nm = record.get('CHNL_NM') or '기타'
-            tag_sale = float(record.get('TAG_SALE_AMT', 0) or 0)
-            act_sale = float(record.get('ACT_SALE_AMT', 0) or 0)
-            discount_pct = float(record.get('DISCOUNT_PCT', 0) or 0)
-            
-            if not chnl_nm:
-                continue
-            
-            if chnl_nm not in channel_discount_current:
-                channel_discount_current[chnl_nm] = {
-                    'tag_sale_amt': 0,
-                    'act_sale_amt': 0,
-                    'discount_pct': 0
-                }
-            
-            channel_discount_current[chnl_nm]['tag_sale_amt'] += tag_sale
-            channel_discount_current[chnl_nm]['act_sale_amt'] += act_sale
-        
-        # 채널별 할인율 계산 (당해월)
-        for chnl_nm in channel_discount_current.keys():
-            tag = channel_discount_current[chnl_nm]['tag_sale_amt']
-            act = channel_discount_current[chnl_nm]['act_sale_amt']
-            channel_discount_current[chnl_nm]['discount_pct'] = round((1 - act / tag) * 100, 1) if tag > 0 else 0
-        
-        # 채널별 할인율 집계 (전년월)
-        channel_discount_previous = {}
-        for record in previous_month_data:
-            chnl_nm = record.get('CHNL_NM') or '기타'
-            tag_sale = float(record.get('TAG_SALE_AMT', 0) or 0)
-            act_sale = float(record.get('ACT_SALE_AMT', 0) or 0)
-            
-            if not chnl_nm:
-                continue
-            
-            if chnl_nm not in channel_discount_previous:
-                channel_discount_previous[chnl_nm] = {
-                    'tag_sale_amt': 0,
-                    'act_sale_amt': 0,
-                    'discount_pct': 0
-                }
-            
-            channel_discount_previous[chnl_nm]['tag_sale_amt'] += tag_sale
-            channel_discount_previous[chnl_nm]['act_sale_amt'] += act_sale
-        
-        # 채널별 할인율 계산 (전년월)
-        for chnl_nm in channel_discount_previous.keys():
-            tag = channel_discount_previous[chnl_nm]['tag_sale_amt']
-            act = channel_discount_previous[chnl_nm]['act_sale_amt']
-            channel_discount_previous[chnl_nm]['discount_pct'] = round((1 - act / tag) * 100, 1) if tag > 0 else 0
-        
-        # 채널별 월별 할인율 추세 데이터 생성
-        channel_trend_data = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM') or '기타'
-            yyyymm_val = record.get('YYYYMM') or ''
-            discount_pct = float(record.get('DISCOUNT_PCT', 0) or 0)
-            
-            if not chnl_nm or not yyyymm_val:
-                continue
-            
-            if chnl_nm not in channel_trend_data:
-                channel_trend_data[chnl_nm] = {}
-            
-            channel_trend_data[chnl_nm][yyyymm_val] = discount_pct
-        
-        # 채널별 요약 데이터 생성 (당해월/전년월 비교)
-        channel_summary = {}
-        all_channels = set(channel_discount_current.keys()) | set(channel_discount_previous.keys())
-        
-        for chnl_nm in all_channels:
-            current_discount = channel_discount_current.get(chnl_nm, {}).get('discount_pct', 0)
-            previous_discount = channel_discount_previous.get(chnl_nm, {}).get('discount_pct', 0)
-            change_pct = current_discount - previous_discount
-            
-            # 월별 추세 데이터
-            trend_months = sorted(channel_trend_data.get(chnl_nm, {}).keys())
-            trend_values = [channel_trend_data[chnl_nm].get(m, 0) for m in trend_months]
-            
-            channel_summary[chnl_nm] = {
-                'current_discount': current_discount,
-                'previous_discount': previous_discount,
-                'change_pct': round(change_pct, 1),
-                'trend_months': trend_months,
-                'trend_values': trend_values,
-                'current_tag_sale': round(channel_discount_current.get(chnl_nm, {}).get('tag_sale_amt', 0) / 1000, 0),
-                'current_act_sale': round(channel_discount_current.get(chnl_nm, {}).get('act_sale_amt', 0) / 1000, 0),
-                'previous_tag_sale': round(channel_discount_previous.get(chnl_nm, {}).get('tag_sale_amt', 0) / 1000, 0),
-                'previous_act_sale': round(channel_discount_previous.get(chnl_nm, {}).get('act_sale_amt', 0) / 1000, 0)
+    # 분석 기간 계산 (당해 1월~지정한 연월, 전년 1월~전년 동일 월)
+    analysis_year, analysis_month = ctx.current_year, ctx.current_month
+    yyyymm_end = yyyymm  # 함수 파라미터로 지정한 연월
+    
+    previous_year = ctx.previous_year
+    yyyymm_py_end = ctx.yyyymm_py  # 전년 동일 월
+    
+    print(f"분석 기간: {analysis_year}년 1월 ~ {analysis_year}년 {analysis_month}월 (당해) vs {previous_year}년 1월 ~ {previous_year}년 {analysis_month}월 (전년)")
+    
+    # SQL 쿼리 실행 (prefetch_analysis_data로 미리 조회한 결과가 있으면 재사용)
+    if prefetched is not None:
+        df = prefetched['agent_store']
+    else:
+        sql, params = get_agent_store_sales_query(yyyymm, yyyymm_py_end, brd_cd)
+        df = run_query(sql, engine, params)
+    if df.is_empty():
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 가공: 대리상별 집계 (월별 합계)
+    agent_data = {}  # shop_cd -> {shop_en_nm, months: {yyyymm: {cy, py}}, total_cy, total_py}
+    
+    for r in df.iter_rows(named=True):
+        shop_cd = r.get('SHOP_CD', '')
+        shop_en_nm = r.get('SHOP_EN_NM', '')
+        yyyymm_val = r.get('YYYYMM', '')
+        cy_sale_amt = float(r.get('CY_SALE_AMT', 0) or 0)
+        py_sale_amt = float(r.get('PY_SALE_AMT', 0) or 0)
+        
+        if shop_cd not in agent_data:
+            agent_data[shop_cd] = {
+                'shop_en_nm': shop_en_nm,
+                'months': defaultdict(lambda: {'cy': 0, 'py': 0}),
+                'total_cy': 0,
+                'total_py': 0
             }
         
-        # 당해/전년 데이터가 모두 있는 채널만 필터링
-        valid_channels = [
-            chnl for chnl, data in channel_summary.items()
-            if data['current_discount'] > 0 and data['previous_discount'] > 0
-        ]
-        
-        # 전체 할인율 계산 (당해월/전년월)
-        total_tag_current = sum(channel_discount_current.get(chnl, {}).get('tag_sale_amt', 0) for chnl in valid_channels)
-        total_act_current = sum(channel_discount_current.get(chnl, {}).get('act_sale_amt', 0) for chnl in valid_channels)
-        total_discount_current = round((1 - total_act_current / total_tag_current) * 100, 1) if total_tag_current > 0 else 0
-        
-        total_tag_previous = sum(channel_discount_previous.get(chnl, {}).get('tag_sale_amt', 0) for chnl in valid_channels)
-        total_act_previous = sum(channel_discount_previous.get(chnl, {}).get('act_sale_amt', 0) for chnl in valid_channels)
-        total_discount_previous = round((1 - total_act_previous / total_tag_previous) * 100, 1) if total_tag_previous > 0 else 0
-        total_change_pct = total_discount_current - total_discount_previous
+        agent = agent_data[shop_cd]
+        agent['months'][yyyymm_val]['cy'] += cy_sale_amt
+        agent['months'][yyyymm_val]['py'] += py_sale_amt
+        agent['total_cy'] += cy_sale_amt
+        agent['total_py'] += py_sale_amt
+    
+    # 대리상별 데이터 정리 (k 단위)
+    agent_summary = []
+    for shop_cd, data in agent_data.items():
+        months_k = {}
+        for month, amounts in sorted(data['months'].items()):
+            months_k[month] = {
+                'cy': round(amounts['cy'] / 1000, 0),
+                'py': round(amounts['py'] / 1000, 0),
+                'change_pct': round(((amounts['cy'] - amounts['py']) / amounts['py'] * 100) if amounts['py'] != 0 else 0, 1)
+            }
         
-        # AI 분석 요청
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 할인율 전략 전문가야. 채널별 할인율 종합분석을 수행해줘.
-
-**분석 기간**
-- 전년월 VS 당해월: {previous_year}년 {current_month}월 ({yyyymm_py}) VS {current_year}년 {current_month}월 ({yyyymm})
-- 추세 분석: {previous_year}년 1월 ~ {current_year}년 {current_month}월 ({start_yyyymm} ~ {yyyymm})
+        agent_summary.append({
+            'shop_cd': shop_cd,
+            'shop_en_nm': data['shop_en_nm'],
+            'total_cy': round(data['total_cy'] / 1000, 0),
+            'total_py': round(data['total_py'] / 1000, 0),
+            'total_change_pct': round(((data['total_cy'] - data['total_py']) / data['total_py'] * 100) if data['total_py'] != 0 else 0, 1),
+            'months': months_k
+        })
+    
+    # 총 매출 계산
+    total_cy = df['CY_SALE_AMT'].fill_null(0).sum()
+    total_py = df['PY_SALE_AMT'].fill_null(0).sum()
+    
+    # 대리상별 정렬 (당해 총 매출 기준)
+    agent_summary_sorted = sorted(agent_summary, key=lambda x: x['total_cy'], reverse=True)
+    
+    print(f"총 매출액 (당해): {total_cy:,.0f}원 ({total_cy/1000:.0f}k)")
+    print(f"총 매출액 (전년): {total_py:,.0f}원 ({total_py/1000:.0f}k)")
+    print(f"대리상 수: {len(agent_summary_sorted)}개")
+    
+    # LLM 분석 프롬프트 생성
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 오프라인 대리상 점당매출 분석 전문가야. 월별 대리상별 매출 추세 분석을 수행해줘.
 
-**전체 요약**
-- 전체 할인율 (당해월): {total_discount_current}%
-- 전체 할인율 (전년월): {total_discount_previous}%
-- 전년대비 변화: {round(total_change_pct, 1)}%p
-- 분석 채널 수: {len(valid_channels)}개
-- 분석 채널 목록: {', '.join(valid_channels)}
+**분석 기간**: {analysis_year}년 1월 ~ {analysis_year}년 11월 (당해) vs {previous_year}년 1월 ~ {previous_year}년 11월 (전년)
 
-**채널별 할인율 데이터** (당해월 VS 전년월 비교)
-{json_dumps_safe({k: v for k, v in channel_summary.items() if k in valid_channels}, ensure_ascii=False, indent=2)}
+**총 매출 요약** (모든 금액은 k 단위):
+- 당해 총 매출: {round(total_cy / 1000, 0):,}k
+- 전년 총 매출: {round(total_py / 1000, 0):,}k
+- 전년 대비 변화: {round(((total_cy - total_py) / total_py * 100) if total_py != 0 else 0, 1):.1f}%
 
-**채널별 월별 할인율 추세 데이터** (전년 1월부터 당해 월까지)
-{json_dumps_safe({k: {'months': v['trend_months'], 'values': v['trend_values']} for k, v in channel_summary.items() if k in valid_channels}, ensure_ascii=False, indent=2)}
+**대리상별 매출 데이터** (모든 금액은 k 단위, 당해 총 매출 기준 내림차순):
+{json_dumps_safe(agent_summary_sorted[:30], ensure_ascii=False, indent=2)}
 
-<분석 목표>
-{BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드의 채널별 할인율을 종합적으로 분석하여:
-1. 할인율 전략이 우수한 채널: 할인율이 낮고 전년대비 개선되거나 안정적인 채널들을 식별
-2. 주의 필요 채널: 할인율이 높거나 전년대비 악화된 채널들을 식별하고 개선 방향 제시
-3. AI 권장사항: 채널별 할인율 전략에 대한 구체적인 권장사항과 액션플랜
+위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
+"""
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('agent_store', brd_cd, yyyymm_end, df),
+        prompt_prefix=PROMPT_PREFIX_AGENT_STORE,
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data = parse_analysis_response(analysis_response, "오프라인 대리상 점당매출 종합분석", [
+        ("종합분석-1", "우수 대리상"),
+        ("종합분석-2", "수익성 개선 필요"),
+        ("종합분석-3", "인사이트"),
+    ])
+    
+    # JSON 데이터 구성
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm_end,  # 당해 11월
+        'yyyymm_py': f"{previous_year}11",
+        'key': '(대리상오프)점당매출',
+        'sub_key': '(대리상오프)점당매출 AI 분석',
+        'analysis_data': {
+            'title': analysis_data.get('title', '오프라인 대리상 점당매출 종합분석'),
+            'sections': analysis_data.get('sections', [])
+        },
+        'summary': {
+            'total_cy': round(total_cy / 1000, 0),
+            'total_py': round(total_py / 1000, 0),
+            'change_pct': round(((total_cy - total_py) / total_py * 100) if total_py != 0 else 0, 1),
+            'total_agents': len(agent_summary_sorted),
+            'analysis_period': f"{analysis_year}년 1월 ~ {analysis_year}년 11월 vs {previous_year}년 1월 ~ {previous_year}년 11월"
+        },
+        'agent_summary': agent_summary_sorted[:50],  # 상위 50개 대리상
+        'raw_data': {
+            'sample_records': df.head(50).to_dicts(),
+            'total_records_count': len(df)
+        }
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm_end[2:]  # 202511 -> 2511
+    filename = f"CN_{yyyymm_short}_{brd_cd}_대리상오프_점당매출"
+    save_analysis_outputs(json_data, filename, '오프라인 대리상 점당매출 종합분석')
+    
+    print(f"[OK] 오프라인 대리상 점당매출 종합분석 완료!\n")
+    return json_data
 
+# 할인율 분석 응답 형식/작성 가이드라인 (call_llm의 prompt_prefix로 전달되어 프롬프트 캐시 대상)
+PROMPT_PREFIX_DISCOUNT = """
 <요구사항>
 아래 JSON 형식으로 분석 결과를 반환해줘. 반드시 유효한 JSON 형식이어야 하고, 마크다운 코드 블록 없이 순수 JSON만 반환해줘.
 
-{{
+{
   "title": "채널별 할인율 종합분석",
   "sections": [
-    {{
+    {
       "div": "종합분석-1",
       "sub_title": "할인율 전략이 우수한 채널",
       "ai_text": "할인율이 낮고 전년대비 개선되거나 안정적인 채널들을 분석. 구체적인 채널명과 할인율 수치, 전년대비 변화율을 포함하여 분석. (최대 3줄)"
-    }},
-    {{
+    },
+    {
       "div": "종합분석-2",
       "sub_title": "주의 필요 채널",
       "ai_text": "할인율이 높거나 전년대비 악화된 채널들을 분석. 구체적인 채널명과 할인율 수치, 전년대비 변화율, 문제점을 포함하여 분석. (최대 3줄)"
-    }},
-    {{
+    },
+    {
       "div": "종합분석-3",
       "sub_title": "AI 권장사항",
       "ai_text": "채널별 할인율 전략에 대한 구체적인 권장사항과 액션플랜. 우수 채널의 성공 요인, 주의 채널의 개선 방안, 전체적인 할인율 전략 방향을 제시. (최대 4줄)"
-    }}
+    }
   ]
-}}
+}
 
 <작성 가이드라인>
 - 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
@@ -2188,396 +2554,525 @@ def analyze_discount_rate(yyyymm, brd_cd):
 - ai_text 내에서 여러 문단이나 항목을 나눌 때는 \\n\\n을 사용
 - 불릿 포인트나 리스트 항목 사이에는 \\n을 사용
 - 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
+"""
+
+def analyze_discount_rate(yyyymm, brd_cd, force_refresh=False, prefetched=None):
+    """할인율 종합분석 - 채널별 할인율 분석 (전년월 VS 당해월, 추세 분석)"""
+    ctx = _period_ctx(yyyymm, brd_cd)
+    print(f"\n{'='*60}")
+    print(f"할인율 종합분석 시작: {ctx.label}")
+    print(f"{'='*60}")
+    
+    # DB 연결
+    engine = get_db_engine()
+    
+    # 분석 기간 계산
+    current_year, current_month = ctx.current_year, ctx.current_month
+    previous_year, yyyymm_py = ctx.previous_year, ctx.yyyymm_py
+    start_yyyymm = f"{previous_year}01"  # 전년도 1월 (추세 분석용)
+    
+    print(f"분석 기간:")
+    print(f"  - 전년월 VS 당해월: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    print(f"  - 추세 분석: {previous_year}년 1월 ~ {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행 (추세 분석용: 전년 1월부터 당해 월까지)
+    if prefetched is not None:
+        df = prefetched['discount_rate']
+    else:
+        sql, params = get_discount_rate_query(yyyymm, yyyymm_py, brd_cd)
+        df = run_query(sql, engine, params)
+    if df.is_empty():
+        print("데이터가 없습니다.")
+        return None
+    
+    # 집계용 데이터 (채널명이 비어 있으면 '기타', 금액/할인율 null은 0)
+    discount = df.select(
+        _blank_to('CHNL_NM', '기타'),
+        pl.col('YYYYMM').fill_null(''),
+        pl.col('TAG_SALE_AMT').cast(pl.Float64).fill_null(0),
+        pl.col('ACT_SALE_AMT').cast(pl.Float64).fill_null(0),
+        pl.col('DISCOUNT_PCT').cast(pl.Float64).fill_null(0),
+    )
+    
+    # 데이터 요약
+    total_tag_sales = discount['TAG_SALE_AMT'].sum()
+    total_act_sales = discount['ACT_SALE_AMT'].sum()
+    overall_discount = round((1 - total_act_sales / total_tag_sales) * 100, 1) if total_tag_sales > 0 else 0
+    
+    unique_channels, unique_months = _count_unique_non_blank(df, 'CHNL_NM', 'YYYYMM')
+    
+    print(f"총 태그매출: {total_tag_sales:,.0f}원 ({total_tag_sales/1000:.0f}k)")
+    print(f"총 실제매출: {total_act_sales:,.0f}원 ({total_act_sales/1000:.0f}k)")
+    print(f"전체 할인율: {overall_discount}%")
+    print(f"채널 수: {unique_channels}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 채널별 할인율 집계 (당해월/전년월을 한 번의 group_by로 집계)
+    channel_discount_current = {}
+    channel_discount_previous = {}
+    channel_period = (
+        discount.filter(pl.col('YYYYMM').is_in([yyyymm, yyyymm_py]))
+        .group_by(['YYYYMM', 'CHNL_NM'], maintain_order=True)
+        .agg(pl.col('TAG_SALE_AMT').sum(), pl.col('ACT_SALE_AMT').sum())
+        .with_columns(_discount_pct_expr())
+    )
+    for yyyymm_val, chnl_nm, tag_sale, act_sale, discount_pct in channel_period.iter_rows():
+        target = channel_discount_current if yyyymm_val == yyyymm else channel_discount_previous
+        target[chnl_nm] = {
+            'tag_sale_amt': tag_sale,
+            'act_sale_amt': act_sale,
+            'discount_pct': discount_pct
+        }
+    
+    # 채널별 월별 할인율 추세 데이터 생성 (같은 채널/월이 여러 행이면 마지막 값 사용)
+    channel_trend_data = {}
+    channel_trend_rows = (
+        discount.filter(pl.col('YYYYMM') != '')
+        .unique(['CHNL_NM', 'YYYYMM'], keep='last', maintain_order=True)
+        .select('CHNL_NM', 'YYYYMM', 'DISCOUNT_PCT')
+    )
+    for chnl_nm, yyyymm_val, discount_pct in channel_trend_rows.iter_rows():
+        channel_trend_data.setdefault(chnl_nm, {})[yyyymm_val] = discount_pct
+    
+    # 월별 전체 할인율 (추세 분석용)
+    monthly_totals = (
+        discount.filter(pl.col('YYYYMM') != '')
+        .group_by('YYYYMM')
+        .agg(pl.col('TAG_SALE_AMT').sum(), pl.col('ACT_SALE_AMT').sum())
+        .with_columns(_discount_pct_expr(), _to_k('TAG_SALE_AMT'), _to_k('ACT_SALE_AMT'))
+        .sort('YYYYMM')
+    )
+    
+    # 채널별 요약 데이터 생성 (당해월/전년월 비교)
+    channel_summary = {}
+    all_channels = set(channel_discount_current.keys()) | set(channel_discount_previous.keys())
+    
+    for chnl_nm in all_channels:
+        current_discount = channel_discount_current.get(chnl_nm, {}).get('discount_pct', 0)
+        previous_discount = channel_discount_previous.get(chnl_nm, {}).get('discount_pct', 0)
+        change_pct = current_discount - previous_discount
+        
+        # 월별 추세 데이터
+        trend_months = sorted(channel_trend_data.get(chnl_nm, {}).keys())
+        trend_values = [channel_trend_data[chnl_nm].get(m, 0) for m in trend_months]
+        
+        channel_summary[chnl_nm] = {
+            'current_discount': current_discount,
+            'previous_discount': previous_discount,
+            'change_pct': round(change_pct, 1),
+            'trend_months': trend_months,
+            'trend_values': trend_values,
+            'current_tag_sale': round(channel_discount_current.get(chnl_nm, {}).get('tag_sale_amt', 0) / 1000, 0),
+            'current_act_sale': round(channel_discount_current.get(chnl_nm, {}).get('act_sale_amt', 0) / 1000, 0),
+            'previous_tag_sale': round(channel_discount_previous.get(chnl_nm, {}).get('tag_sale_amt', 0) / 1000, 0),
+            'previous_act_sale': round(channel_discount_previous.get(chnl_nm, {}).get('act_sale_amt', 0) / 1000, 0)
+        }
+    
+    # 당해/전년 데이터가 모두 있는 채널만 필터링
+    valid_channels = [
+        chnl for chnl, data in channel_summary.items()
+        if data['current_discount'] > 0 and data['previous_discount'] > 0
+    ]
+    
+    # 전체 할인율 계산 (당해월/전년월)
+    total_tag_current = sum(channel_discount_current.get(chnl, {}).get('tag_sale_amt', 0) for chnl in valid_channels)
+    total_act_current = sum(channel_discount_current.get(chnl, {}).get('act_sale_amt', 0) for chnl in valid_channels)
+    total_discount_current = round((1 - total_act_current / total_tag_current) * 100, 1) if total_tag_current > 0 else 0
+    
+    total_tag_previous = sum(channel_discount_previous.get(chnl, {}).get('tag_sale_amt', 0) for chnl in valid_channels)
+    total_act_previous = sum(channel_discount_previous.get(chnl, {}).get('act_sale_amt', 0) for chnl in valid_channels)
+    total_discount_previous = round((1 - total_act_previous / total_tag_previous) * 100, 1) if total_tag_previous > 0 else 0
+    total_change_pct = total_discount_current - total_discount_previous
+    
+    # AI 분석 요청
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 할인율 전략 전문가야. 채널별 할인율 종합분석을 수행해줘.
+
+**분석 기간**
+- 전년월 VS 당해월: {previous_year}년 {current_month}월 ({yyyymm_py}) VS {current_year}년 {current_month}월 ({yyyymm})
+- 추세 분석: {previous_year}년 1월 ~ {current_year}년 {current_month}월 ({start_yyyymm} ~ {yyyymm})
+
+**전체 요약**
+- 전체 할인율 (당해월): {total_discount_current}%
+- 전체 할인율 (전년월): {total_discount_previous}%
+- 전년대비 변화: {round(total_change_pct, 1)}%p
+- 분석 채널 수: {len(valid_channels)}개
+- 분석 채널 목록: {', '.join(valid_channels)}
+
+**채널별 할인율 데이터** (당해월 VS 전년월 비교)
+{json_dumps_safe({k: v for k, v in channel_summary.items() if k in valid_channels}, ensure_ascii=False, indent=2)}
+
+**채널별 월별 할인율 추세 데이터** (전년 1월부터 당해 월까지)
+{json_dumps_safe({k: {'months': v['trend_months'], 'values': v['trend_values']} for k, v in channel_summary.items() if k in valid_channels}, ensure_ascii=False, indent=2)}
+
+<분석 목표>
+{ctx.brand_name} 브랜드의 채널별 할인율을 종합적으로 분석하여:
+1. 할인율 전략이 우수한 채널: 할인율이 낮고 전년대비 개선되거나 안정적인 채널들을 식별
+2. 주의 필요 채널: 할인율이 높거나 전년대비 악화된 채널들을 식별하고 개선 방향 제시
+3. AI 권장사항: 채널별 할인율 전략에 대한 구체적인 권장사항과 액션플랜
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "채널별 할인율 종합분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "할인율 전략이 우수한 채널", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "주의 필요 채널", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "AI 권장사항", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'key': '할인율',
-            'sub_key': '종합분석',
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_discount_current': total_discount_current,
-                'total_discount_previous': total_discount_previous,
-                'total_change_pct': round(total_change_pct, 1),
-                'unique_channels': unique_channels,
-                'unique_months': unique_months,
-                'analysis_period_month': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월",
-                'analysis_period_trend': f"{previous_year}년 1월 ~ {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary,
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))),
-                'monthly_totals': [],
-                'channel_trends': channel_trend_data
-            },
-            'raw_data': {
-                'sample_records': [dict(r) for r in records[:50]],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('discount_rate', brd_cd, yyyymm, df),
+        prompt_prefix=PROMPT_PREFIX_DISCOUNT,
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data = parse_analysis_response(analysis_response, "채널별 할인율 종합분석", [
+        ("종합분석-1", "할인율 전략이 우수한 채널"),
+        ("종합분석-2", "주의 필요 채널"),
+        ("종합분석-3", "AI 권장사항"),
+    ])
+    
+    # JSON 데이터 생성
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'key': '할인율',
+        'sub_key': '종합분석',
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_discount_current': total_discount_current,
+            'total_discount_previous': total_discount_previous,
+            'total_change_pct': round(total_change_pct, 1),
+            'unique_channels': unique_channels,
+            'unique_months': unique_months,
+            'analysis_period_month': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월",
+            'analysis_period_trend': f"{previous_year}년 1월 ~ {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary,
+        'trend_data': {
+            'trend_months': monthly_totals['YYYYMM'].to_list(),
+            'monthly_totals': [
+                {
+                    'yyyymm': yyyymm_val,
+                    'tag_sale_amt': tag_k,
+                    'act_sale_amt': act_k,
+                    'discount_pct': discount_pct
+                }
+                for yyyymm_val, tag_k, act_k, discount_pct in monthly_totals.iter_rows()
+            ],
+            'channel_trends': channel_trend_data
+        },
+        'raw_data': {
+            'sample_records': df.head(50).to_dicts(),
+            'total_records_count': len(df)
         }
-        
-        # 월별 전체 할인율 계산 (추세 분석용)
-        monthly_totals_dict = {}
-        for record in records:
-            yyyymm_val = record.get('YYYYMM') or ''
-            tag_sale = float(record.get('TAG_SALE_AMT', 0) or 0)
-            act_sale = float(record.get('ACT_SALE_AMT', 0) or 0)
-            
-            if yyyymm_val:
-                if yyyymm_val not in monthly_totals_dict:
-                    monthly_totals_dict[yyyymm_val] = {'tag': 0, 'act': 0}
-                monthly_totals_dict[yyyymm_val]['tag'] += tag_sale
-                monthly_totals_dict[yyyymm_val]['act'] += act_sale
-        
-        for yyyymm_val in sorted(json_data['trend_data']['trend_months']):
-            tag = monthly_totals_dict.get(yyyymm_val, {}).get('tag', 0)
-            act = monthly_totals_dict.get(yyyymm_val, {}).get('act', 0)
-            discount = round((1 - act / tag) * 100, 1) if tag > 0 else 0
-            
-            json_data['trend_data']['monthly_totals'].append({
-                'yyyymm': yyyymm_val,
-                'tag_sale_amt': round(tag / 1000, 0),
-                'act_sale_amt': round(act / 1000, 0),
-                'discount_pct': discount
-            })
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202511 -> 2511
-        filename = f"CN_{yyyymm_short}_{brd_cd}_할인율_종합분석"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장
-        markdown_content = f"# {analysis_data.get('title', '채널별 할인율 종합분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 할인율 종합분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202511 -> 2511
+    filename = f"CN_{yyyymm_short}_{brd_cd}_할인율_종합분석"
+    save_analysis_outputs(json_data, filename, '채널별 할인율 종합분석')
+    
+    print(f"[OK] 할인율 종합분석 완료!\n")
+    return json_data
+
+# 영업비 종합분석 공통 작성 가이드라인 (call_llm의 prompt_prefix로 전달되어 프롬프트 캐시 대상)
+# 응답 형식은 분석 기간이 sub_title/ai_text에 들어가므로 프롬프트 본문에 유지
+PROMPT_PREFIX_OPERATING_EXPENSE = """
+<공통 작성 가이드라인>
+- 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
+- 숫자는 천 단위(k)로 표시하고 절대 변형하지 말 것
+- 영업비 계정별(광고비, 인건비, 복리후생비, 지급수수료, 임차료, 수주회, 세금과공과, 감가상각비, 기타) 분석
+- 각 비교에서 변화율(%)을 계산하여 제시
+- 단기 전략 방향과 중장기 전략 방향을 구체적으로 시사
+- 불릿 포인트는 마크다운 형식(-, •) 사용 가능
+- 줄바꿈은 반드시 \\n을 사용하여 표시 (예: "첫 번째 줄\\n두 번째 줄")
+- ai_text 내에서 여러 문단이나 항목을 나눌 때는 \\n\\n을 사용
+- 불릿 포인트나 리스트 항목 사이에는 \\n을 사용
+- 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
+"""
 
-def analyze_operating_expense(yyyymm, brd_cd):
+def analyze_operating_expense(yyyymm, brd_cd, force_refresh=False, prefetched=None):
     """영업비 종합분석"""
+    ctx = _period_ctx(yyyymm, brd_cd)
     print(f"\n{'='*60}")
-    print(f"영업비 종합분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"영업비 종합분석 시작: {ctx.label}")
     print(f"{'='*60}")
     
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행 (브랜드별)
-        sql = get_operating_expense_query(yyyymm, yyyymm_py, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        # 법인 전체 데이터 조회 (모든 브랜드 합계)
-        sql_all_brands = get_operating_expense_all_brands_query(yyyymm, yyyymm_py)
-        df_all_brands = run_query(sql_all_brands, engine)
-        records_all_brands = df_all_brands.to_dicts()
-        
-        if not records:
-            print("브랜드별 데이터가 없습니다.")
-            return None
-        
-        if not records_all_brands:
-            print("법인 전체 데이터가 없습니다.")
-            records_all_brands = []
-        
-        # 데이터 집계: 당해/전년 동월, 누적 YTD, 1년 추세로 구분
-        # 1. 당해당월 데이터
-        current_month_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm]
-        # 2. 전년 동월 데이터
-        previous_month_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm_py]
-        # 3. 당해 YTD 누적 (당해 1월 ~ 당해당월) - 예: 2501~2511
-        current_year_start = f"{current_year}01"
-        current_ytd_data = [r for r in records if current_year_start <= r.get('PST_YYYYMM', '') <= yyyymm]
-        # 4. 전년 YTD 누적 (전년도 1월 ~ 전년 동월) - 예: 2401~2411
-        previous_year_start = f"{previous_year}01"
-        previous_ytd_data = [r for r in records if previous_year_start <= r.get('PST_YYYYMM', '') <= yyyymm_py]
-        # 5. 1년 추세 (전년도 1월 ~ 당해당월, 월별) - 예: 2401~2511
-        trend_start_yyyymm = f"{previous_year}01"
-        trend_data_by_month = {}
-        for r in records:
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year, current_month = ctx.current_year, ctx.current_month
+    previous_year, yyyymm_py = ctx.previous_year, ctx.yyyymm_py
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    if prefetched is not None:
+        # prefetch_analysis_data로 미리 조회한 결과 재사용
+        df = prefetched['operating_expense']
+        df_all_brands = prefetched['operating_expense_all_brands']
+    else:
+        # 브랜드별 / 법인 전체(모든 브랜드 합계) 쿼리를 한 번에 제출
+        frames = run_queries({
+            'operating_expense': get_operating_expense_query(yyyymm, yyyymm_py, brd_cd),
+            'operating_expense_all_brands': get_operating_expense_all_brands_query(yyyymm, yyyymm_py),
+        }, engine)
+        df = frames['operating_expense']
+        df_all_brands = frames['operating_expense_all_brands']
+    records = df.to_dicts()
+    records_all_brands = df_all_brands.to_dicts()
+    
+    if not records:
+        print("브랜드별 데이터가 없습니다.")
+        return None
+    
+    if not records_all_brands:
+        print("법인 전체 데이터가 없습니다.")
+        records_all_brands = []
+    
+    # 데이터 집계: 당해/전년 동월, 누적 YTD, 1년 추세로 구분
+    # 1. 당해당월 데이터
+    current_month_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm]
+    # 2. 전년 동월 데이터
+    previous_month_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm_py]
+    # 3. 당해 YTD 누적 (당해 1월 ~ 당해당월) - 예: 2501~2511
+    current_year_start = f"{current_year}01"
+    current_ytd_data = [r for r in records if current_year_start <= r.get('PST_YYYYMM', '') <= yyyymm]
+    # 4. 전년 YTD 누적 (전년도 1월 ~ 전년 동월) - 예: 2401~2411
+    previous_year_start = f"{previous_year}01"
+    previous_ytd_data = [r for r in records if previous_year_start <= r.get('PST_YYYYMM', '') <= yyyymm_py]
+    # 5. 1년 추세 (전년도 1월 ~ 당해당월, 월별) - 예: 2401~2511
+    trend_start_yyyymm = f"{previous_year}01"
+    trend_data_by_month = defaultdict(list)
+    for r in records:
+        month = r.get('PST_YYYYMM', '')
+        if trend_start_yyyymm <= month <= yyyymm:
+            trend_data_by_month[month].append(r)
+    
+    # 법인 전체 데이터 집계 (모든 브랜드 합계)
+    # 1. 법인 전체 당해당월 데이터
+    all_brands_current_month_data = [r for r in records_all_brands if r.get('PST_YYYYMM') == yyyymm] if records_all_brands else []
+    # 2. 법인 전체 전년 동월 데이터
+    all_brands_previous_month_data = [r for r in records_all_brands if r.get('PST_YYYYMM') == yyyymm_py] if records_all_brands else []
+    # 3. 법인 전체 당해 YTD 누적
+    all_brands_current_ytd_data = [r for r in records_all_brands if current_year_start <= r.get('PST_YYYYMM', '') <= yyyymm] if records_all_brands else []
+    # 4. 법인 전체 전년 YTD 누적
+    all_brands_previous_ytd_data = [r for r in records_all_brands if previous_year_start <= r.get('PST_YYYYMM', '') <= yyyymm_py] if records_all_brands else []
+    # 5. 법인 전체 1년 추세
+    all_brands_trend_data_by_month = defaultdict(list)
+    if records_all_brands:
+        for r in records_all_brands:
             month = r.get('PST_YYYYMM', '')
             if trend_start_yyyymm <= month <= yyyymm:
-                if month not in trend_data_by_month:
-                    trend_data_by_month[month] = []
-                trend_data_by_month[month].append(r)
-        
-        # 법인 전체 데이터 집계 (모든 브랜드 합계)
-        # 1. 법인 전체 당해당월 데이터
-        all_brands_current_month_data = [r for r in records_all_brands if r.get('PST_YYYYMM') == yyyymm] if records_all_brands else []
-        # 2. 법인 전체 전년 동월 데이터
-        all_brands_previous_month_data = [r for r in records_all_brands if r.get('PST_YYYYMM') == yyyymm_py] if records_all_brands else []
-        # 3. 법인 전체 당해 YTD 누적
-        all_brands_current_ytd_data = [r for r in records_all_brands if current_year_start <= r.get('PST_YYYYMM', '') <= yyyymm] if records_all_brands else []
-        # 4. 법인 전체 전년 YTD 누적
-        all_brands_previous_ytd_data = [r for r in records_all_brands if previous_year_start <= r.get('PST_YYYYMM', '') <= yyyymm_py] if records_all_brands else []
-        # 5. 법인 전체 1년 추세
-        all_brands_trend_data_by_month = {}
-        if records_all_brands:
-            for r in records_all_brands:
-                month = r.get('PST_YYYYMM', '')
-                if trend_start_yyyymm <= month <= yyyymm:
-                    if month not in all_brands_trend_data_by_month:
-                        all_brands_trend_data_by_month[month] = []
-                    all_brands_trend_data_by_month[month].append(r)
-        
-        # 영업비 계정별 집계 함수
-        def aggregate_expenses(data_list):
-            """영업비 계정별 집계"""
-            result = {
-                'ad_cst_oprt': 0,  # 광고비
-                'slry_csy_oprt': 0,  # 인건비
-                'emp_bnft_cst_oprt': 0,  # 복리후생비
-                'pmt_cms_oprt': 0,  # 지급수수료
-                'shop_rnt_oprt': 0,  # 임차료
-                'evnt_cst_oprt': 0,  # 수주회
-                'tax_cst_oprt': 0,  # 세금과공과
-                'deprc_cst_oprt': 0,  # 감가상각비
-                'etc_cst_oprt': 0,  # 기타
-                'sale_amt': 0,  # 매출액
-                'sale_amt_vat': 0  # 매출액(VAT 제외)
-            }
-            for r in data_list:
-                result['ad_cst_oprt'] += float(r.get('AD_CST_OPRT', 0) or 0)
-                result['slry_csy_oprt'] += float(r.get('SLRY_CSY_OPRT', 0) or 0)
-                result['emp_bnft_cst_oprt'] += float(r.get('EMP_BNFT_CST_OPRT', 0) or 0)
-                result['pmt_cms_oprt'] += float(r.get('PMT_CMS_OPRT', 0) or 0)
-                result['shop_rnt_oprt'] += float(r.get('SHOP_RNT_OPRT', 0) or 0)
-                result['evnt_cst_oprt'] += float(r.get('EVNT_CST_OPRT', 0) or 0)
-                result['tax_cst_oprt'] += float(r.get('TAX_CST_OPRT', 0) or 0)
-                result['deprc_cst_oprt'] += float(r.get('DEPRC_CST_OPRT', 0) or 0)
-                result['etc_cst_oprt'] += float(r.get('ETC_CST_OPRT', 0) or 0)
-                result['sale_amt'] += float(r.get('SALE_AMT', 0) or 0)
-                result['sale_amt_vat'] += float(r.get('SALE_AMT_VAT', 0) or 0)
-            return result
-        
-        # 각 구간별 집계 (브랜드별)
-        current_month_summary = aggregate_expenses(current_month_data)
-        previous_month_summary = aggregate_expenses(previous_month_data)
-        current_ytd_summary = aggregate_expenses(current_ytd_data)
-        previous_ytd_summary = aggregate_expenses(previous_ytd_data)
-        
-        # 1년 추세 월별 집계 (브랜드별)
-        trend_by_month = {}
-        for month, month_data in sorted(trend_data_by_month.items()):
-            trend_by_month[month] = aggregate_expenses(month_data)
-        
-        # 법인 전체 각 구간별 집계
-        all_brands_current_month_summary = aggregate_expenses(all_brands_current_month_data) if records_all_brands else {}
-        all_brands_previous_month_summary = aggregate_expenses(all_brands_previous_month_data) if records_all_brands else {}
-        all_brands_current_ytd_summary = aggregate_expenses(all_brands_current_ytd_data) if records_all_brands else {}
-        all_brands_previous_ytd_summary = aggregate_expenses(all_brands_previous_ytd_data) if records_all_brands else {}
-        
-        # 법인 전체 1년 추세 월별 집계
-        all_brands_trend_by_month = {}
-        if records_all_brands:
-            for month, month_data in sorted(all_brands_trend_data_by_month.items()):
-                all_brands_trend_by_month[month] = aggregate_expenses(month_data)
-        
-        # k 단위로 변환
-        def convert_to_k(data_dict):
-            """모든 금액을 k 단위로 변환"""
-            result = {}
-            for key, value in data_dict.items():
-                result[key] = round(value / 1000, 0) if isinstance(value, (int, float)) else value
-            return result
-        
-        current_month_k = convert_to_k(current_month_summary)
-        previous_month_k = convert_to_k(previous_month_summary)
-        current_ytd_k = convert_to_k(current_ytd_summary)
-        previous_ytd_k = convert_to_k(previous_ytd_summary)
-        trend_by_month_k = {month: convert_to_k(data) for month, data in trend_by_month.items()}
-        
-        # 법인 전체 k 단위로 변환
-        all_brands_current_month_k = convert_to_k(all_brands_current_month_summary) if records_all_brands else {}
-        all_brands_previous_month_k = convert_to_k(all_brands_previous_month_summary) if records_all_brands else {}
-        all_brands_current_ytd_k = convert_to_k(all_brands_current_ytd_summary) if records_all_brands else {}
-        all_brands_previous_ytd_k = convert_to_k(all_brands_previous_ytd_summary) if records_all_brands else {}
-        all_brands_trend_by_month_k = {month: convert_to_k(data) for month, data in all_brands_trend_by_month.items()} if records_all_brands else {}
-        
-        # 법인 전체 대비 브랜드 비중 계산 함수
-        def calculate_ratio(brand_amount, all_brands_amount):
-            """법인 전체 대비 브랜드 비중 계산 (%)"""
-            if all_brands_amount and all_brands_amount > 0:
-                return round((brand_amount / all_brands_amount) * 100, 1)
-            return 0.0
-        
-        # 법인 전체 대비 비중 계산 (당해당월)
-        brand_vs_all_current_month = {}
-        if records_all_brands:
-            total_all_current_month = sum([
-                all_brands_current_month_summary.get('ad_cst_oprt', 0),
-                all_brands_current_month_summary.get('slry_csy_oprt', 0),
-                all_brands_current_month_summary.get('emp_bnft_cst_oprt', 0),
-                all_brands_current_month_summary.get('pmt_cms_oprt', 0),
-                all_brands_current_month_summary.get('shop_rnt_oprt', 0),
-                all_brands_current_month_summary.get('evnt_cst_oprt', 0),
-                all_brands_current_month_summary.get('tax_cst_oprt', 0),
-                all_brands_current_month_summary.get('deprc_cst_oprt', 0),
-                all_brands_current_month_summary.get('etc_cst_oprt', 0)
-            ])
-            total_brand_current_month = sum([
-                current_month_summary.get('ad_cst_oprt', 0),
-                current_month_summary.get('slry_csy_oprt', 0),
-                current_month_summary.get('emp_bnft_cst_oprt', 0),
-                current_month_summary.get('pmt_cms_oprt', 0),
-                current_month_summary.get('shop_rnt_oprt', 0),
-                current_month_summary.get('evnt_cst_oprt', 0),
-                current_month_summary.get('tax_cst_oprt', 0),
-                current_month_summary.get('deprc_cst_oprt', 0),
-                current_month_summary.get('etc_cst_oprt', 0)
-            ])
-            brand_vs_all_current_month = {
-                'brand_total': round(total_brand_current_month / 1000, 0),
-                'all_brands_total': round(total_all_current_month / 1000, 0),
-                'ratio': calculate_ratio(total_brand_current_month, total_all_current_month),
-                'by_account': {
-                    'ad_cst_oprt': {
-                        'brand': current_month_k.get('ad_cst_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('ad_cst_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('ad_cst_oprt', 0), all_brands_current_month_summary.get('ad_cst_oprt', 0))
-                    },
-                    'slry_csy_oprt': {
-                        'brand': current_month_k.get('slry_csy_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('slry_csy_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('slry_csy_oprt', 0), all_brands_current_month_summary.get('slry_csy_oprt', 0))
-                    },
-                    'emp_bnft_cst_oprt': {
-                        'brand': current_month_k.get('emp_bnft_cst_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('emp_bnft_cst_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('emp_bnft_cst_oprt', 0), all_brands_current_month_summary.get('emp_bnft_cst_oprt', 0))
-                    },
-                    'pmt_cms_oprt': {
-                        'brand': current_month_k.get('pmt_cms_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('pmt_cms_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('pmt_cms_oprt', 0), all_brands_current_month_summary.get('pmt_cms_oprt', 0))
-                    },
-                    'shop_rnt_oprt': {
-                        'brand': current_month_k.get('shop_rnt_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('shop_rnt_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('shop_rnt_oprt', 0), all_brands_current_month_summary.get('shop_rnt_oprt', 0))
-                    },
-                    'evnt_cst_oprt': {
-                        'brand': current_month_k.get('evnt_cst_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('evnt_cst_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('evnt_cst_oprt', 0), all_brands_current_month_summary.get('evnt_cst_oprt', 0))
-                    },
-                    'tax_cst_oprt': {
-                        'brand': current_month_k.get('tax_cst_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('tax_cst_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('tax_cst_oprt', 0), all_brands_current_month_summary.get('tax_cst_oprt', 0))
-                    },
-                    'deprc_cst_oprt': {
-                        'brand': current_month_k.get('deprc_cst_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('deprc_cst_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('deprc_cst_oprt', 0), all_brands_current_month_summary.get('deprc_cst_oprt', 0))
-                    },
-                    'etc_cst_oprt': {
-                        'brand': current_month_k.get('etc_cst_oprt', 0),
-                        'all_brands': all_brands_current_month_k.get('etc_cst_oprt', 0),
-                        'ratio': calculate_ratio(current_month_summary.get('etc_cst_oprt', 0), all_brands_current_month_summary.get('etc_cst_oprt', 0))
-                    }
+                all_brands_trend_data_by_month[month].append(r)
+    
+    # 영업비 계정별 집계 함수
+    def aggregate_expenses(data_list):
+        """영업비 계정별 집계"""
+        result = {
+            'ad_cst_oprt': 0,  # 광고비
+            'slry_csy_oprt': 0,  # 인건비
+            'emp_bnft_cst_oprt': 0,  # 복리후생비
+            'pmt_cms_oprt': 0,  # 지급수수료
+            'shop_rnt_oprt': 0,  # 임차료
+            'evnt_cst_oprt': 0,  # 수주회
+            'tax_cst_oprt': 0,  # 세금과공과
+            'deprc_cst_oprt': 0,  # 감가상각비
+            'etc_cst_oprt': 0,  # 기타
+            'sale_amt': 0,  # 매출액
+            'sale_amt_vat': 0  # 매출액(VAT 제외)
+        }
+        for r in data_list:
+            result['ad_cst_oprt'] += float(r.get('AD_CST_OPRT', 0) or 0)
+            result['slry_csy_oprt'] += float(r.get('SLRY_CSY_OPRT', 0) or 0)
+            result['emp_bnft_cst_oprt'] += float(r.get('EMP_BNFT_CST_OPRT', 0) or 0)
+            result['pmt_cms_oprt'] += float(r.get('PMT_CMS_OPRT', 0) or 0)
+            result['shop_rnt_oprt'] += float(r.get('SHOP_RNT_OPRT', 0) or 0)
+            result['evnt_cst_oprt'] += float(r.get('EVNT_CST_OPRT', 0) or 0)
+            result['tax_cst_oprt'] += float(r.get('TAX_CST_OPRT', 0) or 0)
+            result['deprc_cst_oprt'] += float(r.get('DEPRC_CST_OPRT', 0) or 0)
+            result['etc_cst_oprt'] += float(r.get('ETC_CST_OPRT', 0) or 0)
+            result['sale_amt'] += float(r.get('SALE_AMT', 0) or 0)
+            result['sale_amt_vat'] += float(r.get('SALE_AMT_VAT', 0) or 0)
+        return result
+    
+    # 각 구간별 집계 (브랜드별)
+    current_month_summary = aggregate_expenses(current_month_data)
+    previous_month_summary = aggregate_expenses(previous_month_data)
+    current_ytd_summary = aggregate_expenses(current_ytd_data)
+    previous_ytd_summary = aggregate_expenses(previous_ytd_data)
+    
+    # 1년 추세 월별 집계 (브랜드별)
+    trend_by_month = {}
+    for month, month_data in sorted(trend_data_by_month.items()):
+        trend_by_month[month] = aggregate_expenses(month_data)
+    
+    # 법인 전체 각 구간별 집계
+    all_brands_current_month_summary = aggregate_expenses(all_brands_current_month_data) if records_all_brands else {}
+    all_brands_previous_month_summary = aggregate_expenses(all_brands_previous_month_data) if records_all_brands else {}
+    all_brands_current_ytd_summary = aggregate_expenses(all_brands_current_ytd_data) if records_all_brands else {}
+    all_brands_previous_ytd_summary = aggregate_expenses(all_brands_previous_ytd_data) if records_all_brands else {}
+    
+    # 법인 전체 1년 추세 월별 집계
+    all_brands_trend_by_month = {}
+    if records_all_brands:
+        for month, month_data in sorted(all_brands_trend_data_by_month.items()):
+            all_brands_trend_by_month[month] = aggregate_expenses(month_data)
+    
+    # k 단위로 변환
+    def convert_to_k(data_dict):
+        """모든 금액을 k 단위로 변환"""
+        result = {}
+        for key, value in data_dict.items():
+            result[key] = round(value / 1000, 0) if isinstance(value, (int, float)) else value
+        return result
+    
+    current_month_k = convert_to_k(current_month_summary)
+    previous_month_k = convert_to_k(previous_month_summary)
+    current_ytd_k = convert_to_k(current_ytd_summary)
+    previous_ytd_k = convert_to_k(previous_ytd_summary)
+    trend_by_month_k = {month: convert_to_k(data) for month, data in trend_by_month.items()}
+    
+    # 법인 전체 k 단위로 변환
+    all_brands_current_month_k = convert_to_k(all_brands_current_month_summary) if records_all_brands else {}
+    all_brands_previous_month_k = convert_to_k(all_brands_previous_month_summary) if records_all_brands else {}
+    all_brands_current_ytd_k = convert_to_k(all_brands_current_ytd_summary) if records_all_brands else {}
+    all_brands_previous_ytd_k = convert_to_k(all_brands_previous_ytd_summary) if records_all_brands else {}
+    all_brands_trend_by_month_k = {month: convert_to_k(data) for month, data in all_brands_trend_by_month.items()} if records_all_brands else {}
+    
+    # 법인 전체 대비 브랜드 비중 계산 함수
+    def calculate_ratio(brand_amount, all_brands_amount):
+        """법인 전체 대비 브랜드 비중 계산 (%)"""
+        if all_brands_amount and all_brands_amount > 0:
+            return round((brand_amount / all_brands_amount) * 100, 1)
+        return 0.0
+    
+    # 법인 전체 대비 비중 계산 (당해당월)
+    brand_vs_all_current_month = {}
+    if records_all_brands:
+        total_all_current_month = sum([
+            all_brands_current_month_summary.get('ad_cst_oprt', 0),
+            all_brands_current_month_summary.get('slry_csy_oprt', 0),
+            all_brands_current_month_summary.get('emp_bnft_cst_oprt', 0),
+            all_brands_current_month_summary.get('pmt_cms_oprt', 0),
+            all_brands_current_month_summary.get('shop_rnt_oprt', 0),
+            all_brands_current_month_summary.get('evnt_cst_oprt', 0),
+            all_brands_current_month_summary.get('tax_cst_oprt', 0),
+            all_brands_current_month_summary.get('deprc_cst_oprt', 0),
+            all_brands_current_month_summary.get('etc_cst_oprt', 0)
+        ])
+        total_brand_current_month = sum([
+            current_month_summary.get('ad_cst_oprt', 0),
+            current_month_summary.get('slry_csy_oprt', 0),
+            current_month_summary.get('emp_bnft_cst_oprt', 0),
+            current_month_summary.get('pmt_cms_oprt', 0),
+            current_month_summary.get('shop_rnt_oprt', 0),
+            current_month_summary.get('evnt_cst_oprt', 0),
+            current_month_summary.get('tax_cst_oprt', 0),
+            current_month_summary.get('deprc_cst_oprt', 0),
+            current_month_summary.get('etc_cst_oprt', 0)
+        ])
+        brand_vs_all_current_month = {
+            'brand_total': round(total_brand_current_month / 1000, 0),
+            'all_brands_total': round(total_all_current_month / 1000, 0),
+            'ratio': calculate_ratio(total_brand_current_month, total_all_current_month),
+            'by_account': {
+                'ad_cst_oprt': {
+                    'brand': current_month_k.get('ad_cst_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('ad_cst_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('ad_cst_oprt', 0), all_brands_current_month_summary.get('ad_cst_oprt', 0))
+                },
+                'slry_csy_oprt': {
+                    'brand': current_month_k.get('slry_csy_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('slry_csy_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('slry_csy_oprt', 0), all_brands_current_month_summary.get('slry_csy_oprt', 0))
+                },
+                'emp_bnft_cst_oprt': {
+                    'brand': current_month_k.get('emp_bnft_cst_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('emp_bnft_cst_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('emp_bnft_cst_oprt', 0), all_brands_current_month_summary.get('emp_bnft_cst_oprt', 0))
+                },
+                'pmt_cms_oprt': {
+                    'brand': current_month_k.get('pmt_cms_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('pmt_cms_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('pmt_cms_oprt', 0), all_brands_current_month_summary.get('pmt_cms_oprt', 0))
+                },
+                'shop_rnt_oprt': {
+                    'brand': current_month_k.get('shop_rnt_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('shop_rnt_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('shop_rnt_oprt', 0), all_brands_current_month_summary.get('shop_rnt_oprt', 0))
+                },
+                'evnt_cst_oprt': {
+                    'brand': current_month_k.get('evnt_cst_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('evnt_cst_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('evnt_cst_oprt', 0), all_brands_current_month_summary.get('evnt_cst_oprt', 0))
+                },
+                'tax_cst_oprt': {
+                    'brand': current_month_k.get('tax_cst_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('tax_cst_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('tax_cst_oprt', 0), all_brands_current_month_summary.get('tax_cst_oprt', 0))
+                },
+                'deprc_cst_oprt': {
+                    'brand': current_month_k.get('deprc_cst_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('deprc_cst_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('deprc_cst_oprt', 0), all_brands_current_month_summary.get('deprc_cst_oprt', 0))
+                },
+                'etc_cst_oprt': {
+                    'brand': current_month_k.get('etc_cst_oprt', 0),
+                    'all_brands': all_brands_current_month_k.get('etc_cst_oprt', 0),
+                    'ratio': calculate_ratio(current_month_summary.get('etc_cst_oprt', 0), all_brands_current_month_summary.get('etc_cst_oprt', 0))
                 }
             }
-        
-        # 법인 전체 대비 비중 계산 (당해 YTD)
-        brand_vs_all_current_ytd = {}
-        if records_all_brands:
-            total_all_current_ytd = sum([
-                all_brands_current_ytd_summary.get('ad_cst_oprt', 0),
-                all_brands_current_ytd_summary.get('slry_csy_oprt', 0),
-                all_brands_current_ytd_summary.get('emp_bnft_cst_oprt', 0),
-                all_brands_current_ytd_summary.get('pmt_cms_oprt', 0),
-                all_brands_current_ytd_summary.get('shop_rnt_oprt', 0),
-                all_brands_current_ytd_summary.get('evnt_cst_oprt', 0),
-                all_brands_current_ytd_summary.get('tax_cst_oprt', 0),
-                all_brands_current_ytd_summary.get('deprc_cst_oprt', 0),
-                all_brands_current_ytd_summary.get('etc_cst_oprt', 0)
-            ])
-            total_brand_current_ytd = sum([
-                current_ytd_summary.get('ad_cst_oprt', 0),
-                current_ytd_summary.get('slry_csy_oprt', 0),
-                current_ytd_summary.get('emp_bnft_cst_oprt', 0),
-                current_ytd_summary.get('pmt_cms_oprt', 0),
-                current_ytd_summary.get('shop_rnt_oprt', 0),
-                current_ytd_summary.get('evnt_cst_oprt', 0),
-                current_ytd_summary.get('tax_cst_oprt', 0),
-                current_ytd_summary.get('deprc_cst_oprt', 0),
-                current_ytd_summary.get('etc_cst_oprt', 0)
-            ])
-            brand_vs_all_current_ytd = {
-                'brand_total': round(total_brand_current_ytd / 1000, 0),
-                'all_brands_total': round(total_all_current_ytd / 1000, 0),
-                'ratio': calculate_ratio(total_brand_current_ytd, total_all_current_ytd)
-            }
-        
-        # 총 영업비 계산
-        total_expense_current_month = sum([
-            current_month_summary['ad_cst_oprt'],
-            current_month_summary['slry_csy_oprt'],
-            current_month_summary['emp_bnft_cst_oprt'],
-            current_month_summary['pmt_cms_oprt'],
-            current_month_summary['shop_rnt_oprt'],
-            current_month_summary['evnt_cst_oprt'],
-            current_month_summary['tax_cst_oprt'],
-            current_month_summary['deprc_cst_oprt'],
-            current_month_summary['etc_cst_oprt']
+        }
+    
+    # 법인 전체 대비 비중 계산 (당해 YTD)
+    brand_vs_all_current_ytd = {}
+    if records_all_brands:
+        total_all_current_ytd = sum([
+            all_brands_current_ytd_summary.get('ad_cst_oprt', 0),
+            all_brands_current_ytd_summary.get('slry_csy_oprt', 0),
+            all_brands_current_ytd_summary.get('emp_bnft_cst_oprt', 0),
+            all_brands_current_ytd_summary.get('pmt_cms_oprt', 0),
+            all_brands_current_ytd_summary.get('shop_rnt_oprt', 0),
+            all_brands_current_ytd_summary.get('evnt_cst_oprt', 0),
+            all_brands_current_ytd_summary.get('tax_cst_oprt', 0),
+            all_brands_current_ytd_summary.get('deprc_cst_oprt', 0),
+            all_brands_current_ytd_summary.get('etc_cst_oprt', 0)
         ])
-        
-        print(f"당해당월({yyyymm}) 영업비: {total_expense_current_month:,.0f}원 ({total_expense_current_month/1000:.0f}k)")
-        
-        # AI 분석 요청
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 재무 분석 전문가야. 영업비 종합분석을 수행해줘.
+        total_brand_current_ytd = sum([
+            current_ytd_summary.get('ad_cst_oprt', 0),
+            current_ytd_summary.get('slry_csy_oprt', 0),
+            current_ytd_summary.get('emp_bnft_cst_oprt', 0),
+            current_ytd_summary.get('pmt_cms_oprt', 0),
+            current_ytd_summary.get('shop_rnt_oprt', 0),
+            current_ytd_summary.get('evnt_cst_oprt', 0),
+            current_ytd_summary.get('tax_cst_oprt', 0),
+            current_ytd_summary.get('deprc_cst_oprt', 0),
+            current_ytd_summary.get('etc_cst_oprt', 0)
+        ])
+        brand_vs_all_current_ytd = {
+            'brand_total': round(total_brand_current_ytd / 1000, 0),
+            'all_brands_total': round(total_all_current_ytd / 1000, 0),
+            'ratio': calculate_ratio(total_brand_current_ytd, total_all_current_ytd)
+        }
+    
+    # 총 영업비 계산
+    total_expense_current_month = sum([
+        current_month_summary['ad_cst_oprt'],
+        current_month_summary['slry_csy_oprt'],
+        current_month_summary['emp_bnft_cst_oprt'],
+        current_month_summary['pmt_cms_oprt'],
+        current_month_summary['shop_rnt_oprt'],
+        current_month_summary['evnt_cst_oprt'],
+        current_month_summary['tax_cst_oprt'],
+        current_month_summary['deprc_cst_oprt'],
+        current_month_summary['etc_cst_oprt']
+    ])
+    
+    print(f"당해당월({yyyymm}) 영업비: {total_expense_current_month:,.0f}원 ({total_expense_current_month/1000:.0f}k)")
+    
+    # AI 분석 요청
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 재무 분석 전문가야. 영업비 종합분석을 수행해줘.
 
 **중요: 아래 데이터는 4가지 분석 유형으로 명확히 구분되어 있습니다. 각 섹션에서 어떤 비교인지 반드시 명시해야 합니다.**
 
@@ -2606,13 +3101,13 @@ def analyze_operating_expense(yyyymm, brd_cd):
 월별 영업비 계정별 추이 (모든 금액은 k 단위):
 {json_dumps_safe(trend_by_month_k, ensure_ascii=False, indent=2)}
 
-**4. 법인 전체 대비 브랜드 비중 분석** ({BRAND_CODE_MAP.get(brd_cd, brd_cd)} vs 법인 전체)
+**4. 법인 전체 대비 브랜드 비중 분석** ({ctx.brand_name} vs 법인 전체)
 법인 전체: MLB + MLB KIDS + DISCOVERY + DUVETICA + SERGIO TACCHINI + SUPRA
 
-당해당월({yyyymm}) 법인 전체 대비 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 비중 (모든 금액은 k 단위):
+당해당월({yyyymm}) 법인 전체 대비 {ctx.brand_name} 브랜드 비중 (모든 금액은 k 단위):
 {json_dumps_safe(brand_vs_all_current_month, ensure_ascii=False, indent=2)}
 
-당해 누적({current_year}01~{yyyymm}) 법인 전체 대비 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 비중 (모든 금액은 k 단위):
+당해 누적({current_year}01~{yyyymm}) 법인 전체 대비 {ctx.brand_name} 브랜드 비중 (모든 금액은 k 단위):
 {json_dumps_safe(brand_vs_all_current_ytd, ensure_ascii=False, indent=2)}
 
 <요구사항>
@@ -2638,8 +3133,8 @@ def analyze_operating_expense(yyyymm, brd_cd):
     }},
     {{
       "div": "종합분석-4",
-      "sub_title": "법인 전체 대비 브랜드 비중 분석 ({BRAND_CODE_MAP.get(brd_cd, brd_cd)} vs 법인 전체)",
-      "ai_text": "{BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드의 영업비가 법인 전체(MLB + MLB KIDS + DISCOVERY + DUVETICA + SERGIO TACCHINI + SUPRA) 대비 차지하는 비중을 분석한 내용. 각 영업비 계정별로 법인 전체 대비 비중과 브랜드의 위치를 명확히 분석해줘."
+      "sub_title": "법인 전체 대비 브랜드 비중 분석 ({ctx.brand_name} vs 법인 전체)",
+      "ai_text": "{ctx.brand_name} 브랜드의 영업비가 법인 전체(MLB + MLB KIDS + DISCOVERY + DUVETICA + SERGIO TACCHINI + SUPRA) 대비 차지하는 비중을 분석한 내용. 각 영업비 계정별로 법인 전체 대비 비중과 브랜드의 위치를 명확히 분석해줘."
     }},
     {{
       "div": "종합분석-5",
@@ -2650,276 +3145,189 @@ def analyze_operating_expense(yyyymm, brd_cd):
 }}
 
 <작성 가이드라인>
-- 각 섹션의 ai_text는 구체적이고 실용적인 내용으로 작성
-- 숫자는 천 단위(k)로 표시하고 절대 변형하지 말 것
 - **중요: 각 섹션에서 어떤 비교인지 반드시 명시해야 함**
   - "전년/당해 동월 비교" 섹션: "{yyyymm_py} VS {yyyymm}" 비교임을 명시 (전년 동월 → 당해 동월)
   - "누적 YTD 비교" 섹션: "전년 누적({previous_year}01~{yyyymm_py}) VS 당해 누적({current_year}01~{yyyymm})" 비교임을 명시
   - "1년 추세 분석" 섹션: "{previous_year}년 1월 ~ {current_year}년 {current_month}월({previous_year}01~{yyyymm})" 기간의 월별 추이임을 명시
-  - "법인 전체 대비 브랜드 비중 분석" 섹션: "{BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드의 영업비가 법인 전체(MLB + MLB KIDS + DISCOVERY + DUVETICA + SERGIO TACCHINI + SUPRA) 대비 차지하는 비중" 분석임을 명시
-- 영업비 계정별(광고비, 인건비, 복리후생비, 지급수수료, 임차료, 수주회, 세금과공과, 감가상각비, 기타) 분석
-- 각 비교에서 변화율(%)을 계산하여 제시
-- 단기 전략 방향과 중장기 전략 방향을 구체적으로 시사
-- 불릿 포인트는 마크다운 형식(-, •) 사용 가능
-- 줄바꿈은 반드시 \\n을 사용하여 표시 (예: "첫 번째 줄\\n두 번째 줄")
-- ai_text 내에서 여러 문단이나 항목을 나눌 때는 \\n\\n을 사용
-- 불릿 포인트나 리스트 항목 사이에는 \\n을 사용
-- 반드시 유효한 JSON 형식으로만 응답 (마크다운 코드 블록 없이)
+  - "법인 전체 대비 브랜드 비중 분석" 섹션: "{ctx.brand_name} 브랜드의 영업비가 법인 전체(MLB + MLB KIDS + DISCOVERY + DUVETICA + SERGIO TACCHINI + SUPRA) 대비 차지하는 비중" 분석임을 명시
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "영업비 종합분석",
-                "sections": [
-                    {"sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # JSON 데이터 구성
-        total_expense_current_month_k = round(total_expense_current_month / 1000, 0)
-        total_expense_previous_month = sum([
-            previous_month_summary['ad_cst_oprt'],
-            previous_month_summary['slry_csy_oprt'],
-            previous_month_summary['emp_bnft_cst_oprt'],
-            previous_month_summary['pmt_cms_oprt'],
-            previous_month_summary['shop_rnt_oprt'],
-            previous_month_summary['evnt_cst_oprt'],
-            previous_month_summary['tax_cst_oprt'],
-            previous_month_summary['deprc_cst_oprt'],
-            previous_month_summary['etc_cst_oprt']
-        ])
-        total_expense_previous_month_k = round(total_expense_previous_month / 1000, 0)
-        
-        total_expense_current_ytd = sum([
-            current_ytd_summary['ad_cst_oprt'],
-            current_ytd_summary['slry_csy_oprt'],
-            current_ytd_summary['emp_bnft_cst_oprt'],
-            current_ytd_summary['pmt_cms_oprt'],
-            current_ytd_summary['shop_rnt_oprt'],
-            current_ytd_summary['evnt_cst_oprt'],
-            current_ytd_summary['tax_cst_oprt'],
-            current_ytd_summary['deprc_cst_oprt'],
-            current_ytd_summary['etc_cst_oprt']
-        ])
-        total_expense_current_ytd_k = round(total_expense_current_ytd / 1000, 0)
-        
-        total_expense_previous_ytd = sum([
-            previous_ytd_summary['ad_cst_oprt'],
-            previous_ytd_summary['slry_csy_oprt'],
-            previous_ytd_summary['emp_bnft_cst_oprt'],
-            previous_ytd_summary['pmt_cms_oprt'],
-            previous_ytd_summary['shop_rnt_oprt'],
-            previous_ytd_summary['evnt_cst_oprt'],
-            previous_ytd_summary['tax_cst_oprt'],
-            previous_ytd_summary['deprc_cst_oprt'],
-            previous_ytd_summary['etc_cst_oprt']
-        ])
-        total_expense_previous_ytd_k = round(total_expense_previous_ytd / 1000, 0)
-        
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'key': '영업비',
-            'sub_key': '종합분석',
-            'analysis_data': analysis_data,
-            'summary': {
-                'current_month_expense': total_expense_current_month_k,
-                'previous_month_expense': total_expense_previous_month_k,
-                'current_ytd_expense': total_expense_current_ytd_k,
-                'previous_ytd_expense': total_expense_previous_ytd_k,
-                'total_records': len(records),
-                'analysis_period_month': f"{previous_year}년 {current_month}월 VS {current_year}년 {current_month}월",
-                'analysis_period_ytd': f"{previous_year}년 1월~{previous_year}년 {current_month}월 VS {current_year}년 1월~{current_year}년 {current_month}월",
-                'trend_period': f"{previous_year}년 1월 ~ {current_year}년 {current_month}월 ({previous_year}01~{yyyymm})"
-            },
-            'month_comparison': {
-                'previous_month': previous_month_k,
-                'current_month': current_month_k
-            },
-            'ytd_comparison': {
-                'previous_ytd': previous_ytd_k,
-                'current_ytd': current_ytd_k
-            },
-            'trend_by_month': trend_by_month_k,
-            'brand_vs_all_brands': {
-                'current_month': brand_vs_all_current_month if records_all_brands else {},
-                'current_ytd': brand_vs_all_current_ytd if records_all_brands else {}
-            },
-            'all_brands_summary': {
-                'current_month': all_brands_current_month_k if records_all_brands else {},
-                'previous_month': all_brands_previous_month_k if records_all_brands else {},
-                'current_ytd': all_brands_current_ytd_k if records_all_brands else {},
-                'previous_ytd': all_brands_previous_ytd_k if records_all_brands else {}
-            },
-            'raw_data': {
-                'sample_records': [dict(r) for r in records[:50]],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('operating_expense', brd_cd, yyyymm, df, df_all_brands),
+        prompt_prefix=PROMPT_PREFIX_OPERATING_EXPENSE,
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data = parse_analysis_response(analysis_response, "영업비 종합분석")
+    
+    # JSON 데이터 구성
+    total_expense_current_month_k = round(total_expense_current_month / 1000, 0)
+    total_expense_previous_month = sum([
+        previous_month_summary['ad_cst_oprt'],
+        previous_month_summary['slry_csy_oprt'],
+        previous_month_summary['emp_bnft_cst_oprt'],
+        previous_month_summary['pmt_cms_oprt'],
+        previous_month_summary['shop_rnt_oprt'],
+        previous_month_summary['evnt_cst_oprt'],
+        previous_month_summary['tax_cst_oprt'],
+        previous_month_summary['deprc_cst_oprt'],
+        previous_month_summary['etc_cst_oprt']
+    ])
+    total_expense_previous_month_k = round(total_expense_previous_month / 1000, 0)
+    
+    total_expense_current_ytd = sum([
+        current_ytd_summary['ad_cst_oprt'],
+        current_ytd_summary['slry_csy_oprt'],
+        current_ytd_summary['emp_bnft_cst_oprt'],
+        current_ytd_summary['pmt_cms_oprt'],
+        current_ytd_summary['shop_rnt_oprt'],
+        current_ytd_summary['evnt_cst_oprt'],
+        current_ytd_summary['tax_cst_oprt'],
+        current_ytd_summary['deprc_cst_oprt'],
+        current_ytd_summary['etc_cst_oprt']
+    ])
+    total_expense_current_ytd_k = round(total_expense_current_ytd / 1000, 0)
+    
+    total_expense_previous_ytd = sum([
+        previous_ytd_summary['ad_cst_oprt'],
+        previous_ytd_summary['slry_csy_oprt'],
+        previous_ytd_summary['emp_bnft_cst_oprt'],
+        previous_ytd_summary['pmt_cms_oprt'],
+        previous_ytd_summary['shop_rnt_oprt'],
+        previous_ytd_summary['evnt_cst_oprt'],
+        previous_ytd_summary['tax_cst_oprt'],
+        previous_ytd_summary['deprc_cst_oprt'],
+        previous_ytd_summary['etc_cst_oprt']
+    ])
+    total_expense_previous_ytd_k = round(total_expense_previous_ytd / 1000, 0)
+    
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'key': '영업비',
+        'sub_key': '종합분석',
+        'analysis_data': analysis_data,
+        'summary': {
+            'current_month_expense': total_expense_current_month_k,
+            'previous_month_expense': total_expense_previous_month_k,
+            'current_ytd_expense': total_expense_current_ytd_k,
+            'previous_ytd_expense': total_expense_previous_ytd_k,
+            'total_records': len(records),
+            'analysis_period_month': f"{previous_year}년 {current_month}월 VS {current_year}년 {current_month}월",
+            'analysis_period_ytd': f"{previous_year}년 1월~{previous_year}년 {current_month}월 VS {current_year}년 1월~{current_year}년 {current_month}월",
+            'trend_period': f"{previous_year}년 1월 ~ {current_year}년 {current_month}월 ({previous_year}01~{yyyymm})"
+        },
+        'month_comparison': {
+            'previous_month': previous_month_k,
+            'current_month': current_month_k
+        },
+        'ytd_comparison': {
+            'previous_ytd': previous_ytd_k,
+            'current_ytd': current_ytd_k
+        },
+        'trend_by_month': trend_by_month_k,
+        'brand_vs_all_brands': {
+            'current_month': brand_vs_all_current_month if records_all_brands else {},
+            'current_ytd': brand_vs_all_current_ytd if records_all_brands else {}
+        },
+        'all_brands_summary': {
+            'current_month': all_brands_current_month_k if records_all_brands else {},
+            'previous_month': all_brands_previous_month_k if records_all_brands else {},
+            'current_ytd': all_brands_current_ytd_k if records_all_brands else {},
+            'previous_ytd': all_brands_previous_ytd_k if records_all_brands else {}
+        },
+        'raw_data': {
+            'sample_records': records[:50],
+            'total_records_count': len(records)
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"CN_{yyyymm_short}_{brd_cd}_영업비_종합분석"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장
-        markdown_content = f"# {analysis_data.get('title', '영업비 종합분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 영업비 종합분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"CN_{yyyymm_short}_{brd_cd}_영업비_종합분석"
+    save_analysis_outputs(json_data, filename, '영업비 종합분석')
+    
+    print(f"[OK] 영업비 종합분석 완료!\n")
+    return json_data
 
-def analyze_monthly_channel_sales_trend(yyyymm, brd_cd):
+def analyze_monthly_channel_sales_trend(yyyymm, brd_cd, force_refresh=False):
     """월별 채널별 매출 추세 분석"""
+    ctx = _period_ctx(yyyymm, brd_cd)
     print(f"\n{'='*60}")
-    print(f"월별 채널별 매출 추세 분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"월별 채널별 매출 추세 분석 시작: {ctx.label}")
     print(f"{'='*60}")
     
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해 1월부터 지정한 연월까지)
-        # 함수 파라미터 yyyymm은 분석 종료점으로 사용
-        analysis_year = int(yyyymm[:4])
-        analysis_month = int(yyyymm[4:6])
-        
-        previous_year = analysis_year - 1
-        yyyymm_py = f"{previous_year:04d}{analysis_month:02d}"
-        
-        yyyymm_start = f"{analysis_year}01"  # 분석 시작년도 1월
-        yyyymm_end = yyyymm  # 함수 파라미터로 지정한 연월
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = f"""
---V2-레첼
-WITH
--- SHOP : BOS 매핑용 매장
--- SAP 매장코드가 기준인 SAP_FNF.MST_SHOP에는 ERP 기준인 SHOP_CD 중복이 있을 수 있어 1건만 처리하는 로직 추가
-SHOP AS (SELECT *
-         FROM SAP_FNF.MST_SHOP
-         QUALIFY
-             ROW_NUMBER() OVER ( PARTITION BY BRD_CD, CNTRY_CD, SHOP_CD, AGNT_CD, MAP_SHOP_AGNT_CD ORDER BY SAP_SHOP_CD ) =
-             1)
--- 최종조회쿼리
-SELECT A.YYMM          AS YYYYMM
-     , A.BRD_CD        AS BRD_CD
-     , C.MGMT_CHNL_CD  as CHNL_CD
-     , C.MGMT_CHNL_NM  AS CHNL_NM
-     , SUM(A.SALE_AMT) AS SALE_AMT
-FROM CHN.DM_SH_S_M A
-         LEFT JOIN SAP_FNF.MST_PRDT B
-                   ON A.PRDT_CD = B.PRDT_CD
-         LEFT JOIN SHOP C
-                   ON A.MAP_SHOP_AGNT_CD = C.MAP_SHOP_AGNT_CD
-WHERE A.YYMM BETWEEN '{yyyymm_start}' AND '{yyyymm_end}'
-  AND A.BRD_CD = '{brd_cd}'
-GROUP BY A.YYMM
-       , A.BRD_CD
-       , c.MGMT_CHNL_CD
-       , c.MGMT_CHNL_NM
-ORDER BY A.YYMM DESC, CHNL_CD, SALE_AMT DESC
-        """
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('SALE_AMT', 0) or 0) for r in records)
-        unique_channels = len(set(r.get('CHNL_NM', '') for r in records if r.get('CHNL_NM')))
-        unique_months = len(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000:.0f}k)")
-        print(f"채널 수: {unique_channels}개")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 데이터 가공: 월별/채널별 집계
-        monthly_data = {}
-        channel_data = {}
-        
-        for r in records:
-            yyyymm_val = r.get('YYYYMM', '')
-            chnl_nm = r.get('CHNL_NM', '기타')
-            chnl_cd = r.get('CHNL_CD', '')
-            sale_amt = float(r.get('SALE_AMT', 0) or 0)
-            
-            # 월별 데이터 집계
-            if yyyymm_val not in monthly_data:
-                monthly_data[yyyymm_val] = {
-                    'total': 0,
-                    'channels': {}
-                }
-            monthly_data[yyyymm_val]['total'] += sale_amt
-            
-            if chnl_nm not in monthly_data[yyyymm_val]['channels']:
-                monthly_data[yyyymm_val]['channels'][chnl_nm] = 0
-            monthly_data[yyyymm_val]['channels'][chnl_nm] += sale_amt
-            
-            # 채널별 데이터 집계
-            if chnl_nm not in channel_data:
-                channel_data[chnl_nm] = {
-                    'chnl_cd': chnl_cd,
-                    'total': 0,
-                    'months': {}
-                }
-            channel_data[chnl_nm]['total'] += sale_amt
-            
-            if yyyymm_val not in channel_data[chnl_nm]['months']:
-                channel_data[chnl_nm]['months'][yyyymm_val] = 0
-            channel_data[chnl_nm]['months'][yyyymm_val] += sale_amt
-        
-        # 월별 총 매출 (k 단위)
-        monthly_totals_k = {k: round(v['total'] / 1000, 0) for k, v in sorted(monthly_data.items())}
-        
-        # 채널별 총 매출 및 월별 추이 (k 단위)
-        channel_summary = {}
-        for chnl_nm, data in channel_data.items():
-            channel_summary[chnl_nm] = {
-                'chnl_cd': data['chnl_cd'],
-                'total': round(data['total'] / 1000, 0),
-                'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}
+    # 분석 기간 계산 (당해 1월부터 지정한 연월까지)
+    # 함수 파라미터 yyyymm은 분석 종료점으로 사용
+    analysis_year, analysis_month = ctx.current_year, ctx.current_month
+    yyyymm_py = ctx.yyyymm_py
+    
+    yyyymm_start = f"{analysis_year}01"  # 분석 시작년도 1월
+    yyyymm_end = yyyymm  # 함수 파라미터로 지정한 연월
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
+    
+    # SQL 쿼리 실행
+    sql = _MONTHLY_CHANNEL_SALES_TREND_SQL
+    df = run_query(sql, engine, {'yyyymm_start': yyyymm_start, 'yyyymm_end': yyyymm_end, 'brd_cd': brd_cd})
+    if df.is_empty():
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = df['SALE_AMT'].fill_null(0).sum()
+    unique_channels, unique_months = _count_unique_non_blank(df, 'CHNL_NM', 'YYYYMM')
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000:.0f}k)")
+    print(f"채널 수: {unique_channels}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 데이터 가공: 채널별 집계
+    channel_data = {}
+    
+    for r in df.iter_rows(named=True):
+        yyyymm_val = r.get('YYYYMM', '')
+        chnl_nm = r.get('CHNL_NM', '기타')
+        chnl_cd = r.get('CHNL_CD', '')
+        sale_amt = float(r.get('SALE_AMT', 0) or 0)
+        
+        # 채널별 데이터 집계
+        if chnl_nm not in channel_data:
+            channel_data[chnl_nm] = {
+                'chnl_cd': chnl_cd,
+                'total': 0,
+                'months': defaultdict(float)
             }
-        
-        # 채널별 정렬 (총 매출 기준 내림차순)
-        channel_summary_sorted = dict(sorted(channel_summary.items(), key=lambda x: x[1]['total'], reverse=True))
-        
-        # LLM 분석 프롬프트 생성
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 채널 전략 전문가야. 월별 채널별 매출 추세 분석을 수행해줘.
+        channel_data[chnl_nm]['total'] += sale_amt
+        channel_data[chnl_nm]['months'][yyyymm_val] += sale_amt
+    
+    # 월별 총 매출 (k 단위)
+    monthly_totals_k = _monthly_totals_k(df, 'SALE_AMT')
+    
+    # 채널별 총 매출 및 월별 추이 (k 단위)
+    channel_summary = {}
+    for chnl_nm, data in channel_data.items():
+        channel_summary[chnl_nm] = {
+            'chnl_cd': data['chnl_cd'],
+            'total': round(data['total'] / 1000, 0),
+            'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}
+        }
+    
+    # 채널별 정렬 (총 매출 기준 내림차순)
+    channel_summary_sorted = dict(sorted(channel_summary.items(), key=lambda x: x[1]['total'], reverse=True))
+    
+    # LLM 분석 프롬프트 생성
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 채널 전략 전문가야. 월별 채널별 매출 추세 분석을 수행해줘.
 
 **분석 기간**: {analysis_year}년 1월 ~ {analysis_year}년 {analysis_month}월 ({yyyymm_start}~{yyyymm_end})
 
@@ -2972,276 +3380,136 @@ ORDER BY A.YYMM DESC, CHNL_CD, SALE_AMT DESC
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "월별 채널별 매출 추세 분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "월별 주요 인사이트", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "채널 트렌드", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "전략 포인트", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 구성
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,  # 당해 당월 (현재 날짜 기준)
-            'yyyymm_py': yyyymm_py,
-            'key': '월별채널별매출추세',
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000, 0),
-                'unique_channels': unique_channels,
-                'unique_months': unique_months,
-                'analysis_period': f"{analysis_year}년 01월 ~ {analysis_year}년 {analysis_month:02d}월"
-            },
-            'monthly_totals': monthly_totals_k,
-            'channel_summary': channel_summary_sorted,
-            'raw_data': {
-                'sample_records': [dict(r) for r in records[:50]],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('monthly_channel_sales_trend', brd_cd, yyyymm_end, df),
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data = parse_analysis_response(analysis_response, "월별 채널별 매출 추세 분석", [
+        ("종합분석-1", "월별 주요 인사이트"),
+        ("종합분석-2", "채널 트렌드"),
+        ("종합분석-3", "전략 포인트"),
+    ])
+    
+    # JSON 데이터 구성
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm_end,  # 당해 당월 (현재 날짜 기준)
+        'yyyymm_py': yyyymm_py,
+        'key': '월별채널별매출추세',
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000, 0),
+            'unique_channels': unique_channels,
+            'unique_months': unique_months,
+            'analysis_period': f"{analysis_year}년 01월 ~ {analysis_year}년 {analysis_month:02d}월"
+        },
+        'monthly_totals': monthly_totals_k,
+        'channel_summary': channel_summary_sorted,
+        'raw_data': {
+            'sample_records': df.head(50).to_dicts(),
+            'total_records_count': len(df)
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"CN_{yyyymm_short}_{brd_cd}_월별채널별매출추세분석"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장
-        markdown_content = f"# {json_data['analysis_data'].get('title', '월별 채널별 매출 추세 분석')}\n\n"
-        for section in json_data['analysis_data'].get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 월별 채널별 매출 추세 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"CN_{yyyymm_short}_{brd_cd}_월별채널별매출추세분석"
+    save_analysis_outputs(json_data, filename, '월별 채널별 매출 추세 분석')
+    
+    print(f"[OK] 월별 채널별 매출 추세 분석 완료!\n")
+    return json_data
 
-def analyze_monthly_item_sales_trend(yyyymm, brd_cd):
+def analyze_monthly_item_sales_trend(yyyymm, brd_cd, force_refresh=False):
     """월별 아이템별 매출 추세 분석"""
+    ctx = _period_ctx(yyyymm, brd_cd)
     print(f"\n{'='*60}")
-    print(f"월별 아이템별 매출 추세 분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"월별 아이템별 매출 추세 분석 시작: {ctx.label}")
     print(f"{'='*60}")
     
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해 1월부터 11월까지)
-        # 함수 파라미터 yyyymm은 분석 시작점으로만 사용
-        analysis_year = int(yyyymm[:4])
-        analysis_month = int(yyyymm[4:6])
-        
-        # 실제 당해 당월 계산 (현재 날짜 기준)
-        now = datetime.now()
-        current_year = now.year
-        current_month = now.month
-        current_yyyymm = f"{current_year:04d}{current_month:02d}"
-        
-        previous_year = current_year - 1
-        yyyymm_py = f"{analysis_year:04d}{analysis_month:02d}"
-        
-        yyyymm_start = f"{analysis_year}01"  # 분석 시작년도 1월
-        yyyymm_end = f"{analysis_year}{analysis_month}"  # 당해 11월까지
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = f"""
-WITH
-    -- PARAM :
-    PARAM AS ( SELECT 'CY' AS DIV, '{yyyymm_start}' AS STD_START_YYYYMM, '{yyyymm_end}' AS STD_END_YYYYMM -- start, end 기준년월 지정 필요
-               -- UNION ALL
-               -- SELECT 'PY' AS DIV, '202401' AS STD_START_YYYYMM, '202411' AS STD_END_YYYYMM
-               )
-    -- CY_ITEM : 딩헤 아이템 구분 기준
-  , CY_ITEM AS ( SELECT A.PRDT_CD
-                      , A.SESN
-                      , A.PRDT_HRRC1_NM
-                      , A.PRDT_HRRC2_NM
-                      , A.PRDT_HRRC3_NM
-                      , CASE
-    --------------------------------------------------
-    -- ACC 분류
-    --------------------------------------------------
-    -- 주의사항 : PRDT_HRRC2_NM => 첫번째 문자만 대문자고 나머지는 소문자 ..
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'HEADWEAR'
-            THEN '모자'
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'SHOES'
-            THEN '신발'
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'BAG'
-            THEN '가방'
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'ACC_ETC'
-            THEN '기타'
-        --------------------------------------------------
-        -- 의류 분류
-        --------------------------------------------------
-        -- 당시즌 (SN 통합)
-        WHEN A.PRDT_HRRC1_NM = '의류' AND PARAM.STD_END_YYYYMM BETWEEN B.START_YYYYMM AND B.END_YYYYMM
-            THEN REPLACE(A.SESN, 'N', 'S') || ' ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 전시즌 (조회기준 월이 9~2일때만 존재)
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
-             TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
-                     'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM
-            THEN A.SESN || ' ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 차기시즌
-        WHEN A.PRDT_HRRC1_NM = '의류' AND B.START_YYYYMM > PARAM.STD_END_YYYYMM
-            THEN '차기시즌 ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 전년 SF 시즌
-        --------------------------------------------------
-        -- 조회기준 월이 3~8월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
-             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
-              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
-            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 조회기준 월이 9~2월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
-             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
-              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
-            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 과시즌
-        --------------------------------------------------
-        -- 조회기준 월이 3~8월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
-             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12), 'YYYYMM')
-            THEN '과시즌 ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 조회기준 월이 9~2월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
-             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18), 'YYYYMM')
-            THEN '과시즌 ' || A.PRDT_HRRC1_NM
-        ELSE '미지정'
-                        END AS ITEM_STD
-                 FROM SAP_FNF.MST_PRDT A
-                     LEFT JOIN COMM.MST_SESN B
-                             ON A.SESN = B.SESN
-                     JOIN PARAM
-                             ON PARAM.DIV = 'CY'
-                 WHERE 1 = 1
-                   AND A.SESN <> 'X' -- 저장품 제외
-                 )
--- 최종조회쿼리
-SELECT A.YYMM AS YYYYMM, A.BRD_CD AS BRD_CD, NVL(B.ITEM_STD, 'TBA') AS ITEM_STD, SUM(A.SALE_AMT) AS SALE_AMT
-FROM CHN.DM_SH_S_M A
-    join param
-        on PAram.div = 'CY'
-        and a.YYMM between param.STD_START_YYYYMM and param.STD_END_YYYYMM
-    LEFT JOIN CY_ITEM B
-            ON A.PRDT_CD = B.PRDT_CD
-WHERE A.BRD_CD = '{brd_cd}' -- 브랜드조건 필터링 필요
-GROUP BY A.YYMM
-       , A.BRD_CD
-       , B.ITEM_STD
-having sum(a.sale_amt)<> 0
-order by a.yymm
-        """
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('SALE_AMT', 0) or 0) for r in records)
-        unique_months = len(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))
-        unique_items = len(set(r.get('ITEM_STD', '') for r in records if r.get('ITEM_STD')))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000:.0f}k)")
-        print(f"분석 월 수: {unique_months}개월")
-        print(f"아이템 구분 수: {unique_items}개")
-        
-        # 데이터 가공: 시즌별/카테고리별로 분류
-        item_data = {}
-        for r in records:
-            item_std = r.get('ITEM_STD', '미지정')
-            yyyymm = r.get('YYYYMM', '')
-            sale_amt = float(r.get('SALE_AMT', 0) or 0)
-            
-            if item_std not in item_data:
-                item_data[item_std] = {
-                    'total_sales': 0,
-                    'months': {}
-                }
-            
-            item_data[item_std]['total_sales'] += sale_amt
-            if yyyymm not in item_data[item_std]['months']:
-                item_data[item_std]['months'][yyyymm] = 0
-            item_data[item_std]['months'][yyyymm] += sale_amt
-        
-        # 시즌별 아이템 분류 (의류)
-        season_items = []
-        # 카테고리별 아이템 분류 (ACC)
-        category_items = []
-        
-        for item_std, data in item_data.items():
-            if '의류' in item_std:
-                # 시즌별 의류 분류
-                season_items.append({
-                    'name': item_std,
-                    'total_sales': round(data['total_sales'] / 1000, 0),  # k 단위
-                    'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}  # k 단위
-                })
-            elif item_std in ['모자', '신발', '가방', '기타']:
-                # 카테고리별 ACC 분류
-                category_items.append({
-                    'name': item_std,
-                    'total_sales': round(data['total_sales'] / 1000, 0),  # k 단위
-                    'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}  # k 단위
-                })
-        
-        # 시즌별/카테고리별 정렬 (매출액 기준 내림차순)
-        season_items.sort(key=lambda x: x['total_sales'], reverse=True)
-        category_items.sort(key=lambda x: x['total_sales'], reverse=True)
-        
-        # 월별 총 매출 계산
-        monthly_totals = {}
-        for r in records:
-            yyyymm = r.get('YYYYMM', '')
-            sale_amt = float(r.get('SALE_AMT', 0) or 0)
-            if yyyymm not in monthly_totals:
-                monthly_totals[yyyymm] = 0
-            monthly_totals[yyyymm] += sale_amt
-        
-        monthly_totals_k = {k: round(v / 1000, 0) for k, v in sorted(monthly_totals.items())}
-        
-        # LLM 분석 프롬프트 생성
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 상품 기획 전문가야. 월별 아이템별 매출 추세 분석을 수행해줘.
+    # 분석 기간 계산 (당해 1월부터 11월까지)
+    # 함수 파라미터 yyyymm은 분석 시작점으로만 사용
+    analysis_year = int(yyyymm[:4])
+    analysis_month = int(yyyymm[4:6])
+    
+    # 실제 당해 당월 계산 (현재 날짜 기준)
+    now = datetime.now()
+    current_year = now.year
+    current_month = now.month
+    current_yyyymm = f"{current_year:04d}{current_month:02d}"
+    
+    previous_year = current_year - 1
+    yyyymm_py = f"{analysis_year:04d}{analysis_month:02d}"
+    
+    yyyymm_start = f"{analysis_year}01"  # 분석 시작년도 1월
+    yyyymm_end = f"{analysis_year}{analysis_month}"  # 당해 11월까지
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
+    
+    # SQL 쿼리 실행
+    sql = _MONTHLY_ITEM_SALES_TREND_SQL
+    df = run_query(sql, engine, {'yyyymm_start': yyyymm_start, 'yyyymm_end': yyyymm_end, 'brd_cd': brd_cd})
+    if df.is_empty():
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = df['SALE_AMT'].fill_null(0).sum()
+    unique_months, unique_items = _count_unique_non_blank(df, 'YYYYMM', 'ITEM_STD')
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000:.0f}k)")
+    print(f"분석 월 수: {unique_months}개월")
+    print(f"아이템 구분 수: {unique_items}개")
+    
+    # 데이터 가공: 시즌별/카테고리별로 분류
+    item_data = defaultdict(lambda: {'total_sales': 0, 'months': defaultdict(float)})
+    for r in df.iter_rows(named=True):
+        item_std = r.get('ITEM_STD', '미지정')
+        month = r.get('YYYYMM', '')
+        sale_amt = float(r.get('SALE_AMT', 0) or 0)
+        
+        item = item_data[item_std]
+        item['total_sales'] += sale_amt
+        item['months'][month] += sale_amt
+    
+    # 시즌별 아이템 분류 (의류)
+    season_items = []
+    # 카테고리별 아이템 분류 (ACC)
+    category_items = []
+    
+    for item_std, data in item_data.items():
+        if '의류' in item_std:
+            # 시즌별 의류 분류
+            season_items.append({
+                'name': item_std,
+                'total_sales': round(data['total_sales'] / 1000, 0),  # k 단위
+                'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}  # k 단위
+            })
+        elif item_std in ['모자', '신발', '가방', '기타']:
+            # 카테고리별 ACC 분류
+            category_items.append({
+                'name': item_std,
+                'total_sales': round(data['total_sales'] / 1000, 0),  # k 단위
+                'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}  # k 단위
+            })
+    
+    # 시즌별/카테고리별 정렬 (매출액 기준 내림차순)
+    season_items.sort(key=lambda x: x['total_sales'], reverse=True)
+    category_items.sort(key=lambda x: x['total_sales'], reverse=True)
+    
+    # 월별 총 매출 (k 단위)
+    monthly_totals_k = _monthly_totals_k(df, 'SALE_AMT')
+    
+    # LLM 분석 프롬프트 생성
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 상품 기획 전문가야. 월별 아이템별 매출 추세 분석을 수행해줘.
 
 **분석 기간**: {current_year}년 1월 ~ {current_year}년 {current_month}월 ({yyyymm_start}~{yyyymm_end})
 
@@ -3292,316 +3560,152 @@ order by a.yymm
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "월별 아이템별 매출 추세 분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "시즌 트렌드", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "카테고리", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "핵심 액션", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 구성
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,  # 당해 당월 (현재 날짜 기준)
-            'yyyymm_py': yyyymm_py,
-            'key': '월별아이템별매출추세',
-            'analysis_data': {
-                'title': analysis_data.get('title', '아이템별 매출 종합분석 (당해 1월~현재월)'),
-                'sections': analysis_data.get('sections', [])
-            },
-            'summary': {
-                'total_sales': round(total_sales / 1000, 0),
-                'unique_months': unique_months,
-                'unique_items': unique_items,
-                'analysis_period': f"{current_year}년 01월 ~ {current_year}년 {current_month:02d}월"
-            },
-            'monthly_totals': monthly_totals_k,
-            'season_items': season_items,
-            'category_items': category_items,
-            'raw_data': {
-                'sample_records': [dict(r) for r in records[:50]],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('monthly_item_sales_trend', brd_cd, yyyymm_end, df),
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data = parse_analysis_response(analysis_response, "월별 아이템별 매출 추세 분석", [
+        ("종합분석-1", "시즌 트렌드"),
+        ("종합분석-2", "카테고리"),
+        ("종합분석-3", "핵심 액션"),
+    ])
+    
+    # JSON 데이터 구성
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm_end,  # 당해 당월 (현재 날짜 기준)
+        'yyyymm_py': yyyymm_py,
+        'key': '월별아이템별매출추세',
+        'analysis_data': {
+            'title': analysis_data.get('title', '아이템별 매출 종합분석 (당해 1월~현재월)'),
+            'sections': analysis_data.get('sections', [])
+        },
+        'summary': {
+            'total_sales': round(total_sales / 1000, 0),
+            'unique_months': unique_months,
+            'unique_items': unique_items,
+            'analysis_period': f"{current_year}년 01월 ~ {current_year}년 {current_month:02d}월"
+        },
+        'monthly_totals': monthly_totals_k,
+        'season_items': season_items,
+        'category_items': category_items,
+        'raw_data': {
+            'sample_records': df.head(50).to_dicts(),
+            'total_records_count': len(df)
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"CN_{yyyymm_short}_{brd_cd}_월별아이템별매출추세"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장
-        markdown_content = f"# {json_data['analysis_data'].get('title', '월별 아이템별 매출 추세 분석')}\n\n"
-        for section in json_data['analysis_data'].get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 월별 아이템별 매출 추세 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"CN_{yyyymm_short}_{brd_cd}_월별아이템별매출추세"
+    save_analysis_outputs(json_data, filename, '월별 아이템별 매출 추세 분석')
+    
+    print(f"[OK] 월별 아이템별 매출 추세 분석 완료!\n")
+    return json_data
 
-def analyze_monthly_item_stock_trend(yyyymm, brd_cd):
+def analyze_monthly_item_stock_trend(yyyymm, brd_cd, force_refresh=False):
     """월별 아이템별 재고 추세 분석"""
+    ctx = _period_ctx(yyyymm, brd_cd)
     print(f"\n{'='*60}")
-    print(f"월별 아이템별 재고 추세 분석 시작: {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"월별 아이템별 재고 추세 분석 시작: {ctx.label}")
     print(f"{'='*60}")
     
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해 1월부터 현재월까지)
-        # 함수 파라미터 yyyymm은 분석 시작점으로만 사용
-        analysis_year = int(yyyymm[:4])
-        analysis_month = int(yyyymm[4:6])
-        
-        # 실제 당해 당월 계산 (현재 날짜 기준)
-        now = datetime.now()
-        current_year = now.year
-        current_month = now.month
-        current_yyyymm = f"{analysis_year:04d}{current_month:02d}"
-        
-        previous_year = analysis_year - 1
-        yyyymm_py = f"{previous_year:04d}{analysis_month:02d}"
-        
-        yyyymm_start = f"{analysis_year}01"  # 분석 시작년도 1월
-        yyyymm_end = yyyymm  # 실제 당해 당월
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = f"""
-WITH
-    -- PARAM :
-    PARAM AS ( SELECT 'CY' AS DIV, '{yyyymm_start}' AS STD_START_YYYYMM, '{yyyymm_end}' AS STD_END_YYYYMM -- start, end 기준년월 지정 필요
-               -- UNION ALL
-               -- SELECT 'PY' AS DIV, '202401' AS STD_START_YYYYMM, '202411' AS STD_END_YYYYMM
-               )
-    -- CY_ITEM : 당해 아이템 구분 기준
-  , CY_ITEM AS ( SELECT A.PRDT_CD
-                      , A.SESN
-                      , A.PRDT_HRRC1_NM
-                      , A.PRDT_HRRC2_NM
-                      , A.PRDT_HRRC3_NM
-                      , CASE
-    --------------------------------------------------
-    -- ACC 분류
-    --------------------------------------------------
-    -- 주의사항 : PRDT_HRRC2_NM => 첫번째 문자만 대문자고 나머지는 소문자 ..
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'HEADWEAR'
-            THEN '모자'
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'SHOES'
-            THEN '신발'
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'BAG'
-            THEN '가방'
-        WHEN A.PRDT_HRRC1_NM = 'ACC' AND UPPER(A.PRDT_HRRC2_NM) = 'ACC_ETC'
-            THEN '기타'
-        --------------------------------------------------
-        -- 의류 분류
-        --------------------------------------------------
-        -- 당시즌 (SN 통합)
-        WHEN A.PRDT_HRRC1_NM = '의류' AND PARAM.STD_END_YYYYMM BETWEEN B.START_YYYYMM AND B.END_YYYYMM
-            THEN REPLACE(A.SESN, 'N', 'S') || ' ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 전시즌 (조회기준 월이 9~2일때만 존재)
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
-             TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
-                     'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM
-            THEN A.SESN || ' ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 차기시즌
-        WHEN A.PRDT_HRRC1_NM = '의류' AND B.START_YYYYMM > PARAM.STD_END_YYYYMM
-            THEN '차기시즌 ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 전년 SF 시즌
-        --------------------------------------------------
-        -- 조회기준 월이 3~8월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
-             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -6),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
-              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
-            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 조회기준 월이 9~2월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
-             (TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM OR
-              TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18),
-                      'YYYYMM') BETWEEN B.START_YYYYMM AND B.END_YYYYMM)
-            THEN LEFT(A.SESN, 2) || 'SF ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 과시즌
-        --------------------------------------------------
-        -- 조회기준 월이 3~8월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 3, 4, 5, 6, 7, 8 ) AND
-             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -12), 'YYYYMM')
-            THEN '과시즌 ' || A.PRDT_HRRC1_NM
-        --------------------------------------------------
-        -- 조회기준 월이 9~2월일떄
-        WHEN A.PRDT_HRRC1_NM = '의류' AND RIGHT(PARAM.STD_END_YYYYMM, 2)::INT IN ( 9, 10, 11, 12, 1, 2 ) AND
-             B.END_YYYYMM < TO_CHAR(ADD_MONTHS(TO_DATE(PARAM.STD_END_YYYYMM, 'YYYYMM'), -18), 'YYYYMM')
-            THEN '과시즌 ' || A.PRDT_HRRC1_NM
-        ELSE '미지정'
-                        END AS ITEM_STD
-                 FROM SAP_FNF.MST_PRDT A
-                     LEFT JOIN COMM.MST_SESN B
-                             ON A.SESN = B.SESN
-                     JOIN PARAM
-                             ON PARAM.DIV = 'CY'
-                 WHERE 1 = 1
-                   AND A.SESN <> 'X' -- 저장품 제외
-                 )
--- STOCK : 재고
-    -- OR => SAP / FR => BOS
-  , STOCK AS (
-        SELECT YYYYMM, BRD_CD, ITEM_STD, SUM(STOCK_TAG_AMT_EXPECTED) AS STOCK_TAG_AMT_EXPECTED
-            FROM ( SELECT A.YYMM                      AS YYYYMM
-                        , A.BRD_CD                    AS BRD_CD
-                        , D.ITEM_STD                  AS ITEM_STD
-                        , SUM(STOCK_TAG_AMT_EXPECTED) AS STOCK_TAG_AMT_EXPECTED
-                   FROM CHN.DW_STOCK_M A
-                       JOIN CHN.DW_SHOP_WH_DETAIL B
-                               ON A.SHOP_ID = B.OA_MAP_SHOP_ID AND B.FR_OR_CLS = 'FR' -- 대리상만
-                       JOIN CY_ITEM D
-                               ON A.PRDT_CD = D.PRDT_CD
-                       JOIN PARAM P
-                               ON P.DIV = 'CY' AND A.YYMM BETWEEN P.STD_START_YYYYMM AND P.STD_END_YYYYMM
-                   WHERE 1 = 1
-                     AND A.BRD_CD = '{brd_cd}' -- 브랜드필터링 필요
-                   GROUP BY A.YYMM
-                          , A.BRD_CD
-                          , D.ITEM_STD
-                   UNION ALL
-                   SELECT A.YYYYMM               AS YYYYMM
-                        , A.BRD_CD               AS BRD_CD
-                        , ITEM_STD               AS ITEM_STD
-                        , SUM(END_STOCK_TAG_AMT) AS STOCK_TAG_AMT_EXPECTED
-                   FROM SAP_FNF.DW_CN_IVTR_PRDT_M A
-                       JOIN CY_ITEM D
-                               ON A.PRDT_CD = D.PRDT_CD
-                       JOIN PARAM P
-                               ON P.DIV = 'CY' AND A.YYYYMM BETWEEN P.STD_START_YYYYMM AND P.STD_END_YYYYMM
-                   WHERE 1 = 1
-                     AND A.BRD_CD = '{brd_cd}' -- 브랜드필터링 필요
-                   GROUP BY A.YYYYMM
-                          , A.BRD_CD
-                          , ITEM_STD )
-            GROUP BY YYYYMM, BRD_CD, ITEM_STD
-               )
-SELECT *
-FROM STOCK
-order by yyyymm
-        """
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_stock = sum(float(r.get('STOCK_TAG_AMT_EXPECTED', 0) or 0) for r in records)
-        unique_months = len(set(r.get('YYYYMM', '') for r in records if r.get('YYYYMM')))
-        unique_items = len(set(r.get('ITEM_STD', '') for r in records if r.get('ITEM_STD')))
-        
-        print(f"총 재고액: {total_stock:,.0f}원 ({total_stock/1000:.0f}k)")
-        print(f"분석 월 수: {unique_months}개월")
-        print(f"아이템 구분 수: {unique_items}개")
-        
-        # 데이터 가공: 아이템별/월별 재고 집계
-        item_stock_data = {}
-        monthly_totals = {}
-        
-        for r in records:
-            item_std = r.get('ITEM_STD', '미지정')
-            yyyymm = r.get('YYYYMM', '')
-            stock_amt = float(r.get('STOCK_TAG_AMT_EXPECTED', 0) or 0)
-            
-            # 아이템별 재고 집계
-            if item_std not in item_stock_data:
-                item_stock_data[item_std] = {
-                    'total_stock': 0,
-                    'months': {}
-                }
-            item_stock_data[item_std]['total_stock'] += stock_amt
+    # 분석 기간 계산 (당해 1월부터 현재월까지)
+    # 함수 파라미터 yyyymm은 분석 시작점으로만 사용
+    analysis_year = int(yyyymm[:4])
+    analysis_month = int(yyyymm[4:6])
+    
+    # 실제 당해 당월 계산 (현재 날짜 기준)
+    now = datetime.now()
+    current_year = now.year
+    current_month = now.month
+    current_yyyymm = f"{analysis_year:04d}{current_month:02d}"
+    
+    previous_year = analysis_year - 1
+    yyyymm_py = f"{previous_year:04d}{analysis_month:02d}"
+    
+    yyyymm_start = f"{analysis_year}01"  # 분석 시작년도 1월
+    yyyymm_end = yyyymm  # 실제 당해 당월
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
+    
+    # SQL 쿼리 실행
+    sql = _MONTHLY_ITEM_STOCK_TREND_SQL
+    df = run_query(sql, engine, {'yyyymm_start': yyyymm_start, 'yyyymm_end': yyyymm_end, 'brd_cd': brd_cd})
+    if df.is_empty():
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_stock = df['STOCK_TAG_AMT_EXPECTED'].fill_null(0).sum()
+    unique_months, unique_items = _count_unique_non_blank(df, 'YYYYMM', 'ITEM_STD')
+    
+    print(f"총 재고액: {total_stock:,.0f}원 ({total_stock/1000:.0f}k)")
+    print(f"분석 월 수: {unique_months}개월")
+    print(f"아이템 구분 수: {unique_items}개")
+    
+    # 데이터 가공: 아이템별/월별 재고 집계
+    item_stock_data = defaultdict(lambda: {'total_stock': 0, 'months': defaultdict(float)})
+    
+    for r in df.iter_rows(named=True):
+        item_std = r.get('ITEM_STD', '미지정')
+        month = r.get('YYYYMM', '')
+        stock_amt = float(r.get('STOCK_TAG_AMT_EXPECTED', 0) or 0)
+        
+        # 아이템별 재고 집계
+        item_stock = item_stock_data[item_std]
+        item_stock['total_stock'] += stock_amt
+        item_stock['months'][month] += stock_amt
+    
+    # 월별 총 재고 (k 단위)
+    monthly_totals_k = _monthly_totals_k(df, 'STOCK_TAG_AMT_EXPECTED')
+    
+    # 아이템별 재고 데이터 (k 단위)
+    item_stock_k = {}
+    for item_std, data in item_stock_data.items():
+        item_stock_k[item_std] = {
+            'total_stock': round(data['total_stock'] / 1000, 0),
+            'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}
+        }
+    
+    # 재고 증가/감소 추세 분석
+    stock_trends = {}
+    for item_std, data in item_stock_data.items():
+        months_sorted = sorted(data['months'].items())
+        if len(months_sorted) >= 2:
+            first_month_stock = months_sorted[0][1]
+            last_month_stock = months_sorted[-1][1]
+            change_pct = ((last_month_stock - first_month_stock) / first_month_stock * 100) if first_month_stock > 0 else 0
             
-            if yyyymm not in item_stock_data[item_std]['months']:
-                item_stock_data[item_std]['months'][yyyymm] = 0
-            item_stock_data[item_std]['months'][yyyymm] += stock_amt
+            # 최대/최소 재고
+            max_stock = max(v for k, v in data['months'].items())
+            min_stock = min(v for k, v in data['months'].items())
+            max_month = max(data['months'].items(), key=lambda x: x[1])[0]
+            min_month = min(data['months'].items(), key=lambda x: x[1])[0]
             
-            # 월별 총 재고 집계
-            if yyyymm not in monthly_totals:
-                monthly_totals[yyyymm] = 0
-            monthly_totals[yyyymm] += stock_amt
-        
-        # k 단위로 변환
-        monthly_totals_k = {k: round(v / 1000, 0) for k, v in sorted(monthly_totals.items())}
-        
-        # 아이템별 재고 데이터 (k 단위)
-        item_stock_k = {}
-        for item_std, data in item_stock_data.items():
-            item_stock_k[item_std] = {
-                'total_stock': round(data['total_stock'] / 1000, 0),
-                'months': {k: round(v / 1000, 0) for k, v in sorted(data['months'].items())}
+            stock_trends[item_std] = {
+                'change_pct': round(change_pct, 1),
+                'first_month': months_sorted[0][0],
+                'last_month': months_sorted[-1][0],
+                'first_stock': round(first_month_stock / 1000, 0),
+                'last_stock': round(last_month_stock / 1000, 0),
+                'max_stock': round(max_stock / 1000, 0),
+                'min_stock': round(min_stock / 1000, 0),
+                'max_month': max_month,
+                'min_month': min_month
             }
-        
-        # 재고 증가/감소 추세 분석
-        stock_trends = {}
-        for item_std, data in item_stock_data.items():
-            months_sorted = sorted(data['months'].items())
-            if len(months_sorted) >= 2:
-                first_month_stock = months_sorted[0][1]
-                last_month_stock = months_sorted[-1][1]
-                change_pct = ((last_month_stock - first_month_stock) / first_month_stock * 100) if first_month_stock > 0 else 0
-                
-                # 최대/최소 재고
-                max_stock = max(v for k, v in data['months'].items())
-                min_stock = min(v for k, v in data['months'].items())
-                max_month = max(data['months'].items(), key=lambda x: x[1])[0]
-                min_month = min(data['months'].items(), key=lambda x: x[1])[0]
-                
-                stock_trends[item_std] = {
-                    'change_pct': round(change_pct, 1),
-                    'first_month': months_sorted[0][0],
-                    'last_month': months_sorted[-1][0],
-                    'first_stock': round(first_month_stock / 1000, 0),
-                    'last_stock': round(last_month_stock / 1000, 0),
-                    'max_stock': round(max_stock / 1000, 0),
-                    'min_stock': round(min_stock / 1000, 0),
-                    'max_month': max_month,
-                    'min_month': min_month
-                }
-        
-        # LLM 분석 프롬프트 생성
-        prompt = f"""
-너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 재고 관리 전문가야. 월별 아이템별 재고 추세 분석을 수행해줘.
+    
+    # LLM 분석 프롬프트 생성
+    prompt = f"""
+너는 F&F 그룹의 {ctx.brand_name} 브랜드 재고 관리 전문가야. 월별 아이템별 재고 추세 분석을 수행해줘.
 
 **분석 기간**: {current_year}년 1월 ~ {current_year}년 {current_month}월 ({yyyymm_start}~{yyyymm_end})
 
@@ -3657,79 +3761,64 @@ order by yyyymm
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "월별 아이템별 재고 추세 분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "조기경보", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "긍정신호", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "핵심액션", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 구성
-        json_data = {
-            'country': 'CN',
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,  # 당해 당월 (현재 날짜 기준)
-            'yyyymm_py': yyyymm_py,
-            'key': '월별아이템별재고추세',
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_stock': round(total_stock / 1000, 0),
-                'unique_months': unique_months,
-                'unique_items': unique_items,
-                'analysis_period': f"{current_year}년 01월 ~ {current_year}년 {current_month:02d}월"
-            },
-            'monthly_totals': monthly_totals_k,
-            'item_stock_data': item_stock_k,
-            'stock_trends': stock_trends,
-            'raw_data': {
-                'sample_records': [dict(r) for r in records[:50]],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, force_refresh=force_refresh, temperature=ANALYSIS_TEMPERATURE,
+        cache_key=('monthly_item_stock_trend', brd_cd, yyyymm_end, df),
+        yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (실패 시 응답 원문을 첫 섹션에 담은 기본 구조로 대체)
+    analysis_data = parse_analysis_response(analysis_response, "월별 아이템별 재고 추세 분석", [
+        ("종합분석-1", "조기경보"),
+        ("종합분석-2", "긍정신호"),
+        ("종합분석-3", "핵심액션"),
+    ])
+    
+    # JSON 데이터 구성
+    json_data = {
+        'country': 'CN',
+        'brand_cd': brd_cd,
+        'brand_name': ctx.brand_name,
+        'yyyymm': yyyymm_end,  # 당해 당월 (현재 날짜 기준)
+        'yyyymm_py': yyyymm_py,
+        'key': '월별아이템별재고추세',
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_stock': round(total_stock / 1000, 0),
+            'unique_months': unique_months,
+            'unique_items': unique_items,
+            'analysis_period': f"{current_year}년 01월 ~ {current_year}년 {current_month:02d}월"
+        },
+        'monthly_totals': monthly_totals_k,
+        'item_stock_data': item_stock_k,
+        'stock_trends': stock_trends,
+        'raw_data': {
+            'sample_records': df.head(50).to_dicts(),
+            'total_records_count': len(df)
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"CN_{yyyymm_short}_{brd_cd}_월별아이템별재고추세"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장
-        markdown_content = f"# {json_data['analysis_data'].get('title', '월별 아이템별 재고 추세 분석')}\n\n"
-        for section in json_data['analysis_data'].get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 월별 아이템별 재고 추세 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"CN_{yyyymm_short}_{brd_cd}_월별아이템별재고추세"
+    save_analysis_outputs(json_data, filename, '월별 아이템별 재고 추세 분석')
+    
+    print(f"[OK] 월별 아이템별 재고 추세 분석 완료!\n")
+    return json_data
 # ============================================================================
 # 유틸리티 함수
 # ============================================================================
+@functools.lru_cache(maxsize=64)
+def _yyyymm_range(start_yyyymm, end_yyyymm):
+    """시작~종료 년월 튜플 (datetime 대신 정수 월 연산, 같은 구간은 캐시 재사용)"""
+    start_year, start_month = int(start_yyyymm[:4]), int(start_yyyymm[4:6])
+    end_year, end_month = int(end_yyyymm[:4]), int(end_yyyymm[4:6])
+    month_count = (end_year - start_year) * 12 + (end_month - start_month) + 1
+    return tuple(
+        f"{start_year + (start_month - 1 + i) // 12:04d}{(start_month - 1 + i) % 12 + 1:02d}"
+        for i in range(month_count)
+    )
+
 def generate_yyyymm_list(start_yyyymm, end_yyyymm=None):
     """
     년월 리스트 생성
@@ -3744,28 +3833,200 @@ def generate_yyyymm_list(start_yyyymm, end_yyyymm=None):
     if end_yyyymm is None:
         return [start_yyyymm]
     
-    start_date = datetime(int(start_yyyymm[:4]), int(start_yyyymm[4:6]), 1)
-    end_date = datetime(int(end_yyyymm[:4]), int(end_yyyymm[4:6]), 1)
+    # 캐시된 튜플을 호출자가 수정하지 않도록 새 리스트로 반환
+    return list(_yyyymm_range(start_yyyymm, end_yyyymm))
+
+# ============================================================================
+# 병렬 실행
+# ============================================================================
+# prefetch 태그 -> 쿼리 생성 함수 (yyyymm, yyyymm_py, brd_cd) -> (sql, params)
+_PREFETCH_QUERY_BUILDERS = {
+    'retail_channel': get_retail_channel_sales_query,
+    'outbound_category': get_outbound_category_sales_query,
+    'agent_store': get_agent_store_sales_query,
+    'discount_rate': get_discount_rate_query,
+    'operating_expense': get_operating_expense_query,
+    'operating_expense_all_brands': lambda yyyymm, yyyymm_py, brd_cd: get_operating_expense_all_brands_query(yyyymm, yyyymm_py),
+}
+
+def prefetch_analysis_data(yyyymm, brd_cd, engine=None, tags=None):
+    """
+    리테일/출고/대리상/할인율/영업비 분석 쿼리를 한 커넥션에서 한 번에 제출해 조회
+    (run_queries - 쿼리별 비동기 실행이라 각 쿼리의 ORDER BY/컬럼 스키마가 그대로 유지됨)
+    
+    반환값을 각 analyze_* 함수의 prefetched 인자로 넘기면 함수 안에서 쿼리를 다시 실행하지 않습니다.
     
-    yyyymm_list = []
-    current_date = start_date
+    Args:
+        tags: 조회할 쿼리 태그 (None이면 _PREFETCH_QUERY_BUILDERS 전체)
     
-    while current_date <= end_date:
-        yyyymm = current_date.strftime('%Y%m')
-        yyyymm_list.append(yyyymm)
-        
-        # 다음 달로 이동
-        if current_date.month == 12:
-            current_date = datetime(current_date.year + 1, 1, 1)
-        else:
-            current_date = datetime(current_date.year, current_date.month + 1, 1)
+    Returns:
+        dict: {태그: DataFrame}
+    """
+    yyyymm_py = _period_ctx(yyyymm, brd_cd).yyyymm_py
+    if tags is None:
+        tags = _PREFETCH_QUERY_BUILDERS
+    
+    queries = {tag: _PREFETCH_QUERY_BUILDERS[tag](yyyymm, yyyymm_py, brd_cd) for tag in tags}
+    return run_queries(queries, engine or get_db_engine())
+
+# 기본 실행 분석 목록 (run_analyses에서 analyses를 지정하지 않을 때 사용)
+DEFAULT_ANALYSES = (
+    analyze_retail_channel_top3_sales,  # 리테일매출 채널별 TOP3 분석
+    analyze_outbound_category_sales,  # 출고매출 카테고리별 분석
+    analyze_agent_store_sales,  # 대리상 점당매출 종합분석
+    analyze_discount_rate,  # 할인율 종합분석
+    analyze_operating_expense,  # 영업비 종합분석
+    analyze_monthly_channel_sales_trend,  # 월별 채널별 매출 추세 분석
+    analyze_monthly_item_sales_trend,  # 월별 아이템별 매출 추세 분석
+    analyze_monthly_item_stock_trend,  # 월별 아이템별 재고 추세 분석
+)
+
+# prefetch_analysis_data 결과(prefetched 인자)를 받을 수 있는 분석 -> 해당 분석이 사용하는 쿼리 태그
+_PREFETCH_ANALYSES = {
+    analyze_retail_channel_top3_sales: ('retail_channel',),
+    analyze_outbound_category_sales: ('outbound_category',),
+    analyze_agent_store_sales: ('agent_store',),
+    analyze_discount_rate: ('discount_rate',),
+    analyze_operating_expense: ('operating_expense', 'operating_expense_all_brands'),
+}
+
+# {분석 함수: 해당 분석의 call_llm cache_key 분석명} - 브랜드 묶음 호출 시 기다릴 브랜드 계산용
+_ANALYSIS_LLM_CALLS = {
+    analyze_retail_channel_top3_sales: ('retail_channel_top3', 'retail_channel_overall'),
+    analyze_outbound_category_sales: ('outbound_category',),
+    analyze_agent_store_sales: ('agent_store',),
+    analyze_discount_rate: ('discount_rate',),
+    analyze_operating_expense: ('operating_expense',),
+    analyze_monthly_channel_sales_trend: ('monthly_channel_sales_trend',),
+    analyze_monthly_item_sales_trend: ('monthly_item_sales_trend',),
+    analyze_monthly_item_stock_trend: ('monthly_item_stock_trend',),
+}
+
+def run_analyses(yyyymm_list, brands, analyses=None, max_workers=5, force_refresh=False, prefetch=True, batch_brands=False):
+    """
+    (년월, 브랜드, 분석) 조합을 스레드 풀로 동시에 실행
+    
+    각 분석은 서로 독립적이고 대부분의 시간이 SQL/LLM 응답 대기(I/O)이므로
+    스레드로 병렬 실행하면 전체 소요 시간이 가장 느린 분석 수준으로 줄어듭니다.
+    (DB 엔진의 커넥션 풀은 스레드 간에 공유)
+    
+    Args:
+        yyyymm_list: 분석할 년월 리스트 (예: ['202509', '202510'])
+        brands: 브랜드 코드 리스트 (예: ['M', 'I'])
+        analyses: 실행할 analyze_* 함수 리스트 (None이면 DEFAULT_ANALYSES)
+        max_workers: 동시 실행 스레드 수
+        force_refresh: True면 LLM 응답 캐시를 무시하고 다시 호출
+        prefetch: True면 (년월, 브랜드)마다 리테일/출고/대리상/할인율/영업비 쿼리를
+                  prefetch_analysis_data로 한 번에 제출해 두고 각 분석에서 재사용
+        batch_brands: True면 같은 분석/기간의 브랜드별 LLM 호출을 한 요청으로 묶어서 실행
+                      (브랜드가 2개 이상일 때만 적용, _BrandBatcher 참고)
+                      요청 수는 줄지만 묶인 브랜드의 응답을 한 요청에서 순차 생성하므로
+                      병렬 개별 호출보다 느려질 수 있어 기본값은 False
+    
+    Returns:
+        dict: {(yyyymm, brd_cd, 분석 함수명): 분석 결과 (실패 시 None)}
+    """
+    global _brand_batcher
+    
+    if analyses is None:
+        analyses = DEFAULT_ANALYSES
+    
+    batch_brands = batch_brands and len(brands) > 1
+    if batch_brands:
+        # 같은 분석의 브랜드들이 연달아 제출되어야 LLM 호출 시점이 가까워져 한 묶음으로 모임
+        tasks = [
+            (yyyymm, brd_cd, analyze_fn)
+            for yyyymm in yyyymm_list
+            for analyze_fn in analyses
+            for brd_cd in brands
+        ]
+    else:
+        tasks = [
+            (yyyymm, brd_cd, analyze_fn)
+            for yyyymm in yyyymm_list
+            for brd_cd in brands
+            for analyze_fn in analyses
+        ]
+    if not tasks:
+        return {}
+    
+    # 여러 스레드가 처음 호출하면서 엔진을 중복 생성하지 않도록 미리 생성
+    get_db_engine()
+    
+    if batch_brands:
+        # 실제 실행할 작업 기준으로 (LLM 호출명, 기간)별 대기 브랜드 집합 구성
+        pending = defaultdict(set)
+        for yyyymm, brd_cd, analyze_fn in tasks:
+            for name in _ANALYSIS_LLM_CALLS.get(analyze_fn, ()):
+                pending[(name, yyyymm)].add(brd_cd)
+        _brand_batcher = _BrandBatcher(dict(pending), _ANALYSIS_LLM_CALLS)
+    
+    try:
+        return _run_analysis_tasks(tasks, yyyymm_list, brands, analyses, max_workers, force_refresh, prefetch)
+    finally:
+        _brand_batcher = None
+
+def _run_analysis_task(analyze_fn, yyyymm, brd_cd, **kwargs):
+    """분석 1건 실행 - 종료(조기 종료/오류 포함) 시 브랜드 묶음 대기 중인 스레드에 알림"""
+    try:
+        return analyze_fn(yyyymm, brd_cd, **kwargs)
+    finally:
+        batcher = _brand_batcher
+        if batcher is not None:
+            batcher.task_done(analyze_fn, yyyymm, brd_cd)
+
+def _run_analysis_tasks(tasks, yyyymm_list, brands, analyses, max_workers, force_refresh, prefetch):
+    """run_analyses의 스레드 풀 실행부 - {(yyyymm, brd_cd, 분석 함수명): 결과} 반환"""
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # (년월, 브랜드)별 쿼리 일괄 조회 - 실패하면 각 분석이 직접 쿼리하도록 None으로 둠
+        prefetched = {}
+        # 선택된 분석이 실제로 쓰는 쿼리만 조회
+        prefetch_tags = list(dict.fromkeys(
+            tag for analyze_fn in analyses for tag in _PREFETCH_ANALYSES.get(analyze_fn, ())
+        ))
+        if prefetch and prefetch_tags:
+            pairs = [(yyyymm, brd_cd) for yyyymm in yyyymm_list for brd_cd in brands]
+            prefetch_futures = {
+                executor.submit(prefetch_analysis_data, *pair, tags=prefetch_tags): pair for pair in pairs
+            }
+            for future in as_completed(prefetch_futures):
+                pair = prefetch_futures[future]
+                try:
+                    prefetched[pair] = future.result()
+                except Exception as e:
+                    print(f"[WARNING] 쿼리 일괄 조회 실패 ({pair[1]}, {pair[0]}), 분석별로 개별 조회합니다: {e}")
+        
+        futures = {}
+        for yyyymm, brd_cd, analyze_fn in tasks:
+            kwargs = {'force_refresh': force_refresh}
+            if analyze_fn in _PREFETCH_ANALYSES:
+                kwargs['prefetched'] = prefetched.get((yyyymm, brd_cd))
+            future = executor.submit(_run_analysis_task, analyze_fn, yyyymm, brd_cd, **kwargs)
+            futures[future] = (yyyymm, brd_cd, analyze_fn.__name__)
+        
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                # 한 분석이 실패해도 나머지 분석은 계속 진행
+                yyyymm, brd_cd, name = key
+                print(f"[ERROR] {name} ({BRAND_CODE_MAP.get(brd_cd, brd_cd)}, {yyyymm}) 분석 중 오류 발생: {e}")
+                results[key] = None
     
-    return yyyymm_list
+    return results
 
 # ============================================================================
 # 메인 실행
 # ============================================================================
 if __name__ == '__main__':
+    # 로깅 설정은 라이브러리(core/analyzers)가 아니라 실행 스크립트에서 한 번만 지정
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # INFO 레벨에서 요청마다 로그를 남기는 외부 라이브러리는 경고 이상만 출력
+    for noisy_logger in ('snowflake', 'httpx'):
+        logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+    
     # 시작 시간 기록
     start_time = datetime.now()
     print(f"\n{'='*60}")
@@ -3802,32 +4063,21 @@ if __name__ == '__main__':
         # 'W',   # SUPRA
     ]
     
-    # 기간별, 브랜드별 분석 실행
-    for yyyymm in yyyymm_list:
-        print(f"\n{'='*60}")
-        print(f"기간 분석 시작: {yyyymm} ({yyyymm[:4]}년 {yyyymm[4:6]}월)")
-        print(f"{'='*60}\n")
-        
-        for brd_cd in brands_to_analyze:
-            print(f"\n{'='*60}")
-            print(f"브랜드 분석 시작: {brd_cd} ({BRAND_CODE_MAP.get(brd_cd, brd_cd)})")
-            print(f"{'='*60}\n")
-            
-            try:
-                # 분석 실행 (원하는 분석만 주석 해제)
-                analyze_retail_channel_top3_sales(yyyymm, brd_cd)  # 리테일매출 채널별 TOP3 분석 (완료)
-                analyze_outbound_category_sales(yyyymm, brd_cd)  # 출고매출 카테고리별 분석 (완료)
-                analyze_agent_store_sales(yyyymm, brd_cd)  # 대리상 점당매출 종합분석
-                analyze_discount_rate(yyyymm, brd_cd)  # 할인율 종합분석 (완료)
-                analyze_operating_expense(yyyymm, brd_cd)  # 영업비 종합분석 (완료)
-                analyze_monthly_channel_sales_trend(yyyymm, brd_cd)  # 월별 채널별 매출 추세 분석 (완료)
-                analyze_monthly_item_sales_trend(yyyymm, brd_cd)  # 월별 아이템별 매출 추세 분석
-                analyze_monthly_item_stock_trend(yyyymm, brd_cd)  # 월별 아이템별 재고 추세 분석 (완료)
-                pass  # 주석 처리된 함수가 없을 경우를 위한 pass
-            except Exception as e:
-                print(f"[ERROR] 브랜드 {brd_cd} 분석 중 오류 발생: {e}")
-                print(f"[ERROR] 다음 브랜드로 계속 진행합니다...\n")
-                continue
+    # 실행할 분석 선택 (원하는 분석만 주석 해제)
+    analyses_to_run = [
+        analyze_retail_channel_top3_sales,  # 리테일매출 채널별 TOP3 분석 (완료)
+        analyze_outbound_category_sales,  # 출고매출 카테고리별 분석 (완료)
+        analyze_agent_store_sales,  # 대리상 점당매출 종합분석
+        analyze_discount_rate,  # 할인율 종합분석 (완료)
+        analyze_operating_expense,  # 영업비 종합분석 (완료)
+        analyze_monthly_channel_sales_trend,  # 월별 채널별 매출 추세 분석 (완료)
+        analyze_monthly_item_sales_trend,  # 월별 아이템별 매출 추세 분석
+        analyze_monthly_item_stock_trend,  # 월별 아이템별 재고 추세 분석 (완료)
+    ]
+    
+    # 기간별, 브랜드별, 분석별 작업을 동시에 실행
+    print(f"분석 브랜드: {', '.join(BRAND_CODE_MAP.get(brd_cd, brd_cd) for brd_cd in brands_to_analyze)}")
+    run_analyses(yyyymm_list, brands_to_analyze, analyses_to_run)
     
     # 종료 시간 기록
     end_time = datetime.now()
@@ -3841,6 +4091,7 @@ if __name__ == '__main__':
     print(f"전체 브랜드 분석 완료!")
     print(f"소요 시간: {elapsed_time}")
     print(f"총 토큰 사용량: {total_token_count:,} 토큰 (입력: {total_tokens['input']:,}, 출력: {total_tokens['output']:,})")
+    print(f"프롬프트 캐시: 읽기 {total_tokens['cache_read']:,} 토큰, 생성 {total_tokens['cache_creation']:,} 토큰")
     print(f"{'='*60}\n")
 
 
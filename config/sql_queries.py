@@ -7,9 +7,15 @@ SQL 쿼리 모음 파일
     from config.sql_queries import get_brand_domestic_query
     
     sql = get_brand_domestic_query(yyyymm='202509', yyyymm_py='202409', brd_cd='M')
+
+문자열 인자만 받는 쿼리 함수는 lru_cache로 렌더링 결과를 재사용합니다.
+(같은 인자로 다시 호출하면 f-string을 다시 만들지 않음, 반환값은 불변 str)
 """
 
+import functools
+
 
+@functools.lru_cache(maxsize=256)
 def get_brand_domestic_query(yyyymm, yyyymm_py, brd_cd):
     """
     브랜드별 내수 손익분석 쿼리 (01번 분석)
@@ -52,6 +58,7 @@ def get_brand_domestic_query(yyyymm, yyyymm_py, brd_cd):
     """
 
 
+@functools.lru_cache(maxsize=256)
 def get_brand_export_query(yyyymm, yyyymm_py, brd_cd):
     """
     브랜드별 수출 손익분석 쿼리 (02번 분석)
@@ -94,6 +101,7 @@ def get_brand_export_query(yyyymm, yyyymm_py, brd_cd):
     """
 
 
+@functools.lru_cache(maxsize=256)
 def get_channel_profit_loss_query(yyyymm, yyyymm_py, brd_cd):
     """
     채널별 손익분석 쿼리 (03번 분석)
@@ -184,6 +192,7 @@ def get_channel_profit_loss_query(yyyymm, yyyymm_py, brd_cd):
     """
 
 
+@functools.lru_cache(maxsize=256)
 def get_product_sales_query(yyyymm, brd_cd):
     """
     제품별 매출분석 쿼리 (04번 분석)
@@ -221,6 +230,7 @@ def get_product_sales_query(yyyymm, brd_cd):
     """
 
 
+@functools.lru_cache(maxsize=256)
 def get_ad_expense_total_query(yyyymm, yyyymm_py, brd_cd):
     """
     광고선전비 전체 합계 쿼리 (07번 분석 - 합계용)
@@ -245,6 +255,7 @@ def get_ad_expense_total_query(yyyymm, yyyymm_py, brd_cd):
     """
 
 
+@functools.lru_cache(maxsize=256)
 def get_ad_expense_detail_query(yyyymm, yyyymm_py, brd_cd):
     """
     광고선전비 세부 내역 쿼리 (07번 분석 - 세부용)
@@ -299,6 +310,68 @@ def get_ad_expense_trend_query(trend_months, brd_cd):
     """
 
 
+def get_ad_expense_batch_query(yyyymm, yyyymm_py, trend_months, brd_cd):
+    """
+    광고선전비 통합 쿼리 (07번 분석 - 합계/세부/추세를 한 번에 조회)
+    
+    합계, 세부 내역, 12개월 추세 쿼리를 UNION ALL로 묶어 DB 왕복을 한 번으로 줄입니다.
+    
+    Args:
+        yyyymm: 당해 년월
+        yyyymm_py: 전년 동월
+        trend_months: 12개월 월 리스트 (예: ['202410', '202411', ...])
+        brd_cd: 브랜드 코드
+    
+    Returns:
+        str: SQL 쿼리
+    
+    설명 (QUERY_TYPE 컬럼으로 구분, 금액은 AMT 컬럼):
+        - 'total': 전년/당해 동월 광고선전비 합계 (get_ad_expense_total_query와 동일)
+        - 'detail': 전년/당해 동월 계정별 세부 내역 (get_ad_expense_detail_query와 동일)
+        - 'trend': 12개월 월별 합계 (get_ad_expense_trend_query와 동일)
+    """
+    all_months_str = "', '".join(sorted(set(trend_months) | {yyyymm_py, yyyymm}))
+    trend_months_str = "', '".join(trend_months)
+    return f"""
+    WITH base AS (
+        SELECT pst_yyyymm, brd_cd, brd_nm, ctgr1, ctgr2, ctgr3, gl_nm, ttl_use_amt
+        FROM sap_fnf.dm_idcst_cctr_m
+        WHERE pst_yyyymm IN ('{all_months_str}')
+          AND ctgr1 = '광고선전비'
+          AND brd_cd = '{brd_cd}'
+    )
+    SELECT 'total' AS query_type,
+           pst_yyyymm,
+           NULL::varchar AS brd_cd,
+           NULL::varchar AS brd_nm,
+           NULL::varchar AS ctgr1,
+           NULL::varchar AS ctgr2,
+           NULL::varchar AS ctgr3,
+           NULL::varchar AS gl_nm,
+           SUM(ttl_use_amt) AS amt
+    FROM base
+    WHERE pst_yyyymm IN ('{yyyymm_py}', '{yyyymm}')
+    GROUP BY pst_yyyymm
+    
+    UNION ALL
+    
+    SELECT 'detail', pst_yyyymm, brd_cd, brd_nm, ctgr1, ctgr2, ctgr3, gl_nm, SUM(ttl_use_amt)
+    FROM base
+    WHERE pst_yyyymm IN ('{yyyymm_py}', '{yyyymm}')
+    GROUP BY pst_yyyymm, brd_cd, brd_nm, ctgr1, ctgr2, ctgr3, gl_nm
+    
+    UNION ALL
+    
+    SELECT 'trend', pst_yyyymm, NULL, NULL, NULL, NULL, NULL, NULL, SUM(ttl_use_amt)
+    FROM base
+    WHERE pst_yyyymm IN ('{trend_months_str}')
+    GROUP BY pst_yyyymm
+    
+    ORDER BY query_type, pst_yyyymm, amt DESC
+    """
+
+
+@functools.lru_cache(maxsize=256)
 def get_indirect_cost_query(yyyymm, yyyymm_py, brd_cd):
     """
     간접비 분석 쿼리 (10번 분석)
@@ -333,6 +406,7 @@ def get_indirect_cost_query(yyyymm, yyyymm_py, brd_cd):
     """
 
 
+@functools.lru_cache(maxsize=256)
 def get_direct_cost_query(yyyymm, yyyymm_py, brd_cd):
     """
     직접비 분석 쿼리 (11번 분석)
@@ -383,7 +457,8 @@ def get_direct_cost_query(yyyymm, yyyymm_py, brd_cd):
     """
 
 
-def get_channel_sales_trend_query(yyyymm_start, yyyymm_end, brd_cd):
+@functools.lru_cache(maxsize=256)
+def get_channel_sales_trend_query(yyyymm_start, yyyymm_end, brd_cd, limit=None):
     """
     채널별 매출 분석 쿼리 (12개월 추이 - 기간, 채널, 아이템)
     
@@ -391,6 +466,7 @@ def get_channel_sales_trend_query(yyyymm_start, yyyymm_end, brd_cd):
         yyyymm_start: 시작 년월 (예: '202409')
         yyyymm_end: 종료 년월 (예: '202509')
         brd_cd: 브랜드 코드 (예: 'M')
+        limit: 조회할 최대 행 수 (None이면 전체, 샘플 조회용)
     
     Returns:
         str: SQL 쿼리
@@ -452,6 +528,89 @@ def get_channel_sales_trend_query(yyyymm_start, yyyymm_end, brd_cd):
            in_chnl_rnk
     FROM main 
     ORDER BY pst_yyyymm DESC, in_yymm_rnk, in_chnl_rnk
+    {f"LIMIT {int(limit)}" if limit else ""}
+    """
+
+
+@functools.lru_cache(maxsize=256)
+def get_channel_sales_rollup_query(yyyymm_start, yyyymm_end, brd_cd):
+    """
+    채널별 매출 집계 쿼리 (12개월 추이 분석용 롤업)
+    
+    채널별 매출 분석에 필요한 집계를 DB에서 한 번에 계산합니다.
+    원본 행(기간 x 채널 x 아이템) 대신 아래 세 가지 집계 결과만 반환합니다.
+    
+    Args:
+        yyyymm_start: 시작 년월 (예: '202409')
+        yyyymm_end: 종료 년월 (예: '202509')
+        brd_cd: 브랜드 코드 (예: 'M')
+    
+    Returns:
+        str: SQL 쿼리
+    
+    설명 (AGG_LEVEL 컬럼으로 구분):
+        - 'total': 전체 매출 합계와 행/채널/아이템/월 수 (1행)
+        - 'channel_month': 채널별 월별 매출 합계
+        - 'channel_item_top5': 채널별 기간 전체 매출 상위 5개 아이템 (ITEM_RNK 순위)
+    """
+    return f"""
+    WITH raw AS (
+        SELECT pst_yyyymm,
+               COALESCE(
+                   CASE 
+                       WHEN b.mgmt_chnl_cd = '4' THEN '자사몰'
+                       WHEN b.mgmt_chnl_cd = '5' THEN '제휴몰'
+                       WHEN b.mgmt_chnl_cd IN ('3', '11', 'C3') THEN '직영점'
+                       WHEN b.mgmt_chnl_nm LIKE '아울렛%' THEN '아울렛'
+                       ELSE b.mgmt_chnl_nm
+                   END, '기타') AS chnl_nm,
+               COALESCE(c.prdt_hrrc3_nm, '기타') AS class3,
+               SUM(a.act_sale_amt) AS sale_amt
+        FROM sap_fnf.dm_pl_shop_prdt_m a
+        JOIN sap_fnf.mst_shop b 
+            ON a.brd_cd = b.brd_cd
+           AND a.shop_cd = b.sap_shop_cd
+        JOIN sap_fnf.mst_prdt c
+            ON a.prdt_cd = c.prdt_cd
+        WHERE 1=1
+          AND a.corp_cd = '1000'
+          AND a.brd_cd = '{brd_cd}'
+          AND a.chnl_cd NOT IN ('0', '8', '9', '99')
+          AND a.pst_yyyymm BETWEEN '{yyyymm_start}' AND '{yyyymm_end}'
+        GROUP BY 1, 2, 3
+    ), chnl_item AS (
+        SELECT chnl_nm,
+               class3,
+               SUM(sale_amt) AS sale_amt,
+               ROW_NUMBER() OVER(PARTITION BY chnl_nm ORDER BY SUM(sale_amt) DESC) AS item_rnk
+        FROM raw
+        GROUP BY chnl_nm, class3
+    )
+    SELECT 'total' AS agg_level,
+           NULL::varchar AS chnl_nm,
+           NULL::varchar AS pst_yyyymm,
+           NULL::varchar AS class3,
+           SUM(sale_amt) AS sale_amt,
+           NULL::number AS item_rnk,
+           COUNT(*) AS record_cnt,
+           COUNT(DISTINCT chnl_nm) AS channel_cnt,
+           COUNT(DISTINCT class3) AS item_cnt,
+           COUNT(DISTINCT pst_yyyymm) AS month_cnt
+    FROM raw
+    
+    UNION ALL
+    
+    SELECT 'channel_month', chnl_nm, pst_yyyymm, NULL, SUM(sale_amt), NULL, NULL, NULL, NULL, NULL
+    FROM raw
+    GROUP BY chnl_nm, pst_yyyymm
+    
+    UNION ALL
+    
+    SELECT 'channel_item_top5', chnl_nm, NULL, class3, sale_amt, item_rnk, NULL, NULL, NULL, NULL
+    FROM chnl_item
+    WHERE item_rnk <= 5
+    
+    ORDER BY agg_level, chnl_nm, pst_yyyymm, item_rnk
     """
 
 
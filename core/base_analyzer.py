@@ -4,8 +4,14 @@
 - 공통 기능(DB 연결, 파일 저장, LLM 호출 등)을 제공합니다
 """
 
+import logging
+import atexit
 import sys
 import os
+import time
+import asyncio
+import hashlib
+import threading
 import polars as pl
 from datetime import datetime
 
@@ -17,6 +23,12 @@ from config.analysis_config import BRAND_CODE_MAP
 from core.llm_client import LLMClient
 from core.file_manager import FileManager
 
+logger = logging.getLogger(__name__)
+
+# 쿼리 결과 캐시 설정 (마감된 월 데이터는 자주 바뀌지 않으므로 24시간 재사용)
+QUERY_CACHE_PATH = './cache/query'
+QUERY_CACHE_TTL = 24 * 60 * 60  # 초 단위
+
 
 class BaseAnalyzer:
     """
@@ -35,42 +47,90 @@ class BaseAnalyzer:
                 
                 # 파일 저장
                 self.save_markdown(response, "분석결과")
+    
+    여러 분석을 동시에 실행하려면 *_async 메서드를 run_concurrently로 묶습니다:
+        BaseAnalyzer.run_concurrently(
+            brand.analyze_domestic_profit_loss_async(),
+            brand.analyze_export_profit_loss_async(),
+            channel.analyze_channel_sales_trend_async(),
+        )
     """
     
-    def __init__(self, yyyymm, brd_cd=None):
+    # 인스턴스 속성 고정 (브랜드×월 조합으로 분석기를 대량 생성할 때 __dict__ 생략)
+    # 하위 클래스는 빈 __slots__ = ()를 선언해야 효과가 유지됨
+    __slots__ = (
+        "yyyymm", "yyyymm_py", "brd_cd", "brd_name", "refresh",
+        "year_str", "month_str", "py_year_str", "py_month_str",
+    )
+    
+    # 모든 분석기 인스턴스가 공유하는 클라이언트 (최초 생성 시 한 번만 초기화)
+    # 브랜드/분석별로 분석기를 여러 개 만들어도 DB 커넥션 풀과 HTTP 커넥션을 재사용
+    engine = None
+    llm_client = None
+    file_manager = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, yyyymm, brd_cd=None, refresh=False):
         """
         분석기 초기화
         
         Args:
             yyyymm (str): 분석할 년월 (예: '202509')
             brd_cd (str, optional): 브랜드 코드 (예: 'M', 'X'). None이면 전체 브랜드 분석
+            refresh (bool): True면 캐시된 쿼리 결과를 무시하고 DB에서 다시 조회
         """
-        # DB 연결
-        self.engine = SQLUtil.get_snowflake_engine()
+        # DB 연결 및 LLM/파일 유틸리티 (공유 인스턴스)
+        BaseAnalyzer._init_shared_clients()
         
         # 분석 기간 설정
         self.yyyymm = yyyymm  # 당해 년월
         self.yyyymm_py = str(int(yyyymm[:4]) - 1) + yyyymm[4:]  # 전년 동월
         
+        # 프롬프트/출력에서 반복 사용하는 년·월 문자열 (한 번만 슬라이싱)
+        self.year_str, self.month_str = self.yyyymm[:4], self.yyyymm[4:6]
+        self.py_year_str, self.py_month_str = self.yyyymm_py[:4], self.yyyymm_py[4:6]
+        
         # 브랜드 정보
         self.brd_cd = brd_cd
         self.brd_name = BRAND_CODE_MAP.get(brd_cd, brd_cd) if brd_cd else "전체"
         
-        # 유틸리티 초기화
-        self.llm_client = LLMClient()
-        self.file_manager = FileManager()
+        # 쿼리 캐시 재생성 여부
+        self.refresh = refresh
         
-        print(f"🔧 분석기 초기화: {self.brd_name} ({yyyymm})")
+        logger.info(f"🔧 분석기 초기화: {self.brd_name} ({yyyymm})")
     
-    def __del__(self):
-        """소멸자 - DB 연결 종료"""
-        if hasattr(self, 'engine'):
-            self.engine.dispose()
+    @staticmethod
+    def _init_shared_clients():
+        """공유 DB 엔진과 LLM/파일 유틸리티를 아직 없을 때만 생성 (스레드 안전)"""
+        with BaseAnalyzer._shared_lock:
+            if BaseAnalyzer.engine is None:
+                BaseAnalyzer.engine = SQLUtil.get_snowflake_engine()
+            if BaseAnalyzer.llm_client is None:
+                BaseAnalyzer.llm_client = LLMClient()
+            if BaseAnalyzer.file_manager is None:
+                BaseAnalyzer.file_manager = FileManager()
+    
+    @staticmethod
+    def dispose_shared_clients():
+        """
+        공유 DB 엔진의 커넥션 풀 정리 (배치 작업 종료 시 호출)
+        
+        run_brand_analyses/run_cost_analyses가 끝날 때 호출되며, 그 외 경로를 위해 종료 시에도 호출됩니다(atexit).
+        이후 새 분석기를 만들면 엔진이 다시 생성됩니다.
+        """
+        with BaseAnalyzer._shared_lock:
+            if BaseAnalyzer.engine is not None:
+                BaseAnalyzer.engine.dispose()
+                BaseAnalyzer.engine = None
     
     def execute_query(self, sql_query):
         """
         SQL 쿼리를 실행하고 결과를 DataFrame으로 반환
         
+        같은 쿼리(동일 SQL, 년월, 브랜드)의 결과는 parquet 파일로 캐시되어
+        QUERY_CACHE_TTL 동안 DB 조회 없이 재사용됩니다.
+        (LLM 호출 실패 후 재실행 시 DB 왕복을 생략)
+        
         Args:
             sql_query (str): 실행할 SQL 쿼리
         
@@ -81,15 +141,45 @@ class BaseAnalyzer:
             df = self.execute_query("SELECT * FROM table WHERE yyyymm = '202509'")
             records = df.to_dicts()  # 딕셔너리 리스트로 변환
         """
+        cache_path = self._get_query_cache_path(sql_query)
+        
+        if not self.refresh and os.path.exists(cache_path):
+            if time.time() - os.path.getmtime(cache_path) < QUERY_CACHE_TTL:
+                df = pl.read_parquet(cache_path)
+                logger.info(f"♻️ 캐시된 쿼리 결과 사용: {len(df)}개 행 ({cache_path})")
+                return df
+        
         try:
-            print(f"📊 SQL 쿼리 실행 중...")
+            logger.info(f"📊 SQL 쿼리 실행 중...")
             df = pl.read_database(sql_query, self.engine)
-            print(f"✅ 쿼리 실행 완료: {len(df)}개 행 조회")
-            return df
+            logger.info(f"✅ 쿼리 실행 완료: {len(df)}개 행 조회")
         except Exception as e:
             error_msg = f"❌ SQL 쿼리 실행 실패: {e}"
-            print(error_msg)
+            logger.error(error_msg)
             raise Exception(error_msg)
+        
+        try:
+            os.makedirs(QUERY_CACHE_PATH, exist_ok=True)
+            df.write_parquet(cache_path, compression="zstd")
+        except Exception as e:
+            # 캐시 저장 실패는 분석 결과에 영향을 주지 않음
+            logger.warning(f"⚠️ 쿼리 캐시 저장 실패: {e}")
+        
+        return df
+    
+    def _get_query_cache_path(self, sql_query):
+        """
+        쿼리 캐시 파일 경로 생성
+        
+        Args:
+            sql_query (str): 실행할 SQL 쿼리
+        
+        Returns:
+            str: 캐시 파일 경로 (SQL과 분석 파라미터의 해시값 기준)
+        """
+        key = "\x1f".join([sql_query, self.yyyymm, self.yyyymm_py, self.brd_cd or ""])
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(QUERY_CACHE_PATH, f"{digest}.parquet")
     
     def call_llm(self, prompt, use_system_prompt=True):
         """
@@ -107,32 +197,131 @@ class BaseAnalyzer:
         """
         return self.llm_client.send_message(prompt, use_system_prompt)
     
-    def save_markdown(self, content, filename):
+    def call_llm_stream(self, prompt, use_system_prompt=True):
+        """
+        LLM을 스트리밍으로 호출 (텍스트 조각 단위로 반환)
+        
+        Args:
+            prompt (str): LLM에 전달할 프롬프트
+            use_system_prompt (bool): 공통 시스템 프롬프트 사용 여부
+        
+        Returns:
+            iterator: LLM이 생성한 텍스트 조각들
+        
+        사용 예시:
+            for chunk in self.call_llm_stream("이 데이터를 분석해주세요: {data}"):
+                print(chunk, end="")
+        """
+        return self.llm_client.stream_message(prompt, use_system_prompt)
+    
+    def call_llm_to_markdown(self, prompt, filename, use_system_prompt=True):
+        """
+        LLM 응답을 스트리밍으로 받아 Markdown 파일에 바로 저장
+        
+        Args:
+            prompt (str): LLM에 전달할 프롬프트
+            filename (str): 파일명 (확장자 제외)
+            use_system_prompt (bool): 공통 시스템 프롬프트 사용 여부
+        
+        Returns:
+            str: LLM이 생성한 전체 분석 텍스트
+        
+        사용 예시:
+            response = self.call_llm_to_markdown(prompt, "01.M_브랜드_내수_손익분석")
+        """
+        chunks = self.call_llm_stream(prompt, use_system_prompt)
+        return self.file_manager.save_markdown_stream(chunks, filename)
+    
+    async def call_llm_async(self, prompt, use_system_prompt=True):
+        """
+        LLM을 비동기로 호출하여 분석 텍스트 생성 (call_llm의 비동기 버전)
+        
+        Args:
+            prompt (str): LLM에 전달할 프롬프트
+            use_system_prompt (bool): 공통 시스템 프롬프트 사용 여부
+        
+        Returns:
+            str: LLM이 생성한 분석 텍스트
+        
+        사용 예시:
+            response = await self.call_llm_async("이 데이터를 분석해주세요: {data}")
+        """
+        return await self.llm_client.send_message_async(prompt, use_system_prompt)
+    
+    @staticmethod
+    def run_concurrently(*coroutines, max_concurrency=None):
+        """
+        여러 비동기 분석을 동시에 실행
+        
+        LLM 호출은 I/O 대기 시간이 대부분이므로 동시에 실행하면
+        전체 소요 시간이 가장 오래 걸리는 분석 하나의 시간으로 줄어듭니다.
+        
+        Args:
+            *coroutines: analyze_*_async() 코루틴들
+            max_concurrency (int, optional): 동시에 실행할 최대 분석 수
+                (여러 브랜드를 한 번에 돌릴 때 Claude API 분당 요청 한도 보호용, None이면 제한 없음)
+        
+        Returns:
+            list: 각 분석의 결과 (전달한 순서대로)
+        """
+        async def _limited(semaphore, coroutine):
+            async with semaphore:
+                return await coroutine
+        
+        async def _gather():
+            if max_concurrency:
+                semaphore = asyncio.Semaphore(max_concurrency)
+                return await asyncio.gather(*(_limited(semaphore, c) for c in coroutines))
+            return await asyncio.gather(*coroutines)
+        
+        results = asyncio.run(_gather())
+        BaseAnalyzer.wait_for_saves()
+        return results
+    
+    def save_markdown(self, content, filename, background=False):
         """
         Markdown 파일로 저장
         
         Args:
             content (str): 저장할 마크다운 내용
             filename (str): 파일명 (확장자 제외)
+            background (bool): True면 백그라운드 스레드에서 저장하고 Future를 바로 반환
+                (완료 대기는 wait_for_saves)
         
         사용 예시:
             self.save_markdown(response, "01.M_브랜드_내수_손익분석")
         """
+        if background:
+            return self.file_manager.save_markdown_background(content, filename)
         return self.file_manager.save_markdown(content, filename)
     
-    def save_json(self, data, filename):
+    def save_json(self, data, filename, background=False):
         """
         JSON 파일로 저장
         
         Args:
             data (dict): 저장할 JSON 데이터
             filename (str): 파일명 (확장자 제외)
+            background (bool): True면 백그라운드 스레드에서 저장하고 Future를 바로 반환
+                (완료 대기는 wait_for_saves)
         
         사용 예시:
             self.save_json({"result": "..."}, "01.M_브랜드_내수_손익분석")
         """
+        if background:
+            return self.file_manager.save_json_background(data, filename)
         return self.file_manager.save_json(data, filename)
     
+    @staticmethod
+    def wait_for_saves():
+        """
+        백그라운드로 요청한 파일 저장이 모두 끝날 때까지 대기
+        
+        여러 분석을 실행한 뒤 결과 파일을 읽기 전에 한 번 호출합니다.
+        """
+        if BaseAnalyzer.file_manager is not None:
+            BaseAnalyzer.file_manager.wait_pending()
+    
     def read_markdown(self, filename):
         """
         기존에 저장된 Markdown 파일 읽기
@@ -171,6 +360,30 @@ class BaseAnalyzer:
             return [self.convert_decimal_to_float(item) for item in obj]
         return obj
     
+    def cast_decimal_columns(self, df):
+        """
+        DataFrame의 Decimal 컬럼을 모두 Float64로 변환 (JSON 직렬화용)
+        
+        to_dicts() 이후 convert_decimal_to_float로 하나씩 변환하는 대신
+        DataFrame 단계에서 컬럼 단위로 한 번에 변환합니다.
+        
+        Args:
+            df (polars.DataFrame): 쿼리 결과
+        
+        Returns:
+            polars.DataFrame: Decimal 컬럼이 Float64로 변환된 DataFrame
+        
+        사용 예시:
+            df = self.cast_decimal_columns(self.execute_query(sql))
+            records = df.to_dicts()  # float 값으로 바로 JSON 저장 가능
+        """
+        decimal_columns = [
+            name for name, dtype in df.schema.items() if isinstance(dtype, pl.Decimal)
+        ]
+        if not decimal_columns:
+            return df
+        return df.with_columns(pl.col(decimal_columns).cast(pl.Float64))
+    
     def format_filename(self, prefix, suffix):
         """
         파일명을 일관된 형식으로 생성
@@ -191,3 +404,6 @@ class BaseAnalyzer:
         else:
             return f"{prefix}.{suffix}"
 
+
+# 배치 함수를 거치지 않고 분석기를 직접 사용한 경우에도 종료 시 커넥션 풀 정리
+atexit.register(BaseAnalyzer.dispose_shared_clients)
@@ -4,11 +4,28 @@
 - 모든 분석 결과는 이 모듈을 통해 저장됩니다
 """
 
+import logging
 import json
 import os
+import decimal
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from config.analysis_config import OUTPUT_JSON_PATH, OUTPUT_MD_PATH
 
+logger = logging.getLogger(__name__)
+
+# 백그라운드 파일 저장용 스레드 풀 (LLM 응답 후 파일 쓰기를 기다리지 않고 다음 분석 진행)
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-io")
+
+
+def _json_default(obj):
+    """orjson이 기본 지원하지 않는 타입(Decimal) 변환"""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    raise TypeError(f"JSON 직렬화할 수 없는 타입: {type(obj).__name__}")
+
 
 class FileManager:
     """
@@ -18,6 +35,10 @@ class FileManager:
         manager = FileManager()
         manager.save_markdown(content, "01.M_브랜드_내수_손익분석")
         manager.save_json(data, "01.M_브랜드_내수_손익분석")
+        
+        # 백그라운드 저장 후 마지막에 한 번 대기
+        manager.save_markdown_background(content, "01.M_브랜드_내수_손익분석")
+        manager.wait_pending()
     """
     
     def __init__(self):
@@ -25,7 +46,11 @@ class FileManager:
         # 출력 폴더가 없으면 생성
         os.makedirs(OUTPUT_JSON_PATH, exist_ok=True)
         os.makedirs(OUTPUT_MD_PATH, exist_ok=True)
-        print(f"📁 출력 폴더 확인: {OUTPUT_JSON_PATH}, {OUTPUT_MD_PATH}")
+        logger.info(f"📁 출력 폴더 확인: {OUTPUT_JSON_PATH}, {OUTPUT_MD_PATH}")
+        
+        # 아직 끝나지 않았을 수 있는 백그라운드 저장 작업들
+        self._pending = []
+        self._pending_lock = threading.Lock()
     
     def save_markdown(self, content, filename):
         """
@@ -44,12 +69,43 @@ class FileManager:
             with open(file_path, "w", encoding="utf-8") as f:
                 f.write(content)
             
-            print(f"✅ Markdown 파일 저장 완료: {file_path}")
+            logger.info(f"✅ Markdown 파일 저장 완료: {file_path}")
             return file_path
             
         except Exception as e:
             error_msg = f"❌ Markdown 저장 실패 ({filename}): {e}"
-            print(error_msg)
+            logger.error(error_msg)
+            raise Exception(error_msg)
+    
+    def save_markdown_stream(self, chunks, filename):
+        """
+        텍스트 조각을 받는 대로 Markdown 파일에 기록
+        
+        LLM 스트리밍 응답을 그대로 파일에 쓰므로 응답 대기와 파일 쓰기가 겹쳐지고,
+        생성 중에도 파일 내용을 확인할 수 있습니다.
+        
+        Args:
+            chunks (iterable): 저장할 텍스트 조각들
+            filename (str): 파일명 (확장자 제외)
+        
+        Returns:
+            str: 저장된 전체 내용
+        """
+        try:
+            file_path = os.path.join(OUTPUT_MD_PATH, f"{filename}.md")
+            parts = []
+            
+            with open(file_path, "w", encoding="utf-8") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    parts.append(chunk)
+            
+            logger.info(f"✅ Markdown 파일 저장 완료: {file_path}")
+            return "".join(parts)
+            
+        except Exception as e:
+            error_msg = f"❌ Markdown 저장 실패 ({filename}): {e}"
+            logger.error(error_msg)
             raise Exception(error_msg)
     
     def save_json(self, data, filename):
@@ -63,18 +119,83 @@ class FileManager:
         Returns:
             str: 저장된 파일의 전체 경로
         """
+        return self._write_json(self._encode_json(data, filename), filename)
+    
+    def save_markdown_background(self, content, filename):
+        """
+        Markdown 파일을 백그라운드 스레드에서 저장
+        
+        Args:
+            content (str): 저장할 마크다운 내용
+            filename (str): 파일명 (확장자 제외)
+        
+        Returns:
+            concurrent.futures.Future: 저장 작업 (결과는 저장된 파일 경로)
+        """
+        return self._submit(self.save_markdown, content, filename)
+    
+    def save_json_background(self, data, filename):
+        """
+        JSON 파일을 백그라운드 스레드에서 저장
+        
+        직렬화는 호출 시점에 바로 수행하므로, 반환 후 data를 수정해도 저장 내용에 영향이 없습니다.
+        
+        Args:
+            data (dict): 저장할 JSON 데이터
+            filename (str): 파일명 (확장자 제외)
+        
+        Returns:
+            concurrent.futures.Future: 저장 작업 (결과는 저장된 파일 경로)
+        """
+        return self._submit(self._write_json, self._encode_json(data, filename), filename)
+    
+    def wait_pending(self):
+        """
+        백그라운드 저장 작업이 모두 끝날 때까지 대기
+        
+        실패한 저장이 있으면 첫 번째 예외를 다시 발생시킵니다.
+        """
+        with self._pending_lock:
+            futures, self._pending = self._pending, []
+        
+        for future in futures:
+            future.result()
+    
+    def _submit(self, fn, *args):
+        """저장 작업을 I/O 스레드 풀에 제출하고 대기 목록에 추가"""
+        future = _IO_POOL.submit(fn, *args)
+        with self._pending_lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(future)
+        return future
+    
+    def _encode_json(self, data, filename):
+        """JSON 데이터를 bytes로 직렬화"""
+        try:
+            return orjson.dumps(
+                data,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except Exception as e:
+            error_msg = f"❌ JSON 저장 실패 ({filename}): {e}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+    
+    def _write_json(self, payload, filename):
+        """직렬화된 JSON bytes를 파일로 저장"""
         try:
             file_path = os.path.join(OUTPUT_JSON_PATH, f"{filename}.json")
             
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(file_path, "wb") as f:
+                f.write(payload)
             
-            print(f"✅ JSON 파일 저장 완료: {file_path}")
+            logger.info(f"✅ JSON 파일 저장 완료: {file_path}")
             return file_path
             
         except Exception as e:
             error_msg = f"❌ JSON 저장 실패 ({filename}): {e}"
-            print(error_msg)
+            logger.error(error_msg)
             raise Exception(error_msg)
     
     def read_markdown(self, filename):
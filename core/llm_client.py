@@ -4,7 +4,9 @@ LLM 클라이언트 모듈
 - 모든 분석에서 이 모듈을 사용하여 LLM을 호출합니다
 """
 
+import logging
 import anthropic
+import asyncio
 import time
 import sys
 import os
@@ -14,6 +16,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from settings import Config
 from config.analysis_config import COMMON_SYSTEM_PROMPT, LLM_CONFIG
 
+logger = logging.getLogger(__name__)
+
 
 class LLMClient:
     """
@@ -22,6 +26,7 @@ class LLMClient:
     사용 예시:
         client = LLMClient()
         response = client.send_message("분석할 데이터는...")
+        response = await client.send_message_async("분석할 데이터는...")  # 비동기 호출
     """
     
     def __init__(self):
@@ -30,6 +35,16 @@ class LLMClient:
             api_key=Config.CLAUDE_API_KEY,
             timeout=LLM_CONFIG['timeout']
         )
+        self.async_client = anthropic.AsyncAnthropic(
+            api_key=Config.CLAUDE_API_KEY,
+            timeout=LLM_CONFIG['timeout']
+        )
+    
+    def _build_prompt(self, prompt, use_system_prompt):
+        """시스템 프롬프트 적용 여부에 따라 최종 프롬프트 생성"""
+        if use_system_prompt:
+            return COMMON_SYSTEM_PROMPT + "\n\n" + prompt
+        return prompt
     
     def send_message(self, prompt, use_system_prompt=True, retry_count=None):
         """
@@ -50,15 +65,12 @@ class LLMClient:
             retry_count = LLM_CONFIG['retry_count']
         
         # 시스템 프롬프트 적용 여부 결정
-        if use_system_prompt:
-            full_prompt = COMMON_SYSTEM_PROMPT + "\n\n" + prompt
-        else:
-            full_prompt = prompt
+        full_prompt = self._build_prompt(prompt, use_system_prompt)
         
         # 재시도 로직
         for attempt in range(retry_count):
             try:
-                print(f"Claude API 호출 시도 {attempt + 1}/{retry_count}")
+                logger.info(f"Claude API 호출 시도 {attempt + 1}/{retry_count}")
                 
                 message = self.client.messages.create(
                     model=Config.CLAUDE_MODEL_VERSION,
@@ -69,25 +81,127 @@ class LLMClient:
                 
                 # 응답이 잘렸는지 확인
                 if message.stop_reason == "max_tokens":
-                    print("⚠️ 경고: 응답이 잘렸습니다! (max_tokens 초과)")
+                    logger.warning("⚠️ 경고: 응답이 잘렸습니다! (max_tokens 초과)")
                 
-                print("✅ Claude API 호출 성공!")
+                logger.info("✅ Claude API 호출 성공!")
                 return message.content[0].text
                 
             except Exception as e:
-                print(f"❌ 시도 {attempt + 1} 실패: {e}")
+                logger.error(f"❌ 시도 {attempt + 1} 실패: {e}")
                 
                 # 마지막 시도가 아니면 대기 후 재시도
                 if attempt < retry_count - 1:
                     wait_time = (attempt + 1) * 5  # 5초, 10초, 15초 대기
-                    print(f"⏳ {wait_time}초 대기 후 재시도...")
+                    logger.info(f"⏳ {wait_time}초 대기 후 재시도...")
                     time.sleep(wait_time)
                 else:
                     # 모든 시도 실패
                     error_msg = f"API 호출 실패 (네트워크 오류): {e}"
-                    print(f"❌ {error_msg}")
+                    logger.error(f"❌ {error_msg}")
                     raise Exception(error_msg)
         
         # 이 코드는 실행되지 않아야 하지만, 안전을 위해 추가
         raise Exception("예상치 못한 오류 발생")
-
+    
+    def stream_message(self, prompt, use_system_prompt=True, retry_count=None):
+        """
+        Claude API 응답을 스트리밍으로 받습니다 (텍스트 조각 단위로 yield)
+        
+        첫 조각을 받기 전에 실패하면 send_message와 같은 방식으로 재시도하고,
+        스트리밍 도중 실패하면 이미 전달된 조각이 있으므로 바로 예외를 발생시킵니다.
+        
+        Args:
+            prompt (str): LLM에 전달할 프롬프트
+            use_system_prompt (bool): 공통 시스템 프롬프트 사용 여부
+            retry_count (int): 재시도 횟수 (None이면 설정값 사용)
+        
+        Yields:
+            str: LLM이 생성한 텍스트 조각
+        """
+        if retry_count is None:
+            retry_count = LLM_CONFIG['retry_count']
+        
+        full_prompt = self._build_prompt(prompt, use_system_prompt)
+        
+        for attempt in range(retry_count):
+            started = False
+            try:
+                logger.info(f"Claude API 스트리밍 호출 시도 {attempt + 1}/{retry_count}")
+                
+                with self.client.messages.stream(
+                    model=Config.CLAUDE_MODEL_VERSION,
+                    max_tokens=LLM_CONFIG['max_tokens'],
+                    temperature=LLM_CONFIG['temperature'],
+                    messages=[{"role": "user", "content": full_prompt}]
+                ) as stream:
+                    for text in stream.text_stream:
+                        started = True
+                        yield text
+                    message = stream.get_final_message()
+                
+                if message.stop_reason == "max_tokens":
+                    logger.warning("⚠️ 경고: 응답이 잘렸습니다! (max_tokens 초과)")
+                
+                logger.info("✅ Claude API 호출 성공!")
+                return
+                
+            except Exception as e:
+                logger.error(f"❌ 시도 {attempt + 1} 실패: {e}")
+                
+                if not started and attempt < retry_count - 1:
+                    wait_time = (attempt + 1) * 5
+                    logger.info(f"⏳ {wait_time}초 대기 후 재시도...")
+                    time.sleep(wait_time)
+                else:
+                    error_msg = f"API 호출 실패 (네트워크 오류): {e}"
+                    logger.error(f"❌ {error_msg}")
+                    raise Exception(error_msg)
+    
+    async def send_message_async(self, prompt, use_system_prompt=True, retry_count=None):
+        """
+        Claude API에 메시지를 비동기로 전송하고 응답을 받습니다
+        
+        여러 분석의 LLM 호출을 asyncio.gather로 동시에 실행할 때 사용합니다.
+        인자와 재시도 정책은 send_message와 동일합니다.
+        
+        Returns:
+            str: LLM이 생성한 분석 텍스트
+        
+        Raises:
+            Exception: 모든 재시도 실패 시 예외 발생
+        """
+        if retry_count is None:
+            retry_count = LLM_CONFIG['retry_count']
+        
+        full_prompt = self._build_prompt(prompt, use_system_prompt)
+        
+        for attempt in range(retry_count):
+            try:
+                logger.info(f"Claude API 비동기 호출 시도 {attempt + 1}/{retry_count}")
+                
+                message = await self.async_client.messages.create(
+                    model=Config.CLAUDE_MODEL_VERSION,
+                    max_tokens=LLM_CONFIG['max_tokens'],
+                    temperature=LLM_CONFIG['temperature'],
+                    messages=[{"role": "user", "content": full_prompt}]
+                )
+                
+                if message.stop_reason == "max_tokens":
+                    logger.warning("⚠️ 경고: 응답이 잘렸습니다! (max_tokens 초과)")
+                
+                logger.info("✅ Claude API 호출 성공!")
+                return message.content[0].text
+                
+            except Exception as e:
+                logger.error(f"❌ 시도 {attempt + 1} 실패: {e}")
+                
+                if attempt < retry_count - 1:
+                    wait_time = (attempt + 1) * 5
+                    logger.info(f"⏳ {wait_time}초 대기 후 재시도...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    error_msg = f"API 호출 실패 (네트워크 오류): {e}"
+                    logger.error(f"❌ {error_msg}")
+                    raise Exception(error_msg)
+        
+        raise Exception("예상치 못한 오류 발생")
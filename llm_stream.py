@@ -0,0 +1,70 @@
+"""
+LLM 스트리밍 응답 처리 (cn_analysis.py / pl_analysis.py 공용)
+- 스트리밍으로 받는 응답에서 최상위 JSON 객체가 완성되는 시점을 감지합니다
+"""
+
+import orjson
+
+
+def read_json_stream(stream):
+    """
+    스트리밍 응답을 받으면서 최상위 JSON 객체가 닫히는 시점을 바로 감지
+    
+    - '{' ~ 짝이 맞는 '}'가 도착하면 그 구간을 orjson으로 검증 (실패하면 다음 '{'부터 다시 탐색)
+    - JSON이 완성된 뒤 공백/코드 블록 표시(```)가 아닌 텍스트가 이어지면
+      (응답 뒤에 붙는 부연 설명) 스트림을 닫아 불필요한 출력 토큰 생성을 중단
+    
+    Returns:
+        tuple: (응답 텍스트, 메시지)
+               중단한 경우 메시지는 중단 시점의 스냅샷이라 출력 토큰 수가 실제보다 적게 잡힐 수 있음
+    """
+    chunks = []
+    length = 0
+    depth = 0
+    in_string = False
+    escape = False
+    obj_start = None
+    json_done = False
+    
+    for text in stream.text_stream:
+        if json_done:
+            if text.strip().strip('`'):
+                # JSON 뒤 부연 설명은 버리고 생성을 중단
+                return "".join(chunks), stream.current_message_snapshot
+            chunks.append(text)
+            continue
+        
+        chunks.append(text)
+        for i, ch in enumerate(text, length):
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == '\\':
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                if obj_start is not None:
+                    in_string = True
+            elif ch == '{':
+                if obj_start is None:
+                    obj_start = i
+                depth += 1
+            elif ch == '}' and obj_start is not None:
+                depth -= 1
+                if depth == 0:
+                    response_text = "".join(chunks)
+                    try:
+                        orjson.loads(response_text[obj_start:i + 1])
+                    except orjson.JSONDecodeError:
+                        obj_start = None
+                        continue
+                    # 검증된 JSON 뒤의 나머지 텍스트(같은 조각 안)만 남기고 이후 조각은 위에서 처리
+                    if response_text[i + 1:].strip().strip('`'):
+                        return response_text[:i + 1], stream.current_message_snapshot
+                    chunks = [response_text]
+                    json_done = True
+                    break
+        length += len(text)
+    
+    return "".join(chunks), stream.get_final_message()
@@ -6,7 +6,13 @@
 """
 
 import os
-import json
+import logging
+import atexit
+import threading
+import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
 import polars as pl
 import anthropic
 from datetime import datetime, timedelta
@@ -14,6 +20,7 @@ from decimal import Decimal
 from sqlalchemy import create_engine
 from snowflake.sqlalchemy import URL
 from dotenv import load_dotenv
+from llm_stream import read_json_stream
 
 # 환경 변수 로드
 load_dotenv()
@@ -40,8 +47,15 @@ os.makedirs(OUTPUT_MD_PATH, exist_ok=True)
 # ============================================================================
 # DB 연결
 # ============================================================================
+@functools.lru_cache(maxsize=1)
 def get_db_engine():
-    """Snowflake DB 연결 엔진 생성"""
+    """
+    Snowflake DB 연결 엔진 생성
+    
+    프로세스 내에서 한 번만 생성되어 재사용됩니다.
+    (커넥션 풀을 통해 매 분석마다 Snowflake 인증을 다시 하지 않음)
+    분석 함수에서는 dispose하지 않으며, 풀 정리는 종료 시 _dispose_db_engine에서 수행합니다.
+    """
     account = os.getenv('SNOWFLAKE_ACCOUNT')
     user = os.getenv('SNOWFLAKE_USER')
     password = os.getenv('SNOWFLAKE_PASSWORD')
@@ -62,16 +76,62 @@ def get_db_engine():
             schema=schema,
             warehouse=warehouse,
             role=role,
-        )
+        ),
+        pool_size=4,
+        pool_pre_ping=True,
+        pool_recycle=3600,
     )
 
+@atexit.register
+def _dispose_db_engine():
+    """프로세스 종료 시 공유 엔진의 커넥션 풀을 한 번만 정리"""
+    if get_db_engine.cache_info().currsize:
+        get_db_engine().dispose()
+
 # ============================================================================
 # SQL 쿼리 실행
 # ============================================================================
-def run_query(sql, engine):
-    """SQL 쿼리 실행하고 DataFrame 반환"""
+def _cursor_to_dataframe(cursor):
+    """
+    실행이 끝난 Snowflake 커서의 결과를 Polars DataFrame으로 변환
+    
+    Snowflake 커넥터가 내부적으로 받은 Arrow 결과(fetch_arrow_all)를 그대로 Polars로 변환하여
+    Python 튜플 행을 만들고 다시 컬럼으로 바꾸는 과정을 생략합니다.
+    """
+    arrow_table = cursor.fetch_arrow_all()
+    if arrow_table is None:
+        # 결과가 0건이면 Arrow 테이블이 없으므로 컬럼만 있는 빈 DataFrame 생성
+        return pl.DataFrame(schema=[col[0] for col in cursor.description])
+    
+    df = pl.from_arrow(arrow_table)
+    # NUMBER(p,s) 컬럼은 Decimal로 들어오므로 컬럼 단위로 한 번에 Float64 변환
+    # (이후 to_dicts()/JSON 직렬화 시 값마다 Decimal 변환을 거치지 않음)
+    decimal_columns = [
+        name for name, dtype in df.schema.items() if isinstance(dtype, pl.Decimal)
+    ]
+    if decimal_columns:
+        df = df.with_columns(pl.col(decimal_columns).cast(pl.Float64))
+    return df
+
+def run_query(sql, engine=None):
+    """
+    SQL 쿼리 실행하고 DataFrame 반환 (engine을 생략하면 공유 엔진 사용)
+    
+    커넥션은 엔진의 커넥션 풀에서 빌려 쓰고 반환합니다.
+    """
+    if engine is None:
+        engine = get_db_engine()
     print(f"[SQL] 쿼리 실행 중...")
-    df = pl.read_database(sql, engine)
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql)
+            df = _cursor_to_dataframe(cursor)
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
     print(f"[OK] {len(df)}개 행 조회 완료")
     return df
 
@@ -79,17 +139,16 @@ def run_query(sql, engine):
 # LLM 호출
 # ============================================================================
 # 전역 토큰 사용량 추적
-_total_tokens_used = {'input': 0, 'output': 0}
+_total_tokens_used = {'input': 0, 'output': 0, 'cache_read': 0, 'cache_creation': 0}
+_token_lock = threading.Lock()  # 여러 스레드에서 call_llm을 동시에 호출해도 누락 없이 합산
 
-def call_llm(prompt, max_tokens=4000, temperature=0.7):
-    """Claude API 호출"""
-    api_key = os.getenv('CLAUDE_API_KEY')
-    if not api_key:
-        raise ValueError("CLAUDE_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
-    
-    client = anthropic.Anthropic(api_key=api_key, timeout=120.0)
-    
-    system_prompt = """
+# Claude 클라이언트는 프로세스 전체에서 하나만 생성해 HTTP 연결(TLS 핸드셰이크)을 재사용
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+# 공통 시스템 프롬프트 (모든 분석에서 동일 → Anthropic 프롬프트 캐싱 대상)
+LLM_MODEL = 'claude-sonnet-4-20250514'
+SYSTEM_PROMPT = """
 당신은 F&F 그룹의 최고 전략 분석가입니다. 다음 원칙을 반드시 준수하세요:
 
 📊 **분석 원칙**
@@ -113,37 +172,151 @@ def call_llm(prompt, max_tokens=4000, temperature=0.7):
 - 근거 기반의 객관적 분석
 - 이상징후나 특이사항 언급
 """
+
+# LLM 응답 캐시 (동일 프롬프트 재실행 시 API 호출 생략, 년월/브랜드 단위로 삭제 가능)
+LLM_CACHE_PATH = './kr_output/llm_cache'
+# 이 값보다 높은 temperature의 응답은 무작위 샘플이므로 캐시하지 않음 (캐시가 한 번의 샘플을 영구 결과로 고정하지 않도록)
+LLM_CACHE_MAX_TEMPERATURE = 0.3
+# 분석 함수의 LLM 호출 temperature (결정적인 분석 결과 + 응답 캐시 재사용)
+ANALYSIS_TEMPERATURE = 0.3
+
+def _get_llm_cache_path(prompt, max_tokens, temperature):
+    """모델/시스템 프롬프트/프롬프트/옵션으로 응답 캐시 파일 경로 생성"""
+    key_source = "\x1f".join([LLM_MODEL, SYSTEM_PROMPT, prompt, str(max_tokens), str(temperature)])
+    key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    return os.path.join(LLM_CACHE_PATH, f"{key}.json")
+
+def invalidate_cache(yyyymm=None, brd_cd=None):
+    """
+    LLM 응답 캐시 삭제
+    
+    Args:
+        yyyymm: 삭제할 년월 (None이면 모든 년월)
+        brd_cd: 삭제할 브랜드 코드 (None이면 모든 브랜드)
+    
+    Returns:
+        int: 삭제한 캐시 파일 수
+    """
+    if not os.path.isdir(LLM_CACHE_PATH):
+        return 0
+    
+    removed = 0
+    for name in os.listdir(LLM_CACHE_PATH):
+        if not name.endswith('.json'):
+            continue
+        cache_path = os.path.join(LLM_CACHE_PATH, name)
+        try:
+            with open(cache_path, 'rb') as f:
+                entry = orjson.loads(f.read())
+        except (OSError, ValueError):
+            continue
+        if yyyymm is not None and entry.get('yyyymm') != yyyymm:
+            continue
+        if brd_cd is not None and entry.get('brd_cd') != brd_cd:
+            continue
+        os.remove(cache_path)
+        removed += 1
     
-    full_prompt = system_prompt + "\n\n" + prompt
+    print(f"[CACHE] LLM 응답 캐시 {removed}개 삭제 (yyyymm={yyyymm}, brd_cd={brd_cd})")
+    return removed
+
+def _get_llm_client():
+    """공유 Claude 클라이언트 반환 (최초 호출 시 생성)"""
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            api_key = os.getenv('CLAUDE_API_KEY')
+            if not api_key:
+                raise ValueError("CLAUDE_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+            _llm_client = anthropic.Anthropic(api_key=api_key, timeout=120.0)
+        return _llm_client
+
+def call_llm(prompt, max_tokens=4000, temperature=0.7, force_refresh=False, yyyymm=None, brd_cd=None):
+    """
+    Claude API 호출
+    
+    응답은 프롬프트 전체의 sha256 기준으로 LLM_CACHE_PATH에 저장되어 재실행 시 그대로 반환
+    (force_refresh=True면 캐시를 무시하고 다시 호출)
+    yyyymm/brd_cd는 캐시 항목에 기록되어 invalidate_cache로 해당 년월/브랜드만 삭제할 때 사용
+    temperature가 LLM_CACHE_MAX_TEMPERATURE보다 높으면 캐시를 읽지도 저장하지도 않음
+    """
+    cache_path = _get_llm_cache_path(prompt, max_tokens, temperature)
+    use_cache = temperature <= LLM_CACHE_MAX_TEMPERATURE
+    if use_cache and not force_refresh and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = orjson.loads(f.read())
+            print(f"[CACHE] 캐시된 LLM 응답 사용 ({cache_path})")
+            return cached['response']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] LLM 응답 캐시 읽기 실패, 다시 호출합니다: {e}")
     
+    client = _get_llm_client()
+    
+    # 시스템 프롬프트는 별도 블록으로 보내 프롬프트 캐시(cache_control)로 재사용
+    # 스트리밍으로 받으면서 JSON이 완성되는 시점을 감지 (llm_stream.read_json_stream)
     print(f"[LLM] Claude API 호출 중...")
-    message = client.messages.create(
-        model='claude-sonnet-4-20250514',
+    with client.messages.stream(
+        model=LLM_MODEL,
         max_tokens=max_tokens,
         temperature=temperature,
-        messages=[{"role": "user", "content": full_prompt}]
-    )
+        system=[{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+        messages=[{"role": "user", "content": prompt}]
+    ) as stream:
+        response_text, message = read_json_stream(stream)
     
     # 토큰 사용량 추적
     if hasattr(message, 'usage') and message.usage:
         input_tokens = message.usage.input_tokens if hasattr(message.usage, 'input_tokens') else 0
         output_tokens = message.usage.output_tokens if hasattr(message.usage, 'output_tokens') else 0
-        _total_tokens_used['input'] += input_tokens
-        _total_tokens_used['output'] += output_tokens
-        print(f"[OK] LLM 응답 완료 (입력: {input_tokens:,} 토큰, 출력: {output_tokens:,} 토큰, 총: {input_tokens + output_tokens:,} 토큰)")
+        # 프롬프트 캐시 적중/생성 토큰 (input_tokens에는 포함되지 않음)
+        cache_read_tokens = getattr(message.usage, 'cache_read_input_tokens', 0) or 0
+        cache_creation_tokens = getattr(message.usage, 'cache_creation_input_tokens', 0) or 0
+        with _token_lock:
+            _total_tokens_used['input'] += input_tokens
+            _total_tokens_used['output'] += output_tokens
+            _total_tokens_used['cache_read'] += cache_read_tokens
+            _total_tokens_used['cache_creation'] += cache_creation_tokens
+        print(f"[OK] LLM 응답 완료 (입력: {input_tokens:,} 토큰, 출력: {output_tokens:,} 토큰, 총: {input_tokens + output_tokens:,} 토큰, "
+              f"캐시 읽기: {cache_read_tokens:,} 토큰, 캐시 생성: {cache_creation_tokens:,} 토큰)")
     else:
         print(f"[OK] LLM 응답 완료")
     
-    return message.content[0].text
+    if not use_cache:
+        return response_text
+    
+    usage = getattr(message, 'usage', None)
+    cache_entry = {
+        'prompt_hash': os.path.splitext(os.path.basename(cache_path))[0],
+        'response': response_text,
+        'usage': {
+            'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+            'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+        },
+        'yyyymm': yyyymm,
+        'brd_cd': brd_cd,
+        'ts': datetime.now().isoformat(timespec='seconds'),
+    }
+    try:
+        os.makedirs(LLM_CACHE_PATH, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            f.write(orjson.dumps(cache_entry))
+    except OSError as e:
+        # 캐시 저장 실패는 분석 결과에 영향을 주지 않음
+        print(f"[WARNING] LLM 응답 캐시 저장 실패: {e}")
+    
+    return response_text
 
 def get_total_tokens():
     """전체 토큰 사용량 반환"""
-    return _total_tokens_used.copy()
+    with _token_lock:
+        return _total_tokens_used.copy()
 
 def reset_token_counter():
     """토큰 카운터 초기화"""
-    global _total_tokens_used
-    _total_tokens_used = {'input': 0, 'output': 0}
+    with _token_lock:
+        for key in _total_tokens_used:
+            _total_tokens_used[key] = 0
 
 # ============================================================================
 # 파일 저장
@@ -172,16 +345,26 @@ def save_markdown(content, filename):
     print(f"[OK] Markdown 저장: {file_path}")
     return file_path
 
-class DecimalEncoder(json.JSONEncoder):
-    """Decimal 타입을 float로 변환하는 JSON 인코더"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+def _json_default(obj):
+    """orjson이 기본 지원하지 않는 타입(Decimal) 변환 - 쿼리 결과는 run_query에서 이미 float로 변환됨"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"JSON 직렬화할 수 없는 타입: {type(obj).__name__}")
 
-def json_dumps_safe(obj, **kwargs):
-    """Decimal 타입을 안전하게 처리하는 json.dumps 래퍼"""
-    return json.dumps(obj, cls=DecimalEncoder, **kwargs)
+def json_dumps_bytes(obj, *, indent=False):
+    """Decimal 타입을 안전하게 처리하는 JSON 직렬화 - orjson 결과(UTF-8 bytes)를 그대로 반환"""
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=_json_default, option=option)
+
+def json_dumps_safe(obj, indent=None, **kwargs):
+    """
+    json_dumps_bytes의 str 버전 (프롬프트 f-string 삽입용)
+    
+    orjson은 항상 UTF-8로 출력하므로 ensure_ascii 등 나머지 인자는 무시됨
+    """
+    return json_dumps_bytes(obj, indent=bool(indent)).decode("utf-8")
 
 def extract_key_from_filename(filename):
     """
@@ -232,9 +415,8 @@ def save_json(data, filename):
     
     # JSON 데이터에 KEY, sub_key, country 추가 (지정된 순서로)
     if isinstance(data, dict):
-        # 순서를 보장하기 위해 OrderedDict 사용
-        from collections import OrderedDict
-        new_data = OrderedDict()
+        # dict는 삽입 순서를 유지하므로 아래 순서대로 채움
+        new_data = {}
         
         # 1. country (항상 첫 번째)
         if 'country' in data:
@@ -279,11 +461,11 @@ def save_json(data, filename):
             if k not in ['country', 'brand_cd', 'brand_name', 'yyyymm', 'yyyymm_py', 'key', 'sub_key', 'analysis_data']:
                 new_data[k] = v
         
-        data = dict(new_data)  # OrderedDict를 일반 dict로 변환 (Python 3.7+에서는 순서 보장)
+        data = new_data
     
     file_path = os.path.join(OUTPUT_JSON_PATH, f"{filename}.json")
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, cls=DecimalEncoder)
+    with open(file_path, "wb") as f:
+        f.write(json_dumps_bytes(data, indent=True))
     print(f"[OK] JSON 저장: {file_path}")
     return file_path
 
@@ -642,150 +824,149 @@ def analyze_channel_sales(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    previous_year = current_year - 1
+    yyyymm_py = f"{previous_year:04d}{current_month:02d}"
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행 (한 번만 조회)
+    sql = get_channel_sales_cypy_query(yyyymm, yyyymm_py, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = sum(float(r.get('SALE_AMT', 0)) for r in records)
+    unique_channels = len(set(r.get('CHNL_NM', '') for r in records))
+    unique_items = len(set(r.get('CLASS3', '') for r in records))
+    unique_months = len(set(r.get('PST_YYYYMM', '') for r in records))
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"채널 수: {unique_channels}개")
+    print(f"아이템 수: {unique_items}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 채널별 요약 데이터 생성
+    channel_summary = {}
+    for record in records:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        month = record.get('PST_YYYYMM', '')
+        sale_amt = float(record.get('SALE_AMT', 0))
         
-        # SQL 쿼리 실행 (한 번만 조회)
-        sql = get_channel_sales_cypy_query(yyyymm, yyyymm_py, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
+        if chnl_nm not in channel_summary:
+            channel_summary[chnl_nm] = {
+                'total_sales': 0,
+                'months': {},
+                'top_items': []
+            }
         
-        if not records:
-            print("데이터가 없습니다.")
-            return None
+        channel_summary[chnl_nm]['total_sales'] += sale_amt
         
-        # 데이터 요약
-        total_sales = sum(float(r.get('SALE_AMT', 0)) for r in records)
-        unique_channels = len(set(r.get('CHNL_NM', '') for r in records))
-        unique_items = len(set(r.get('CLASS3', '') for r in records))
-        unique_months = len(set(r.get('PST_YYYYMM', '') for r in records))
+        if month not in channel_summary[chnl_nm]['months']:
+            channel_summary[chnl_nm]['months'][month] = 0
+        channel_summary[chnl_nm]['months'][month] += sale_amt
+    
+    # 채널별 상위 아이템 추출
+    item_sales_by_channel = {}
+    for record in records:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        class3 = record.get('CLASS3', '기타')
+        sale_amt = float(record.get('SALE_AMT', 0))
+        
+        key = (chnl_nm, class3)
+        if key not in item_sales_by_channel:
+            item_sales_by_channel[key] = {
+                'chnl_nm': chnl_nm,
+                'class3': class3,
+                'total_sales': 0
+            }
+        item_sales_by_channel[key]['total_sales'] += sale_amt
+    
+    # 채널별로 상위 5개 아이템 추출
+    for chnl_nm in channel_summary.keys():
+        channel_items = [
+            item for key, item in item_sales_by_channel.items()
+            if item['chnl_nm'] == chnl_nm
+        ]
+        channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
+        channel_summary[chnl_nm]['top_items'] = [
+            {
+                'class3': item['class3'],
+                'total_sales': round(item['total_sales'] / 1000000, 2)
+            }
+            for item in channel_items[:5]
+        ]
+        channel_summary[chnl_nm]['total_sales'] = round(
+            channel_summary[chnl_nm]['total_sales'] / 1000000, 2
+        )
+    
+    # 월별 합계 계산
+    monthly_totals = {}
+    for record in records:
+        month = record.get('PST_YYYYMM', '')
+        sale_amt = float(record.get('SALE_AMT', 0))
+        if month not in monthly_totals:
+            monthly_totals[month] = 0
+        monthly_totals[month] += sale_amt
+    
+    monthly_totals_list = [
+        {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
+        for month, amount in sorted(monthly_totals.items())
+    ]
+    
+    # 채널별로 당해/전년 데이터 존재 여부 확인
+    channel_data_check = {}
+    for record in records:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        month = record.get('PST_YYYYMM', '')
         
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"채널 수: {unique_channels}개")
-        print(f"아이템 수: {unique_items}개")
-        print(f"분석 월 수: {unique_months}개월")
+        if chnl_nm not in channel_data_check:
+            channel_data_check[chnl_nm] = {
+                'has_current': False,
+                'has_previous': False
+            }
         
-        # 채널별 요약 데이터 생성
-        channel_summary = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            month = record.get('PST_YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            
-            if chnl_nm not in channel_summary:
-                channel_summary[chnl_nm] = {
-                    'total_sales': 0,
-                    'months': {},
-                    'top_items': []
-                }
-            
-            channel_summary[chnl_nm]['total_sales'] += sale_amt
-            
-            if month not in channel_summary[chnl_nm]['months']:
-                channel_summary[chnl_nm]['months'][month] = 0
-            channel_summary[chnl_nm]['months'][month] += sale_amt
+        if month == yyyymm:
+            channel_data_check[chnl_nm]['has_current'] = True
+        elif month == yyyymm_py:
+            channel_data_check[chnl_nm]['has_previous'] = True
+    
+    # 당해/전년 데이터가 모두 있는 채널만 필터링
+    valid_channels = [
+        chnl for chnl, check in channel_data_check.items()
+        if check['has_current'] and check['has_previous']
+    ]
+    
+    # 채널별 데이터 요약 (당해/전년 비교용)
+    channel_comparison = {}
+    for chnl_nm in valid_channels:
+        current_data = [r for r in records if r.get('CHNL_NM') == chnl_nm and r.get('PST_YYYYMM') == yyyymm]
+        previous_data = [r for r in records if r.get('CHNL_NM') == chnl_nm and r.get('PST_YYYYMM') == yyyymm_py]
         
-        # 채널별 상위 아이템 추출
-        item_sales_by_channel = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            class3 = record.get('CLASS3', '기타')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            
-            key = f"{chnl_nm}|{class3}"
-            if key not in item_sales_by_channel:
-                item_sales_by_channel[key] = {
-                    'chnl_nm': chnl_nm,
-                    'class3': class3,
-                    'total_sales': 0
-                }
-            item_sales_by_channel[key]['total_sales'] += sale_amt
+        # 채널별 TOP 3 아이템 (당해 기준)
+        current_items = sorted(current_data, key=lambda x: float(x.get('SALE_AMT', 0)), reverse=True)[:3]
         
-        # 채널별로 상위 5개 아이템 추출
-        for chnl_nm in channel_summary.keys():
-            channel_items = [
-                item for key, item in item_sales_by_channel.items()
-                if item['chnl_nm'] == chnl_nm
-            ]
-            channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            channel_summary[chnl_nm]['top_items'] = [
+        channel_comparison[chnl_nm] = {
+            'current_top3': [
                 {
-                    'class3': item['class3'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2)
-                }
-                for item in channel_items[:5]
-            ]
-            channel_summary[chnl_nm]['total_sales'] = round(
-                channel_summary[chnl_nm]['total_sales'] / 1000000, 2
-            )
-        
-        # 월별 합계 계산
-        monthly_totals = {}
-        for record in records:
-            month = record.get('PST_YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            if month not in monthly_totals:
-                monthly_totals[month] = 0
-            monthly_totals[month] += sale_amt
-        
-        monthly_totals_list = [
-            {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
-            for month, amount in sorted(monthly_totals.items())
-        ]
-        
-        # 채널별로 당해/전년 데이터 존재 여부 확인
-        channel_data_check = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            month = record.get('PST_YYYYMM', '')
-            
-            if chnl_nm not in channel_data_check:
-                channel_data_check[chnl_nm] = {
-                    'has_current': False,
-                    'has_previous': False
+                    'class3': item.get('CLASS3', ''),
+                    'sale_amt': round(float(item.get('SALE_AMT', 0)) / 1000000, 2),
+                    'sale_ratio': float(item.get('SALE_RATIO', 0))
                 }
-            
-            if month == yyyymm:
-                channel_data_check[chnl_nm]['has_current'] = True
-            elif month == yyyymm_py:
-                channel_data_check[chnl_nm]['has_previous'] = True
-        
-        # 당해/전년 데이터가 모두 있는 채널만 필터링
-        valid_channels = [
-            chnl for chnl, check in channel_data_check.items()
-            if check['has_current'] and check['has_previous']
-        ]
-        
-        # 채널별 데이터 요약 (당해/전년 비교용)
-        channel_comparison = {}
-        for chnl_nm in valid_channels:
-            current_data = [r for r in records if r.get('CHNL_NM') == chnl_nm and r.get('PST_YYYYMM') == yyyymm]
-            previous_data = [r for r in records if r.get('CHNL_NM') == chnl_nm and r.get('PST_YYYYMM') == yyyymm_py]
-            
-            # 채널별 TOP 3 아이템 (당해 기준)
-            current_items = sorted(current_data, key=lambda x: float(x.get('SALE_AMT', 0)), reverse=True)[:3]
-            
-            channel_comparison[chnl_nm] = {
-                'current_top3': [
-                    {
-                        'class3': item.get('CLASS3', ''),
-                        'sale_amt': round(float(item.get('SALE_AMT', 0)) / 1000000, 2),
-                        'sale_ratio': float(item.get('SALE_RATIO', 0))
-                    }
-                    for item in current_items
-                ],
-                'current_total': round(sum(float(r.get('SALE_AMT', 0)) for r in current_data) / 1000000, 2),
-                'previous_total': round(sum(float(r.get('SALE_AMT', 0)) for r in previous_data) / 1000000, 2)
-            }
-        
-        # LLM 프롬프트 생성 (JSON 형식 응답 요청)
-        prompt = f"""
+                for item in current_items
+            ],
+            'current_total': round(sum(float(r.get('SALE_AMT', 0)) for r in current_data) / 1000000, 2),
+            'previous_total': round(sum(float(r.get('SALE_AMT', 0)) for r in previous_data) / 1000000, 2)
+        }
+    
+    # LLM 프롬프트 생성 (JSON 형식 응답 요청)
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 채널 전략 전문가야. 각 채널별 당해 당월 매출 베스트 아이템 3개를 전년대비 주요변화로 분석해줘.
 
 **분석 기간**
@@ -839,185 +1020,185 @@ def analyze_channel_sales(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "채널별 매출 분석 (12개월 추이)",
-                "sections": [
-                    {"sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'unique_channels': unique_channels,
-                'unique_items': unique_items,
-                'unique_months': unique_months,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'PST_YYYYMM': r.get('PST_YYYYMM', ''),
-                        'CHNL_NM': r.get('CHNL_NM', ''),
-                        'CLASS3': r.get('CLASS3', ''),
-                        'SALE_AMT': float(r.get('SALE_AMT', 0)),
-                        'SALE_AMT_CHNL_TTL': float(r.get('SALE_AMT_CHNL_TTL', 0)),
-                        'SALE_RATIO': float(r.get('SALE_RATIO', 0)),
-                        'IN_YMM_RNK': int(r.get('IN_YMM_RNK', 0)),
-                        'IN_CHNL_RNK': int(r.get('IN_CHNL_RNK', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('PST_YYYYMM', '') for r in records))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('PST_YYYYMM', ''),
-                        'chnl_nm': r.get('CHNL_NM', ''),
-                        'class3': r.get('CLASS3', ''),
-                        'sale_amt': round(float(r.get('SALE_AMT', 0)) / 1000000, 2),
-                        'sale_ratio': float(r.get('SALE_RATIO', 0))
-                    }
-                    for r in records
-                ]
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "채널별 매출 분석 (12개월 추이)",
+            "sections": [
+                {"sub_title": "분석 결과", "ai_text": analysis_response}
+            ]
         }
-        
-        # ============================================================
-        # 두 번째 분석: 브랜드별 채널 매출 종합분석 (OVERALL)
-        # ============================================================
-        print(f"\n{'='*60}")
-        print(f"채널별 매출 종합분석 시작 (OVERALL): {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
-        print(f"{'='*60}")
-        
-        # 데이터 요약 (두 번째 분석용)
-        current_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm]
-        previous_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm_py]
-        
-        total_sales_cy = sum(float(r.get('SALE_AMT', 0)) for r in current_data)
-        total_sales_py = sum(float(r.get('SALE_AMT', 0)) for r in previous_data)
-        
-        print(f"전년 매출액: {total_sales_py:,.0f}원 ({total_sales_py/1000000:.2f}백만원)")
-        print(f"당해 매출액: {total_sales_cy:,.0f}원 ({total_sales_cy/1000000:.2f}백만원)")
-        
-        # 채널별 요약 데이터 생성 (당해/전년 비교)
-        channel_summary_overall = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            month = record.get('PST_YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            
-            if chnl_nm not in channel_summary_overall:
-                channel_summary_overall[chnl_nm] = {
-                    'current_sales': 0,
-                    'previous_sales': 0,
-                    'all_items': []
-                }
-            
-            if month == yyyymm:
-                channel_summary_overall[chnl_nm]['current_sales'] += sale_amt
-            elif month == yyyymm_py:
-                channel_summary_overall[chnl_nm]['previous_sales'] += sale_amt
-        
-        # 채널별 상위 아이템 추출 (당해 기준)
-        item_sales_by_channel_overall = {}
-        for record in current_data:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            class3 = record.get('CLASS3', '기타')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            
-            key = f"{chnl_nm}|{class3}"
-            if key not in item_sales_by_channel_overall:
-                item_sales_by_channel_overall[key] = {
-                    'chnl_nm': chnl_nm,
-                    'class3': class3,
-                    'total_sales': 0
+    
+    # JSON 데이터 생성
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'unique_channels': unique_channels,
+            'unique_items': unique_items,
+            'unique_months': unique_months,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'PST_YYYYMM': r.get('PST_YYYYMM', ''),
+                    'CHNL_NM': r.get('CHNL_NM', ''),
+                    'CLASS3': r.get('CLASS3', ''),
+                    'SALE_AMT': float(r.get('SALE_AMT', 0)),
+                    'SALE_AMT_CHNL_TTL': float(r.get('SALE_AMT_CHNL_TTL', 0)),
+                    'SALE_RATIO': float(r.get('SALE_RATIO', 0)),
+                    'IN_YMM_RNK': int(r.get('IN_YMM_RNK', 0)),
+                    'IN_CHNL_RNK': int(r.get('IN_CHNL_RNK', 0))
                 }
-            item_sales_by_channel_overall[key]['total_sales'] += sale_amt
-        
-        # 채널별로 전체 아이템 추출 (top3 제한 없음)
-        for chnl_nm in channel_summary_overall.keys():
-            channel_items = [
-                item for key, item in item_sales_by_channel_overall.items()
-                if item['chnl_nm'] == chnl_nm
-            ]
-            channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            # 모든 아이템 포함 (제한 없음)
-            channel_summary_overall[chnl_nm]['all_items'] = [
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
+        },
+        'trend_data': {
+            'trend_months': sorted(list(set(r.get('PST_YYYYMM', '') for r in records))),
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': [
                 {
-                    'class3': item['class3'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2)
+                    'yyyymm': r.get('PST_YYYYMM', ''),
+                    'chnl_nm': r.get('CHNL_NM', ''),
+                    'class3': r.get('CLASS3', ''),
+                    'sale_amt': round(float(r.get('SALE_AMT', 0)) / 1000000, 2),
+                    'sale_ratio': float(r.get('SALE_RATIO', 0))
                 }
-                for item in channel_items
+                for r in records
             ]
-            channel_summary_overall[chnl_nm]['current_sales'] = round(
-                channel_summary_overall[chnl_nm]['current_sales'] / 1000000, 2
-            )
-            channel_summary_overall[chnl_nm]['previous_sales'] = round(
-                channel_summary_overall[chnl_nm]['previous_sales'] / 1000000, 2
-            )
-            if channel_summary_overall[chnl_nm]['previous_sales'] > 0:
-                channel_summary_overall[chnl_nm]['change_pct'] = round(
-                    ((channel_summary_overall[chnl_nm]['current_sales'] - channel_summary_overall[chnl_nm]['previous_sales']) / channel_summary_overall[chnl_nm]['previous_sales'] * 100), 1
-                )
-            else:
-                channel_summary_overall[chnl_nm]['change_pct'] = 0
+        }
+    }
+    
+    # ============================================================
+    # 두 번째 분석: 브랜드별 채널 매출 종합분석 (OVERALL)
+    # ============================================================
+    print(f"\n{'='*60}")
+    print(f"채널별 매출 종합분석 시작 (OVERALL): {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"{'='*60}")
+    
+    # 데이터 요약 (두 번째 분석용)
+    current_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm]
+    previous_data = [r for r in records if r.get('PST_YYYYMM') == yyyymm_py]
+    
+    total_sales_cy = sum(float(r.get('SALE_AMT', 0)) for r in current_data)
+    total_sales_py = sum(float(r.get('SALE_AMT', 0)) for r in previous_data)
+    
+    print(f"전년 매출액: {total_sales_py:,.0f}원 ({total_sales_py/1000000:.2f}백만원)")
+    print(f"당해 매출액: {total_sales_cy:,.0f}원 ({total_sales_cy/1000000:.2f}백만원)")
+    
+    # 채널별 요약 데이터 생성 (당해/전년 비교)
+    channel_summary_overall = {}
+    for record in records:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        month = record.get('PST_YYYYMM', '')
+        sale_amt = float(record.get('SALE_AMT', 0))
         
-        # 채널별로 당해/전년 데이터 존재 여부 확인
-        channel_data_check_overall = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            month = record.get('PST_YYYYMM', '')
-            
-            if chnl_nm not in channel_data_check_overall:
-                channel_data_check_overall[chnl_nm] = {
-                    'has_current': False,
-                    'has_previous': False
-                }
-            
-            if month == yyyymm:
-                channel_data_check_overall[chnl_nm]['has_current'] = True
-            elif month == yyyymm_py:
-                channel_data_check_overall[chnl_nm]['has_previous'] = True
+        if chnl_nm not in channel_summary_overall:
+            channel_summary_overall[chnl_nm] = {
+                'current_sales': 0,
+                'previous_sales': 0,
+                'all_items': []
+            }
         
-        # 당해/전년 데이터가 모두 있는 채널만 필터링
-        valid_channels_overall = [
-            channel for channel, check in channel_data_check_overall.items()
-            if check['has_current'] and check['has_previous']
+        if month == yyyymm:
+            channel_summary_overall[chnl_nm]['current_sales'] += sale_amt
+        elif month == yyyymm_py:
+            channel_summary_overall[chnl_nm]['previous_sales'] += sale_amt
+    
+    # 채널별 상위 아이템 추출 (당해 기준)
+    item_sales_by_channel_overall = {}
+    for record in current_data:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        class3 = record.get('CLASS3', '기타')
+        sale_amt = float(record.get('SALE_AMT', 0))
+        
+        key = (chnl_nm, class3)
+        if key not in item_sales_by_channel_overall:
+            item_sales_by_channel_overall[key] = {
+                'chnl_nm': chnl_nm,
+                'class3': class3,
+                'total_sales': 0
+            }
+        item_sales_by_channel_overall[key]['total_sales'] += sale_amt
+    
+    # 채널별로 전체 아이템 추출 (top3 제한 없음)
+    for chnl_nm in channel_summary_overall.keys():
+        channel_items = [
+            item for key, item in item_sales_by_channel_overall.items()
+            if item['chnl_nm'] == chnl_nm
         ]
+        channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
+        # 모든 아이템 포함 (제한 없음)
+        channel_summary_overall[chnl_nm]['all_items'] = [
+            {
+                'class3': item['class3'],
+                'total_sales': round(item['total_sales'] / 1000000, 2)
+            }
+            for item in channel_items
+        ]
+        channel_summary_overall[chnl_nm]['current_sales'] = round(
+            channel_summary_overall[chnl_nm]['current_sales'] / 1000000, 2
+        )
+        channel_summary_overall[chnl_nm]['previous_sales'] = round(
+            channel_summary_overall[chnl_nm]['previous_sales'] / 1000000, 2
+        )
+        if channel_summary_overall[chnl_nm]['previous_sales'] > 0:
+            channel_summary_overall[chnl_nm]['change_pct'] = round(
+                ((channel_summary_overall[chnl_nm]['current_sales'] - channel_summary_overall[chnl_nm]['previous_sales']) / channel_summary_overall[chnl_nm]['previous_sales'] * 100), 1
+            )
+        else:
+            channel_summary_overall[chnl_nm]['change_pct'] = 0
+    
+    # 채널별로 당해/전년 데이터 존재 여부 확인
+    channel_data_check_overall = {}
+    for record in records:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        month = record.get('PST_YYYYMM', '')
+        
+        if chnl_nm not in channel_data_check_overall:
+            channel_data_check_overall[chnl_nm] = {
+                'has_current': False,
+                'has_previous': False
+            }
         
-        # LLM 프롬프트 생성 (종합분석용)
-        prompt_overall = f"""
+        if month == yyyymm:
+            channel_data_check_overall[chnl_nm]['has_current'] = True
+        elif month == yyyymm_py:
+            channel_data_check_overall[chnl_nm]['has_previous'] = True
+    
+    # 당해/전년 데이터가 모두 있는 채널만 필터링
+    valid_channels_overall = [
+        channel for channel, check in channel_data_check_overall.items()
+        if check['has_current'] and check['has_previous']
+    ]
+    
+    # LLM 프롬프트 생성 (종합분석용)
+    prompt_overall = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 채널 전략 전문가야. 브랜드 전체 채널을 종합적으로 분석하여 최고 성과 채널, 개선 필요 채널, 핵심 제안을 도출해줘.
 
 **분석 기간**
@@ -1079,158 +1260,155 @@ def analyze_channel_sales(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (종합분석용)
-        analysis_response_overall = call_llm(prompt_overall, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response_overall = analysis_response_overall.strip()
-        if analysis_response_overall.startswith('```json'):
-            analysis_response_overall = analysis_response_overall[7:]
-        if analysis_response_overall.startswith('```'):
-            analysis_response_overall = analysis_response_overall[3:]
-        if analysis_response_overall.endswith('```'):
-            analysis_response_overall = analysis_response_overall[:-3]
-        analysis_response_overall = analysis_response_overall.strip()
-        
-        try:
-            analysis_data_overall = json.loads(analysis_response_overall)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response_overall[:500]}")
-            # 기본 구조로 대체
-            analysis_data_overall = {
-                "title": "브랜드별 채널 매출 종합분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "최고 성과 채널", "ai_text": analysis_response_overall},
-                    {"div": "종합분석-2", "sub_title": "개선 필요 채널", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "핵심 제안", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 생성 (종합분석용)
-        json_data_overall = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data_overall,
-            'summary': {
-                'total_sales_cy': round(total_sales_cy / 1000000, 2),
-                'total_sales_py': round(total_sales_py / 1000000, 2),
-                'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py != 0 else 0, 1),
-                'unique_channels': unique_channels,
-                'unique_items': unique_items,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary_overall,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'PST_YYYYMM': r.get('PST_YYYYMM', ''),
-                        'CHNL_NM': r.get('CHNL_NM', ''),
-                        'CLASS3': r.get('CLASS3', ''),
-                        'SALE_AMT': float(r.get('SALE_AMT', 0)),
-                        'SALE_AMT_CHNL_TTL': float(r.get('SALE_AMT_CHNL_TTL', 0)),
-                        'SALE_RATIO': float(r.get('SALE_RATIO', 0)),
-                        'IN_YMM_RNK': int(r.get('IN_YMM_RNK', 0)),
-                        'IN_CHNL_RNK': int(r.get('IN_CHNL_RNK', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (종합분석용)
+    analysis_response_overall = call_llm(prompt_overall, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response_overall = analysis_response_overall.strip()
+    if analysis_response_overall.startswith('```json'):
+        analysis_response_overall = analysis_response_overall[7:]
+    if analysis_response_overall.startswith('```'):
+        analysis_response_overall = analysis_response_overall[3:]
+    if analysis_response_overall.endswith('```'):
+        analysis_response_overall = analysis_response_overall[:-3]
+    analysis_response_overall = analysis_response_overall.strip()
+    
+    try:
+        analysis_data_overall = orjson.loads(analysis_response_overall)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response_overall[:500]}")
+        # 기본 구조로 대체
+        analysis_data_overall = {
+            "title": "브랜드별 채널 매출 종합분석",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "최고 성과 채널", "ai_text": analysis_response_overall},
+                {"div": "종합분석-2", "sub_title": "개선 필요 채널", "ai_text": ""},
+                {"div": "종합분석-3", "sub_title": "핵심 제안", "ai_text": ""}
+            ]
         }
-        
-        # ============================================================
-        # 채널별 섹션과 종합분석을 하나로 통합
-        # ============================================================
-        
-        # 종합분석 섹션을 채널별 섹션 뒤에 추가
-        # 종합분석의 div를 "종합분석-1", "종합분석-2" 형태로 변경
-        overall_sections = []
-        for idx, section in enumerate(analysis_data_overall.get('sections', []), 1):
-            overall_sections.append({
-                'div': f'종합분석-{idx}',
-                'sub_title': section.get('sub_title', ''),
-                'ai_text': section.get('ai_text', '')
-            })
-        
-        # 채널별 섹션 + 종합분석 섹션 통합
-        combined_sections = analysis_data.get('sections', []) + overall_sections
-        analysis_data_combined = {
-            'title': analysis_data.get('title', '채널별 매출 top3 분석 (당해 전년 주요변화)'),
-            'sections': combined_sections
+    
+    # JSON 데이터 생성 (종합분석용)
+    json_data_overall = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data_overall,
+        'summary': {
+            'total_sales_cy': round(total_sales_cy / 1000000, 2),
+            'total_sales_py': round(total_sales_py / 1000000, 2),
+            'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py != 0 else 0, 1),
+            'unique_channels': unique_channels,
+            'unique_items': unique_items,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary_overall,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'PST_YYYYMM': r.get('PST_YYYYMM', ''),
+                    'CHNL_NM': r.get('CHNL_NM', ''),
+                    'CLASS3': r.get('CLASS3', ''),
+                    'SALE_AMT': float(r.get('SALE_AMT', 0)),
+                    'SALE_AMT_CHNL_TTL': float(r.get('SALE_AMT_CHNL_TTL', 0)),
+                    'SALE_RATIO': float(r.get('SALE_RATIO', 0)),
+                    'IN_YMM_RNK': int(r.get('IN_YMM_RNK', 0)),
+                    'IN_CHNL_RNK': int(r.get('IN_CHNL_RNK', 0))
+                }
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
         }
-        
-        # 통합된 JSON 데이터 생성
-        json_data_combined = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data_combined,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'total_sales_cy': round(total_sales_cy / 1000000, 2),
-                'total_sales_py': round(total_sales_py / 1000000, 2),
-                'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py != 0 else 0, 1),
-                'unique_channels': unique_channels,
-                'unique_items': unique_items,
-                'unique_months': unique_months,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary,
-            'channel_summary_overall': channel_summary_overall,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'PST_YYYYMM': r.get('PST_YYYYMM', ''),
-                        'CHNL_NM': r.get('CHNL_NM', ''),
-                        'CLASS3': r.get('CLASS3', ''),
-                        'SALE_AMT': float(r.get('SALE_AMT', 0)),
-                        'SALE_AMT_CHNL_TTL': float(r.get('SALE_AMT_CHNL_TTL', 0)),
-                        'SALE_RATIO': float(r.get('SALE_RATIO', 0)),
-                        'IN_YMM_RNK': int(r.get('IN_YMM_RNK', 0)),
-                        'IN_CHNL_RNK': int(r.get('IN_CHNL_RNK', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('PST_YYYYMM', '') for r in records))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('PST_YYYYMM', ''),
-                        'chnl_nm': r.get('CHNL_NM', ''),
-                        'class3': r.get('CLASS3', ''),
-                        'sale_amt': round(float(r.get('SALE_AMT', 0)) / 1000000, 2),
-                        'sale_ratio': float(r.get('SALE_RATIO', 0))
-                    }
-                    for r in records
-                ]
-            }
+    }
+    
+    # ============================================================
+    # 채널별 섹션과 종합분석을 하나로 통합
+    # ============================================================
+    
+    # 종합분석 섹션을 채널별 섹션 뒤에 추가
+    # 종합분석의 div를 "종합분석-1", "종합분석-2" 형태로 변경
+    overall_sections = []
+    for idx, section in enumerate(analysis_data_overall.get('sections', []), 1):
+        overall_sections.append({
+            'div': f'종합분석-{idx}',
+            'sub_title': section.get('sub_title', ''),
+            'ai_text': section.get('ai_text', '')
+        })
+    
+    # 채널별 섹션 + 종합분석 섹션 통합
+    combined_sections = analysis_data.get('sections', []) + overall_sections
+    analysis_data_combined = {
+        'title': analysis_data.get('title', '채널별 매출 top3 분석 (당해 전년 주요변화)'),
+        'sections': combined_sections
+    }
+    
+    # 통합된 JSON 데이터 생성
+    json_data_combined = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data_combined,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'total_sales_cy': round(total_sales_cy / 1000000, 2),
+            'total_sales_py': round(total_sales_py / 1000000, 2),
+            'change_pct': round(((total_sales_cy - total_sales_py) / total_sales_py * 100) if total_sales_py != 0 else 0, 1),
+            'unique_channels': unique_channels,
+            'unique_items': unique_items,
+            'unique_months': unique_months,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary,
+        'channel_summary_overall': channel_summary_overall,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'PST_YYYYMM': r.get('PST_YYYYMM', ''),
+                    'CHNL_NM': r.get('CHNL_NM', ''),
+                    'CLASS3': r.get('CLASS3', ''),
+                    'SALE_AMT': float(r.get('SALE_AMT', 0)),
+                    'SALE_AMT_CHNL_TTL': float(r.get('SALE_AMT_CHNL_TTL', 0)),
+                    'SALE_RATIO': float(r.get('SALE_RATIO', 0)),
+                    'IN_YMM_RNK': int(r.get('IN_YMM_RNK', 0)),
+                    'IN_CHNL_RNK': int(r.get('IN_CHNL_RNK', 0))
+                }
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
+        },
+        'trend_data': {
+            'trend_months': sorted(list(set(r.get('PST_YYYYMM', '') for r in records))),
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': [
+                {
+                    'yyyymm': r.get('PST_YYYYMM', ''),
+                    'chnl_nm': r.get('CHNL_NM', ''),
+                    'class3': r.get('CLASS3', ''),
+                    'sale_amt': round(float(r.get('SALE_AMT', 0)) / 1000000, 2),
+                    'sale_ratio': float(r.get('SALE_RATIO', 0))
+                }
+                for r in records
+            ]
         }
-        
-        # 파일 저장 (통합된 결과)
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_실판매출_채널별매출분석"
-        save_json(json_data_combined, filename)
-        
-        # Markdown도 저장 (통합된 sections를 조합)
-        markdown_content = f"# {analysis_data_combined.get('title', '채널별 매출 분석')}\n\n"
-        for section in analysis_data_combined.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 채널별 TOP3 분석 및 종합분석 완료!\n")
-        return json_data_combined
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장 (통합된 결과)
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_실판매출_채널별매출분석"
+    save_json(json_data_combined, filename)
+    
+    # Markdown도 저장 (통합된 sections를 조합)
+    markdown_content = f"# {analysis_data_combined.get('title', '채널별 매출 분석')}\n\n"
+    for section in analysis_data_combined.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 채널별 TOP3 분석 및 종합분석 완료!\n")
+    return json_data_combined
 
 # analyze_channel_sales_overall 함수는 analyze_channel_sales 함수에 통합되었습니다.
 # 이 함수는 더 이상 사용되지 않습니다.
@@ -1244,169 +1422,168 @@ def analyze_gender_purchase_pattern(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행
-        sql = get_gender_purchase_pattern_query(yyyymm, yyyymm_py, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
-        total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
-        unique_genders = len(set(r.get('SEX_NM', '') for r in records))
-        unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
-        unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
-        unique_months = len(set(r.get('YYYY_MM', '') for r in records))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"총 판매수량: {total_qty:,.0f}개")
-        print(f"성별 수: {unique_genders}개")
-        print(f"카테고리 수: {unique_categories}개")
-        print(f"아이템 수: {unique_items}개")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 성별별 요약 데이터 생성
-        gender_summary = {}
-        for record in records:
-            sex_nm = record.get('SEX_NM', '기타')
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            sale_qty = float(record.get('SALE_QTY', 0))
-            
-            if sex_nm not in gender_summary:
-                gender_summary[sex_nm] = {
-                    'total_sales': 0,
-                    'total_qty': 0,
-                    'months': {},
-                    'top_items': []
-                }
-            
-            gender_summary[sex_nm]['total_sales'] += sale_amt
-            gender_summary[sex_nm]['total_qty'] += sale_qty
-            
-            if month not in gender_summary[sex_nm]['months']:
-                gender_summary[sex_nm]['months'][month] = {'sales': 0, 'qty': 0}
-            gender_summary[sex_nm]['months'][month]['sales'] += sale_amt
-            gender_summary[sex_nm]['months'][month]['qty'] += sale_qty
-        
-        # 성별별 상위 아이템 추출
-        item_sales_by_gender = {}
-        for record in records:
-            sex_nm = record.get('SEX_NM', '기타')
-            class3 = record.get('PRDT_HRRC3_NM', '기타')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            
-            key = f"{sex_nm}|{class3}"
-            if key not in item_sales_by_gender:
-                item_sales_by_gender[key] = {
-                    'sex_nm': sex_nm,
-                    'class3': class3,
-                    'total_sales': 0
-                }
-            item_sales_by_gender[key]['total_sales'] += sale_amt
-        
-        # 성별별로 상위 5개 아이템 추출
-        for sex_nm in gender_summary.keys():
-            gender_items = [
-                item for key, item in item_sales_by_gender.items()
-                if item['sex_nm'] == sex_nm
-            ]
-            gender_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            gender_summary[sex_nm]['top_items'] = [
-                {
-                    'class3': item['class3'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2)
-                }
-                for item in gender_items[:5]
-            ]
-            gender_summary[sex_nm]['total_sales'] = round(
-                gender_summary[sex_nm]['total_sales'] / 1000000, 2
-            )
-            gender_summary[sex_nm]['total_qty'] = round(
-                gender_summary[sex_nm]['total_qty'], 0
-            )
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    previous_year = current_year - 1
+    yyyymm_py = f"{previous_year:04d}{current_month:02d}"
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행
+    sql = get_gender_purchase_pattern_query(yyyymm, yyyymm_py, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
+    total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
+    unique_genders = len(set(r.get('SEX_NM', '') for r in records))
+    unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
+    unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
+    unique_months = len(set(r.get('YYYY_MM', '') for r in records))
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"총 판매수량: {total_qty:,.0f}개")
+    print(f"성별 수: {unique_genders}개")
+    print(f"카테고리 수: {unique_categories}개")
+    print(f"아이템 수: {unique_items}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 성별별 요약 데이터 생성
+    gender_summary = {}
+    for record in records:
+        sex_nm = record.get('SEX_NM', '기타')
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        sale_qty = float(record.get('SALE_QTY', 0))
+        
+        if sex_nm not in gender_summary:
+            gender_summary[sex_nm] = {
+                'total_sales': 0,
+                'total_qty': 0,
+                'months': {},
+                'top_items': []
+            }
         
-        # 월별 합계 계산
-        monthly_totals = {}
-        for record in records:
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            if month not in monthly_totals:
-                monthly_totals[month] = 0
-            monthly_totals[month] += sale_amt
+        gender_summary[sex_nm]['total_sales'] += sale_amt
+        gender_summary[sex_nm]['total_qty'] += sale_qty
         
-        monthly_totals_list = [
-            {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
-            for month, amount in sorted(monthly_totals.items())
+        if month not in gender_summary[sex_nm]['months']:
+            gender_summary[sex_nm]['months'][month] = {'sales': 0, 'qty': 0}
+        gender_summary[sex_nm]['months'][month]['sales'] += sale_amt
+        gender_summary[sex_nm]['months'][month]['qty'] += sale_qty
+    
+    # 성별별 상위 아이템 추출
+    item_sales_by_gender = {}
+    for record in records:
+        sex_nm = record.get('SEX_NM', '기타')
+        class3 = record.get('PRDT_HRRC3_NM', '기타')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        
+        key = (sex_nm, class3)
+        if key not in item_sales_by_gender:
+            item_sales_by_gender[key] = {
+                'sex_nm': sex_nm,
+                'class3': class3,
+                'total_sales': 0
+            }
+        item_sales_by_gender[key]['total_sales'] += sale_amt
+    
+    # 성별별로 상위 5개 아이템 추출
+    for sex_nm in gender_summary.keys():
+        gender_items = [
+            item for key, item in item_sales_by_gender.items()
+            if item['sex_nm'] == sex_nm
         ]
-        
-        # 성별별로 당해/전년 데이터 존재 여부 확인
-        gender_data_check = {}
-        for record in records:
-            sex_nm = record.get('SEX_NM', '기타')
-            month = record.get('YYYY_MM', '').replace('-', '')
-            
-            if sex_nm not in gender_data_check:
-                gender_data_check[sex_nm] = {
-                    'has_current': False,
-                    'has_previous': False
-                }
-            
-            if month == yyyymm:
-                gender_data_check[sex_nm]['has_current'] = True
-            elif month == yyyymm_py:
-                gender_data_check[sex_nm]['has_previous'] = True
-        
-        # 당해/전년 데이터가 모두 있는 성별만 필터링
-        valid_genders = [
-            gender for gender, check in gender_data_check.items()
-            if check['has_current'] and check['has_previous']
+        gender_items.sort(key=lambda x: x['total_sales'], reverse=True)
+        gender_summary[sex_nm]['top_items'] = [
+            {
+                'class3': item['class3'],
+                'total_sales': round(item['total_sales'] / 1000000, 2)
+            }
+            for item in gender_items[:5]
         ]
-        
-        # 성별별 데이터 요약 (당해/전년 비교용)
-        gender_comparison = {}
-        for sex_nm in valid_genders:
-            current_data = [r for r in records if r.get('SEX_NM') == sex_nm and r.get('YYYY_MM', '').replace('-', '') == yyyymm]
-            previous_data = [r for r in records if r.get('SEX_NM') == sex_nm and r.get('YYYY_MM', '').replace('-', '') == yyyymm_py]
-            
-            # 성별별 TOP 3 아이템 (당해 기준)
-            current_items = sorted(current_data, key=lambda x: float(x.get('ACT_SALE_AMT', 0)), reverse=True)[:3]
-            
-            gender_comparison[sex_nm] = {
-                'current_top3': [
-                    {
-                        'prdt_hrrc1_nm': item.get('PRDT_HRRC1_NM', ''),
-                        'prdt_hrrc2_nm': item.get('PRDT_HRRC2_NM', ''),
-                        'prdt_hrrc3_nm': item.get('PRDT_HRRC3_NM', ''),
-                        'sale_amt': round(float(item.get('ACT_SALE_AMT', 0)) / 1000000, 2),
-                        'sale_qty': float(item.get('SALE_QTY', 0))
-                    }
-                    for item in current_items
-                ],
-                'current_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in current_data) / 1000000, 2),
-                'previous_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in previous_data) / 1000000, 2)
+        gender_summary[sex_nm]['total_sales'] = round(
+            gender_summary[sex_nm]['total_sales'] / 1000000, 2
+        )
+        gender_summary[sex_nm]['total_qty'] = round(
+            gender_summary[sex_nm]['total_qty'], 0
+        )
+    
+    # 월별 합계 계산
+    monthly_totals = {}
+    for record in records:
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        if month not in monthly_totals:
+            monthly_totals[month] = 0
+        monthly_totals[month] += sale_amt
+    
+    monthly_totals_list = [
+        {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
+        for month, amount in sorted(monthly_totals.items())
+    ]
+    
+    # 성별별로 당해/전년 데이터 존재 여부 확인
+    gender_data_check = {}
+    for record in records:
+        sex_nm = record.get('SEX_NM', '기타')
+        month = record.get('YYYY_MM', '').replace('-', '')
+        
+        if sex_nm not in gender_data_check:
+            gender_data_check[sex_nm] = {
+                'has_current': False,
+                'has_previous': False
             }
         
-        # 성별별 섹션 템플릿 생성
-        gender_sections_template = ',\n    '.join([
-            '{{\n      "div": "{gender}",\n      "sub_title": "{gender} 제품별 성별 구매 패턴 분석",\n      "ai_text": "각 {gender} 당해 당월 성별 제품 구매 패턴 분석을 해줘. 전년과 달라진 점도 분석해줘. (예: • 남성 고객은 아우터에 대한 구매 비중이 45.2%로 가장 높으며, 전년(43.1%) 대비 +2.1%p 상승하여 아우터 선호도가 강화되는 추세입니다. ACC 카테고리에서는 모자(36.5%)가 가장 인기 있으며 전년(32.8%) 대비 +3.7%p 증가했습니다. 계절성 아우터 상품 라인업 강화와 모자 신상품 출시를 통한 매출 확대 기회가 있습니다.)"\n    }}'.format(gender=gender)
-            for gender in valid_genders
-        ])
+        if month == yyyymm:
+            gender_data_check[sex_nm]['has_current'] = True
+        elif month == yyyymm_py:
+            gender_data_check[sex_nm]['has_previous'] = True
+    
+    # 당해/전년 데이터가 모두 있는 성별만 필터링
+    valid_genders = [
+        gender for gender, check in gender_data_check.items()
+        if check['has_current'] and check['has_previous']
+    ]
+    
+    # 성별별 데이터 요약 (당해/전년 비교용)
+    gender_comparison = {}
+    for sex_nm in valid_genders:
+        current_data = [r for r in records if r.get('SEX_NM') == sex_nm and r.get('YYYY_MM', '').replace('-', '') == yyyymm]
+        previous_data = [r for r in records if r.get('SEX_NM') == sex_nm and r.get('YYYY_MM', '').replace('-', '') == yyyymm_py]
         
-        # LLM 프롬프트 생성 (JSON 형식 응답 요청)
-        prompt = f"""
+        # 성별별 TOP 3 아이템 (당해 기준)
+        current_items = sorted(current_data, key=lambda x: float(x.get('ACT_SALE_AMT', 0)), reverse=True)[:3]
+        
+        gender_comparison[sex_nm] = {
+            'current_top3': [
+                {
+                    'prdt_hrrc1_nm': item.get('PRDT_HRRC1_NM', ''),
+                    'prdt_hrrc2_nm': item.get('PRDT_HRRC2_NM', ''),
+                    'prdt_hrrc3_nm': item.get('PRDT_HRRC3_NM', ''),
+                    'sale_amt': round(float(item.get('ACT_SALE_AMT', 0)) / 1000000, 2),
+                    'sale_qty': float(item.get('SALE_QTY', 0))
+                }
+                for item in current_items
+            ],
+            'current_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in current_data) / 1000000, 2),
+            'previous_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in previous_data) / 1000000, 2)
+        }
+    
+    # 성별별 섹션 템플릿 생성
+    gender_sections_template = ',\n    '.join([
+        '{{\n      "div": "{gender}",\n      "sub_title": "{gender} 제품별 성별 구매 패턴 분석",\n      "ai_text": "각 {gender} 당해 당월 성별 제품 구매 패턴 분석을 해줘. 전년과 달라진 점도 분석해줘. (예: • 남성 고객은 아우터에 대한 구매 비중이 45.2%로 가장 높으며, 전년(43.1%) 대비 +2.1%p 상승하여 아우터 선호도가 강화되는 추세입니다. ACC 카테고리에서는 모자(36.5%)가 가장 인기 있으며 전년(32.8%) 대비 +3.7%p 증가했습니다. 계절성 아우터 상품 라인업 강화와 모자 신상품 출시를 통한 매출 확대 기회가 있습니다.)"\n    }}'.format(gender=gender)
+        for gender in valid_genders
+    ])
+    
+    # LLM 프롬프트 생성 (JSON 형식 응답 요청)
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 채널 전략 전문가야. 각 제품별 당해 당월 성별 제품 구매 패턴 분석을 해줘.
 
 **분석 기간**
@@ -1457,99 +1634,96 @@ def analyze_gender_purchase_pattern(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "성별 구매 패턴 분석 (당해 전년 주요변화)",
-                "sections": [
-                    {"div": "기타", "sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'total_qty': round(total_qty, 0),
-                'unique_genders': unique_genders,
-                'unique_categories': unique_categories,
-                'unique_items': unique_items,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'gender_summary': gender_summary,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'YYYY_MM': r.get('YYYY_MM', ''),
-                        'SEX_NM': r.get('SEX_NM', ''),
-                        'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
-                        'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
-                        'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
-                        'SALE_QTY': float(r.get('SALE_QTY', 0)),
-                        'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('YYYY_MM', ''),
-                        'sex_nm': r.get('SEX_NM', ''),
-                        'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
-                        'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
-                        'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
-                        'sale_qty': float(r.get('SALE_QTY', 0)),
-                        'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2)
-                    }
-                    for r in records
-                ]
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "성별 구매 패턴 분석 (당해 전년 주요변화)",
+            "sections": [
+                {"div": "기타", "sub_title": "분석 결과", "ai_text": analysis_response}
+            ]
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_4-1-3-1"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장 (analysis_data의 sections를 조합)
-        markdown_content = f"# {analysis_data.get('title', '성별 구매 패턴 분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    
+    # JSON 데이터 생성
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'total_qty': round(total_qty, 0),
+            'unique_genders': unique_genders,
+            'unique_categories': unique_categories,
+            'unique_items': unique_items,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'gender_summary': gender_summary,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'YYYY_MM': r.get('YYYY_MM', ''),
+                    'SEX_NM': r.get('SEX_NM', ''),
+                    'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
+                    'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
+                    'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
+                    'SALE_QTY': float(r.get('SALE_QTY', 0)),
+                    'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0))
+                }
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
+        },
+        'trend_data': {
+            'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': [
+                {
+                    'yyyymm': r.get('YYYY_MM', ''),
+                    'sex_nm': r.get('SEX_NM', ''),
+                    'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
+                    'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
+                    'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
+                    'sale_qty': float(r.get('SALE_QTY', 0)),
+                    'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2)
+                }
+                for r in records
+            ]
+        }
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_4-1-3-1"
+    save_json(json_data, filename)
+    
+    # Markdown도 저장 (analysis_data의 sections를 조합)
+    markdown_content = f"# {analysis_data.get('title', '성별 구매 패턴 분석')}\n\n"
+    for section in analysis_data.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 분석 완료!\n")
+    return json_data
 
 def analyze_gender_purchase_pattern_overall(yyyymm, brd_cd):
     """성별 구매 패턴 종합분석 (12개월 추이) - 4-1-3-2"""
@@ -1560,158 +1734,157 @@ def analyze_gender_purchase_pattern_overall(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (12개월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        
-        start_year = current_year
-        start_month = current_month - 11
-        
-        while start_month <= 0:
-            start_month += 12
-            start_year -= 1
-        
-        yyyymm_start = f"{start_year:04d}{start_month:02d}"
-        yyyymm_end = yyyymm
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = get_gender_purchase_pattern_overall_query(yyyymm_start, yyyymm_end, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
-        total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
-        unique_genders = len(set(r.get('SEX_NM', '') for r in records))
-        unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
-        unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
-        unique_months = len(set(r.get('YYYY_MM', '') for r in records))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"총 판매수량: {total_qty:,.0f}개")
-        print(f"성별 수: {unique_genders}개")
-        print(f"카테고리 수: {unique_categories}개")
-        print(f"아이템 수: {unique_items}개")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 성별별 요약 데이터 생성
-        gender_summary = {}
-        for record in records:
-            sex_nm = record.get('SEX_NM', '기타')
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            sale_qty = float(record.get('SALE_QTY', 0))
-            
-            if sex_nm not in gender_summary:
-                gender_summary[sex_nm] = {
-                    'total_sales': 0,
-                    'total_qty': 0,
-                    'months': {},
-                    'top_items': []
-                }
-            
-            gender_summary[sex_nm]['total_sales'] += sale_amt
-            gender_summary[sex_nm]['total_qty'] += sale_qty
-            
-            if month not in gender_summary[sex_nm]['months']:
-                gender_summary[sex_nm]['months'][month] = {'sales': 0, 'qty': 0}
-            gender_summary[sex_nm]['months'][month]['sales'] += sale_amt
-            gender_summary[sex_nm]['months'][month]['qty'] += sale_qty
-        
-        # 성별별 상위 아이템 추출
-        item_sales_by_gender = {}
-        for record in records:
-            sex_nm = record.get('SEX_NM', '기타')
-            class3 = record.get('PRDT_HRRC3_NM', '기타')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            
-            key = f"{sex_nm}|{class3}"
-            if key not in item_sales_by_gender:
-                item_sales_by_gender[key] = {
-                    'sex_nm': sex_nm,
-                    'class3': class3,
-                    'total_sales': 0
-                }
-            item_sales_by_gender[key]['total_sales'] += sale_amt
-        
-        # 성별별로 상위 5개 아이템 추출
-        for sex_nm in gender_summary.keys():
-            gender_items = [
-                item for key, item in item_sales_by_gender.items()
-                if item['sex_nm'] == sex_nm
-            ]
-            gender_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            gender_summary[sex_nm]['top_items'] = [
-                {
-                    'class3': item['class3'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2)
-                }
-                for item in gender_items[:5]
-            ]
-            gender_summary[sex_nm]['total_sales'] = round(
-                gender_summary[sex_nm]['total_sales'] / 1000000, 2
-            )
-            gender_summary[sex_nm]['total_qty'] = round(
-                gender_summary[sex_nm]['total_qty'], 0
-            )
+    # 분석 기간 계산 (12개월)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    
+    start_year = current_year
+    start_month = current_month - 11
+    
+    while start_month <= 0:
+        start_month += 12
+        start_year -= 1
+    
+    yyyymm_start = f"{start_year:04d}{start_month:02d}"
+    yyyymm_end = yyyymm
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
+    
+    # SQL 쿼리 실행
+    sql = get_gender_purchase_pattern_overall_query(yyyymm_start, yyyymm_end, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
+    total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
+    unique_genders = len(set(r.get('SEX_NM', '') for r in records))
+    unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
+    unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
+    unique_months = len(set(r.get('YYYY_MM', '') for r in records))
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"총 판매수량: {total_qty:,.0f}개")
+    print(f"성별 수: {unique_genders}개")
+    print(f"카테고리 수: {unique_categories}개")
+    print(f"아이템 수: {unique_items}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 성별별 요약 데이터 생성
+    gender_summary = {}
+    for record in records:
+        sex_nm = record.get('SEX_NM', '기타')
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        sale_qty = float(record.get('SALE_QTY', 0))
+        
+        if sex_nm not in gender_summary:
+            gender_summary[sex_nm] = {
+                'total_sales': 0,
+                'total_qty': 0,
+                'months': {},
+                'top_items': []
+            }
         
-        # 월별 합계 계산
-        monthly_totals = {}
-        for record in records:
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            if month not in monthly_totals:
-                monthly_totals[month] = 0
-            monthly_totals[month] += sale_amt
+        gender_summary[sex_nm]['total_sales'] += sale_amt
+        gender_summary[sex_nm]['total_qty'] += sale_qty
         
-        monthly_totals_list = [
-            {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
-            for month, amount in sorted(monthly_totals.items())
+        if month not in gender_summary[sex_nm]['months']:
+            gender_summary[sex_nm]['months'][month] = {'sales': 0, 'qty': 0}
+        gender_summary[sex_nm]['months'][month]['sales'] += sale_amt
+        gender_summary[sex_nm]['months'][month]['qty'] += sale_qty
+    
+    # 성별별 상위 아이템 추출
+    item_sales_by_gender = {}
+    for record in records:
+        sex_nm = record.get('SEX_NM', '기타')
+        class3 = record.get('PRDT_HRRC3_NM', '기타')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        
+        key = (sex_nm, class3)
+        if key not in item_sales_by_gender:
+            item_sales_by_gender[key] = {
+                'sex_nm': sex_nm,
+                'class3': class3,
+                'total_sales': 0
+            }
+        item_sales_by_gender[key]['total_sales'] += sale_amt
+    
+    # 성별별로 상위 5개 아이템 추출
+    for sex_nm in gender_summary.keys():
+        gender_items = [
+            item for key, item in item_sales_by_gender.items()
+            if item['sex_nm'] == sex_nm
         ]
-        
-        # 섹션 정의 (변수 처리)
-        section_definitions = [
+        gender_items.sort(key=lambda x: x['total_sales'], reverse=True)
+        gender_summary[sex_nm]['top_items'] = [
             {
-                'sub_title': '성별 구매 패턴 종합 평가',
-                'ai_text': '12개월간의 성별 구매 패턴을 종합적으로 평가한 내용 (예: 남성 고객이 전체 매출의 55%를 차지하며 핵심 타겟으로 부상, 여성 고객은 아우터 카테고리에서 지속적 성장세 유지 등)'
-            },
-            {
-                'sub_title': '성장 성별 및 기회',
-                'ai_text': '성장세가 뚜렷한 성별과 기회를 불릿 포인트로 나열 (예: • 남성 고객: 12개월간 지속적 성장으로 전체 매출의 55% 기여, 아우터 카테고리에서 강세 등)'
-            },
-            {
-                'sub_title': '주의 필요 성별',
-                'ai_text': '주의가 필요한 성별들을 불릿 포인트로 나열 (예: • 여성 고객: 최근 3개월간 특정 카테고리 매출 감소 추세 등)'
-            },
-            {
-                'sub_title': '이상징후 및 리스크 감지',
-                'ai_text': '이상징후와 리스크를 구체적으로 설명 (예: • 특정 성별의 아이템 집중도 과다: 남성 고객의 상위 3개 아이템이 전체의 60% 차지 등)'
-            },
-            {
-                'sub_title': '성별별 전략 최적화 방안',
-                'ai_text': '단기 전략 방향과 중장기 전략 방향을 구체적으로 제시 (예: ### 즉시 실행 방안\\n1. 남성 고객 타겟 아이템 포트폴리오 다변화: ... 등)'
+                'class3': item['class3'],
+                'total_sales': round(item['total_sales'] / 1000000, 2)
             }
+            for item in gender_items[:5]
         ]
-        
-        # 섹션 템플릿 동적 생성
-        sections_template = ',\n    '.join([
-            '{{\n      "div": "종합분석-{idx}",\n      "sub_title": "{sub_title}",\n      "ai_text": "{ai_text}"\n    }}'.format(
-                idx=i+1,
-                sub_title=section['sub_title'],
-                ai_text=section['ai_text']
-            )
-            for i, section in enumerate(section_definitions)
-        ])
-        
-        # LLM 프롬프트 생성 (JSON 형식 응답 요청)
-        prompt = f"""
+        gender_summary[sex_nm]['total_sales'] = round(
+            gender_summary[sex_nm]['total_sales'] / 1000000, 2
+        )
+        gender_summary[sex_nm]['total_qty'] = round(
+            gender_summary[sex_nm]['total_qty'], 0
+        )
+    
+    # 월별 합계 계산
+    monthly_totals = {}
+    for record in records:
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        if month not in monthly_totals:
+            monthly_totals[month] = 0
+        monthly_totals[month] += sale_amt
+    
+    monthly_totals_list = [
+        {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
+        for month, amount in sorted(monthly_totals.items())
+    ]
+    
+    # 섹션 정의 (변수 처리)
+    section_definitions = [
+        {
+            'sub_title': '성별 구매 패턴 종합 평가',
+            'ai_text': '12개월간의 성별 구매 패턴을 종합적으로 평가한 내용 (예: 남성 고객이 전체 매출의 55%를 차지하며 핵심 타겟으로 부상, 여성 고객은 아우터 카테고리에서 지속적 성장세 유지 등)'
+        },
+        {
+            'sub_title': '성장 성별 및 기회',
+            'ai_text': '성장세가 뚜렷한 성별과 기회를 불릿 포인트로 나열 (예: • 남성 고객: 12개월간 지속적 성장으로 전체 매출의 55% 기여, 아우터 카테고리에서 강세 등)'
+        },
+        {
+            'sub_title': '주의 필요 성별',
+            'ai_text': '주의가 필요한 성별들을 불릿 포인트로 나열 (예: • 여성 고객: 최근 3개월간 특정 카테고리 매출 감소 추세 등)'
+        },
+        {
+            'sub_title': '이상징후 및 리스크 감지',
+            'ai_text': '이상징후와 리스크를 구체적으로 설명 (예: • 특정 성별의 아이템 집중도 과다: 남성 고객의 상위 3개 아이템이 전체의 60% 차지 등)'
+        },
+        {
+            'sub_title': '성별별 전략 최적화 방안',
+            'ai_text': '단기 전략 방향과 중장기 전략 방향을 구체적으로 제시 (예: ### 즉시 실행 방안\\n1. 남성 고객 타겟 아이템 포트폴리오 다변화: ... 등)'
+        }
+    ]
+    
+    # 섹션 템플릿 동적 생성
+    sections_template = ',\n    '.join([
+        '{{\n      "div": "종합분석-{idx}",\n      "sub_title": "{sub_title}",\n      "ai_text": "{ai_text}"\n    }}'.format(
+            idx=i+1,
+            sub_title=section['sub_title'],
+            ai_text=section['ai_text']
+        )
+        for i, section in enumerate(section_definitions)
+    ])
+    
+    # LLM 프롬프트 생성 (JSON 형식 응답 요청)
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 고객 전략 전문가야. 12개월간의 성별 구매 패턴 추이를 분석하여 성별별 성과와 제품 포트폴리오 전략을 제시해야 해.
 
 **분석 기간**
@@ -1761,104 +1934,101 @@ def analyze_gender_purchase_pattern_overall(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "성별 구매 패턴 분석 (12개월 추이)",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        # yyyymm_py 계산 (전년 동월)
-        previous_year = int(yyyymm_end[:4]) - 1
-        yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
-        
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'total_qty': round(total_qty, 0),
-                'unique_genders': unique_genders,
-                'unique_categories': unique_categories,
-                'unique_items': unique_items,
-                'unique_months': unique_months,
-                'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
-            },
-            'gender_summary': gender_summary,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'YYYY_MM': r.get('YYYY_MM', ''),
-                        'SEX_NM': r.get('SEX_NM', ''),
-                        'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
-                        'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
-                        'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
-                        'SALE_QTY': float(r.get('SALE_QTY', 0)),
-                        'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('YYYY_MM', ''),
-                        'sex_nm': r.get('SEX_NM', ''),
-                        'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
-                        'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
-                        'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
-                        'sale_qty': float(r.get('SALE_QTY', 0)),
-                        'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2)
-                    }
-                    for r in records
-                ]
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "성별 구매 패턴 분석 (12개월 추이)",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "분석 결과", "ai_text": analysis_response}
+            ]
         }
-        
-        # 파일 저장 (4-1-3-2로 저장)
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_4-1-3-2"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장 (analysis_data의 sections를 조합)
-        markdown_content = f"# {analysis_data.get('title', '성별 구매 패턴 분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    
+    # JSON 데이터 생성
+    # yyyymm_py 계산 (전년 동월)
+    previous_year = int(yyyymm_end[:4]) - 1
+    yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
+    
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm_end,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'total_qty': round(total_qty, 0),
+            'unique_genders': unique_genders,
+            'unique_categories': unique_categories,
+            'unique_items': unique_items,
+            'unique_months': unique_months,
+            'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
+        },
+        'gender_summary': gender_summary,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'YYYY_MM': r.get('YYYY_MM', ''),
+                    'SEX_NM': r.get('SEX_NM', ''),
+                    'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
+                    'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
+                    'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
+                    'SALE_QTY': float(r.get('SALE_QTY', 0)),
+                    'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0))
+                }
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
+        },
+        'trend_data': {
+            'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': [
+                {
+                    'yyyymm': r.get('YYYY_MM', ''),
+                    'sex_nm': r.get('SEX_NM', ''),
+                    'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
+                    'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
+                    'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
+                    'sale_qty': float(r.get('SALE_QTY', 0)),
+                    'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2)
+                }
+                for r in records
+            ]
+        }
+    }
+    
+    # 파일 저장 (4-1-3-2로 저장)
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_4-1-3-2"
+    save_json(json_data, filename)
+    
+    # Markdown도 저장 (analysis_data의 sections를 조합)
+    markdown_content = f"# {analysis_data.get('title', '성별 구매 패턴 분석')}\n\n"
+    for section in analysis_data.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 분석 완료!\n")
+    return json_data
 
 def analyze_category_profit(yyyymm, brd_cd):
     """영업이익_아이템별 직접이익_카테고리요약 (당해/전년 동월 비교)"""
@@ -1869,201 +2039,200 @@ def analyze_category_profit(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행
-        sql = get_category_profit_analysis_query(yyyymm, yyyymm_py, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    previous_year = current_year - 1
+    yyyymm_py = f"{previous_year:04d}{current_month:02d}"
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행
+    sql = get_category_profit_analysis_query(yyyymm, yyyymm_py, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
+    total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
+    total_profit = sum(float(r.get('SALE_TTL_PRFT', 0)) for r in records)
+    unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
+    unique_subcategories = len(set(r.get('PRDT_HRRC2_NM', '') for r in records))
+    unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
+    unique_products = len(set(r.get('PRDT_NM', '') for r in records))
+    unique_months = len(set(r.get('YYYY_MM', '') for r in records))
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"총 판매수량: {total_qty:,.0f}개")
+    print(f"총 이익: {total_profit:,.0f}원 ({total_profit/1000000:.2f}백만원)")
+    print(f"카테고리 수: {unique_categories}개")
+    print(f"서브카테고리 수: {unique_subcategories}개")
+    print(f"아이템 수: {unique_items}개")
+    print(f"제품 수: {unique_products}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 카테고리별 요약 데이터 생성
+    category_summary = {}
+    for record in records:
+        category1 = record.get('PRDT_HRRC1_NM', '기타')
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        sale_qty = float(record.get('SALE_QTY', 0))
+        profit = float(record.get('SALE_TTL_PRFT', 0))
+        
+        if category1 not in category_summary:
+            category_summary[category1] = {
+                'total_sales': 0,
+                'total_qty': 0,
+                'total_profit': 0,
+                'months': {},
+                'top_items': []
+            }
         
-        # 데이터 요약
-        total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
-        total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
-        total_profit = sum(float(r.get('SALE_TTL_PRFT', 0)) for r in records)
-        unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
-        unique_subcategories = len(set(r.get('PRDT_HRRC2_NM', '') for r in records))
-        unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
-        unique_products = len(set(r.get('PRDT_NM', '') for r in records))
-        unique_months = len(set(r.get('YYYY_MM', '') for r in records))
+        category_summary[category1]['total_sales'] += sale_amt
+        category_summary[category1]['total_qty'] += sale_qty
+        category_summary[category1]['total_profit'] += profit
         
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"총 판매수량: {total_qty:,.0f}개")
-        print(f"총 이익: {total_profit:,.0f}원 ({total_profit/1000000:.2f}백만원)")
-        print(f"카테고리 수: {unique_categories}개")
-        print(f"서브카테고리 수: {unique_subcategories}개")
-        print(f"아이템 수: {unique_items}개")
-        print(f"제품 수: {unique_products}개")
-        print(f"분석 월 수: {unique_months}개월")
+        if month not in category_summary[category1]['months']:
+            category_summary[category1]['months'][month] = {'sales': 0, 'qty': 0, 'profit': 0}
+        category_summary[category1]['months'][month]['sales'] += sale_amt
+        category_summary[category1]['months'][month]['qty'] += sale_qty
+        category_summary[category1]['months'][month]['profit'] += profit
+    
+    # 카테고리별 상위 아이템 추출
+    item_sales_by_category = {}
+    for record in records:
+        category1 = record.get('PRDT_HRRC1_NM', '기타')
+        class3 = record.get('PRDT_HRRC3_NM', '기타')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        profit = float(record.get('SALE_TTL_PRFT', 0))
+        
+        key = (category1, class3)
+        if key not in item_sales_by_category:
+            item_sales_by_category[key] = {
+                'category1': category1,
+                'class3': class3,
+                'total_sales': 0,
+                'total_profit': 0
+            }
+        item_sales_by_category[key]['total_sales'] += sale_amt
+        item_sales_by_category[key]['total_profit'] += profit
+    
+    # 카테고리별로 상위 5개 아이템 추출
+    for category1 in category_summary.keys():
+        category_items = [
+            item for key, item in item_sales_by_category.items()
+            if item['category1'] == category1
+        ]
+        category_items.sort(key=lambda x: x['total_sales'], reverse=True)
+        category_summary[category1]['top_items'] = [
+            {
+                'class3': item['class3'],
+                'total_sales': round(item['total_sales'] / 1000000, 2),
+                'total_profit': round(item['total_profit'] / 1000000, 2),
+                'profit_rate': round((item['total_profit'] / item['total_sales'] * 100) if item['total_sales'] != 0 else 0, 1)
+            }
+            for item in category_items[:5]
+        ]
+        category_summary[category1]['total_sales'] = round(
+            category_summary[category1]['total_sales'] / 1000000, 2
+        )
+        category_summary[category1]['total_qty'] = round(
+            category_summary[category1]['total_qty'], 0
+        )
+        category_summary[category1]['total_profit'] = round(
+            category_summary[category1]['total_profit'] / 1000000, 2
+        )
+        if category_summary[category1]['total_sales'] > 0:
+            category_summary[category1]['profit_rate'] = round(
+                (category_summary[category1]['total_profit'] / category_summary[category1]['total_sales'] * 100), 1
+            )
+        else:
+            category_summary[category1]['profit_rate'] = 0
+    
+    # 월별 합계 계산
+    monthly_totals = {}
+    for record in records:
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        if month not in monthly_totals:
+            monthly_totals[month] = 0
+        monthly_totals[month] += sale_amt
+    
+    monthly_totals_list = [
+        {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
+        for month, amount in sorted(monthly_totals.items())
+    ]
+    
+    # 카테고리별로 당해/전년 데이터 존재 여부 확인
+    category_data_check = {}
+    for record in records:
+        category1 = record.get('PRDT_HRRC1_NM', '기타')
+        month = record.get('YYYY_MM', '').replace('-', '')
+        
+        if category1 not in category_data_check:
+            category_data_check[category1] = {
+                'has_current': False,
+                'has_previous': False
+            }
         
-        # 카테고리별 요약 데이터 생성
-        category_summary = {}
-        for record in records:
-            category1 = record.get('PRDT_HRRC1_NM', '기타')
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            sale_qty = float(record.get('SALE_QTY', 0))
-            profit = float(record.get('SALE_TTL_PRFT', 0))
-            
-            if category1 not in category_summary:
-                category_summary[category1] = {
-                    'total_sales': 0,
-                    'total_qty': 0,
-                    'total_profit': 0,
-                    'months': {},
-                    'top_items': []
-                }
-            
-            category_summary[category1]['total_sales'] += sale_amt
-            category_summary[category1]['total_qty'] += sale_qty
-            category_summary[category1]['total_profit'] += profit
-            
-            if month not in category_summary[category1]['months']:
-                category_summary[category1]['months'][month] = {'sales': 0, 'qty': 0, 'profit': 0}
-            category_summary[category1]['months'][month]['sales'] += sale_amt
-            category_summary[category1]['months'][month]['qty'] += sale_qty
-            category_summary[category1]['months'][month]['profit'] += profit
+        if month == yyyymm:
+            category_data_check[category1]['has_current'] = True
+        elif month == yyyymm_py:
+            category_data_check[category1]['has_previous'] = True
+    
+    # 당해/전년 데이터가 모두 있는 카테고리만 필터링
+    valid_categories = [
+        category for category, check in category_data_check.items()
+        if check['has_current'] and check['has_previous']
+    ]
+    
+    # 카테고리별 데이터 요약 (당해/전년 비교용)
+    category_comparison = {}
+    for category1 in valid_categories:
+        current_data = [r for r in records if r.get('PRDT_HRRC1_NM') == category1 and r.get('YYYY_MM', '').replace('-', '') == yyyymm]
+        previous_data = [r for r in records if r.get('PRDT_HRRC1_NM') == category1 and r.get('YYYY_MM', '').replace('-', '') == yyyymm_py]
         
-        # 카테고리별 상위 아이템 추출
-        item_sales_by_category = {}
-        for record in records:
-            category1 = record.get('PRDT_HRRC1_NM', '기타')
-            class3 = record.get('PRDT_HRRC3_NM', '기타')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            profit = float(record.get('SALE_TTL_PRFT', 0))
-            
-            key = f"{category1}|{class3}"
-            if key not in item_sales_by_category:
-                item_sales_by_category[key] = {
-                    'category1': category1,
-                    'class3': class3,
-                    'total_sales': 0,
-                    'total_profit': 0
-                }
-            item_sales_by_category[key]['total_sales'] += sale_amt
-            item_sales_by_category[key]['total_profit'] += profit
+        # 카테고리별 TOP 3 아이템 (당해 기준)
+        current_items = sorted(current_data, key=lambda x: float(x.get('ACT_SALE_AMT', 0)), reverse=True)[:3]
         
-        # 카테고리별로 상위 5개 아이템 추출
-        for category1 in category_summary.keys():
-            category_items = [
-                item for key, item in item_sales_by_category.items()
-                if item['category1'] == category1
-            ]
-            category_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            category_summary[category1]['top_items'] = [
+        category_comparison[category1] = {
+            'current_top3': [
                 {
-                    'class3': item['class3'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2),
-                    'total_profit': round(item['total_profit'] / 1000000, 2),
-                    'profit_rate': round((item['total_profit'] / item['total_sales'] * 100) if item['total_sales'] != 0 else 0, 1)
+                    'prdt_nm': item.get('PRDT_NM', ''),
+                    'prdt_hrrc2_nm': item.get('PRDT_HRRC2_NM', ''),
+                    'prdt_hrrc3_nm': item.get('PRDT_HRRC3_NM', ''),
+                    'sale_amt': round(float(item.get('ACT_SALE_AMT', 0)) / 1000000, 2),
+                    'sale_qty': float(item.get('SALE_QTY', 0)),
+                    'profit': round(float(item.get('SALE_TTL_PRFT', 0)) / 1000000, 2),
+                    'profit_rate': round((float(item.get('SALE_TTL_PRFT', 0)) / float(item.get('ACT_SALE_AMT', 0)) * 100) if float(item.get('ACT_SALE_AMT', 0)) != 0 else 0, 1)
                 }
-                for item in category_items[:5]
-            ]
-            category_summary[category1]['total_sales'] = round(
-                category_summary[category1]['total_sales'] / 1000000, 2
-            )
-            category_summary[category1]['total_qty'] = round(
-                category_summary[category1]['total_qty'], 0
-            )
-            category_summary[category1]['total_profit'] = round(
-                category_summary[category1]['total_profit'] / 1000000, 2
+                for item in current_items
+            ],
+            'current_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in current_data) / 1000000, 2),
+            'current_profit': round(sum(float(r.get('SALE_TTL_PRFT', 0)) for r in current_data) / 1000000, 2),
+            'previous_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in previous_data) / 1000000, 2),
+            'previous_profit': round(sum(float(r.get('SALE_TTL_PRFT', 0)) for r in previous_data) / 1000000, 2)
+        }
+        if category_comparison[category1]['current_total'] > 0:
+            category_comparison[category1]['current_profit_rate'] = round(
+                (category_comparison[category1]['current_profit'] / category_comparison[category1]['current_total'] * 100), 1
             )
-            if category_summary[category1]['total_sales'] > 0:
-                category_summary[category1]['profit_rate'] = round(
-                    (category_summary[category1]['total_profit'] / category_summary[category1]['total_sales'] * 100), 1
-                )
-            else:
-                category_summary[category1]['profit_rate'] = 0
-        
-        # 월별 합계 계산
-        monthly_totals = {}
-        for record in records:
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            if month not in monthly_totals:
-                monthly_totals[month] = 0
-            monthly_totals[month] += sale_amt
-        
-        monthly_totals_list = [
-            {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
-            for month, amount in sorted(monthly_totals.items())
-        ]
-        
-        # 카테고리별로 당해/전년 데이터 존재 여부 확인
-        category_data_check = {}
-        for record in records:
-            category1 = record.get('PRDT_HRRC1_NM', '기타')
-            month = record.get('YYYY_MM', '').replace('-', '')
-            
-            if category1 not in category_data_check:
-                category_data_check[category1] = {
-                    'has_current': False,
-                    'has_previous': False
-                }
-            
-            if month == yyyymm:
-                category_data_check[category1]['has_current'] = True
-            elif month == yyyymm_py:
-                category_data_check[category1]['has_previous'] = True
-        
-        # 당해/전년 데이터가 모두 있는 카테고리만 필터링
-        valid_categories = [
-            category for category, check in category_data_check.items()
-            if check['has_current'] and check['has_previous']
-        ]
-        
-        # 카테고리별 데이터 요약 (당해/전년 비교용)
-        category_comparison = {}
-        for category1 in valid_categories:
-            current_data = [r for r in records if r.get('PRDT_HRRC1_NM') == category1 and r.get('YYYY_MM', '').replace('-', '') == yyyymm]
-            previous_data = [r for r in records if r.get('PRDT_HRRC1_NM') == category1 and r.get('YYYY_MM', '').replace('-', '') == yyyymm_py]
-            
-            # 카테고리별 TOP 3 아이템 (당해 기준)
-            current_items = sorted(current_data, key=lambda x: float(x.get('ACT_SALE_AMT', 0)), reverse=True)[:3]
-            
-            category_comparison[category1] = {
-                'current_top3': [
-                    {
-                        'prdt_nm': item.get('PRDT_NM', ''),
-                        'prdt_hrrc2_nm': item.get('PRDT_HRRC2_NM', ''),
-                        'prdt_hrrc3_nm': item.get('PRDT_HRRC3_NM', ''),
-                        'sale_amt': round(float(item.get('ACT_SALE_AMT', 0)) / 1000000, 2),
-                        'sale_qty': float(item.get('SALE_QTY', 0)),
-                        'profit': round(float(item.get('SALE_TTL_PRFT', 0)) / 1000000, 2),
-                        'profit_rate': round((float(item.get('SALE_TTL_PRFT', 0)) / float(item.get('ACT_SALE_AMT', 0)) * 100) if float(item.get('ACT_SALE_AMT', 0)) != 0 else 0, 1)
-                    }
-                    for item in current_items
-                ],
-                'current_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in current_data) / 1000000, 2),
-                'current_profit': round(sum(float(r.get('SALE_TTL_PRFT', 0)) for r in current_data) / 1000000, 2),
-                'previous_total': round(sum(float(r.get('ACT_SALE_AMT', 0)) for r in previous_data) / 1000000, 2),
-                'previous_profit': round(sum(float(r.get('SALE_TTL_PRFT', 0)) for r in previous_data) / 1000000, 2)
-            }
-            if category_comparison[category1]['current_total'] > 0:
-                category_comparison[category1]['current_profit_rate'] = round(
-                    (category_comparison[category1]['current_profit'] / category_comparison[category1]['current_total'] * 100), 1
-                )
-            else:
-                category_comparison[category1]['current_profit_rate'] = 0
-        
-        # 카테고리별 섹션 템플릿 생성
-        category_sections_template = ',\n    '.join([
-            '{{\n      "div": "{category}",\n      "sub_title": "{category} 전년대비 주요 변화",\n      "ai_text": "각 {category} 당해 당월 매출과 수익성을 전년대비 주요변화로 분석해줘. 카테고리별 데이터 요약의 current_top3와 current_total, previous_total, current_profit, previous_profit을 참고하여 구체적인 변화율과 원인을 분석해줘. (예: • ACC: 당해 신규 운동모 제품 +156.3% 폭증, 수익률 45.2%로 전년(42.1%) 대비 +3.1%p 상승\\n • 의류: 다운점퍼 제품 폭발적 성장 +120.1%, 수익률 38.5%로 전년(35.8%) 대비 +2.7%p 증가 등)"\n    }}'.format(category=category)
-            for category in valid_categories
-        ])
-        
-        # LLM 프롬프트 생성 (JSON 형식 응답 요청)
-        prompt = f"""
+        else:
+            category_comparison[category1]['current_profit_rate'] = 0
+    
+    # 카테고리별 섹션 템플릿 생성
+    category_sections_template = ',\n    '.join([
+        '{{\n      "div": "{category}",\n      "sub_title": "{category} 전년대비 주요 변화",\n      "ai_text": "각 {category} 당해 당월 매출과 수익성을 전년대비 주요변화로 분석해줘. 카테고리별 데이터 요약의 current_top3와 current_total, previous_total, current_profit, previous_profit을 참고하여 구체적인 변화율과 원인을 분석해줘. (예: • ACC: 당해 신규 운동모 제품 +156.3% 폭증, 수익률 45.2%로 전년(42.1%) 대비 +3.1%p 상승\\n • 의류: 다운점퍼 제품 폭발적 성장 +120.1%, 수익률 38.5%로 전년(35.8%) 대비 +2.7%p 증가 등)"\n    }}'.format(category=category)
+        for category in valid_categories
+    ])
+    
+    # LLM 프롬프트 생성 (JSON 형식 응답 요청)
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 제품 전략 전문가야. 각 카테고리별(악세서리, 의류 등) 당해 당월 매출과 수익성을 전년대비 주요변화로 분석해줘.
 
 **분석 기간**
@@ -2116,268 +2285,268 @@ def analyze_category_profit(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "카테고리별 수익성 분석 (당해 전년 주요변화)",
-                "sections": [
-                    {"div": "기타", "sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'total_qty': round(total_qty, 0),
-                'total_profit': round(total_profit / 1000000, 2),
-                'total_profit_rate': round((total_profit / total_sales * 100) if total_sales != 0 else 0, 1),
-                'unique_categories': unique_categories,
-                'unique_subcategories': unique_subcategories,
-                'unique_items': unique_items,
-                'unique_products': unique_products,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'category_summary': category_summary,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'YYYY_MM': r.get('YYYY_MM', ''),
-                        'PRDT_NM': r.get('PRDT_NM', ''),
-                        'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
-                        'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
-                        'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
-                        'SALE_QTY': float(r.get('SALE_QTY', 0)),
-                        'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0)),
-                        'SALE_TTL_PRFT': float(r.get('SALE_TTL_PRFT', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('YYYY_MM', ''),
-                        'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
-                        'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
-                        'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
-                        'prdt_nm': r.get('PRDT_NM', ''),
-                        'sale_qty': float(r.get('SALE_QTY', 0)),
-                        'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2),
-                        'profit': round(float(r.get('SALE_TTL_PRFT', 0)) / 1000000, 2)
-                    }
-                    for r in records
-                ]
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "카테고리별 수익성 분석 (당해 전년 주요변화)",
+            "sections": [
+                {"div": "기타", "sub_title": "분석 결과", "ai_text": analysis_response}
+            ]
         }
-        
-        # ============================================================
-        # 두 번째 분석: 카테고리별 수익성 종합분석 (12개월 추이)
-        # ============================================================
-        print(f"\n{'='*60}")
-        print(f"카테고리별 수익성 종합분석 시작 (12개월 추이): {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
-        print(f"{'='*60}")
-        
-        # 분석 기간 계산 (12개월)
-        current_year_overall = int(yyyymm[:4])
-        current_month_overall = int(yyyymm[4:6])
-        
-        start_year = current_year_overall
-        start_month = current_month_overall - 11
-        
-        while start_month <= 0:
-            start_month += 12
-            start_year -= 1
-        
-        yyyymm_start = f"{start_year:04d}{start_month:02d}"
-        yyyymm_end = yyyymm
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = get_category_profit_overall_query(yyyymm_start, yyyymm_end, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
-        total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
-        total_profit = sum(float(r.get('SALE_TTL_PRFT', 0)) for r in records)
-        unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
-        unique_subcategories = len(set(r.get('PRDT_HRRC2_NM', '') for r in records))
-        unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
-        unique_products = len(set(r.get('PRDT_NM', '') for r in records))
-        unique_months = len(set(r.get('YYYY_MM', '') for r in records))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"총 판매수량: {total_qty:,.0f}개")
-        print(f"총 이익: {total_profit:,.0f}원 ({total_profit/1000000:.2f}백만원)")
-        print(f"전체 수익률: {round((total_profit / total_sales * 100) if total_sales != 0 else 0, 1)}%")
-        print(f"카테고리 수: {unique_categories}개")
-        print(f"서브카테고리 수: {unique_subcategories}개")
-        print(f"아이템 수: {unique_items}개")
-        print(f"제품 수: {unique_products}개")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 카테고리별 요약 데이터 생성
-        category_summary = {}
-        for record in records:
-            category1 = record.get('PRDT_HRRC1_NM', '기타')
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            sale_qty = float(record.get('SALE_QTY', 0))
-            profit = float(record.get('SALE_TTL_PRFT', 0))
-            
-            if category1 not in category_summary:
-                category_summary[category1] = {
-                    'total_sales': 0,
-                    'total_qty': 0,
-                    'total_profit': 0,
-                    'months': {},
-                    'top_items': []
-                }
-            
-            category_summary[category1]['total_sales'] += sale_amt
-            category_summary[category1]['total_qty'] += sale_qty
-            category_summary[category1]['total_profit'] += profit
-            
-            if month not in category_summary[category1]['months']:
-                category_summary[category1]['months'][month] = {'sales': 0, 'qty': 0, 'profit': 0}
-            category_summary[category1]['months'][month]['sales'] += sale_amt
-            category_summary[category1]['months'][month]['qty'] += sale_qty
-            category_summary[category1]['months'][month]['profit'] += profit
-        
-        # 카테고리별 상위 아이템 추출
-        item_sales_by_category = {}
-        for record in records:
-            category1 = record.get('PRDT_HRRC1_NM', '기타')
-            class3 = record.get('PRDT_HRRC3_NM', '기타')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            profit = float(record.get('SALE_TTL_PRFT', 0))
-            
-            key = f"{category1}|{class3}"
-            if key not in item_sales_by_category:
-                item_sales_by_category[key] = {
-                    'category1': category1,
-                    'class3': class3,
-                    'total_sales': 0,
-                    'total_profit': 0
+    
+    # JSON 데이터 생성
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'total_qty': round(total_qty, 0),
+            'total_profit': round(total_profit / 1000000, 2),
+            'total_profit_rate': round((total_profit / total_sales * 100) if total_sales != 0 else 0, 1),
+            'unique_categories': unique_categories,
+            'unique_subcategories': unique_subcategories,
+            'unique_items': unique_items,
+            'unique_products': unique_products,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'category_summary': category_summary,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'YYYY_MM': r.get('YYYY_MM', ''),
+                    'PRDT_NM': r.get('PRDT_NM', ''),
+                    'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
+                    'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
+                    'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
+                    'SALE_QTY': float(r.get('SALE_QTY', 0)),
+                    'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0)),
+                    'SALE_TTL_PRFT': float(r.get('SALE_TTL_PRFT', 0))
                 }
-            item_sales_by_category[key]['total_sales'] += sale_amt
-            item_sales_by_category[key]['total_profit'] += profit
-        
-        # 카테고리별로 상위 5개 아이템 추출
-        for category1 in category_summary.keys():
-            category_items = [
-                item for key, item in item_sales_by_category.items()
-                if item['category1'] == category1
-            ]
-            category_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            category_summary[category1]['top_items'] = [
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
+        },
+        'trend_data': {
+            'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': [
                 {
-                    'class3': item['class3'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2),
-                    'total_profit': round(item['total_profit'] / 1000000, 2),
-                    'profit_rate': round((item['total_profit'] / item['total_sales'] * 100) if item['total_sales'] != 0 else 0, 1)
+                    'yyyymm': r.get('YYYY_MM', ''),
+                    'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
+                    'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
+                    'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
+                    'prdt_nm': r.get('PRDT_NM', ''),
+                    'sale_qty': float(r.get('SALE_QTY', 0)),
+                    'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2),
+                    'profit': round(float(r.get('SALE_TTL_PRFT', 0)) / 1000000, 2)
                 }
-                for item in category_items[:5]
+                for r in records
             ]
-            category_summary[category1]['total_sales'] = round(
-                category_summary[category1]['total_sales'] / 1000000, 2
-            )
-            category_summary[category1]['total_qty'] = round(
-                category_summary[category1]['total_qty'], 0
-            )
-            category_summary[category1]['total_profit'] = round(
-                category_summary[category1]['total_profit'] / 1000000, 2
-            )
-            if category_summary[category1]['total_sales'] > 0:
-                category_summary[category1]['profit_rate'] = round(
-                    (category_summary[category1]['total_profit'] / category_summary[category1]['total_sales'] * 100), 1
-                )
-            else:
-                category_summary[category1]['profit_rate'] = 0
+        }
+    }
+    
+    # ============================================================
+    # 두 번째 분석: 카테고리별 수익성 종합분석 (12개월 추이)
+    # ============================================================
+    print(f"\n{'='*60}")
+    print(f"카테고리별 수익성 종합분석 시작 (12개월 추이): {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
+    print(f"{'='*60}")
+    
+    # 분석 기간 계산 (12개월)
+    current_year_overall = int(yyyymm[:4])
+    current_month_overall = int(yyyymm[4:6])
+    
+    start_year = current_year_overall
+    start_month = current_month_overall - 11
+    
+    while start_month <= 0:
+        start_month += 12
+        start_year -= 1
+    
+    yyyymm_start = f"{start_year:04d}{start_month:02d}"
+    yyyymm_end = yyyymm
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
+    
+    # SQL 쿼리 실행
+    sql = get_category_profit_overall_query(yyyymm_start, yyyymm_end, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = sum(float(r.get('ACT_SALE_AMT', 0)) for r in records)
+    total_qty = sum(float(r.get('SALE_QTY', 0)) for r in records)
+    total_profit = sum(float(r.get('SALE_TTL_PRFT', 0)) for r in records)
+    unique_categories = len(set(r.get('PRDT_HRRC1_NM', '') for r in records))
+    unique_subcategories = len(set(r.get('PRDT_HRRC2_NM', '') for r in records))
+    unique_items = len(set(r.get('PRDT_HRRC3_NM', '') for r in records))
+    unique_products = len(set(r.get('PRDT_NM', '') for r in records))
+    unique_months = len(set(r.get('YYYY_MM', '') for r in records))
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"총 판매수량: {total_qty:,.0f}개")
+    print(f"총 이익: {total_profit:,.0f}원 ({total_profit/1000000:.2f}백만원)")
+    print(f"전체 수익률: {round((total_profit / total_sales * 100) if total_sales != 0 else 0, 1)}%")
+    print(f"카테고리 수: {unique_categories}개")
+    print(f"서브카테고리 수: {unique_subcategories}개")
+    print(f"아이템 수: {unique_items}개")
+    print(f"제품 수: {unique_products}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 카테고리별 요약 데이터 생성
+    category_summary = {}
+    for record in records:
+        category1 = record.get('PRDT_HRRC1_NM', '기타')
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        sale_qty = float(record.get('SALE_QTY', 0))
+        profit = float(record.get('SALE_TTL_PRFT', 0))
+        
+        if category1 not in category_summary:
+            category_summary[category1] = {
+                'total_sales': 0,
+                'total_qty': 0,
+                'total_profit': 0,
+                'months': {},
+                'top_items': []
+            }
         
-        # 월별 합계 계산
-        monthly_totals = {}
-        for record in records:
-            month = record.get('YYYY_MM', '')
-            sale_amt = float(record.get('ACT_SALE_AMT', 0))
-            if month not in monthly_totals:
-                monthly_totals[month] = 0
-            monthly_totals[month] += sale_amt
+        category_summary[category1]['total_sales'] += sale_amt
+        category_summary[category1]['total_qty'] += sale_qty
+        category_summary[category1]['total_profit'] += profit
         
-        monthly_totals_list = [
-            {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
-            for month, amount in sorted(monthly_totals.items())
+        if month not in category_summary[category1]['months']:
+            category_summary[category1]['months'][month] = {'sales': 0, 'qty': 0, 'profit': 0}
+        category_summary[category1]['months'][month]['sales'] += sale_amt
+        category_summary[category1]['months'][month]['qty'] += sale_qty
+        category_summary[category1]['months'][month]['profit'] += profit
+    
+    # 카테고리별 상위 아이템 추출
+    item_sales_by_category = {}
+    for record in records:
+        category1 = record.get('PRDT_HRRC1_NM', '기타')
+        class3 = record.get('PRDT_HRRC3_NM', '기타')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        profit = float(record.get('SALE_TTL_PRFT', 0))
+        
+        key = (category1, class3)
+        if key not in item_sales_by_category:
+            item_sales_by_category[key] = {
+                'category1': category1,
+                'class3': class3,
+                'total_sales': 0,
+                'total_profit': 0
+            }
+        item_sales_by_category[key]['total_sales'] += sale_amt
+        item_sales_by_category[key]['total_profit'] += profit
+    
+    # 카테고리별로 상위 5개 아이템 추출
+    for category1 in category_summary.keys():
+        category_items = [
+            item for key, item in item_sales_by_category.items()
+            if item['category1'] == category1
         ]
-        
-        # 섹션 정의 (변수 처리)
-        section_definitions = [
-            {
-                'sub_title': '카테고리별 수익성 종합 평가',
-                'ai_text': '12개월간의 카테고리별 매출과 수익성을 종합적으로 평가한 내용 (예: ACC 카테고리가 전체 매출의 45%를 차지하며 핵심 카테고리로 부상, 수익률 42.5%로 전반적으로 높은 수익성을 보이고 있습니다. 의류 카테고리는 안정적 성장세를 유지하며 수익률 38.2%를 기록했습니다 등)'
-            },
-            {
-                'sub_title': '성장 카테고리 및 기회',
-                'ai_text': '성장세가 뚜렷한 카테고리와 기회를 불릿 포인트로 나열 (예: • ACC: 12개월간 지속적 성장으로 전체 매출의 45% 기여, 수익률 42.5%로 높은 수익성 유지 등)'
-            },
-            {
-                'sub_title': '주의 필요 카테고리',
-                'ai_text': '주의가 필요한 카테고리들을 불릿 포인트로 나열 (예: • 특정 카테고리: 최근 3개월간 수익률 하락 추세 등)'
-            },
-            {
-                'sub_title': '이상징후 및 리스크 감지',
-                'ai_text': '이상징후와 리스크를 구체적으로 설명 (예: • 특정 카테고리의 아이템 집중도 과다: ACC의 상위 3개 아이템이 전체의 60% 차지, 수익률 변동성 증가 등)'
-            },
+        category_items.sort(key=lambda x: x['total_sales'], reverse=True)
+        category_summary[category1]['top_items'] = [
             {
-                'sub_title': '카테고리별 전략 최적화 방안',
-                'ai_text': '단기 전략 방향과 중장기 전략 방향을 구체적으로 제시 (예: ### 즉시 실행 방안\\n1. ACC 카테고리 아이템 포트폴리오 다변화: ... 등)'
+                'class3': item['class3'],
+                'total_sales': round(item['total_sales'] / 1000000, 2),
+                'total_profit': round(item['total_profit'] / 1000000, 2),
+                'profit_rate': round((item['total_profit'] / item['total_sales'] * 100) if item['total_sales'] != 0 else 0, 1)
             }
+            for item in category_items[:5]
         ]
-        
-        # 섹션 템플릿 동적 생성
-        sections_template = ',\n    '.join([
-            '{{\n      "div": "종합분석-{idx}",\n      "sub_title": "{sub_title}",\n      "ai_text": "{ai_text}"\n    }}'.format(
-                idx=i+1,
-                sub_title=section['sub_title'],
-                ai_text=section['ai_text']
+        category_summary[category1]['total_sales'] = round(
+            category_summary[category1]['total_sales'] / 1000000, 2
+        )
+        category_summary[category1]['total_qty'] = round(
+            category_summary[category1]['total_qty'], 0
+        )
+        category_summary[category1]['total_profit'] = round(
+            category_summary[category1]['total_profit'] / 1000000, 2
+        )
+        if category_summary[category1]['total_sales'] > 0:
+            category_summary[category1]['profit_rate'] = round(
+                (category_summary[category1]['total_profit'] / category_summary[category1]['total_sales'] * 100), 1
             )
-            for i, section in enumerate(section_definitions)
-        ])
-        
-        # LLM 프롬프트 생성 (JSON 형식 응답 요청)
-        prompt = f"""
+        else:
+            category_summary[category1]['profit_rate'] = 0
+    
+    # 월별 합계 계산
+    monthly_totals = {}
+    for record in records:
+        month = record.get('YYYY_MM', '')
+        sale_amt = float(record.get('ACT_SALE_AMT', 0))
+        if month not in monthly_totals:
+            monthly_totals[month] = 0
+        monthly_totals[month] += sale_amt
+    
+    monthly_totals_list = [
+        {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
+        for month, amount in sorted(monthly_totals.items())
+    ]
+    
+    # 섹션 정의 (변수 처리)
+    section_definitions = [
+        {
+            'sub_title': '카테고리별 수익성 종합 평가',
+            'ai_text': '12개월간의 카테고리별 매출과 수익성을 종합적으로 평가한 내용 (예: ACC 카테고리가 전체 매출의 45%를 차지하며 핵심 카테고리로 부상, 수익률 42.5%로 전반적으로 높은 수익성을 보이고 있습니다. 의류 카테고리는 안정적 성장세를 유지하며 수익률 38.2%를 기록했습니다 등)'
+        },
+        {
+            'sub_title': '성장 카테고리 및 기회',
+            'ai_text': '성장세가 뚜렷한 카테고리와 기회를 불릿 포인트로 나열 (예: • ACC: 12개월간 지속적 성장으로 전체 매출의 45% 기여, 수익률 42.5%로 높은 수익성 유지 등)'
+        },
+        {
+            'sub_title': '주의 필요 카테고리',
+            'ai_text': '주의가 필요한 카테고리들을 불릿 포인트로 나열 (예: • 특정 카테고리: 최근 3개월간 수익률 하락 추세 등)'
+        },
+        {
+            'sub_title': '이상징후 및 리스크 감지',
+            'ai_text': '이상징후와 리스크를 구체적으로 설명 (예: • 특정 카테고리의 아이템 집중도 과다: ACC의 상위 3개 아이템이 전체의 60% 차지, 수익률 변동성 증가 등)'
+        },
+        {
+            'sub_title': '카테고리별 전략 최적화 방안',
+            'ai_text': '단기 전략 방향과 중장기 전략 방향을 구체적으로 제시 (예: ### 즉시 실행 방안\\n1. ACC 카테고리 아이템 포트폴리오 다변화: ... 등)'
+        }
+    ]
+    
+    # 섹션 템플릿 동적 생성
+    sections_template = ',\n    '.join([
+        '{{\n      "div": "종합분석-{idx}",\n      "sub_title": "{sub_title}",\n      "ai_text": "{ai_text}"\n    }}'.format(
+            idx=i+1,
+            sub_title=section['sub_title'],
+            ai_text=section['ai_text']
+        )
+        for i, section in enumerate(section_definitions)
+    ])
+    
+    # LLM 프롬프트 생성 (JSON 형식 응답 요청)
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 제품 전략 전문가야. 12개월간의 카테고리별 매출과 수익성 추이를 분석하여 카테고리별 성과와 제품 포트폴리오 전략을 제시해야 해.
 
 **분석 기간**
@@ -2431,130 +2600,127 @@ def analyze_category_profit(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data_overall = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data_overall = {
-                "title": "카테고리별 수익성 분석 (12개월 추이)",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # 종합분석용 category_summary 저장
-        category_summary_overall = category_summary
-        
-        # ============================================================
-        # 카테고리별 섹션과 종합분석을 하나로 통합
-        # ============================================================
-        
-        # 종합분석 섹션을 카테고리별 섹션 뒤에 추가
-        # 종합분석의 div를 "종합분석-1", "종합분석-2" 형태로 변경
-        overall_sections = []
-        for idx, section in enumerate(analysis_data_overall.get('sections', []), 1):
-            overall_sections.append({
-                'div': f'종합분석-{idx}',
-                'sub_title': section.get('sub_title', ''),
-                'ai_text': section.get('ai_text', '')
-            })
-        
-        # 카테고리별 섹션 + 종합분석 섹션 통합
-        combined_sections = analysis_data.get('sections', []) + overall_sections
-        analysis_data_combined = {
-            'title': analysis_data.get('title', '카테고리별 수익성 분석 (당해 전년 주요변화)'),
-            'sections': combined_sections
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data_overall = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data_overall = {
+            "title": "카테고리별 수익성 분석 (12개월 추이)",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "분석 결과", "ai_text": analysis_response}
+            ]
         }
-        
-        # 통합된 JSON 데이터 생성
-        json_data_combined = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data_combined,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'total_qty': round(total_qty, 0),
-                'total_profit': round(total_profit / 1000000, 2),
-                'total_profit_rate': round((total_profit / total_sales * 100) if total_sales != 0 else 0, 1),
-                'unique_categories': unique_categories,
-                'unique_subcategories': unique_subcategories,
-                'unique_items': unique_items,
-                'unique_products': unique_products,
-                'unique_months': unique_months,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'category_summary': category_summary,
-            'category_summary_overall': category_summary_overall,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'YYYY_MM': r.get('YYYY_MM', ''),
-                        'PRDT_NM': r.get('PRDT_NM', ''),
-                        'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
-                        'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
-                        'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
-                        'SALE_QTY': float(r.get('SALE_QTY', 0)),
-                        'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0)),
-                        'SALE_TTL_PRFT': float(r.get('SALE_TTL_PRFT', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('YYYY_MM', ''),
-                        'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
-                        'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
-                        'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
-                        'prdt_nm': r.get('PRDT_NM', ''),
-                        'sale_qty': float(r.get('SALE_QTY', 0)),
-                        'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2),
-                        'profit': round(float(r.get('SALE_TTL_PRFT', 0)) / 1000000, 2)
-                    }
-                    for r in records
-                ]
-            }
+    
+    # 종합분석용 category_summary 저장
+    category_summary_overall = category_summary
+    
+    # ============================================================
+    # 카테고리별 섹션과 종합분석을 하나로 통합
+    # ============================================================
+    
+    # 종합분석 섹션을 카테고리별 섹션 뒤에 추가
+    # 종합분석의 div를 "종합분석-1", "종합분석-2" 형태로 변경
+    overall_sections = []
+    for idx, section in enumerate(analysis_data_overall.get('sections', []), 1):
+        overall_sections.append({
+            'div': f'종합분석-{idx}',
+            'sub_title': section.get('sub_title', ''),
+            'ai_text': section.get('ai_text', '')
+        })
+    
+    # 카테고리별 섹션 + 종합분석 섹션 통합
+    combined_sections = analysis_data.get('sections', []) + overall_sections
+    analysis_data_combined = {
+        'title': analysis_data.get('title', '카테고리별 수익성 분석 (당해 전년 주요변화)'),
+        'sections': combined_sections
+    }
+    
+    # 통합된 JSON 데이터 생성
+    json_data_combined = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data_combined,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'total_qty': round(total_qty, 0),
+            'total_profit': round(total_profit / 1000000, 2),
+            'total_profit_rate': round((total_profit / total_sales * 100) if total_sales != 0 else 0, 1),
+            'unique_categories': unique_categories,
+            'unique_subcategories': unique_subcategories,
+            'unique_items': unique_items,
+            'unique_products': unique_products,
+            'unique_months': unique_months,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'category_summary': category_summary,
+        'category_summary_overall': category_summary_overall,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'YYYY_MM': r.get('YYYY_MM', ''),
+                    'PRDT_NM': r.get('PRDT_NM', ''),
+                    'PRDT_HRRC1_NM': r.get('PRDT_HRRC1_NM', ''),
+                    'PRDT_HRRC2_NM': r.get('PRDT_HRRC2_NM', ''),
+                    'PRDT_HRRC3_NM': r.get('PRDT_HRRC3_NM', ''),
+                    'SALE_QTY': float(r.get('SALE_QTY', 0)),
+                    'ACT_SALE_AMT': float(r.get('ACT_SALE_AMT', 0)),
+                    'SALE_TTL_PRFT': float(r.get('SALE_TTL_PRFT', 0))
+                }
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
+        },
+        'trend_data': {
+            'trend_months': sorted(list(set(r.get('YYYY_MM', '') for r in records))),
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': [
+                {
+                    'yyyymm': r.get('YYYY_MM', ''),
+                    'prdt_hrrc1_nm': r.get('PRDT_HRRC1_NM', ''),
+                    'prdt_hrrc2_nm': r.get('PRDT_HRRC2_NM', ''),
+                    'prdt_hrrc3_nm': r.get('PRDT_HRRC3_NM', ''),
+                    'prdt_nm': r.get('PRDT_NM', ''),
+                    'sale_qty': float(r.get('SALE_QTY', 0)),
+                    'sale_amt': round(float(r.get('ACT_SALE_AMT', 0)) / 1000000, 2),
+                    'profit': round(float(r.get('SALE_TTL_PRFT', 0)) / 1000000, 2)
+                }
+                for r in records
+            ]
         }
-        
-        # 파일 저장 (통합된 결과)
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_영업이익_아이템별직접이익"
-        save_json(json_data_combined, filename)
-        
-        # Markdown도 저장 (통합된 sections를 조합)
-        markdown_content = f"# {analysis_data_combined.get('title', '카테고리별 수익성 분석')}\n\n"
-        for section in analysis_data_combined.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 카테고리별 수익성 분석 및 종합분석 완료!\n")
-        return json_data_combined
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장 (통합된 결과)
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_영업이익_아이템별직접이익"
+    save_json(json_data_combined, filename)
+    
+    # Markdown도 저장 (통합된 sections를 조합)
+    markdown_content = f"# {analysis_data_combined.get('title', '카테고리별 수익성 분석')}\n\n"
+    for section in analysis_data_combined.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 카테고리별 수익성 분석 및 종합분석 완료!\n")
+    return json_data_combined
 
 # analyze_category_profit_overall 함수는 analyze_category_profit 함수에 통합되었습니다.
 # 이 함수는 더 이상 사용되지 않습니다.
@@ -2568,308 +2734,307 @@ def analyze_channel_sales_trend(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해 1월부터 현재월까지)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        
-        yyyymm_start = f"{current_year}01"  # 당해 1월
-        yyyymm_end = yyyymm  # 현재월
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = get_channel_sales_query(yyyymm_start, yyyymm_end, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('SALE_AMT', 0)) for r in records)
-        unique_channels = len(set(r.get('CHNL_NM', '') for r in records))
-        unique_items = len(set(r.get('CLASS3', '') for r in records))
-        unique_months = len(set(r.get('PST_YYYYMM', '') for r in records))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"채널 수: {unique_channels}개")
-        print(f"아이템 수: {unique_items}개")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 채널별 요약 데이터 생성
-        channel_summary = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            month = record.get('PST_YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            
-            if chnl_nm not in channel_summary:
-                channel_summary[chnl_nm] = {
-                    'total_sales': 0,
-                    'months': {},
-                    'top_items': []
-                }
-            
-            channel_summary[chnl_nm]['total_sales'] += sale_amt
-            
-            if month not in channel_summary[chnl_nm]['months']:
-                channel_summary[chnl_nm]['months'][month] = 0
-            channel_summary[chnl_nm]['months'][month] += sale_amt
-        
-        # 채널별 상위 아이템 추출
-        item_sales_by_channel = {}
-        for record in records:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            class3 = record.get('CLASS3', '기타')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            
-            key = f"{chnl_nm}|{class3}"
-            if key not in item_sales_by_channel:
-                item_sales_by_channel[key] = {
-                    'chnl_nm': chnl_nm,
-                    'class3': class3,
-                    'total_sales': 0
-                }
-            item_sales_by_channel[key]['total_sales'] += sale_amt
+    # 분석 기간 계산 (당해 1월부터 현재월까지)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    
+    yyyymm_start = f"{current_year}01"  # 당해 1월
+    yyyymm_end = yyyymm  # 현재월
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
+    
+    # SQL 쿼리 실행
+    sql = get_channel_sales_query(yyyymm_start, yyyymm_end, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = sum(float(r.get('SALE_AMT', 0)) for r in records)
+    unique_channels = len(set(r.get('CHNL_NM', '') for r in records))
+    unique_items = len(set(r.get('CLASS3', '') for r in records))
+    unique_months = len(set(r.get('PST_YYYYMM', '') for r in records))
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"채널 수: {unique_channels}개")
+    print(f"아이템 수: {unique_items}개")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 채널별 요약 데이터 생성
+    channel_summary = {}
+    for record in records:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        month = record.get('PST_YYYYMM', '')
+        sale_amt = float(record.get('SALE_AMT', 0))
         
-        # 채널별로 상위 5개 아이템 추출
-        for chnl_nm in channel_summary.keys():
-            channel_items = [
-                item for key, item in item_sales_by_channel.items()
-                if item['chnl_nm'] == chnl_nm
-            ]
-            channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
-            channel_summary[chnl_nm]['top_items'] = [
-                {
-                    'class3': item['class3'],
-                    'total_sales': round(item['total_sales'] / 1000000, 2)
-                }
-                for item in channel_items[:5]
-            ]
-            channel_summary[chnl_nm]['total_sales'] = round(
-                channel_summary[chnl_nm]['total_sales'] / 1000000, 2
-            )
+        if chnl_nm not in channel_summary:
+            channel_summary[chnl_nm] = {
+                'total_sales': 0,
+                'months': {},
+                'top_items': []
+            }
         
-        # 월별 합계 계산
-        monthly_totals = {}
-        for record in records:
-            month = record.get('PST_YYYYMM', '')
-            sale_amt = float(record.get('SALE_AMT', 0))
-            if month not in monthly_totals:
-                monthly_totals[month] = 0
-            monthly_totals[month] += sale_amt
+        channel_summary[chnl_nm]['total_sales'] += sale_amt
         
-        monthly_totals_list = [
-            {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
-            for month, amount in sorted(monthly_totals.items())
+        if month not in channel_summary[chnl_nm]['months']:
+            channel_summary[chnl_nm]['months'][month] = 0
+        channel_summary[chnl_nm]['months'][month] += sale_amt
+    
+    # 채널별 상위 아이템 추출
+    item_sales_by_channel = {}
+    for record in records:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        class3 = record.get('CLASS3', '기타')
+        sale_amt = float(record.get('SALE_AMT', 0))
+        
+        key = (chnl_nm, class3)
+        if key not in item_sales_by_channel:
+            item_sales_by_channel[key] = {
+                'chnl_nm': chnl_nm,
+                'class3': class3,
+                'total_sales': 0
+            }
+        item_sales_by_channel[key]['total_sales'] += sale_amt
+    
+    # 채널별로 상위 5개 아이템 추출
+    for chnl_nm in channel_summary.keys():
+        channel_items = [
+            item for key, item in item_sales_by_channel.items()
+            if item['chnl_nm'] == chnl_nm
         ]
-        
-        # 월별 매출 분석 (최대/최소/턴어라운드)
-        if monthly_totals_list:
-            # 최대 매출월 찾기
-            max_month_data = max(monthly_totals_list, key=lambda x: x['total_amount'])
-            max_month = max_month_data['yyyymm']
-            max_amount = max_month_data['total_amount']
-            
-            # 최소 매출월 찾기
-            min_month_data = min(monthly_totals_list, key=lambda x: x['total_amount'])
-            min_month = min_month_data['yyyymm']
-            min_amount = min_month_data['total_amount']
+        channel_items.sort(key=lambda x: x['total_sales'], reverse=True)
+        channel_summary[chnl_nm]['top_items'] = [
+            {
+                'class3': item['class3'],
+                'total_sales': round(item['total_sales'] / 1000000, 2)
+            }
+            for item in channel_items[:5]
+        ]
+        channel_summary[chnl_nm]['total_sales'] = round(
+            channel_summary[chnl_nm]['total_sales'] / 1000000, 2
+        )
+    
+    # 월별 합계 계산
+    monthly_totals = {}
+    for record in records:
+        month = record.get('PST_YYYYMM', '')
+        sale_amt = float(record.get('SALE_AMT', 0))
+        if month not in monthly_totals:
+            monthly_totals[month] = 0
+        monthly_totals[month] += sale_amt
+    
+    monthly_totals_list = [
+        {'yyyymm': month, 'total_amount': round(amount / 1000000, 2)}
+        for month, amount in sorted(monthly_totals.items())
+    ]
+    
+    # 월별 매출 분석 (최대/최소/턴어라운드)
+    if monthly_totals_list:
+        # 최대 매출월 찾기
+        max_month_data = max(monthly_totals_list, key=lambda x: x['total_amount'])
+        max_month = max_month_data['yyyymm']
+        max_amount = max_month_data['total_amount']
+        
+        # 최소 매출월 찾기
+        min_month_data = min(monthly_totals_list, key=lambda x: x['total_amount'])
+        min_month = min_month_data['yyyymm']
+        min_amount = min_month_data['total_amount']
+        
+        # 턴어라운드 시점 찾기 (하락 후 상승으로 전환되는 시점)
+        turnaround_month = None
+        turnaround_amount = None
+        if len(monthly_totals_list) >= 3:
+            for i in range(1, len(monthly_totals_list) - 1):
+                prev_amount = monthly_totals_list[i-1]['total_amount']
+                curr_amount = monthly_totals_list[i]['total_amount']
+                next_amount = monthly_totals_list[i+1]['total_amount']
+                
+                # 이전 월보다 감소했고, 다음 월보다 증가한 경우 (턴어라운드)
+                if prev_amount > curr_amount and next_amount > curr_amount:
+                    turnaround_month = monthly_totals_list[i]['yyyymm']
+                    turnaround_amount = curr_amount
+                    break
             
-            # 턴어라운드 시점 찾기 (하락 후 상승으로 전환되는 시점)
-            turnaround_month = None
-            turnaround_amount = None
-            if len(monthly_totals_list) >= 3:
-                for i in range(1, len(monthly_totals_list) - 1):
+            # 턴어라운드가 없으면 마지막으로 상승한 시점 찾기
+            if turnaround_month is None:
+                for i in range(len(monthly_totals_list) - 1, 0, -1):
                     prev_amount = monthly_totals_list[i-1]['total_amount']
                     curr_amount = monthly_totals_list[i]['total_amount']
-                    next_amount = monthly_totals_list[i+1]['total_amount']
-                    
-                    # 이전 월보다 감소했고, 다음 월보다 증가한 경우 (턴어라운드)
-                    if prev_amount > curr_amount and next_amount > curr_amount:
+                    if curr_amount > prev_amount:
                         turnaround_month = monthly_totals_list[i]['yyyymm']
                         turnaround_amount = curr_amount
                         break
-                
-                # 턴어라운드가 없으면 마지막으로 상승한 시점 찾기
-                if turnaround_month is None:
-                    for i in range(len(monthly_totals_list) - 1, 0, -1):
-                        prev_amount = monthly_totals_list[i-1]['total_amount']
-                        curr_amount = monthly_totals_list[i]['total_amount']
-                        if curr_amount > prev_amount:
-                            turnaround_month = monthly_totals_list[i]['yyyymm']
-                            turnaround_amount = curr_amount
-                            break
-            
-            # 월 표시 형식 변환 (YYYYMM -> M월)
-            def format_month(yyyymm):
-                if len(yyyymm) == 6:
-                    return f"{int(yyyymm[4:6])}월"
-                return yyyymm
-            
-            max_month_str = format_month(max_month)
-            min_month_str = format_month(min_month)
-            turnaround_month_str = format_month(turnaround_month) if turnaround_month else "없음"
-            
-            # 주요 인사이트 텍스트 생성
-            insight_text = f"• {max_month_str} 최대 {max_amount:,.0f}\n• {min_month_str} 최저 {min_amount:,.0f}\n"
-            if turnaround_month:
-                insight_text += f"• {turnaround_month_str} 회복 {turnaround_amount:,.0f}"
-            else:
-                insight_text += f"• 턴어라운드 시점 없음"
-        else:
-            insight_text = "• 데이터 부족"
         
-        # 채널별 트렌드 분석 (특정 이벤트가 있는 채널 찾기)
-        channel_trends = []
+        # 월 표시 형식 변환 (YYYYMM -> M월)
+        def format_month(yyyymm):
+            if len(yyyymm) == 6:
+                return f"{int(yyyymm[4:6])}월"
+            return yyyymm
         
-        for chnl_nm, chnl_data in channel_summary.items():
-            months_data = chnl_data.get('months', {})
-            if len(months_data) < 3:
-                continue
-            
-            # 월별 매출을 정렬된 리스트로 변환 (월 순서대로, YYYYMM 형식으로 정렬)
-            sorted_months = sorted(months_data.items())
-            month_values = [amount / 1000000 for month, amount in sorted_months]  # 백만원 단위로 변환
-            
-            # 트렌드 분석
-            trend_type = None
-            trend_month = None
-            trend_description = None
-            
-            # 1. 회복 패턴 찾기 (하락 후 상승)
-            # 가장 최근의 회복 시점을 찾기 위해 뒤에서부터 검색
-            # 회복 = 연속으로 하락하다가 상승으로 전환되는 시점
-            for i in range(len(month_values) - 2, 0, -1):
-                # 기본 회복 패턴: 이전 월보다 감소했고, 다음 월보다 증가한 경우
-                if month_values[i-1] > month_values[i] and month_values[i+1] > month_values[i]:
-                    # 회복이 시작된 월 찾기 (상승이 시작된 시점 = i+1)
+        max_month_str = format_month(max_month)
+        min_month_str = format_month(min_month)
+        turnaround_month_str = format_month(turnaround_month) if turnaround_month else "없음"
+        
+        # 주요 인사이트 텍스트 생성
+        insight_text = f"• {max_month_str} 최대 {max_amount:,.0f}\n• {min_month_str} 최저 {min_amount:,.0f}\n"
+        if turnaround_month:
+            insight_text += f"• {turnaround_month_str} 회복 {turnaround_amount:,.0f}"
+        else:
+            insight_text += f"• 턴어라운드 시점 없음"
+    else:
+        insight_text = "• 데이터 부족"
+    
+    # 채널별 트렌드 분석 (특정 이벤트가 있는 채널 찾기)
+    channel_trends = []
+    
+    for chnl_nm, chnl_data in channel_summary.items():
+        months_data = chnl_data.get('months', {})
+        if len(months_data) < 3:
+            continue
+        
+        # 월별 매출을 정렬된 리스트로 변환 (월 순서대로, YYYYMM 형식으로 정렬)
+        sorted_months = sorted(months_data.items())
+        month_values = [amount / 1000000 for month, amount in sorted_months]  # 백만원 단위로 변환
+        
+        # 트렌드 분석
+        trend_type = None
+        trend_month = None
+        trend_description = None
+        
+        # 1. 회복 패턴 찾기 (하락 후 상승)
+        # 가장 최근의 회복 시점을 찾기 위해 뒤에서부터 검색
+        # 회복 = 연속으로 하락하다가 상승으로 전환되는 시점
+        for i in range(len(month_values) - 2, 0, -1):
+            # 기본 회복 패턴: 이전 월보다 감소했고, 다음 월보다 증가한 경우
+            if month_values[i-1] > month_values[i] and month_values[i+1] > month_values[i]:
+                # 회복이 시작된 월 찾기 (상승이 시작된 시점 = i+1)
+                recovery_month = sorted_months[i+1][0]
+                month_num = int(recovery_month[4:6]) if len(recovery_month) == 6 else recovery_month
+                trend_type = "회복"
+                trend_description = f"{month_num}월 회복"
+                break
+            # 연속 하락 후 상승 패턴 (2개월 이상 하락 후 상승)
+            elif i >= 2:
+                if (month_values[i-2] > month_values[i-1] and 
+                    month_values[i-1] > month_values[i] and 
+                    month_values[i+1] > month_values[i]):
                     recovery_month = sorted_months[i+1][0]
                     month_num = int(recovery_month[4:6]) if len(recovery_month) == 6 else recovery_month
                     trend_type = "회복"
                     trend_description = f"{month_num}월 회복"
                     break
-                # 연속 하락 후 상승 패턴 (2개월 이상 하락 후 상승)
-                elif i >= 2:
-                    if (month_values[i-2] > month_values[i-1] and 
-                        month_values[i-1] > month_values[i] and 
-                        month_values[i+1] > month_values[i]):
-                        recovery_month = sorted_months[i+1][0]
-                        month_num = int(recovery_month[4:6]) if len(recovery_month) == 6 else recovery_month
-                        trend_type = "회복"
-                        trend_description = f"{month_num}월 회복"
-                        break
-            
-            # 2. 지속 성장 패턴 (전반적으로 상승 추세)
-            if trend_type is None:
-                growth_count = 0
-                decline_count = 0
-                for i in range(1, len(month_values)):
-                    if month_values[i] > month_values[i-1]:
-                        growth_count += 1
-                    elif month_values[i] < month_values[i-1]:
-                        decline_count += 1
-                
-                if growth_count > decline_count * 1.5:  # 성장이 하락보다 1.5배 이상
-                    trend_type = "지속 성장"
-                    trend_description = "지속 성장"
-            
-            # 3. 계절성 영향 (특정 월에 급증/급감)
-            if trend_type is None:
-                max_month_idx = month_values.index(max(month_values))
-                min_month_idx = month_values.index(min(month_values))
-                max_month = sorted_months[max_month_idx][0]
-                min_month = sorted_months[min_month_idx][0]
-                
-                if abs(max_month_idx - min_month_idx) >= 2:  # 최대/최소가 충분히 떨어져 있음
-                    max_month_num = int(max_month[4:6]) if len(max_month) == 6 else max_month
-                    min_month_num = int(min_month[4:6]) if len(min_month) == 6 else min_month
-                    if max_month_num in [3, 4, 5, 9, 10, 11, 12] or min_month_num in [1, 2, 6, 7, 8]:
-                        trend_type = "계절성"
-                        trend_description = "계절성 영향"
+        
+        # 2. 지속 성장 패턴 (전반적으로 상승 추세)
+        if trend_type is None:
+            growth_count = 0
+            decline_count = 0
+            for i in range(1, len(month_values)):
+                if month_values[i] > month_values[i-1]:
+                    growth_count += 1
+                elif month_values[i] < month_values[i-1]:
+                    decline_count += 1
             
-            # 4. 하락 추세
-            if trend_type is None:
-                if decline_count > growth_count * 1.5:
-                    trend_type = "하락"
-                    trend_description = "하락 추세"
+            if growth_count > decline_count * 1.5:  # 성장이 하락보다 1.5배 이상
+                trend_type = "지속 성장"
+                trend_description = "지속 성장"
+        
+        # 3. 계절성 영향 (특정 월에 급증/급감)
+        if trend_type is None:
+            max_month_idx = month_values.index(max(month_values))
+            min_month_idx = month_values.index(min(month_values))
+            max_month = sorted_months[max_month_idx][0]
+            min_month = sorted_months[min_month_idx][0]
             
-            if trend_type:
-                channel_trends.append({
-                    'channel': chnl_nm,
-                    'trend_type': trend_type,
-                    'trend_description': trend_description,
-                    'trend_month': trend_month,
-                    'total_sales': chnl_data['total_sales']
-                })
-        
-        # 총 매출 기준으로 상위 3개 채널 선택 (특정 이벤트가 있는 것 중에서)
-        channel_trends.sort(key=lambda x: x['total_sales'], reverse=True)
-        top_3_trends = channel_trends[:3] if len(channel_trends) >= 3 else channel_trends
-        
-        # 채널 트렌드 텍스트 생성
-        if top_3_trends:
-            trend_text = '\n'.join([
-                f"• {item['channel']}: {item['trend_description']}"
-                for item in top_3_trends
-            ])
-        else:
-            trend_text = "• 분석 가능한 채널 트렌드 없음"
-        
-        # 전략 제안을 위한 데이터 분석
-        # 1. 채널별 매출 기여도 분석
-        channel_contributions = []
-        for chnl_nm, chnl_data in channel_summary.items():
-            contribution_pct = round((chnl_data['total_sales'] / (total_sales / 1000000) * 100) if total_sales > 0 else 0, 1)
-            channel_contributions.append({
+            if abs(max_month_idx - min_month_idx) >= 2:  # 최대/최소가 충분히 떨어져 있음
+                max_month_num = int(max_month[4:6]) if len(max_month) == 6 else max_month
+                min_month_num = int(min_month[4:6]) if len(min_month) == 6 else min_month
+                if max_month_num in [3, 4, 5, 9, 10, 11, 12] or min_month_num in [1, 2, 6, 7, 8]:
+                    trend_type = "계절성"
+                    trend_description = "계절성 영향"
+        
+        # 4. 하락 추세
+        if trend_type is None:
+            if decline_count > growth_count * 1.5:
+                trend_type = "하락"
+                trend_description = "하락 추세"
+        
+        if trend_type:
+            channel_trends.append({
                 'channel': chnl_nm,
-                'sales': chnl_data['total_sales'],
-                'contribution': contribution_pct,
-                'top_items': chnl_data.get('top_items', [])[:3]
+                'trend_type': trend_type,
+                'trend_description': trend_description,
+                'trend_month': trend_month,
+                'total_sales': chnl_data['total_sales']
             })
-        channel_contributions.sort(key=lambda x: x['sales'], reverse=True)
-        
-        # 2. 성장 채널과 하락 채널 식별
-        growing_channels = []
-        declining_channels = []
-        for chnl_nm, chnl_data in channel_summary.items():
-            months_data = chnl_data.get('months', {})
-            if len(months_data) >= 2:
-                sorted_months = sorted(months_data.items())
-                first_half = sum([amount for month, amount in sorted_months[:len(sorted_months)//2]])
-                second_half = sum([amount for month, amount in sorted_months[len(sorted_months)//2:]])
-                
-                if second_half > first_half * 1.1:  # 10% 이상 성장
-                    growing_channels.append(chnl_nm)
-                elif second_half < first_half * 0.9:  # 10% 이상 하락
-                    declining_channels.append(chnl_nm)
-        
-        # 3. 아이템 집중도 분석 (상위 3개 아이템이 전체의 비중)
-        item_concentration = {}
-        for chnl_nm, chnl_data in channel_summary.items():
-            top_items = chnl_data.get('top_items', [])
-            if top_items:
-                top3_sales = sum([item['total_sales'] for item in top_items[:3]])
-                total_chnl_sales = chnl_data['total_sales']
-                concentration = round((top3_sales / total_chnl_sales * 100) if total_chnl_sales > 0 else 0, 1)
-                item_concentration[chnl_nm] = concentration
-        
-        # 전략 제안 데이터 정리
-        strategy_data = {
-            'top_channels': channel_contributions[:3],
-            'growing_channels': growing_channels[:3],
-            'declining_channels': declining_channels[:3],
-            'high_concentration_channels': [
-                {'channel': chnl, 'concentration': conc}
-                for chnl, conc in sorted(item_concentration.items(), key=lambda x: x[1], reverse=True)
-                if conc > 50
-            ][:3]
-        }
-        
-        # 전략 포인트 텍스트 생성 (데이터 요약)
-        strategy_summary = f"""
+    
+    # 총 매출 기준으로 상위 3개 채널 선택 (특정 이벤트가 있는 것 중에서)
+    channel_trends.sort(key=lambda x: x['total_sales'], reverse=True)
+    top_3_trends = channel_trends[:3] if len(channel_trends) >= 3 else channel_trends
+    
+    # 채널 트렌드 텍스트 생성
+    if top_3_trends:
+        trend_text = '\n'.join([
+            f"• {item['channel']}: {item['trend_description']}"
+            for item in top_3_trends
+        ])
+    else:
+        trend_text = "• 분석 가능한 채널 트렌드 없음"
+    
+    # 전략 제안을 위한 데이터 분석
+    # 1. 채널별 매출 기여도 분석
+    channel_contributions = []
+    for chnl_nm, chnl_data in channel_summary.items():
+        contribution_pct = round((chnl_data['total_sales'] / (total_sales / 1000000) * 100) if total_sales > 0 else 0, 1)
+        channel_contributions.append({
+            'channel': chnl_nm,
+            'sales': chnl_data['total_sales'],
+            'contribution': contribution_pct,
+            'top_items': chnl_data.get('top_items', [])[:3]
+        })
+    channel_contributions.sort(key=lambda x: x['sales'], reverse=True)
+    
+    # 2. 성장 채널과 하락 채널 식별
+    growing_channels = []
+    declining_channels = []
+    for chnl_nm, chnl_data in channel_summary.items():
+        months_data = chnl_data.get('months', {})
+        if len(months_data) >= 2:
+            sorted_months = sorted(months_data.items())
+            first_half = sum([amount for month, amount in sorted_months[:len(sorted_months)//2]])
+            second_half = sum([amount for month, amount in sorted_months[len(sorted_months)//2:]])
+            
+            if second_half > first_half * 1.1:  # 10% 이상 성장
+                growing_channels.append(chnl_nm)
+            elif second_half < first_half * 0.9:  # 10% 이상 하락
+                declining_channels.append(chnl_nm)
+    
+    # 3. 아이템 집중도 분석 (상위 3개 아이템이 전체의 비중)
+    item_concentration = {}
+    for chnl_nm, chnl_data in channel_summary.items():
+        top_items = chnl_data.get('top_items', [])
+        if top_items:
+            top3_sales = sum([item['total_sales'] for item in top_items[:3]])
+            total_chnl_sales = chnl_data['total_sales']
+            concentration = round((top3_sales / total_chnl_sales * 100) if total_chnl_sales > 0 else 0, 1)
+            item_concentration[chnl_nm] = concentration
+    
+    # 전략 제안 데이터 정리
+    strategy_data = {
+        'top_channels': channel_contributions[:3],
+        'growing_channels': growing_channels[:3],
+        'declining_channels': declining_channels[:3],
+        'high_concentration_channels': [
+            {'channel': chnl, 'concentration': conc}
+            for chnl, conc in sorted(item_concentration.items(), key=lambda x: x[1], reverse=True)
+            if conc > 50
+        ][:3]
+    }
+    
+    # 전략 포인트 텍스트 생성 (데이터 요약)
+    strategy_summary = f"""
 **주요 채널 기여도 (상위 3개)**
 {json_dumps_safe([{'channel': c['channel'], 'sales': c['sales'], 'contribution': c['contribution']} for c in strategy_data['top_channels']], ensure_ascii=False, indent=2)}
 
@@ -2877,36 +3042,36 @@ def analyze_channel_sales_trend(yyyymm, brd_cd):
 **하락 채널**: {', '.join(strategy_data['declining_channels']) if strategy_data['declining_channels'] else '없음'}
 **아이템 집중도 높은 채널**: {', '.join([c['channel'] for c in strategy_data['high_concentration_channels']]) if strategy_data['high_concentration_channels'] else '없음'}
 """
-        
-        # 섹션 정의 (변수 처리)
-        section_definitions = [
-            {
-                'sub_title': '주요 인사이트',
-                'ai_text': '당해 1월~현재월까지의 매출 분석 결과를 구체적으로 3줄로 작성해줘. 각 줄은 다음 형식을 정확히 따르세요:\n• [최대 매출월] 최대 [금액]백만원 - [구체적 원인 또는 특징 설명]\n• [최소 매출월] 최저 [금액]백만원 - [구체적 원인 또는 특징 설명]\n• [턴어라운드 월] 회복 [금액]백만원 - [구체적 회복 요인 설명]\n위 "월별 매출 분석 결과"의 데이터를 바탕으로 각 월의 구체적인 특징과 원인을 포함하여 작성하세요.'
-            },
-            {
-                'sub_title': '채널 트렌드',
-                'ai_text': f'특정 이벤트가 있는 채널 3개를 구체적으로 3줄로 작성해줘. 각 줄은 다음 형식을 정확히 따르세요:\n• [채널명]: [구체적인 트렌드 설명] - [매출 변화율 또는 금액 변화, 주요 아이템 또는 특징]\n• [채널명]: [구체적인 트렌드 설명] - [매출 변화율 또는 금액 변화, 주요 아이템 또는 특징]\n• [채널명]: [구체적인 트렌드 설명] - [매출 변화율 또는 금액 변화, 주요 아이템 또는 특징]\n\n아래 채널별 트렌드 분석 결과를 참고하여 각 채널의 구체적인 변화 패턴, 성장률, 주요 아이템 등을 포함하여 작성하세요:\n{trend_text}'
-            },
-            {
-                'sub_title': '전략 포인트',
-                'ai_text': '위 데이터 분석 결과를 바탕으로 구체적이고 실행 가능한 전략을 3줄로 제시해줘. 각 전략은 불릿 포인트 형식으로 작성하세요.'
-            },
+    
+    # 섹션 정의 (변수 처리)
+    section_definitions = [
+        {
+            'sub_title': '주요 인사이트',
+            'ai_text': '당해 1월~현재월까지의 매출 분석 결과를 구체적으로 3줄로 작성해줘. 각 줄은 다음 형식을 정확히 따르세요:\n• [최대 매출월] 최대 [금액]백만원 - [구체적 원인 또는 특징 설명]\n• [최소 매출월] 최저 [금액]백만원 - [구체적 원인 또는 특징 설명]\n• [턴어라운드 월] 회복 [금액]백만원 - [구체적 회복 요인 설명]\n위 "월별 매출 분석 결과"의 데이터를 바탕으로 각 월의 구체적인 특징과 원인을 포함하여 작성하세요.'
+        },
+        {
+            'sub_title': '채널 트렌드',
+            'ai_text': f'특정 이벤트가 있는 채널 3개를 구체적으로 3줄로 작성해줘. 각 줄은 다음 형식을 정확히 따르세요:\n• [채널명]: [구체적인 트렌드 설명] - [매출 변화율 또는 금액 변화, 주요 아이템 또는 특징]\n• [채널명]: [구체적인 트렌드 설명] - [매출 변화율 또는 금액 변화, 주요 아이템 또는 특징]\n• [채널명]: [구체적인 트렌드 설명] - [매출 변화율 또는 금액 변화, 주요 아이템 또는 특징]\n\n아래 채널별 트렌드 분석 결과를 참고하여 각 채널의 구체적인 변화 패턴, 성장률, 주요 아이템 등을 포함하여 작성하세요:\n{trend_text}'
+        },
+        {
+            'sub_title': '전략 포인트',
+            'ai_text': '위 데이터 분석 결과를 바탕으로 구체적이고 실행 가능한 전략을 3줄로 제시해줘. 각 전략은 불릿 포인트 형식으로 작성하세요.'
+        },
  
-        ]
-        
-        # 섹션 템플릿 동적 생성
-        sections_template = ',\n    '.join([
-            '{{\n      "div": "종합분석-{idx}",\n      "sub_title": "{sub_title}",\n      "ai_text": "{ai_text}"\n    }}'.format(
-                idx=i+1,
-                sub_title=section['sub_title'],
-                ai_text=section['ai_text']
-            )
-            for i, section in enumerate(section_definitions)
-        ])
-        
-        # LLM 프롬프트 생성 (JSON 형식 응답 요청)
-        prompt = f"""
+    ]
+    
+    # 섹션 템플릿 동적 생성
+    sections_template = ',\n    '.join([
+        '{{\n      "div": "종합분석-{idx}",\n      "sub_title": "{sub_title}",\n      "ai_text": "{ai_text}"\n    }}'.format(
+            idx=i+1,
+            sub_title=section['sub_title'],
+            ai_text=section['ai_text']
+        )
+        for i, section in enumerate(section_definitions)
+    ])
+    
+    # LLM 프롬프트 생성 (JSON 형식 응답 요청)
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 채널 전략 전문가야. 당해 1월부터 현재월까지의 채널별 매출 추이를 분석하여 채널별 성과와 아이템 포트폴리오 전략을 제시해야 해.
 
 **분석 기간**
@@ -2984,98 +3149,95 @@ def analyze_channel_sales_trend(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "채널별 매출 종합분석 (당해 1월~현재월)",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "분석 결과", "ai_text": analysis_response}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        # yyyymm_py 계산 (전년 동월)
-        previous_year = int(yyyymm_end[:4]) - 1
-        yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
-        
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'unique_channels': unique_channels,
-                'unique_items': unique_items,
-                'unique_months': unique_months,
-                'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
-            },
-            'channel_summary': channel_summary,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'PST_YYYYMM': r.get('PST_YYYYMM', ''),
-                        'CHNL_NM': r.get('CHNL_NM', ''),
-                        'CLASS3': r.get('CLASS3', ''),
-                        'SALE_AMT': float(r.get('SALE_AMT', 0)),
-                        'SALE_RATIO': float(r.get('SALE_RATIO', 0))
-                    }
-                    for r in records[:50]
-                ],
-                'total_records_count': len(records)
-            },
-            'trend_data': {
-                'trend_months': sorted(list(set(r.get('PST_YYYYMM', '') for r in records))),
-                'monthly_totals': monthly_totals_list,
-                'monthly_details': [
-                    {
-                        'yyyymm': r.get('PST_YYYYMM', ''),
-                        'chnl_nm': r.get('CHNL_NM', ''),
-                        'class3': r.get('CLASS3', ''),
-                        'sale_amt': round(float(r.get('SALE_AMT', 0)) / 1000000, 2),
-                        'sale_ratio': float(r.get('SALE_RATIO', 0))
-                    }
-                    for r in records
-                ]
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "채널별 매출 종합분석 (당해 1월~현재월)",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "분석 결과", "ai_text": analysis_response}
+            ]
+        }
+    
+    # JSON 데이터 생성
+    # yyyymm_py 계산 (전년 동월)
+    previous_year = int(yyyymm_end[:4]) - 1
+    yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
+    
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm_end,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'unique_channels': unique_channels,
+            'unique_items': unique_items,
+            'unique_months': unique_months,
+            'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
+        },
+        'channel_summary': channel_summary,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'PST_YYYYMM': r.get('PST_YYYYMM', ''),
+                    'CHNL_NM': r.get('CHNL_NM', ''),
+                    'CLASS3': r.get('CLASS3', ''),
+                    'SALE_AMT': float(r.get('SALE_AMT', 0)),
+                    'SALE_RATIO': float(r.get('SALE_RATIO', 0))
+                }
+                for r in records[:50]
+            ],
+            'total_records_count': len(records)
+        },
+        'trend_data': {
+            'trend_months': sorted(list(set(r.get('PST_YYYYMM', '') for r in records))),
+            'monthly_totals': monthly_totals_list,
+            'monthly_details': [
+                {
+                    'yyyymm': r.get('PST_YYYYMM', ''),
+                    'chnl_nm': r.get('CHNL_NM', ''),
+                    'class3': r.get('CLASS3', ''),
+                    'sale_amt': round(float(r.get('SALE_AMT', 0)) / 1000000, 2),
+                    'sale_ratio': float(r.get('SALE_RATIO', 0))
+                }
+                for r in records
+            ]
         }
-        
-        # 파일 저장 (14-1-1-1로 저장)
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_월별채널별매출추세"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장 (analysis_data의 sections를 조합)
-        markdown_content = f"# {analysis_data.get('title', '채널별 매출 분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    }
+    
+    # 파일 저장 (14-1-1-1로 저장)
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_월별채널별매출추세"
+    save_json(json_data, filename)
+    
+    # Markdown도 저장 (analysis_data의 sections를 조합)
+    markdown_content = f"# {analysis_data.get('title', '채널별 매출 분석')}\n\n"
+    for section in analysis_data.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 분석 완료!\n")
+    return json_data
 
 def analyze_operating_expense(yyyymm, brd_cd):
     """영업비 추이분석 - CTGR1별 개별 분석"""
@@ -3086,57 +3248,53 @@ def analyze_operating_expense(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 전년 동월 계산
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # 1. 모든 CTGR1 조회
-        all_detail_sql = get_ad_expense_detail_query(yyyymm, yyyymm_py, brd_cd)
-        all_detail_df = run_query(all_detail_sql, engine)
-        all_detail_records = all_detail_df.to_dicts()
-        
-        if not all_detail_records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 2. CTGR1별로 그룹화
-        ctgr1_groups = {}
-        for record in all_detail_records:
-            ctgr1 = record.get('CTGR1', '')
-            if ctgr1 and ctgr1 not in ctgr1_groups:
-                ctgr1_groups[ctgr1] = []
-            if ctgr1:
-                ctgr1_groups[ctgr1].append(record)
-        
-        print(f"발견된 CTGR1 카테고리: {len(ctgr1_groups)}개")
-        for ctgr1 in ctgr1_groups.keys():
-            print(f"  - {ctgr1}")
-        
-        # 3. 각 CTGR1별로 분석 수행
-        results = []
-        for ctgr1, detail_records in ctgr1_groups.items():
-            print(f"\n{'='*60}")
-            print(f"분석 중: {ctgr1}")
-            print(f"{'='*60}")
-            
-            try:
-                result = analyze_operating_expense_by_ctgr1(yyyymm, brd_cd, ctgr1, detail_records, engine)
-                if result:
-                    results.append(result)
-            except Exception as e:
-                print(f"[ERROR] {ctgr1} 분석 중 오류 발생: {e}")
-                continue
-        
-        print(f"\n[OK] 전체 영업비 분석 완료! ({len(results)}개 카테고리 분석)")
-        return results
+    # 전년 동월 계산
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    previous_year = current_year - 1
+    yyyymm_py = f"{previous_year:04d}{current_month:02d}"
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # 1. 모든 CTGR1 조회
+    all_detail_sql = get_ad_expense_detail_query(yyyymm, yyyymm_py, brd_cd)
+    all_detail_df = run_query(all_detail_sql, engine)
+    all_detail_records = all_detail_df.to_dicts()
+    
+    if not all_detail_records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 2. CTGR1별로 그룹화
+    ctgr1_groups = {}
+    for record in all_detail_records:
+        ctgr1 = record.get('CTGR1', '')
+        if ctgr1 and ctgr1 not in ctgr1_groups:
+            ctgr1_groups[ctgr1] = []
+        if ctgr1:
+            ctgr1_groups[ctgr1].append(record)
+    
+    print(f"발견된 CTGR1 카테고리: {len(ctgr1_groups)}개")
+    for ctgr1 in ctgr1_groups.keys():
+        print(f"  - {ctgr1}")
+    
+    # 3. 각 CTGR1별로 분석 수행
+    results = []
+    for ctgr1, detail_records in ctgr1_groups.items():
+        print(f"\n{'='*60}")
+        print(f"분석 중: {ctgr1}")
+        print(f"{'='*60}")
         
-    finally:
-        engine.dispose()
+        try:
+            result = analyze_operating_expense_by_ctgr1(yyyymm, brd_cd, ctgr1, detail_records, engine)
+            if result:
+                results.append(result)
+        except Exception as e:
+            print(f"[ERROR] {ctgr1} 분석 중 오류 발생: {e}")
+            continue
+    
+    print(f"\n[OK] 전체 영업비 분석 완료! ({len(results)}개 카테고리 분석)")
+    return results
 
 def analyze_operating_expense_by_ctgr1(yyyymm, brd_cd, ctgr1, detail_records, engine):
     """CTGR1별 영업비 추이분석"""
@@ -3197,7 +3355,7 @@ def analyze_operating_expense_by_ctgr1(yyyymm, brd_cd, ctgr1, detail_records, en
         gl_nm = record.get('GL_NM', '')
         amount = float(record.get('AD_TTL_AMT', 0))
         
-        key = f"{ctgr2}|{ctgr3}|{gl_nm}"
+        key = (ctgr2, ctgr3, gl_nm)
         
         if pst_yyyymm == yyyymm_py:
             prev_year_dict[key] = {
@@ -3330,7 +3488,7 @@ def analyze_operating_expense_by_ctgr1(yyyymm, brd_cd, ctgr1, detail_records, en
 """
         
     # 7. LLM 호출 (JSON 응답)
-    analysis_response = call_llm(prompt, max_tokens=4000)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
     
     # JSON 파싱 (마크다운 코드 블록 제거)
     analysis_response = analysis_response.strip()
@@ -3343,12 +3501,12 @@ def analyze_operating_expense_by_ctgr1(yyyymm, brd_cd, ctgr1, detail_records, en
     analysis_response = analysis_response.strip()
     
     try:
-        analysis_data = json.loads(analysis_response)
+        analysis_data = orjson.loads(analysis_response)
         # sections에 div 필드 추가 (종합분석-1, 종합분석-2, ...)
         for idx, section in enumerate(analysis_data.get('sections', []), 1):
             if 'div' not in section:
                 section['div'] = f'종합분석-{idx}'
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"[WARNING] JSON 파싱 실패: {e}")
         print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
         # 기본 구조로 대체
@@ -3646,84 +3804,83 @@ def analyze_discount_rate_overall(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행
-        sql = get_discount_rate_overall_query(yyyymm, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 전체 할인율 계산
-        total_record = next((r for r in records if r.get('SEQ') == 1), None)
-        total_discount_cy = float(total_record.get('DISCOUNT', 0)) if total_record else 0
-        total_discount_py = total_discount_cy - float(total_record.get('YOY', 0)) if total_record else 0
-        
-        # 채널별 데이터 추출 (seq = 2)
-        channel_data = [r for r in records if r.get('SEQ') == 2]
-        
-        # 채널별 할인율 데이터 정리
-        channel_summary = {}
-        for record in channel_data:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            discount_cy = float(record.get('DISCOUNT', 0))
-            yoy = float(record.get('YOY', 0))
-            discount_py = discount_cy - yoy
-            
-            channel_summary[chnl_nm] = {
-                'discount_cy': round(discount_cy, 1),
-                'discount_py': round(discount_py, 1),
-                'yoy': round(yoy, 1)
-            }
-        
-        # 전략 우수 채널 (할인율이 낮고 전년대비 개선)
-        excellent_channels = [
-            {
-                'chnl_nm': chnl,
-                'discount_cy': data['discount_cy'],
-                'yoy': data['yoy']
-            }
-            for chnl, data in channel_summary.items()
-            if data['discount_cy'] < total_discount_cy and data['yoy'] < 0  # 할인율이 평균보다 낮고 개선됨
-        ]
-        excellent_channels.sort(key=lambda x: (x['discount_cy'], x['yoy']))
-        
-        # 주의 필요 채널 (할인율이 높거나 악화)
-        warning_channels = [
-            {
-                'chnl_nm': chnl,
-                'discount_cy': data['discount_cy'],
-                'yoy': data['yoy']
-            }
-            for chnl, data in channel_summary.items()
-            if data['discount_cy'] > total_discount_cy or data['yoy'] > 0  # 할인율이 평균보다 높거나 악화됨
-        ]
-        warning_channels.sort(key=lambda x: (x['discount_cy'], -x['yoy']), reverse=True)
-        
-        # 아이템별 데이터 추출 (seq = 4)
-        item_data = [r for r in records if r.get('SEQ') == 4]
-        
-        unique_channels = len(channel_summary)
-        unique_items = len(item_data)
-        
-        print(f"전년 할인율: {total_discount_py:.1f}%")
-        print(f"당해 할인율: {total_discount_cy:.1f}%")
-        print(f"전년대비 변화: {round(total_discount_cy - total_discount_py, 1)}%p")
-        print(f"채널 수: {unique_channels}개")
-        print(f"아이템 수: {unique_items}개")
-        
-        # LLM 프롬프트 생성
-        prompt = f"""
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    previous_year = current_year - 1
+    yyyymm_py = f"{previous_year:04d}{current_month:02d}"
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행
+    sql = get_discount_rate_overall_query(yyyymm, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 전체 할인율 계산
+    total_record = next((r for r in records if r.get('SEQ') == 1), None)
+    total_discount_cy = float(total_record.get('DISCOUNT', 0)) if total_record else 0
+    total_discount_py = total_discount_cy - float(total_record.get('YOY', 0)) if total_record else 0
+    
+    # 채널별 데이터 추출 (seq = 2)
+    channel_data = [r for r in records if r.get('SEQ') == 2]
+    
+    # 채널별 할인율 데이터 정리
+    channel_summary = {}
+    for record in channel_data:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        discount_cy = float(record.get('DISCOUNT', 0))
+        yoy = float(record.get('YOY', 0))
+        discount_py = discount_cy - yoy
+        
+        channel_summary[chnl_nm] = {
+            'discount_cy': round(discount_cy, 1),
+            'discount_py': round(discount_py, 1),
+            'yoy': round(yoy, 1)
+        }
+    
+    # 전략 우수 채널 (할인율이 낮고 전년대비 개선)
+    excellent_channels = [
+        {
+            'chnl_nm': chnl,
+            'discount_cy': data['discount_cy'],
+            'yoy': data['yoy']
+        }
+        for chnl, data in channel_summary.items()
+        if data['discount_cy'] < total_discount_cy and data['yoy'] < 0  # 할인율이 평균보다 낮고 개선됨
+    ]
+    excellent_channels.sort(key=lambda x: (x['discount_cy'], x['yoy']))
+    
+    # 주의 필요 채널 (할인율이 높거나 악화)
+    warning_channels = [
+        {
+            'chnl_nm': chnl,
+            'discount_cy': data['discount_cy'],
+            'yoy': data['yoy']
+        }
+        for chnl, data in channel_summary.items()
+        if data['discount_cy'] > total_discount_cy or data['yoy'] > 0  # 할인율이 평균보다 높거나 악화됨
+    ]
+    warning_channels.sort(key=lambda x: (x['discount_cy'], -x['yoy']), reverse=True)
+    
+    # 아이템별 데이터 추출 (seq = 4)
+    item_data = [r for r in records if r.get('SEQ') == 4]
+    
+    unique_channels = len(channel_summary)
+    unique_items = len(item_data)
+    
+    print(f"전년 할인율: {total_discount_py:.1f}%")
+    print(f"당해 할인율: {total_discount_cy:.1f}%")
+    print(f"전년대비 변화: {round(total_discount_cy - total_discount_py, 1)}%p")
+    print(f"채널 수: {unique_channels}개")
+    print(f"아이템 수: {unique_items}개")
+    
+    # LLM 프롬프트 생성
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 가격 전략 전문가야. 당해와 전년 동월의 할인율을 비교 분석하여 채널별 할인 전략의 효율성을 평가하고 최적화 방안을 제시해야 해.
 
 **분석 기간**
@@ -3792,89 +3949,86 @@ def analyze_discount_rate_overall(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-            # sections에 div 필드 추가 (종합분석-1, 종합분석-2, 종합분석-3)
-            for idx, section in enumerate(analysis_data.get('sections', []), 1):
-                if 'div' not in section:
-                    section['div'] = f'종합분석-{idx}'
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "할인율 종합분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "전략 우수 채널", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "주의 필요 채널", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "AI 권장 사항", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        # yyyymm_py 계산 (전년 동월)
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_discount_cy': round(total_discount_cy, 1),
-                'total_discount_py': round(total_discount_py, 1),
-                'change_pct': round(total_discount_cy - total_discount_py, 1),
-                'unique_channels': unique_channels,
-                'unique_items': unique_items,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary,
-            'excellent_channels': excellent_channels[:5],
-            'warning_channels': warning_channels[:5],
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'CHNL_NM': r.get('CHNL_NM', ''),
-                        'DISCOUNT': float(r.get('DISCOUNT', 0)),
-                        'YOY': float(r.get('YOY', 0)),
-                        'SEQ': int(r.get('SEQ', 0))
-                    }
-                    for r in records[:100]
-                ],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+        # sections에 div 필드 추가 (종합분석-1, 종합분석-2, 종합분석-3)
+        for idx, section in enumerate(analysis_data.get('sections', []), 1):
+            if 'div' not in section:
+                section['div'] = f'종합분석-{idx}'
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "할인율 종합분석",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "전략 우수 채널", "ai_text": analysis_response},
+                {"div": "종합분석-2", "sub_title": "주의 필요 채널", "ai_text": ""},
+                {"div": "종합분석-3", "sub_title": "AI 권장 사항", "ai_text": ""}
+            ]
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_할인율_종합분석"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장 (analysis_data의 sections를 조합)
-        markdown_content = f"# {analysis_data.get('title', '할인율 종합분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    
+    # JSON 데이터 생성
+    # yyyymm_py 계산 (전년 동월)
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_discount_cy': round(total_discount_cy, 1),
+            'total_discount_py': round(total_discount_py, 1),
+            'change_pct': round(total_discount_cy - total_discount_py, 1),
+            'unique_channels': unique_channels,
+            'unique_items': unique_items,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary,
+        'excellent_channels': excellent_channels[:5],
+        'warning_channels': warning_channels[:5],
+        'raw_data': {
+            'sample_records': [
+                {
+                    'CHNL_NM': r.get('CHNL_NM', ''),
+                    'DISCOUNT': float(r.get('DISCOUNT', 0)),
+                    'YOY': float(r.get('YOY', 0)),
+                    'SEQ': int(r.get('SEQ', 0))
+                }
+                for r in records[:100]
+            ],
+            'total_records_count': len(records)
+        }
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_할인율_종합분석"
+    save_json(json_data, filename)
+    
+    # Markdown도 저장 (analysis_data의 sections를 조합)
+    markdown_content = f"# {analysis_data.get('title', '할인율 종합분석')}\n\n"
+    for section in analysis_data.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 분석 완료!\n")
+    return json_data
 
 def get_store_efficiency_overall_query(yyyymm, brd_cd):
     """매장효율성 종합분석 쿼리 (당해/전년 동월 비교) - 8-1-1-1용"""
@@ -4018,89 +4172,88 @@ def analyze_store_efficiency_overall(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해/전년 동월)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        previous_year = current_year - 1
-        yyyymm_py = f"{previous_year:04d}{current_month:02d}"
-        
-        print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
-        
-        # SQL 쿼리 실행
-        sql = get_store_efficiency_overall_query(yyyymm, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 전체 데이터 추출 (seq = 1)
-        total_record = next((r for r in records if r.get('SEQ') == 1), None)
-        total_shop_amt_cy = float(total_record.get('SHOP_AMT_CY', 0)) if total_record else 0
-        total_shop_amt_py = float(total_record.get('SHOP_AMT_PY', 0)) if total_record else 0
-        total_shop_cnt_cy = int(total_record.get('SHOP_CNT_CY', 0)) if total_record else 0
-        total_shop_cnt_py = int(total_record.get('SHOP_CNT_PY', 0)) if total_record else 0
-        
-        # 채널별 데이터 추출 (seq = 2)
-        channel_data = [r for r in records if r.get('SEQ') == 2]
-        
-        # 채널별 매장효율성 데이터 정리
-        channel_summary = {}
-        for record in channel_data:
-            chnl_nm = record.get('CHNL_NM', '기타')
-            shop_amt_cy = float(record.get('SHOP_AMT_CY', 0))
-            shop_amt_py = float(record.get('SHOP_AMT_PY', 0))
-            shop_cnt_cy = int(record.get('SHOP_CNT_CY', 0))
-            shop_cnt_py = int(record.get('SHOP_CNT_PY', 0))
-            yoy = float(record.get('YOY', 0))
-            
-            channel_summary[chnl_nm] = {
-                'shop_amt_cy': round(shop_amt_cy, 2),
-                'shop_amt_py': round(shop_amt_py, 2),
-                'shop_cnt_cy': shop_cnt_cy,
-                'shop_cnt_py': shop_cnt_py,
-                'yoy': round(yoy, 1)
-            }
-        
-        # 우수 점포 생산성 (점포당 매출이 평균보다 높고 전년대비 개선)
-        excellent_channels = [
-            {
-                'chnl_nm': chnl,
-                'shop_amt_cy': data['shop_amt_cy'],
-                'shop_amt_py': data['shop_amt_py'],
-                'yoy': data['yoy'],
-                'shop_cnt_cy': data['shop_cnt_cy']
-            }
-            for chnl, data in channel_summary.items()
-            if data['shop_amt_cy'] > total_shop_amt_cy and data['yoy'] > 100  # 평균보다 높고 개선됨
-        ]
-        excellent_channels.sort(key=lambda x: (x['shop_amt_cy'], x['yoy']), reverse=True)
-        
-        # 대응 필요 매장 (점포당 매출이 평균보다 낮거나 악화)
-        warning_channels = [
-            {
-                'chnl_nm': chnl,
-                'shop_amt_cy': data['shop_amt_cy'],
-                'shop_amt_py': data['shop_amt_py'],
-                'yoy': data['yoy'],
-                'shop_cnt_cy': data['shop_cnt_cy']
-            }
-            for chnl, data in channel_summary.items()
-            if data['shop_amt_cy'] < total_shop_amt_cy or data['yoy'] < 100  # 평균보다 낮거나 악화됨
-        ]
-        warning_channels.sort(key=lambda x: (x['shop_amt_cy'], x['yoy']))
-        
-        unique_channels = len(channel_summary)
-        
-        print(f"전년 점포당 매출: {total_shop_amt_py:.2f}백만원 ({total_shop_cnt_py}개 점포)")
-        print(f"당해 점포당 매출: {total_shop_amt_cy:.2f}백만원 ({total_shop_cnt_cy}개 점포)")
-        print(f"전년대비 변화: {round(total_shop_amt_cy / total_shop_amt_py * 100 if total_shop_amt_py > 0 else 0, 1)}%")
-        print(f"채널 수: {unique_channels}개")
-        
-        # LLM 프롬프트 생성
-        prompt = f"""
+    # 분석 기간 계산 (당해/전년 동월)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    previous_year = current_year - 1
+    yyyymm_py = f"{previous_year:04d}{current_month:02d}"
+    
+    print(f"분석 기간: {previous_year}년 {current_month}월 vs {current_year}년 {current_month}월")
+    
+    # SQL 쿼리 실행
+    sql = get_store_efficiency_overall_query(yyyymm, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 전체 데이터 추출 (seq = 1)
+    total_record = next((r for r in records if r.get('SEQ') == 1), None)
+    total_shop_amt_cy = float(total_record.get('SHOP_AMT_CY', 0)) if total_record else 0
+    total_shop_amt_py = float(total_record.get('SHOP_AMT_PY', 0)) if total_record else 0
+    total_shop_cnt_cy = int(total_record.get('SHOP_CNT_CY', 0)) if total_record else 0
+    total_shop_cnt_py = int(total_record.get('SHOP_CNT_PY', 0)) if total_record else 0
+    
+    # 채널별 데이터 추출 (seq = 2)
+    channel_data = [r for r in records if r.get('SEQ') == 2]
+    
+    # 채널별 매장효율성 데이터 정리
+    channel_summary = {}
+    for record in channel_data:
+        chnl_nm = record.get('CHNL_NM', '기타')
+        shop_amt_cy = float(record.get('SHOP_AMT_CY', 0))
+        shop_amt_py = float(record.get('SHOP_AMT_PY', 0))
+        shop_cnt_cy = int(record.get('SHOP_CNT_CY', 0))
+        shop_cnt_py = int(record.get('SHOP_CNT_PY', 0))
+        yoy = float(record.get('YOY', 0))
+        
+        channel_summary[chnl_nm] = {
+            'shop_amt_cy': round(shop_amt_cy, 2),
+            'shop_amt_py': round(shop_amt_py, 2),
+            'shop_cnt_cy': shop_cnt_cy,
+            'shop_cnt_py': shop_cnt_py,
+            'yoy': round(yoy, 1)
+        }
+    
+    # 우수 점포 생산성 (점포당 매출이 평균보다 높고 전년대비 개선)
+    excellent_channels = [
+        {
+            'chnl_nm': chnl,
+            'shop_amt_cy': data['shop_amt_cy'],
+            'shop_amt_py': data['shop_amt_py'],
+            'yoy': data['yoy'],
+            'shop_cnt_cy': data['shop_cnt_cy']
+        }
+        for chnl, data in channel_summary.items()
+        if data['shop_amt_cy'] > total_shop_amt_cy and data['yoy'] > 100  # 평균보다 높고 개선됨
+    ]
+    excellent_channels.sort(key=lambda x: (x['shop_amt_cy'], x['yoy']), reverse=True)
+    
+    # 대응 필요 매장 (점포당 매출이 평균보다 낮거나 악화)
+    warning_channels = [
+        {
+            'chnl_nm': chnl,
+            'shop_amt_cy': data['shop_amt_cy'],
+            'shop_amt_py': data['shop_amt_py'],
+            'yoy': data['yoy'],
+            'shop_cnt_cy': data['shop_cnt_cy']
+        }
+        for chnl, data in channel_summary.items()
+        if data['shop_amt_cy'] < total_shop_amt_cy or data['yoy'] < 100  # 평균보다 낮거나 악화됨
+    ]
+    warning_channels.sort(key=lambda x: (x['shop_amt_cy'], x['yoy']))
+    
+    unique_channels = len(channel_summary)
+    
+    print(f"전년 점포당 매출: {total_shop_amt_py:.2f}백만원 ({total_shop_cnt_py}개 점포)")
+    print(f"당해 점포당 매출: {total_shop_amt_cy:.2f}백만원 ({total_shop_cnt_cy}개 점포)")
+    print(f"전년대비 변화: {round(total_shop_amt_cy / total_shop_amt_py * 100 if total_shop_amt_py > 0 else 0, 1)}%")
+    print(f"채널 수: {unique_channels}개")
+    
+    # LLM 프롬프트 생성
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 매장 운영 전문가야. 당해와 전년 동월의 매장 효율성(점포당 매출)을 비교 분석하여 우수 점포와 개선이 필요한 매장을 식별하고 최적화 방안을 제시해야 해.
 
 **분석 기간**
@@ -4172,93 +4325,90 @@ def analyze_store_efficiency_overall(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-            # sections에 div 필드 추가 (종합분석-1, 종합분석-2, 종합분석-3, 종합분석-4)
-            for idx, section in enumerate(analysis_data.get('sections', []), 1):
-                if 'div' not in section:
-                    section['div'] = f'종합분석-{idx}'
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "매장효율성 종합분석",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "우수 점포 생산성", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "대응 필요 매장", "ai_text": ""},
-                    {"div": "종합분석-3", "sub_title": "AI 권장사항", "ai_text": ""},
-                    {"div": "종합분석-4", "sub_title": "최적의 시나리오", "ai_text": ""}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_shop_amt_cy': round(total_shop_amt_cy, 2),
-                'total_shop_amt_py': round(total_shop_amt_py, 2),
-                'total_shop_cnt_cy': total_shop_cnt_cy,
-                'total_shop_cnt_py': total_shop_cnt_py,
-                'yoy': round(total_shop_amt_cy / total_shop_amt_py * 100 if total_shop_amt_py > 0 else 0, 1),
-                'unique_channels': unique_channels,
-                'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
-            },
-            'channel_summary': channel_summary,
-            'excellent_channels': excellent_channels[:5],
-            'warning_channels': warning_channels[:5],
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'CHNL_NM': r.get('CHNL_NM', ''),
-                        'SHOP_CNT_CY': int(r.get('SHOP_CNT_CY', 0)),
-                        'SHOP_CNT_PY': int(r.get('SHOP_CNT_PY', 0)),
-                        'SHOP_AMT_CY': float(r.get('SHOP_AMT_CY', 0)),
-                        'SHOP_AMT_PY': float(r.get('SHOP_AMT_PY', 0)),
-                        'YOY': float(r.get('YOY', 0)),
-                        'SEQ': int(r.get('SEQ', 0))
-                    }
-                    for r in records[:100]
-                ],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+        # sections에 div 필드 추가 (종합분석-1, 종합분석-2, 종합분석-3, 종합분석-4)
+        for idx, section in enumerate(analysis_data.get('sections', []), 1):
+            if 'div' not in section:
+                section['div'] = f'종합분석-{idx}'
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "매장효율성 종합분석",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "우수 점포 생산성", "ai_text": analysis_response},
+                {"div": "종합분석-2", "sub_title": "대응 필요 매장", "ai_text": ""},
+                {"div": "종합분석-3", "sub_title": "AI 권장사항", "ai_text": ""},
+                {"div": "종합분석-4", "sub_title": "최적의 시나리오", "ai_text": ""}
+            ]
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_매장효율성_종합분석"
-        save_json(json_data, filename)
-        
-        # Markdown도 저장 (analysis_data의 sections를 조합)
-        markdown_content = f"# {analysis_data.get('title', '매장효율성 종합분석')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    
+    # JSON 데이터 생성
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_shop_amt_cy': round(total_shop_amt_cy, 2),
+            'total_shop_amt_py': round(total_shop_amt_py, 2),
+            'total_shop_cnt_cy': total_shop_cnt_cy,
+            'total_shop_cnt_py': total_shop_cnt_py,
+            'yoy': round(total_shop_amt_cy / total_shop_amt_py * 100 if total_shop_amt_py > 0 else 0, 1),
+            'unique_channels': unique_channels,
+            'analysis_period': f"{previous_year}년 {current_month}월 vs {current_year}년 {current_month}월"
+        },
+        'channel_summary': channel_summary,
+        'excellent_channels': excellent_channels[:5],
+        'warning_channels': warning_channels[:5],
+        'raw_data': {
+            'sample_records': [
+                {
+                    'CHNL_NM': r.get('CHNL_NM', ''),
+                    'SHOP_CNT_CY': int(r.get('SHOP_CNT_CY', 0)),
+                    'SHOP_CNT_PY': int(r.get('SHOP_CNT_PY', 0)),
+                    'SHOP_AMT_CY': float(r.get('SHOP_AMT_CY', 0)),
+                    'SHOP_AMT_PY': float(r.get('SHOP_AMT_PY', 0)),
+                    'YOY': float(r.get('YOY', 0)),
+                    'SEQ': int(r.get('SEQ', 0))
+                }
+                for r in records[:100]
+            ],
+            'total_records_count': len(records)
+        }
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_매장효율성_종합분석"
+    save_json(json_data, filename)
+    
+    # Markdown도 저장 (analysis_data의 sections를 조합)
+    markdown_content = f"# {analysis_data.get('title', '매장효율성 종합분석')}\n\n"
+    for section in analysis_data.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 분석 완료!\n")
+    return json_data
 
 def get_item_sales_overall_query(yyyymm, brd_cd):
     """아이템별 매출 종합분석 쿼리 (당해 1월~현재월)"""
@@ -4503,114 +4653,113 @@ def analyze_item_sales_trend(yyyymm, brd_cd):
     print(f"아이템별 매출 종합분석 시작 (15-1-1-1): {BRAND_CODE_MAP.get(brd_cd, brd_cd)} ({yyyymm})")
     print(f"{'='*60}")
     
-    # DB 연결
-    engine = get_db_engine()
+    # DB 연결
+    engine = get_db_engine()
+    
+    # 분석 기간 계산 (당해 1월부터 현재월까지)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    
+    yyyymm_start = f"{current_year}01"  # 당해 1월
+    yyyymm_end = yyyymm  # 현재월
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
     
-    try:
-        # 분석 기간 계산 (당해 1월부터 현재월까지)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        
-        yyyymm_start = f"{current_year}01"  # 당해 1월
-        yyyymm_end = yyyymm  # 현재월
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = get_item_sales_overall_query(yyyymm, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_sales = sum(float(r.get('SALE_AMT', 0)) * 1000000 for r in records if r.get('SEQ') == 1)  # 전체만 합산
-        unique_months = len(set(r.get('MONTH', '') for r in records))
-        
-        print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
-        print(f"분석 월 수: {unique_months}개월")
-        
-        # 아이템별 데이터 정리 (seq=3인 것만)
-        item_data = {}
-        season_items = []  # F시즌, S시즌, 과시즌 의류
-        category_items = []  # 모자, 신발, 가방, 기타ACC
-        
-        for record in records:
-            if record.get('SEQ') != 3:  # 아이템 데이터만
-                continue
-            
-            item_std = record.get('CHNL_NM', '')  # 실제로는 item_std
-            month = record.get('MONTH', '')
-            sale_amt = float(record.get('SALE_AMT', 0)) * 1000000  # 백만원 -> 원
-            ratio = float(record.get('RATIO', 0))
-            yoy = float(record.get('YOY', 0))
-            
-            if item_std not in item_data:
-                item_data[item_std] = {
-                    'total_sales': 0,
-                    'months': {},
-                    'total_ratio': 0,
-                    'avg_yoy': 0
-                }
-            
-            item_data[item_std]['total_sales'] += sale_amt
-            if month not in item_data[item_std]['months']:
-                item_data[item_std]['months'][month] = {
-                    'sale_amt': 0,
-                    'ratio': 0,
-                    'yoy': 0
-                }
-            item_data[item_std]['months'][month]['sale_amt'] += sale_amt
-            item_data[item_std]['months'][month]['ratio'] = ratio
-            item_data[item_std]['months'][month]['yoy'] = yoy
+    # SQL 쿼리 실행
+    sql = get_item_sales_overall_query(yyyymm, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_sales = sum(float(r.get('SALE_AMT', 0)) * 1000000 for r in records if r.get('SEQ') == 1)  # 전체만 합산
+    unique_months = len(set(r.get('MONTH', '') for r in records))
+    
+    print(f"총 매출액: {total_sales:,.0f}원 ({total_sales/1000000:.2f}백만원)")
+    print(f"분석 월 수: {unique_months}개월")
+    
+    # 아이템별 데이터 정리 (seq=3인 것만)
+    item_data = {}
+    season_items = []  # F시즌, S시즌, 과시즌 의류
+    category_items = []  # 모자, 신발, 가방, 기타ACC
+    
+    for record in records:
+        if record.get('SEQ') != 3:  # 아이템 데이터만
+            continue
+        
+        item_std = record.get('CHNL_NM', '')  # 실제로는 item_std
+        month = record.get('MONTH', '')
+        sale_amt = float(record.get('SALE_AMT', 0)) * 1000000  # 백만원 -> 원
+        ratio = float(record.get('RATIO', 0))
+        yoy = float(record.get('YOY', 0))
+        
+        if item_std not in item_data:
+            item_data[item_std] = {
+                'total_sales': 0,
+                'months': {},
+                'total_ratio': 0,
+                'avg_yoy': 0
+            }
         
-        # 시즌별 아이템 분류
-        for item_std, data in item_data.items():
-            if '의류' in item_std:
-                if 'F' in item_std or 'F시즌' in item_std:
-                    season_items.append({
-                        'name': item_std,
-                        'total_sales': round(data['total_sales'] / 1000000, 2),
-                        'months': {k: round(v['sale_amt'] / 1000000, 2) for k, v in data['months'].items()},
-                        'avg_ratio': sum(v['ratio'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0,
-                        'avg_yoy': sum(v['yoy'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0
-                    })
-                elif 'S' in item_std or 'S시즌' in item_std:
-                    season_items.append({
-                        'name': item_std,
-                        'total_sales': round(data['total_sales'] / 1000000, 2),
-                        'months': {k: round(v['sale_amt'] / 1000000, 2) for k, v in data['months'].items()},
-                        'avg_ratio': sum(v['ratio'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0,
-                        'avg_yoy': sum(v['yoy'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0
-                    })
-                elif '과시즌' in item_std:
-                    season_items.append({
-                        'name': item_std,
-                        'total_sales': round(data['total_sales'] / 1000000, 2),
-                        'months': {k: round(v['sale_amt'] / 1000000, 2) for k, v in data['months'].items()},
-                        'avg_ratio': sum(v['ratio'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0,
-                        'avg_yoy': sum(v['yoy'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0
-                    })
-            elif item_std in ['모자', '신발', '가방', '기타ACC']:
-                category_items.append({
+        item_data[item_std]['total_sales'] += sale_amt
+        if month not in item_data[item_std]['months']:
+            item_data[item_std]['months'][month] = {
+                'sale_amt': 0,
+                'ratio': 0,
+                'yoy': 0
+            }
+        item_data[item_std]['months'][month]['sale_amt'] += sale_amt
+        item_data[item_std]['months'][month]['ratio'] = ratio
+        item_data[item_std]['months'][month]['yoy'] = yoy
+    
+    # 시즌별 아이템 분류
+    for item_std, data in item_data.items():
+        if '의류' in item_std:
+            if 'F' in item_std or 'F시즌' in item_std:
+                season_items.append({
                     'name': item_std,
                     'total_sales': round(data['total_sales'] / 1000000, 2),
                     'months': {k: round(v['sale_amt'] / 1000000, 2) for k, v in data['months'].items()},
                     'avg_ratio': sum(v['ratio'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0,
                     'avg_yoy': sum(v['yoy'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0
                 })
-        
-        # 시즌별 정렬 (총 매출 기준)
-        season_items.sort(key=lambda x: x['total_sales'], reverse=True)
-        category_items.sort(key=lambda x: x['total_sales'], reverse=True)
-        
-        print(f"시즌 아이템 수: {len(season_items)}개")
-        print(f"카테고리 아이템 수: {len(category_items)}개")
-        
-        # LLM 프롬프트 생성
-        prompt = f"""
+            elif 'S' in item_std or 'S시즌' in item_std:
+                season_items.append({
+                    'name': item_std,
+                    'total_sales': round(data['total_sales'] / 1000000, 2),
+                    'months': {k: round(v['sale_amt'] / 1000000, 2) for k, v in data['months'].items()},
+                    'avg_ratio': sum(v['ratio'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0,
+                    'avg_yoy': sum(v['yoy'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0
+                })
+            elif '과시즌' in item_std:
+                season_items.append({
+                    'name': item_std,
+                    'total_sales': round(data['total_sales'] / 1000000, 2),
+                    'months': {k: round(v['sale_amt'] / 1000000, 2) for k, v in data['months'].items()},
+                    'avg_ratio': sum(v['ratio'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0,
+                    'avg_yoy': sum(v['yoy'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0
+                })
+        elif item_std in ['모자', '신발', '가방', '기타ACC']:
+            category_items.append({
+                'name': item_std,
+                'total_sales': round(data['total_sales'] / 1000000, 2),
+                'months': {k: round(v['sale_amt'] / 1000000, 2) for k, v in data['months'].items()},
+                'avg_ratio': sum(v['ratio'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0,
+                'avg_yoy': sum(v['yoy'] for v in data['months'].values()) / len(data['months']) if data['months'] else 0
+            })
+    
+    # 시즌별 정렬 (총 매출 기준)
+    season_items.sort(key=lambda x: x['total_sales'], reverse=True)
+    category_items.sort(key=lambda x: x['total_sales'], reverse=True)
+    
+    print(f"시즌 아이템 수: {len(season_items)}개")
+    print(f"카테고리 아이템 수: {len(category_items)}개")
+    
+    # LLM 프롬프트 생성
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 아이템 전략 전문가야. 당해 1월부터 현재월까지의 아이템별 매출 추이를 분석하여 시즌 트렌드와 카테고리별 성과를 분석하고 판매율 향상을 위한 전략을 제시해야 해.
 
 **분석 기간**
@@ -4688,86 +4837,83 @@ def analyze_item_sales_trend(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "아이템별 매출 종합분석 (당해 1월~현재월)",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "시즌 트렌드", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "카테고리", "ai_text": "데이터 분석 중"},
-                    {"div": "종합분석-3", "sub_title": "핵심액션", "ai_text": "데이터 분석 중"}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        # yyyymm_py 계산 (전년 동월)
-        previous_year = int(yyyymm_end[:4]) - 1
-        yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
-        
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_sales': round(total_sales / 1000000, 2),
-                'unique_months': unique_months,
-                'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
-            },
-            'season_items': season_items,
-            'category_items': category_items,
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'MONTH': r.get('MONTH', ''),
-                        'CHNL_NM': r.get('CHNL_NM', ''),
-                        'SALE_AMT': float(r.get('SALE_AMT', 0)),
-                        'RATIO': float(r.get('RATIO', 0)),
-                        'YOY': float(r.get('YOY', 0)),
-                        'SEQ': int(r.get('SEQ', 0))
-                    }
-                    for r in records[:100]
-                ],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "아이템별 매출 종합분석 (당해 1월~현재월)",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "시즌 트렌드", "ai_text": analysis_response},
+                {"div": "종합분석-2", "sub_title": "카테고리", "ai_text": "데이터 분석 중"},
+                {"div": "종합분석-3", "sub_title": "핵심액션", "ai_text": "데이터 분석 중"}
+            ]
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_월별아이템별매출추세"
-        save_json(json_data, filename)
-        
-        # Markdown 파일 생성
-        markdown_content = f"# {analysis_data.get('title', '아이템별 매출 종합분석 (당해 1월~현재월)')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    
+    # JSON 데이터 생성
+    # yyyymm_py 계산 (전년 동월)
+    previous_year = int(yyyymm_end[:4]) - 1
+    yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
+    
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm_end,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_sales': round(total_sales / 1000000, 2),
+            'unique_months': unique_months,
+            'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
+        },
+        'season_items': season_items,
+        'category_items': category_items,
+        'raw_data': {
+            'sample_records': [
+                {
+                    'MONTH': r.get('MONTH', ''),
+                    'CHNL_NM': r.get('CHNL_NM', ''),
+                    'SALE_AMT': float(r.get('SALE_AMT', 0)),
+                    'RATIO': float(r.get('RATIO', 0)),
+                    'YOY': float(r.get('YOY', 0)),
+                    'SEQ': int(r.get('SEQ', 0))
+                }
+                for r in records[:100]
+            ],
+            'total_records_count': len(records)
+        }
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_월별아이템별매출추세"
+    save_json(json_data, filename)
+    
+    # Markdown 파일 생성
+    markdown_content = f"# {analysis_data.get('title', '아이템별 매출 종합분석 (당해 1월~현재월)')}\n\n"
+    for section in analysis_data.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 분석 완료!\n")
+    return json_data
 
 def get_item_stock_overall_query(yyyymm, brd_cd):
     """아이템별 재고 종합분석 쿼리 (당해 1월~현재월)"""
@@ -4901,187 +5047,186 @@ def analyze_item_stock_trend(yyyymm, brd_cd):
     # DB 연결
     engine = get_db_engine()
     
-    try:
-        # 분석 기간 계산 (당해 1월부터 현재월까지)
-        current_year = int(yyyymm[:4])
-        current_month = int(yyyymm[4:6])
-        
-        yyyymm_start = f"{current_year}01"  # 당해 1월
-        yyyymm_end = yyyymm  # 현재월
-        
-        print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
-        
-        # SQL 쿼리 실행
-        sql = get_item_stock_overall_query(yyyymm, brd_cd)
-        df = run_query(sql, engine)
-        records = df.to_dicts()
-        
-        if not records:
-            print("데이터가 없습니다.")
-            return None
-        
-        # 데이터 요약
-        total_stock = sum(float(r.get('CY_END_STOCK_TAG_AMT', 0)) for r in records)
-        unique_months = len(set(r.get('YYYYMM', '') for r in records))
-        unique_items = len(set(r.get('ITEM_STD', '') for r in records))
-        
-        print(f"총 재고액: {total_stock:,.0f}원 ({total_stock/1000000:.2f}백만원)")
-        print(f"분석 월 수: {unique_months}개월")
-        print(f"아이템 수: {unique_items}개")
-        
-        # 월별/아이템별 데이터 정리
-        monthly_data = {}  # 월별 총 재고
-        item_data = {}  # 아이템별 재고 추이
-        
-        for record in records:
-            yyyymm_val = record.get('YYYYMM', '')
-            item_std = record.get('ITEM_STD', '')
-            cy_stock = float(record.get('CY_END_STOCK_TAG_AMT') or 0)
-            py_stock = float(record.get('PY_END_STOCK_TAG_AMT') or 0)
-            yoy = float(record.get('YOY') or 0)
-            
-            # 월별 총 재고
-            if yyyymm_val not in monthly_data:
-                monthly_data[yyyymm_val] = {
-                    'total_stock': 0,
-                    'items': {}
-                }
-            monthly_data[yyyymm_val]['total_stock'] += cy_stock
-            
-            # 아이템별 데이터
-            if item_std not in item_data:
-                item_data[item_std] = {
-                    'total_stock': 0,
-                    'months': {},
-                    'max_stock': 0,
-                    'max_month': None,
-                    'min_stock': float('inf'),
-                    'min_month': None,
-                    'first_stock': None,
-                    'last_stock': None
-                }
-            
-            item_data[item_std]['total_stock'] += cy_stock
-            item_data[item_std]['months'][yyyymm_val] = {
-                'stock': cy_stock,
-                'py_stock': py_stock,
-                'yoy': yoy
+    # 분석 기간 계산 (당해 1월부터 현재월까지)
+    current_year = int(yyyymm[:4])
+    current_month = int(yyyymm[4:6])
+    
+    yyyymm_start = f"{current_year}01"  # 당해 1월
+    yyyymm_end = yyyymm  # 현재월
+    
+    print(f"분석 기간: {yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월")
+    
+    # SQL 쿼리 실행
+    sql = get_item_stock_overall_query(yyyymm, brd_cd)
+    df = run_query(sql, engine)
+    records = df.to_dicts()
+    
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+    
+    # 데이터 요약
+    total_stock = sum(float(r.get('CY_END_STOCK_TAG_AMT', 0)) for r in records)
+    unique_months = len(set(r.get('YYYYMM', '') for r in records))
+    unique_items = len(set(r.get('ITEM_STD', '') for r in records))
+    
+    print(f"총 재고액: {total_stock:,.0f}원 ({total_stock/1000000:.2f}백만원)")
+    print(f"분석 월 수: {unique_months}개월")
+    print(f"아이템 수: {unique_items}개")
+    
+    # 월별/아이템별 데이터 정리
+    monthly_data = {}  # 월별 총 재고
+    item_data = {}  # 아이템별 재고 추이
+    
+    for record in records:
+        yyyymm_val = record.get('YYYYMM', '')
+        item_std = record.get('ITEM_STD', '')
+        cy_stock = float(record.get('CY_END_STOCK_TAG_AMT') or 0)
+        py_stock = float(record.get('PY_END_STOCK_TAG_AMT') or 0)
+        yoy = float(record.get('YOY') or 0)
+        
+        # 월별 총 재고
+        if yyyymm_val not in monthly_data:
+            monthly_data[yyyymm_val] = {
+                'total_stock': 0,
+                'items': {}
+            }
+        monthly_data[yyyymm_val]['total_stock'] += cy_stock
+        
+        # 아이템별 데이터
+        if item_std not in item_data:
+            item_data[item_std] = {
+                'total_stock': 0,
+                'months': {},
+                'max_stock': 0,
+                'max_month': None,
+                'min_stock': float('inf'),
+                'min_month': None,
+                'first_stock': None,
+                'last_stock': None
             }
-            
-            # 최대/최소 재고 추적
-            if cy_stock > item_data[item_std]['max_stock']:
-                item_data[item_std]['max_stock'] = cy_stock
-                item_data[item_std]['max_month'] = yyyymm_val
-            if cy_stock < item_data[item_std]['min_stock']:
-                item_data[item_std]['min_stock'] = cy_stock
-                item_data[item_std]['min_month'] = yyyymm_val
-            
-            # 첫 월/마지막 월 재고
-            if item_data[item_std]['first_stock'] is None:
-                item_data[item_std]['first_stock'] = cy_stock
-            item_data[item_std]['last_stock'] = cy_stock
-        
-        # 월별 총 재고 리스트 (정렬)
-        monthly_totals_list = []
-        for month in sorted(monthly_data.keys()):
-            monthly_totals_list.append({
-                'yyyymm': month,
-                'total_stock': round(monthly_data[month]['total_stock'] / 1000000, 2)
-            })
-        
-        # 조기경보 분석 (재고 증가, 최대 재고액, 수치 악화)
-        early_warning_items = []
-        for item_std, data in item_data.items():
-            if len(data['months']) < 2:
-                continue
-            
-            # 1월 대비 증가율 계산
-            first_month = min(data['months'].keys())
-            last_month = max(data['months'].keys())
-            first_stock = data['months'][first_month]['stock']
-            last_stock = data['months'][last_month]['stock']
-            
-            if first_stock > 0:
-                change_pct = ((last_stock - first_stock) / first_stock) * 100
-            else:
-                change_pct = 0
-            
-            # 재고 증가하고 최대 재고액이 큰 아이템
-            if change_pct > 0 and data['max_stock'] > 0:
-                early_warning_items.append({
-                    'item_std': item_std,
-                    'max_stock': round(data['max_stock'] / 1000000, 2),
-                    'max_month': data['max_month'],
-                    'change_pct': round(change_pct, 1),
-                    'first_stock': round(first_stock / 1000000, 2),
-                    'last_stock': round(last_stock / 1000000, 2)
-                })
-        
-        # 조기경보 정렬 (최대 재고액 기준)
-        early_warning_items.sort(key=lambda x: x['max_stock'], reverse=True)
-        
-        # 긍정신호 분석 (재고 감소)
-        positive_signal_items = []
-        for item_std, data in item_data.items():
-            if len(data['months']) < 2:
-                continue
-            
-            first_month = min(data['months'].keys())
-            last_month = max(data['months'].keys())
-            first_stock = data['months'][first_month]['stock']
-            last_stock = data['months'][last_month]['stock']
-            
-            if first_stock > 0:
-                change_pct = ((last_stock - first_stock) / first_stock) * 100
-            else:
-                change_pct = 0
-            
-            # 재고 감소한 아이템
-            if change_pct < 0:
-                positive_signal_items.append({
-                    'item_std': item_std,
-                    'first_stock': round(first_stock / 1000000, 2),
-                    'last_stock': round(last_stock / 1000000, 2),
-                    'change_pct': round(change_pct, 1),
-                    'reduction': round((first_stock - last_stock) / 1000000, 2)
-                })
-        
-        # 긍정신호 정렬 (감소율 기준)
-        positive_signal_items.sort(key=lambda x: x['change_pct'])
-        
-        # 인사이트 분석 (총 재고액, 재고 감소/증가 월)
-        # 최종 월 총 재고액
-        final_month_total = monthly_totals_list[-1]['total_stock'] if monthly_totals_list else 0
-        
-        # 재고가 감소한 월 찾기
-        decreasing_months = []
-        increasing_months = []
-        for i in range(1, len(monthly_totals_list)):
-            prev_stock = monthly_totals_list[i-1]['total_stock']
-            curr_stock = monthly_totals_list[i]['total_stock']
-            month = monthly_totals_list[i]['yyyymm']
-            
-            if curr_stock < prev_stock:
-                decreasing_months.append({
-                    'month': month,
-                    'stock': curr_stock,
-                    'change': round(curr_stock - prev_stock, 2)
-                })
-            elif curr_stock > prev_stock:
-                increasing_months.append({
-                    'month': month,
-                    'stock': curr_stock,
-                    'change': round(curr_stock - prev_stock, 2)
-                })
-        
-        # 최저점 찾기
-        min_total_month = min(monthly_totals_list, key=lambda x: x['total_stock']) if monthly_totals_list else None
         
-        print(f"조기경보 아이템 수: {len(early_warning_items)}개")
-        print(f"긍정신호 아이템 수: {len(positive_signal_items)}개")
+        item_data[item_std]['total_stock'] += cy_stock
+        item_data[item_std]['months'][yyyymm_val] = {
+            'stock': cy_stock,
+            'py_stock': py_stock,
+            'yoy': yoy
+        }
         
-        # LLM 프롬프트 생성
-        prompt = f"""
+        # 최대/최소 재고 추적
+        if cy_stock > item_data[item_std]['max_stock']:
+            item_data[item_std]['max_stock'] = cy_stock
+            item_data[item_std]['max_month'] = yyyymm_val
+        if cy_stock < item_data[item_std]['min_stock']:
+            item_data[item_std]['min_stock'] = cy_stock
+            item_data[item_std]['min_month'] = yyyymm_val
+        
+        # 첫 월/마지막 월 재고
+        if item_data[item_std]['first_stock'] is None:
+            item_data[item_std]['first_stock'] = cy_stock
+        item_data[item_std]['last_stock'] = cy_stock
+    
+    # 월별 총 재고 리스트 (정렬)
+    monthly_totals_list = []
+    for month in sorted(monthly_data.keys()):
+        monthly_totals_list.append({
+            'yyyymm': month,
+            'total_stock': round(monthly_data[month]['total_stock'] / 1000000, 2)
+        })
+    
+    # 조기경보 분석 (재고 증가, 최대 재고액, 수치 악화)
+    early_warning_items = []
+    for item_std, data in item_data.items():
+        if len(data['months']) < 2:
+            continue
+        
+        # 1월 대비 증가율 계산
+        first_month = min(data['months'].keys())
+        last_month = max(data['months'].keys())
+        first_stock = data['months'][first_month]['stock']
+        last_stock = data['months'][last_month]['stock']
+        
+        if first_stock > 0:
+            change_pct = ((last_stock - first_stock) / first_stock) * 100
+        else:
+            change_pct = 0
+        
+        # 재고 증가하고 최대 재고액이 큰 아이템
+        if change_pct > 0 and data['max_stock'] > 0:
+            early_warning_items.append({
+                'item_std': item_std,
+                'max_stock': round(data['max_stock'] / 1000000, 2),
+                'max_month': data['max_month'],
+                'change_pct': round(change_pct, 1),
+                'first_stock': round(first_stock / 1000000, 2),
+                'last_stock': round(last_stock / 1000000, 2)
+            })
+    
+    # 조기경보 정렬 (최대 재고액 기준)
+    early_warning_items.sort(key=lambda x: x['max_stock'], reverse=True)
+    
+    # 긍정신호 분석 (재고 감소)
+    positive_signal_items = []
+    for item_std, data in item_data.items():
+        if len(data['months']) < 2:
+            continue
+        
+        first_month = min(data['months'].keys())
+        last_month = max(data['months'].keys())
+        first_stock = data['months'][first_month]['stock']
+        last_stock = data['months'][last_month]['stock']
+        
+        if first_stock > 0:
+            change_pct = ((last_stock - first_stock) / first_stock) * 100
+        else:
+            change_pct = 0
+        
+        # 재고 감소한 아이템
+        if change_pct < 0:
+            positive_signal_items.append({
+                'item_std': item_std,
+                'first_stock': round(first_stock / 1000000, 2),
+                'last_stock': round(last_stock / 1000000, 2),
+                'change_pct': round(change_pct, 1),
+                'reduction': round((first_stock - last_stock) / 1000000, 2)
+            })
+    
+    # 긍정신호 정렬 (감소율 기준)
+    positive_signal_items.sort(key=lambda x: x['change_pct'])
+    
+    # 인사이트 분석 (총 재고액, 재고 감소/증가 월)
+    # 최종 월 총 재고액
+    final_month_total = monthly_totals_list[-1]['total_stock'] if monthly_totals_list else 0
+    
+    # 재고가 감소한 월 찾기
+    decreasing_months = []
+    increasing_months = []
+    for i in range(1, len(monthly_totals_list)):
+        prev_stock = monthly_totals_list[i-1]['total_stock']
+        curr_stock = monthly_totals_list[i]['total_stock']
+        month = monthly_totals_list[i]['yyyymm']
+        
+        if curr_stock < prev_stock:
+            decreasing_months.append({
+                'month': month,
+                'stock': curr_stock,
+                'change': round(curr_stock - prev_stock, 2)
+            })
+        elif curr_stock > prev_stock:
+            increasing_months.append({
+                'month': month,
+                'stock': curr_stock,
+                'change': round(curr_stock - prev_stock, 2)
+            })
+    
+    # 최저점 찾기
+    min_total_month = min(monthly_totals_list, key=lambda x: x['total_stock']) if monthly_totals_list else None
+    
+    print(f"조기경보 아이템 수: {len(early_warning_items)}개")
+    print(f"긍정신호 아이템 수: {len(positive_signal_items)}개")
+    
+    # LLM 프롬프트 생성
+    prompt = f"""
 너는 F&F 그룹의 {BRAND_CODE_MAP.get(brd_cd, brd_cd)} 브랜드 재고 관리 전문가야. 당해 1월부터 현재월까지의 아이템별 재고 추이를 분석하여 조기경보, 긍정신호, 인사이트를 제시해야 해.
 
 **분석 기간**
@@ -5168,94 +5313,91 @@ def analyze_item_stock_trend(yyyymm, brd_cd):
 
 위 데이터를 바탕으로 JSON 형식으로 분석 결과를 반환해줘:
 """
-        
-        # LLM 호출 (JSON 응답)
-        analysis_response = call_llm(prompt, max_tokens=4000)
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        analysis_response = analysis_response.strip()
-        if analysis_response.startswith('```json'):
-            analysis_response = analysis_response[7:]
-        if analysis_response.startswith('```'):
-            analysis_response = analysis_response[3:]
-        if analysis_response.endswith('```'):
-            analysis_response = analysis_response[:-3]
-        analysis_response = analysis_response.strip()
-        
-        try:
-            analysis_data = json.loads(analysis_response)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] JSON 파싱 실패: {e}")
-            print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
-            # 기본 구조로 대체
-            analysis_data = {
-                "title": "아이템별 재고 종합분석 (당해 1월~현재월)",
-                "sections": [
-                    {"div": "종합분석-1", "sub_title": "조기경보", "ai_text": analysis_response},
-                    {"div": "종합분석-2", "sub_title": "긍정신호", "ai_text": "데이터 분석 중"},
-                    {"div": "종합분석-3", "sub_title": "인사이트", "ai_text": "데이터 분석 중"}
-                ]
-            }
-        
-        # JSON 데이터 생성
-        # yyyymm_py 계산 (전년 동월)
-        previous_year = int(yyyymm_end[:4]) - 1
-        yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
-        
-        json_data = {
-            'brand_cd': brd_cd,
-            'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
-            'yyyymm': yyyymm_end,
-            'yyyymm_py': yyyymm_py,
-            'analysis_data': analysis_data,
-            'summary': {
-                'total_stock': round(total_stock / 1000000, 2),
-                'unique_months': unique_months,
-                'unique_items': unique_items,
-                'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
-            },
-            'monthly_totals': monthly_totals_list,
-            'early_warning_items': early_warning_items[:10],
-            'positive_signal_items': positive_signal_items[:10],
-            'insights': {
-                'final_month_total': final_month_total,
-                'decreasing_months_count': len(decreasing_months),
-                'increasing_months_count': len(increasing_months),
-                'min_month': min_total_month['yyyymm'] if min_total_month else None,
-                'min_stock': min_total_month['total_stock'] if min_total_month else 0
-            },
-            'raw_data': {
-                'sample_records': [
-                    {
-                        'YYYYMM': r.get('YYYYMM', ''),
-                        'ITEM_STD': r.get('ITEM_STD', ''),
-                        'CY_END_STOCK_TAG_AMT': float(r.get('CY_END_STOCK_TAG_AMT') or 0),
-                        'PY_END_STOCK_TAG_AMT': float(r.get('PY_END_STOCK_TAG_AMT') or 0),
-                        'YOY': float(r.get('YOY') or 0)
-                    }
-                    for r in records[:100]
-                ],
-                'total_records_count': len(records)
-            }
+    
+    # LLM 호출 (JSON 응답)
+    analysis_response = call_llm(prompt, max_tokens=4000, temperature=ANALYSIS_TEMPERATURE, yyyymm=yyyymm, brd_cd=brd_cd)
+    
+    # JSON 파싱 (마크다운 코드 블록 제거)
+    analysis_response = analysis_response.strip()
+    if analysis_response.startswith('```json'):
+        analysis_response = analysis_response[7:]
+    if analysis_response.startswith('```'):
+        analysis_response = analysis_response[3:]
+    if analysis_response.endswith('```'):
+        analysis_response = analysis_response[:-3]
+    analysis_response = analysis_response.strip()
+    
+    try:
+        analysis_data = orjson.loads(analysis_response)
+    except orjson.JSONDecodeError as e:
+        print(f"[WARNING] JSON 파싱 실패: {e}")
+        print(f"[WARNING] 응답 내용: {analysis_response[:500]}")
+        # 기본 구조로 대체
+        analysis_data = {
+            "title": "아이템별 재고 종합분석 (당해 1월~현재월)",
+            "sections": [
+                {"div": "종합분석-1", "sub_title": "조기경보", "ai_text": analysis_response},
+                {"div": "종합분석-2", "sub_title": "긍정신호", "ai_text": "데이터 분석 중"},
+                {"div": "종합분석-3", "sub_title": "인사이트", "ai_text": "데이터 분석 중"}
+            ]
         }
-        
-        # 파일 저장
-        yyyymm_short = yyyymm[2:]  # 202510 -> 2510
-        filename = f"KR_{yyyymm_short}_{brd_cd}_월별아이템별재고추세"
-        save_json(json_data, filename)
-        
-        # Markdown 파일 생성
-        markdown_content = f"# {analysis_data.get('title', '아이템별 재고 종합분석 (당해 1월~현재월)')}\n\n"
-        for section in analysis_data.get('sections', []):
-            markdown_content += f"## {section.get('sub_title', '')}\n\n"
-            markdown_content += f"{section.get('ai_text', '')}\n\n"
-        save_markdown(markdown_content, filename)
-        
-        print(f"[OK] 분석 완료!\n")
-        return json_data
-        
-    finally:
-        engine.dispose()
+    
+    # JSON 데이터 생성
+    # yyyymm_py 계산 (전년 동월)
+    previous_year = int(yyyymm_end[:4]) - 1
+    yyyymm_py = f"{previous_year}{yyyymm_end[4:6]}"
+    
+    json_data = {
+        'brand_cd': brd_cd,
+        'brand_name': BRAND_CODE_MAP.get(brd_cd, brd_cd),
+        'yyyymm': yyyymm_end,
+        'yyyymm_py': yyyymm_py,
+        'analysis_data': analysis_data,
+        'summary': {
+            'total_stock': round(total_stock / 1000000, 2),
+            'unique_months': unique_months,
+            'unique_items': unique_items,
+            'analysis_period': f"{yyyymm_start[:4]}년 {yyyymm_start[4:6]}월 ~ {yyyymm_end[:4]}년 {yyyymm_end[4:6]}월"
+        },
+        'monthly_totals': monthly_totals_list,
+        'early_warning_items': early_warning_items[:10],
+        'positive_signal_items': positive_signal_items[:10],
+        'insights': {
+            'final_month_total': final_month_total,
+            'decreasing_months_count': len(decreasing_months),
+            'increasing_months_count': len(increasing_months),
+            'min_month': min_total_month['yyyymm'] if min_total_month else None,
+            'min_stock': min_total_month['total_stock'] if min_total_month else 0
+        },
+        'raw_data': {
+            'sample_records': [
+                {
+                    'YYYYMM': r.get('YYYYMM', ''),
+                    'ITEM_STD': r.get('ITEM_STD', ''),
+                    'CY_END_STOCK_TAG_AMT': float(r.get('CY_END_STOCK_TAG_AMT') or 0),
+                    'PY_END_STOCK_TAG_AMT': float(r.get('PY_END_STOCK_TAG_AMT') or 0),
+                    'YOY': float(r.get('YOY') or 0)
+                }
+                for r in records[:100]
+            ],
+            'total_records_count': len(records)
+        }
+    }
+    
+    # 파일 저장
+    yyyymm_short = yyyymm[2:]  # 202510 -> 2510
+    filename = f"KR_{yyyymm_short}_{brd_cd}_월별아이템별재고추세"
+    save_json(json_data, filename)
+    
+    # Markdown 파일 생성
+    markdown_content = f"# {analysis_data.get('title', '아이템별 재고 종합분석 (당해 1월~현재월)')}\n\n"
+    for section in analysis_data.get('sections', []):
+        markdown_content += f"## {section.get('sub_title', '')}\n\n"
+        markdown_content += f"{section.get('ai_text', '')}\n\n"
+    save_markdown(markdown_content, filename)
+    
+    print(f"[OK] 분석 완료!\n")
+    return json_data
 
 # ============================================================================
 # 유틸리티 함수
@@ -5305,10 +5447,81 @@ def generate_yyyymm_list(start_yyyymm, end_yyyymm=None):
     
     return yyyymm_list
 
+# ============================================================================
+# 분석 일괄 실행
+# ============================================================================
+# run_analyses에서 analyses를 지정하지 않았을 때 실행할 분석
+DEFAULT_ANALYSES = (
+    analyze_channel_sales,  # 실판매출_채널별매출분석
+    analyze_category_profit,  # 영업이익_아이템별직접이익
+    analyze_operating_expense,  # 영업비_각 계정별 분석
+    analyze_discount_rate_overall,  # 할인율 종합분석
+    analyze_store_efficiency_overall,  # 매장효율성 종합분석
+    analyze_channel_sales_trend,  # 월별 채널별 매출추세 (당해 1월~현재월)
+    analyze_item_sales_trend,  # 월별 아이템별 매출추세 (당해 1월~현재월)
+    analyze_item_stock_trend,  # 월별 아이템별 재고추세 (당해 1월~현재월)
+)
+
+def run_analyses(yyyymm_list, brands, analyses=None, max_workers=5):
+    """
+    (년월, 브랜드, 분석) 조합을 스레드 풀로 동시에 실행
+    
+    각 분석은 서로 독립적이고 대부분의 시간이 SQL/LLM 응답 대기(I/O)이므로
+    스레드로 병렬 실행하면 Snowflake 쿼리와 LLM 호출이 서로 겹쳐 전체 소요 시간이 줄어듭니다.
+    (DB 엔진의 커넥션 풀과 Claude 클라이언트는 스레드 간에 공유)
+    
+    Args:
+        yyyymm_list: 분석할 년월 리스트 (예: ['202510', '202511'])
+        brands: 브랜드 코드 리스트 (예: ['M', 'I'])
+        analyses: 실행할 analyze_* 함수 리스트 (None이면 DEFAULT_ANALYSES)
+        max_workers: 동시 실행 스레드 수 (LLM API 동시 요청 수 제한을 고려해 작게 유지)
+    
+    Returns:
+        dict: {(yyyymm, brd_cd, 분석 함수명): 분석 결과 (실패 시 None)}
+    """
+    if analyses is None:
+        analyses = DEFAULT_ANALYSES
+    
+    tasks = [
+        (yyyymm, brd_cd, analyze_fn)
+        for yyyymm in yyyymm_list
+        for brd_cd in brands
+        for analyze_fn in analyses
+    ]
+    if not tasks:
+        return {}
+    
+    # 여러 스레드가 처음 호출하면서 엔진을 중복 생성하지 않도록 미리 생성
+    get_db_engine()
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(analyze_fn, yyyymm, brd_cd): (yyyymm, brd_cd, analyze_fn.__name__)
+            for yyyymm, brd_cd, analyze_fn in tasks
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                # 한 분석이 실패해도 나머지 분석은 계속 진행
+                yyyymm, brd_cd, name = key
+                print(f"[ERROR] {name} ({BRAND_CODE_MAP.get(brd_cd, brd_cd)}, {yyyymm}) 분석 중 오류 발생: {e}")
+                results[key] = None
+    
+    return results
+
 # ============================================================================
 # 메인 실행
 # ============================================================================
 if __name__ == '__main__':
+    # 로깅 설정은 라이브러리(core/analyzers)가 아니라 실행 스크립트에서 한 번만 지정
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # INFO 레벨에서 요청마다 로그를 남기는 외부 라이브러리는 경고 이상만 출력
+    for noisy_logger in ('snowflake', 'httpx'):
+        logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+    
     # 시작 시간 기록
     start_time = datetime.now()
     print(f"\n{'='*60}")
@@ -5335,6 +5548,9 @@ if __name__ == '__main__':
     else:
         print(f"분석할 기간: {len(yyyymm_list)}개월 ({yyyymm_list[0]} ~ {yyyymm_list[-1]})")
     
+    # 특정 년월/브랜드를 LLM 캐시 없이 다시 분석하려면 해당 캐시를 먼저 삭제
+    # invalidate_cache(yyyymm='202511', brd_cd='M')
+    
     # 브랜드 선택 (원하는 브랜드만 주석 해제)
     brands_to_analyze = [
         'M',   # MLB
@@ -5345,33 +5561,23 @@ if __name__ == '__main__':
         'W',   # SUPRA
     ]
     
-    # 기간별, 브랜드별 분석 실행
-    for yyyymm in yyyymm_list:
-        print(f"\n{'='*60}")
-        print(f"기간 분석 시작: {yyyymm} ({yyyymm[:4]}년 {yyyymm[4:6]}월)")
-        print(f"{'='*60}\n")
-        
-        for brd_cd in brands_to_analyze:
-            print(f"\n{'='*60}")
-            print(f"브랜드 분석 시작: {brd_cd} ({BRAND_CODE_MAP.get(brd_cd, brd_cd)})")
-            print(f"{'='*60}\n")
-            
-            try:
-                # 분석 실행 (원하는 분석만 주석 해제)
-                analyze_channel_sales(yyyymm, brd_cd)  # 실판매출_채널별매출분석
-                # analyze_gender_purchase_pattern(yyyymm, brd_cd)  # 성별 구매 패턴 분석 (4-1-3-1)
-                # analyze_gender_purchase_pattern_overall(yyyymm, brd_cd)  # 성별 구매 패턴 종합분석 (4-1-3-2)
-                analyze_category_profit(yyyymm, brd_cd)  # 영업이익_아이템별직접이익
-                analyze_operating_expense(yyyymm, brd_cd)  # 영업비_각 계정별 분석
-                analyze_discount_rate_overall(yyyymm, brd_cd)  # 할인율 종합분석
-                analyze_store_efficiency_overall(yyyymm, brd_cd)  # 매장효율성 종합분석
-                analyze_channel_sales_trend(yyyymm, brd_cd)  # 월별 채널별 매출추세 (당해 1월~현재월)
-                analyze_item_sales_trend(yyyymm, brd_cd)  # 월별 아이템별 매출추세 (당해 1월~현재월)
-                analyze_item_stock_trend(yyyymm, brd_cd)  # 월별 아이템별 재고추세 (당해 1월~현재월)
-            except Exception as e:
-                print(f"[ERROR] 브랜드 {brd_cd} 분석 중 오류 발생: {e}")
-                print(f"[ERROR] 다음 브랜드로 계속 진행합니다...\n")
-                continue
+    # 실행할 분석 선택 (원하는 분석만 주석 해제)
+    analyses_to_run = [
+        analyze_channel_sales,  # 실판매출_채널별매출분석
+        # analyze_gender_purchase_pattern,  # 성별 구매 패턴 분석 (4-1-3-1)
+        # analyze_gender_purchase_pattern_overall,  # 성별 구매 패턴 종합분석 (4-1-3-2)
+        analyze_category_profit,  # 영업이익_아이템별직접이익
+        analyze_operating_expense,  # 영업비_각 계정별 분석
+        analyze_discount_rate_overall,  # 할인율 종합분석
+        analyze_store_efficiency_overall,  # 매장효율성 종합분석
+        analyze_channel_sales_trend,  # 월별 채널별 매출추세 (당해 1월~현재월)
+        analyze_item_sales_trend,  # 월별 아이템별 매출추세 (당해 1월~현재월)
+        analyze_item_stock_trend,  # 월별 아이템별 재고추세 (당해 1월~현재월)
+    ]
+    
+    # 기간별, 브랜드별, 분석별 작업을 동시에 실행 (DB 엔진은 run_analyses에서 한 번 생성해 공유)
+    print(f"분석 브랜드: {', '.join(BRAND_CODE_MAP.get(brd_cd, brd_cd) for brd_cd in brands_to_analyze)}")
+    run_analyses(yyyymm_list, brands_to_analyze, analyses_to_run)
     
     # 종료 시간 기록
     end_time = datetime.now()
@@ -5398,4 +5604,6 @@ if __name__ == '__main__':
     print(f"입력 토큰: {total_tokens['input']:,} 토큰")
     print(f"출력 토큰: {total_tokens['output']:,} 토큰")
     print(f"총 토큰: {total_token_count:,} 토큰")
+    print(f"프롬프트 캐시 읽기: {total_tokens['cache_read']:,} 토큰")
+    print(f"프롬프트 캐시 생성: {total_tokens['cache_creation']:,} 토큰")
     print(f"{'='*60}\n")
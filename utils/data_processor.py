@@ -28,6 +28,21 @@ def convert_decimal_to_float(obj):
     return obj
 
 
+def shift_yyyymm(yyyymm, months):
+    """
+    년월(YYYYMM)을 지정한 개월 수만큼 이동
+    
+    Args:
+        yyyymm (str): 기준 년월 (예: '202509')
+        months (int): 이동할 개월 수 (음수면 과거)
+    
+    Returns:
+        str: 이동한 년월 (예: shift_yyyymm('202509', -11) -> '202410')
+    """
+    year, month_index = divmod(int(yyyymm[:4]) * 12 + int(yyyymm[4:6]) - 1 + months, 12)
+    return f"{year:04d}{month_index + 1:02d}"
+
+
 def calculate_percentage_change(current, previous):
     """
     전년대비 증감률 계산